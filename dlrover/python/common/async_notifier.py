@@ -0,0 +1,91 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+from typing import Callable, Optional, Set, Tuple
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AsyncNotifier(object):
+    """
+    A condition which the coroutines wait on in their event loops and
+    any thread notifies, so the requests waiting for an update do not
+    hold threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: Set[
+            Tuple[asyncio.AbstractEventLoop, asyncio.Future]
+        ] = set()
+
+    def notify_all(self):
+        """Wake all waiting coroutines. It is safe to call in any thread."""
+        with self._lock:
+            waiters = self._waiters
+            self._waiters = set()
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                # The event loop is closed.
+                pass
+
+    async def wait_for(
+        self,
+        predicate: Callable[[], bool],
+        timeout: float,
+        get_wait_time: Optional[Callable[[float], float]] = None,
+    ) -> bool:
+        """
+        Wait until the predicate is true or the timeout elapses.
+
+        Args:
+            predicate: the function to check the state after notified.
+            timeout: the max seconds to wait.
+            get_wait_time: the function to get the seconds to wait before
+                checking the predicate again from the remaining seconds,
+                if the state may change without a notification.
+
+        Returns:
+            The last result of the predicate.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = time.time() + timeout
+        while True:
+            # Add the waiter before checking the predicate, so it is
+            # notified if the state changes after the check.
+            waiter = (loop, loop.create_future())
+            with self._lock:
+                self._waiters.add(waiter)
+            try:
+                if predicate():
+                    return True
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                if get_wait_time:
+                    remaining = get_wait_time(remaining)
+                try:
+                    await asyncio.wait_for(waiter[1], remaining)
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                with self._lock:
+                    self._waiters.discard(waiter)
@@ -11,6 +11,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import base64
+import os
 import socket
 from dataclasses import dataclass, field
 from typing import Dict, List
@@ -18,12 +19,16 @@ from typing import Dict, List
 import grpc
 
 import dlrover.python.util.dlrover_pickle as pickle
-from dlrover.python.common.constants import GRPC
+from dlrover.python.common import message_codec
+from dlrover.python.common.constants import GRPC, MessageCodecType, NodeEnv
 from dlrover.python.common.log import default_logger as logger
 from dlrover.python.common.serialize import JsonSerializable
 
 TIMEOUT_SEC = 5
 
+# The content type of the HTTP body which is the pickled message.
+HTTP_BINARY_CONTENT_TYPE = "application/octet-stream"
+
 
 def build_grpc_channel(addr):
     if not addr_connected(addr):
@@ -84,26 +89,58 @@ def serialize_message(message):
         try:
             data = pickle.dumps(message)
         except Exception as e:
-            logger.warning(f"Pickle failed to load {str(data)}", e)
+            logger.warning(f"Failed to encode the message: {e}")
     return data
 
 
+def get_message_codec(data: bytes = b""):
+    """
+    Get the codec of the serialized message or the codec configured
+    by the environment variable if the data is empty.
+    """
+    if data:
+        if message_codec.is_encoded(data):
+            return MessageCodecType.MSGPACK
+        return MessageCodecType.PICKLE
+    return os.getenv(NodeEnv.DLROVER_MESSAGE_CODEC, MessageCodecType.PICKLE)
+
+
 def deserialize_message(data: bytes):
     """The method will create a message instance with the content.
     Args:
-        data: pickle bytes of a class instance.
+        data: pickle bytes or the bytes encoded by `message_codec`
+            of a class instance.
     """
     message = None
     if data:
         try:
-            message = pickle.loads(data)
+            if message_codec.is_encoded(data):
+                message = message_codec.decode(data)
+            else:
+                message = pickle.loads(data)
         except Exception as e:
-            logger.warning(f"Pickle failed to load {str(data)}", e)
+            logger.warning(f"Failed to decode the message: {e}")
     return message
 
 
 class Message(JsonSerializable):
-    def serialize(self):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        message_codec.register_message_class(cls)
+
+    def serialize(self, codec=""):
+        """
+        Serialize the message by the codec. The codec is configured by
+        the environment variable if it is empty. The message is pickled
+        if msgpack is not installed or it has the values not supported
+        by `message_codec`.
+        """
+        codec = codec or get_message_codec()
+        if codec == MessageCodecType.MSGPACK and message_codec.is_available():
+            try:
+                return message_codec.encode(self)
+            except (TypeError, ValueError, OverflowError):
+                pass
         return pickle.dumps(self)
 
 
@@ -148,6 +185,18 @@ class BaseResponse(Message):
         )
 
 
+@dataclass
+class BatchRequest(Message):
+    """The report requests sent by one HTTP request."""
+
+    requests: List[BaseRequest] = field(default_factory=list)
+
+
+@dataclass
+class BatchResponse(Message):
+    responses: List[BaseResponse] = field(default_factory=list)
+
+
 @dataclass
 class TaskRequest(Message):
     dataset_name: str = ""
@@ -169,6 +218,30 @@ class Task(Message):
     extended_config: Dict[str, str] = field(default_factory=dict)
 
 
+@dataclass
+class TaskLeaseRequest(Message):
+    """
+    Lease tasks of a dataset. The master reassigns the tasks of a lease
+    to other nodes if the node does not request or report any task of
+    the dataset in `lease_seconds`. The lease does not expire if
+    `lease_seconds` is not positive. The request with `num_tasks=0`
+    only renews the leases.
+    """
+
+    dataset_name: str = ""
+    num_tasks: int = 1
+    lease_seconds: int = 0
+
+
+@dataclass
+class TaskLease(Message):
+    tasks: List[Task] = field(default_factory=list)
+    # All tasks of the dataset are completed.
+    finished: bool = False
+    # The tasks of the node whose leases expire and are reassigned.
+    revoked_task_ids: List[int] = field(default_factory=list)
+
+
 @dataclass
 class GPUStats(Message):
     index: int = 0
@@ -281,6 +354,13 @@ class TaskResult(Message):
     exec_counters: Dict[str, int] = field(default_factory=dict)
 
 
+@dataclass
+class TaskResults(Message):
+    """The results of tasks reported by one request."""
+
+    results: List[TaskResult] = field(default_factory=list)
+
+
 @dataclass
 class SyncJoin(Message):
     sync_name: str = ""
@@ -365,7 +445,9 @@ class RendezvousRequest(Message):
 
 @dataclass
 class CommWorldRequest(RendezvousRequest):
-    pass
+    # The master holds the request until the node is in the world
+    # or the seconds elapse if positive.
+    wait_timeout: float = 0
 
 
 @dataclass
@@ -440,12 +522,21 @@ class KeyValuePair(Message):
     key: str = ""
     value: bytes = b""
     op: str = ""
+    # The value to compare for "compare_set".
+    expected: bytes = b""
+    # The key expires after the seconds if positive.
+    ttl: float = 0
 
 
 @dataclass
 class KeyValuePairs(Message):
     kvs: Dict[str, bytes] = field(default_factory=dict)
     op: str = ""
+    # The master holds the request until all keys are set for "get" or
+    # any key is updated for "watch" or the seconds elapse.
+    wait_timeout: float = 0
+    # The version of each key which is increased when the key is updated.
+    versions: Dict[str, int] = field(default_factory=dict)
 
 
 @dataclass
@@ -521,6 +612,19 @@ class ElasticRunConfig(Message):
     configs: Dict[str, str] = field(default_factory=dict)
 
 
+@dataclass
+class ServiceStatsRequest(Message):
+    pass
+
+
+@dataclass
+class ServiceStats(Message):
+    """The stats of the handlers and the executors of the master service."""
+
+    message_stats: Dict[str, Dict] = field(default_factory=dict)
+    executor_stats: Dict[str, Dict] = field(default_factory=dict)
+
+
 @dataclass
 class Event(Message):
     event_type: str = ""
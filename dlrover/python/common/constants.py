@@ -33,6 +33,11 @@ class CommunicationType(object):
     COMM_SERVICE_HTTP = "http"
 
 
+class MessageCodecType(object):
+    PICKLE = "pickle"
+    MSGPACK = "msgpack"
+
+
 class ElasticJobApi(object):
     GROUP = "elastic.iml.github.io"
     VERION = "v1alpha1"
@@ -188,6 +193,8 @@ class JobExitReason(object):
 
 class CustomMetricKeys:
     RDZV_ROUND = "rdzv_round"
+    RDZV_LATENCY_P50 = "rdzv_latency_p50"
+    RDZV_LATENCY_P99 = "rdzv_latency_p99"
     TRAINING_ERROR_LEVEL = "error_level"
     ERROR_CONTENT = "error_content"
 
@@ -282,6 +289,11 @@ class NodeEnv(object):
     RELAUNCHED_POD = "RELAUNCHED_POD"
     DLROVER_MASTER_ADDR = "DLROVER_MASTER_ADDR"
     DLROVER_MASTER_SERVICE_TYPE = "DLROVER_MASTER_SERVICE_TYPE"
+    # Post the pickled request to the HTTP master without the base64
+    # encoding in JSON if true.
+    DLROVER_MASTER_HTTP_BINARY = "DLROVER_MASTER_HTTP_BINARY"
+    # The codec to serialize the messages to the master.
+    DLROVER_MESSAGE_CODEC = "DLROVER_MESSAGE_CODEC"
     GRPC_ENABLE_FORK = "GRPC_ENABLE_FORK_SUPPORT"
     GRPC_POLL_STRATEGY = "GRPC_POLL_STRATEGY"
     POD_NAME = "POD_NAME"
@@ -380,6 +392,43 @@ class CheckpointConstant(object):
     MODEL_STATES_NAME = "model_states"
     OPTIM_STATES_NAME = "optim_states"
     SAVE_TIMEOUT = 600
+    # The number of threads to write the segments of a shard in parallel.
+    # The saver writes each shard with a single `torch.save` if it <= 1.
+    PERSIST_WORKERS_ENV = "DLROVER_CKPT_PERSIST_WORKERS"
+    # The number of threads to load the files of a checkpoint.
+    LOAD_WORKERS_ENV = "DLROVER_CKPT_LOAD_WORKERS"
+    # The max bytes of a segment file of a shard.
+    PERSIST_CHUNK_SIZE_ENV = "DLROVER_CKPT_PERSIST_CHUNK_SIZE"
+    DEFAULT_PERSIST_CHUNK_SIZE = 256 * 1024 * 1024
+    SEGMENT_FILE_SUFFIX = ".seg_"
+    SEGMENT_MANIFEST_MAGIC = b"DLROVER_SEGMENTS"
+    # The format to persist a shard if not persisting segments. The value
+    # is "torch" to use `torch.save` or "raw" to stream the shared memory.
+    PERSIST_FORMAT_ENV = "DLROVER_CKPT_PERSIST_FORMAT"
+    TORCH_FORMAT = "torch"
+    RAW_FORMAT = "raw"
+    RAW_CKPT_MAGIC = b"DLROVER_RAW_CKPT"
+    # The file compressed in chunks with checksums by `CompressedStorage`.
+    COMPRESSED_CKPT_MAGIC = b"DLROVER_COMPRESS"
+    DEFAULT_COMPRESS_CHUNK_SIZE = 4 * 1024 * 1024
+    # Only save the tensors modified since the latest checkpoint and
+    # save all tensors every `DELTA_FULL_INTERVAL` checkpoints.
+    DELTA_MODE_ENV = "DLROVER_CKPT_DELTA_MODE"
+    DELTA_FULL_INTERVAL_ENV = "DLROVER_CKPT_DELTA_FULL_INTERVAL"
+    DEFAULT_DELTA_FULL_INTERVAL = 10
+    # Copy the tensors into the shared memory through a pool of staging
+    # buffers on a side stream without blocking the training.
+    PIPELINED_COPY_ENV = "DLROVER_CKPT_PIPELINED_COPY"
+    STAGING_BUFFER_SIZE_ENV = "DLROVER_CKPT_STAGING_BUFFER_SIZE"
+    DEFAULT_STAGING_BUFFER_SIZE = 64 * 1024 * 1024
+    STAGING_BUFFER_NUM_ENV = "DLROVER_CKPT_STAGING_BUFFER_NUM"
+    DEFAULT_STAGING_BUFFER_NUM = 4
+    # The max bytes of a chunk to send a shard to the replica of peer nodes.
+    REPLICA_CHUNK_SIZE_ENV = "DLROVER_CKPT_REPLICA_CHUNK_SIZE"
+    DEFAULT_REPLICA_CHUNK_SIZE = 64 * 1024 * 1024
+    # The max bytes per second to drain the checkpoint files from the
+    # local tier into the remote tier of `TieredStorage`. 0 is no limit.
+    DRAIN_BANDWIDTH_ENV = "DLROVER_CKPT_DRAIN_BANDWIDTH"
 
 
 class JobConstant(object):
@@ -415,6 +464,18 @@ class JobConstant(object):
     # sleep 5s before next rendezvous round
     RENDEZVOUS_DEFAULT_INTERVAL = 5
 
+    # The max seconds of the master to hold a request of the world
+    # until the rendezvous completes.
+    RENDEZVOUS_LONG_POLL_TIMEOUT = 15
+
+    # The max seconds of the master to hold a request of the KV store
+    # until the keys are set.
+    KV_STORE_LONG_POLL_TIMEOUT = 15
+
+    # The max number of requests held by the master to wait for the world
+    # of the rendezvous or the keys of the KV store.
+    MASTER_MAX_LONG_POLL_REQUESTS = 1024
+
     # sleep 5s before next port synchronization
     SYNC_PORTS_DEFAULT_INTERVAL = 5
 
@@ -499,3 +560,5 @@ class KeyValueOps(object):
     GET = "get"
     SET = "set"
     DELETE = "delete"
+    WATCH = "watch"
+    COMPARE_SET = "compare_set"
@@ -79,11 +79,22 @@ class DefaultValues(object):
     MIN_HANG_DOWNTIME = 2  # min downtime, unit is minute
     MAX_CKPT_THRESHOLD = 900  # seconds
     MAX_AVG_STEPS = 50
+    POD_CREATION_CONCURRENCY = 16
+    POD_CREATION_QPS = 20
+    POD_CREATION_MAX_BACKOFF = 60  # seconds
 
 
 class Context(Singleton):
     def __init__(self):
         self.master_service_type = DefaultValues.SERVICE_TYPE
+        # Serve the gRPC requests by grpc.aio and the executors of
+        # the request categories.
+        self.master_service_async = False
+        # The max number of the concurrent requests and the requests per
+        # second to create pods.
+        self.pod_creation_concurrency = DefaultValues.POD_CREATION_CONCURRENCY
+        self.pod_creation_qps = DefaultValues.POD_CREATION_QPS
+        self.pod_creation_max_backoff = DefaultValues.POD_CREATION_MAX_BACKOFF
         self.reporter_cls = (
             "dlrover.python.common.event.reporter",
             "EventReporter",
@@ -0,0 +1,105 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+from typing import List
+
+try:
+    import numpy as np
+
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    _NUMPY_AVAILABLE = False
+
+_MASK64 = (1 << 64) - 1
+_FEISTEL_ROUNDS = 4
+
+
+def _mix64(x, key):
+    """The splitmix64 finalizer as the round function of the Feistel."""
+    x = (x + key) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _np_mix64(x, key):
+    x = x + np.uint64(key)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class IndexPermutation(object):
+    """A seeded pseudo-random permutation of the record indices [0, size).
+
+    The position is mapped to an index by a Feistel network on the bits
+    of the position with cycle walking, so the indices of any range of
+    positions are computed on demand without materializing the whole
+    permutation.
+
+    Args:
+        size: int, the number of records.
+        seed: int, the seed of the permutation.
+    """
+
+    def __init__(self, size, seed):
+        self.size = size
+        self.seed = seed
+        bits = max((size - 1).bit_length(), 2)
+        self._half_bits = (bits + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        rand = random.Random(seed)
+        self._keys = [rand.getrandbits(64) for _ in range(_FEISTEL_ROUNDS)]
+
+    def _encrypt(self, x):
+        left, right = x >> self._half_bits, x & self._half_mask
+        for key in self._keys:
+            left, right = right, left ^ (_mix64(right, key) & self._half_mask)
+        return (left << self._half_bits) | right
+
+    def _np_encrypt(self, x):
+        half_bits = np.uint64(self._half_bits)
+        half_mask = np.uint64(self._half_mask)
+        left, right = x >> half_bits, x & half_mask
+        for key in self._keys:
+            left, right = right, left ^ (_np_mix64(right, key) & half_mask)
+        return (left << half_bits) | right
+
+    def get(self, position) -> int:
+        """Get the record index at the position of the permutation."""
+        index = self._encrypt(position)
+        while index >= self.size:
+            index = self._encrypt(index)
+        return index
+
+    def get_indices(self, start, end) -> List[int]:
+        """Get the record indices at the positions [start, end)."""
+        if not _NUMPY_AVAILABLE:
+            return [self.get(i) for i in range(start, end)]
+        return self.take(np.arange(start, end, dtype=np.uint64))
+
+    def take(self, positions) -> List[int]:
+        """Get the record indices at the positions in a sequence, a numpy
+        array or a CPU tensor."""
+        if not _NUMPY_AVAILABLE:
+            return [self.get(int(i)) for i in positions]
+        indices = self._np_encrypt(np.asarray(positions, dtype=np.uint64))
+        walking = indices >= self.size
+        while walking.any():
+            indices[walking] = self._np_encrypt(indices[walking])
+            walking = indices >= self.size
+        return indices.tolist()
+
+    def to_dict(self):
+        return {"size": self.size, "seed": self.seed}
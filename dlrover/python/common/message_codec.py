@@ -0,0 +1,259 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The schema-based binary codec of the dataclass messages in
+`dlrover.python.common.comm` by msgpack.
+
+A message is encoded as the class name and the list of field values in the
+declaration order of the dataclass, so the field names are not in the
+payload. The nested message of a field annotated by its class is encoded
+as the list of its values without the class name. The schema of a message
+can evolve by appending fields with default values:
+    - The decoder fills the default values of the fields missing in
+      the payload sent by an older peer.
+    - The decoder ignores the extra values in the payload sent by
+      a newer peer.
+
+The message of a subclass which inherits the fields of a base message,
+like `CommWorldRequest` of `RendezvousRequest`, is encoded as the dict of
+the field names and values instead, because the fields of the base class
+precede its own fields and appending fields to the base class would shift
+them. The decoder matches its fields by names.
+
+The payload starts with a magic byte which is never the first byte of
+a pickle and the version of the codec.
+"""
+
+import dataclasses
+import typing
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import msgpack
+
+    _MSGPACK_AVAILABLE = True
+except ImportError:
+    _MSGPACK_AVAILABLE = False
+
+_MAGIC = 0xD1
+CODEC_VERSION = 1
+
+# The codes of the msgpack extension types.
+_EXT_MESSAGE = 1
+_EXT_TUPLE = 2
+_EXT_SET = 3
+
+# The kinds of fields in the schema of a message.
+_PLAIN = 0
+_MESSAGE = 1
+_MESSAGE_LIST = 2
+_MESSAGE_DICT = 3
+
+# The messages can be decoded only from the modules which are allowed to
+# be unpickled by `dlrover_pickle`.
+_ALLOWED_MODULES = ["dlrover.python.common.comm"]
+
+_message_classes: Dict[str, type] = {}
+_schemas: Dict[type, List[Tuple[str, int, Optional[type]]]] = {}
+# The classes without the fields of messages are decoded by positions.
+_plain_classes: Set[type] = set()
+# The classes inheriting fields are encoded by the names of fields.
+_named_classes: Set[type] = set()
+
+
+def is_available():
+    return _MSGPACK_AVAILABLE
+
+
+def register_message_class(cls):
+    if cls.__module__ in _ALLOWED_MODULES:
+        _message_classes[cls.__name__] = cls
+
+
+def is_encoded(data) -> bool:
+    """Whether the data is encoded by the codec instead of pickle."""
+    return len(data) > 1 and data[0] == _MAGIC
+
+
+def _is_message_class(tp) -> bool:
+    return isinstance(tp, type) and _message_classes.get(tp.__name__) is tp
+
+
+def _get_schema(cls):
+    """
+    Get the name, the kind and the message class of each field by the
+    type annotations of the dataclass. The field of a message class is
+    encoded as the list of its values without the class name.
+    """
+    schema = _schemas.get(cls)
+    if schema is None:
+        if not dataclasses.is_dataclass(cls):
+            raise TypeError(f"{cls.__name__} is not a dataclass.")
+        hints = typing.get_type_hints(cls)
+        schema = []
+        for f in dataclasses.fields(cls):
+            tp = hints.get(f.name)
+            args = typing.get_args(tp)
+            origin = typing.get_origin(tp)
+            if _is_message_class(tp):
+                schema.append((f.name, _MESSAGE, tp))
+            elif origin is list and args and _is_message_class(args[0]):
+                schema.append((f.name, _MESSAGE_LIST, args[0]))
+            elif origin is dict and args and _is_message_class(args[-1]):
+                schema.append((f.name, _MESSAGE_DICT, args[-1]))
+            else:
+                schema.append((f.name, _PLAIN, None))
+        own_fields = cls.__dict__.get("__annotations__", {})
+        if any(name not in own_fields for name, _, _ in schema):
+            _named_classes.add(cls)
+        elif all(kind == _PLAIN for _, kind, _ in schema):
+            _plain_classes.add(cls)
+        _schemas[cls] = schema
+    return schema
+
+
+def _encode_field(value, cls):
+    # The value of a subclass or other types is encoded with its type.
+    if type(value) is cls:
+        return _to_values(value)
+    return value
+
+
+def _to_values(message):
+    schema = _get_schema(type(message))
+    values = []
+    for name, kind, cls in schema:
+        value = getattr(message, name)
+        if kind == _MESSAGE:
+            value = _encode_field(value, cls)
+        elif kind == _MESSAGE_LIST and type(value) is list:
+            value = [_encode_field(v, cls) for v in value]
+        elif kind == _MESSAGE_DICT and type(value) is dict:
+            value = {k: _encode_field(v, cls) for k, v in value.items()}
+        values.append(value)
+    if type(message) in _named_classes:
+        return {name: value for (name, _, _), value in zip(schema, values)}
+    return values
+
+
+def _encode_message(message):
+    cls = type(message)
+    if _message_classes.get(cls.__name__) is not cls:
+        raise TypeError(f"{cls.__name__} is not a registered message.")
+    return [cls.__name__, _to_values(message)]
+
+
+def _pack(obj):
+    return msgpack.packb(
+        obj, default=_encode_ext, use_bin_type=True, strict_types=True
+    )
+
+
+def _encode_ext(obj):
+    """Encode the values which are not the exact msgpack types."""
+    if _message_classes.get(type(obj).__name__) is type(obj):
+        return msgpack.ExtType(_EXT_MESSAGE, _pack(_encode_message(obj)))
+    elif isinstance(obj, tuple):
+        return msgpack.ExtType(_EXT_TUPLE, _pack(list(obj)))
+    elif isinstance(obj, (set, frozenset)):
+        return msgpack.ExtType(_EXT_SET, _pack(list(obj)))
+    elif isinstance(obj, int):
+        return int(obj)
+    elif isinstance(obj, float):
+        return float(obj)
+    elif isinstance(obj, str):
+        return str(obj)
+    elif isinstance(obj, dict):
+        return dict(obj)
+    elif isinstance(obj, list):
+        return list(obj)
+    raise TypeError(f"Cannot encode the type {type(obj)}.")
+
+
+def _unpack(data):
+    return msgpack.unpackb(
+        data, ext_hook=_decode_ext, raw=False, strict_map_key=False
+    )
+
+
+def _decode_field(value, cls):
+    if type(value) is list:
+        return _from_values(cls, value)
+    if type(value) is dict:
+        _get_schema(cls)
+        if cls in _named_classes:
+            return _from_values(cls, value)
+    return value
+
+
+def _from_values(cls, values):
+    schema = _get_schema(cls)
+    # The fields missing in the values use the default values and
+    # the values of unknown fields are ignored.
+    if type(values) is dict:
+        items = [(f, values[f[0]]) for f in schema if f[0] in values]
+    elif cls in _plain_classes:
+        return cls(*values[: len(schema)])  # noqa E203
+    else:
+        items = list(zip(schema, values))
+    kwargs = {}
+    for (name, kind, field_cls), value in items:
+        if kind == _MESSAGE:
+            value = _decode_field(value, field_cls)
+        elif kind == _MESSAGE_LIST and type(value) is list:
+            value = [_decode_field(v, field_cls) for v in value]
+        elif kind == _MESSAGE_DICT and type(value) is dict:
+            value = {k: _decode_field(v, field_cls) for k, v in value.items()}
+        kwargs[name] = value
+    return cls(**kwargs)
+
+
+def _decode_message(obj):
+    name, values = obj
+    cls = _message_classes.get(name)
+    if cls is None:
+        raise ValueError(f"Unknown message type {name}.")
+    return _from_values(cls, values)
+
+
+def _decode_ext(code, data):
+    if code == _EXT_MESSAGE:
+        return _decode_message(_unpack(data))
+    elif code == _EXT_TUPLE:
+        return tuple(_unpack(data))
+    elif code == _EXT_SET:
+        return set(_unpack(data))
+    return msgpack.ExtType(code, data)
+
+
+def encode(message) -> bytes:
+    """
+    Encode the message.
+
+    Raises:
+        TypeError: if the message or any of its values is not supported.
+    """
+    header = bytes([_MAGIC, CODEC_VERSION])
+    return header + _pack(_encode_message(message))
+
+
+def decode(data: bytes):
+    """Decode the message encoded by `encode`."""
+    if not is_encoded(data):
+        raise ValueError("The data is not encoded by the message codec.")
+    if data[1] > CODEC_VERSION:
+        raise ValueError(f"Unsupported version {data[1]} of the codec.")
+    if not _MSGPACK_AVAILABLE:
+        raise RuntimeError("msgpack is required to decode the message.")
+    return _decode_message(_unpack(memoryview(data)[2:]))
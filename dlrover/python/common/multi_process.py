@@ -17,12 +17,14 @@ import pickle
 import queue
 import shutil
 import socket
+import struct
 import threading
 import time
+import uuid
 from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass, field
 from multiprocessing import shared_memory
-from typing import Dict
+from typing import Dict, Optional, Set
 
 import _posixshmem
 
@@ -30,6 +32,7 @@ from .constants import NodeEnv
 from .log import default_logger as logger
 
 SOCKET_TMP_DIR = "/tmp/ckpt_sock/"
+SHM_MESSAGE_THRESHOLD_ENV = "DLROVER_LOCAL_COMM_SHM_THRESHOLD"
 
 SUCCESS_CODE = "OK"
 ERROR_CODE = "ERROR"
@@ -104,27 +107,205 @@ def _create_socket_client(path):
     return client
 
 
+# The frame header has the kind and the size of a message.
+_FRAME_HEADER = struct.Struct("!BI")
+# The message follows the header in the socket.
+_INLINE_FRAME = 0
+# The message is in the shared memory of the connection.
+_SHM_FRAME = 1
+# The message is the shared memory of the connection for the peer to attach.
+_ATTACH_FRAME = 2
+
+_RECV_BUFFER_SIZE = 64 * 1024
+
+
+def _get_shm_message_threshold():
+    """The messages larger than the threshold pass the shared memory."""
+    return int(os.getenv(SHM_MESSAGE_THRESHOLD_ENV, 64 * 1024))
+
+
+def _recv_exactly(socket: socket.socket, view: memoryview):
+    """Receive bytes from the socket until the view is full."""
+    received = 0
+    while received < len(view):
+        size = socket.recv_into(view[received:])
+        if size == 0:
+            raise EOFError("The peer closed the socket.")
+        received += size
+
+
+def _send_frame(socket: socket.socket, kind, size, message=b""):
+    socket.sendall(_FRAME_HEADER.pack(kind, size))
+    if message:
+        socket.sendall(message)
+
+
 def _socket_send(socket: socket.socket, message):
     """
-    In the protocol, the first 4 bytes is the size of message.
+    In the protocol, the first 5 bytes are the kind and size of message.
     """
-    head = len(message).to_bytes(4, "big")
-    send_data = head + message
-    socket.send(send_data)
+    _send_frame(socket, _INLINE_FRAME, len(message), message)
 
 
 def _socket_recv(socket: socket.socket):
     """
-    In the protocol, the first 4 bytes is the size of message.
+    In the protocol, the first 5 bytes are the kind and size of message.
+    """
+    header = bytearray(_FRAME_HEADER.size)
+    _recv_exactly(socket, memoryview(header))
+    _, message_len = _FRAME_HEADER.unpack(header)
+    message = bytearray(message_len)
+    _recv_exactly(socket, memoryview(message))
+    return bytes(message)
+
+
+def _round_up_size(size):
+    """Round up the size to the power of 2."""
+    return 1 << max(size - 1, 1).bit_length()
+
+
+class _LocalChannel(object):
+    """
+    A persistent connection of the local socket. The messages larger than
+    `DLROVER_LOCAL_COMM_SHM_THRESHOLD` bytes pass a shared memory with a
+    request region and a response region of the connection, and the socket
+    only carries a small frame to notify the peer like an eventfd. The
+    client creates and grows the shared memory and the server attaches it.
+
+    Args:
+        sock: the connected socket.
     """
-    recv_data = socket.recv(1024)
-    head = recv_data[0:4]
-    message = recv_data[4:]
-    message_len = int.from_bytes(head, "big")
-    while len(message) < message_len:
-        recv_data = socket.recv(1024)
-        message += recv_data
-    return message
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._shm: Optional[SharedMemory] = None
+        self._request_size = 0
+        self._response_size = 0
+        self._header = bytearray(_FRAME_HEADER.size)
+        self._recv_buffer = bytearray(_RECV_BUFFER_SIZE)
+        self._shm_threshold = _get_shm_message_threshold()
+
+    def close(self):
+        if self._shm:
+            self._shm.close()
+            self._shm = None
+        self.sock.close()
+
+    def _recv_header(self):
+        _recv_exactly(self.sock, memoryview(self._header))
+        return _FRAME_HEADER.unpack(self._header)
+
+    def _recv_payload(self, size):
+        """Receive the message into the preallocated buffer."""
+        if size > len(self._recv_buffer):
+            self._recv_buffer = bytearray(_round_up_size(size))
+        view = memoryview(self._recv_buffer)[:size]
+        _recv_exactly(self.sock, view)
+        return view
+
+    def _send_message(self, message: bytes, shm_offset, shm_size):
+        size = len(message)
+        if self._shm is not None and self._shm_threshold < size <= shm_size:
+            end = shm_offset + size
+            self._shm.buf[shm_offset:end] = message
+            _send_frame(self.sock, _SHM_FRAME, size)
+        else:
+            _send_frame(self.sock, _INLINE_FRAME, size, message)
+
+
+class _ClientChannel(_LocalChannel):
+    def __init__(self, sock: socket.socket):
+        super().__init__(sock)
+        self.pid = os.getpid()
+        # The size of the latest large response passed by the socket.
+        self._response_hint = 0
+
+    def _reserve(self, request_size, response_size):
+        """Create a larger shared memory and notify the server to attach."""
+        request_size = _round_up_size(request_size)
+        response_size = _round_up_size(response_size)
+        name = f"dlrover_comm_{os.getpid()}_{uuid.uuid4().hex[:12]}"
+        shm = SharedMemory(
+            name=name, create=True, size=request_size + response_size
+        )
+        try:
+            message = pickle.dumps((name, request_size, response_size))
+            _send_frame(self.sock, _ATTACH_FRAME, len(message), message)
+            _, size = self._recv_header()
+            self._recv_payload(size).release()
+        except Exception:
+            shm.close()
+            raise
+        finally:
+            # Both processes have mapped the shared memory and the
+            # kernel releases it after the connection is closed.
+            _posixshmem.shm_unlink(shm._name)
+        if self._shm:
+            self._shm.close()
+        self._shm = shm
+        self._request_size = request_size
+        self._response_size = response_size
+
+    def request(self, request):
+        """Send a request and return the response from the server."""
+        message = pickle.dumps(request)
+        size = len(message)
+        request_size = self._request_size
+        response_size = self._response_size
+        if size > self._shm_threshold and size > request_size:
+            request_size = size
+        if self._response_hint > response_size:
+            response_size = self._response_hint
+        if (request_size, response_size) != (
+            self._request_size,
+            self._response_size,
+        ):
+            self._reserve(
+                max(request_size, self._shm_threshold),
+                max(response_size, self._shm_threshold),
+            )
+        self._send_message(message, 0, self._request_size)
+        kind, size = self._recv_header()
+        if kind == _SHM_FRAME:
+            assert self._shm is not None
+            start = self._request_size
+            with self._shm.buf[start : start + size] as view:  # noqa E203
+                return pickle.loads(view)
+        if size > self._shm_threshold:
+            self._response_hint = size
+        with self._recv_payload(size) as view:
+            return pickle.loads(view)
+
+
+class _ServerChannel(_LocalChannel):
+    def _attach(self, message):
+        name, request_size, response_size = pickle.loads(message)
+        shm = SharedMemory(name=name, create=False)
+        if self._shm:
+            self._shm.close()
+        self._shm = shm
+        self._request_size = request_size
+        self._response_size = response_size
+
+    def recv(self):
+        """Receive a request from the client."""
+        while True:
+            kind, size = self._recv_header()
+            if kind == _ATTACH_FRAME:
+                with self._recv_payload(size) as view:
+                    self._attach(view)
+                _send_frame(self.sock, _INLINE_FRAME, 0)
+                continue
+            if kind == _SHM_FRAME:
+                assert self._shm is not None
+                with self._shm.buf[:size] as view:
+                    return pickle.loads(view)
+            with self._recv_payload(size) as view:
+                return pickle.loads(view)
+
+    def reply(self, response):
+        message = pickle.dumps(response)
+        self._send_message(message, self._request_size, self._response_size)
 
 
 @dataclass
@@ -180,7 +361,10 @@ class LockedResponse(SocketResponse):
 
 class LocalSocketComm(metaclass=ABCMeta):
     """
-    Local socket for processes to communicate.
+    Local socket for processes to communicate. The server serves each
+    client connection in a thread and the client keeps the connection
+    if persistent. The large messages pass the shared memory of the
+    connection instead of the socket.
 
     Args:
         name (str): the instance name which must be unique if multiple
@@ -201,9 +385,11 @@ class LocalSocketComm(metaclass=ABCMeta):
         self._socket_file = self._create_socket_path()
         self._create = create
         self._server = None
+        self._closed = False
         self._init_socket()
         self._persist = persist
-        self._client = None
+        self._client: Optional[_ClientChannel] = None
+        self._request_lock = threading.Lock()
 
     @property
     def name(self):
@@ -236,24 +422,114 @@ class LocalSocketComm(metaclass=ABCMeta):
             )
             t.start()
 
-    @abstractmethod
     def _sync(self):
-        """Synchronize the obj between processes."""
+        """Serve each connection to synchronize the obj between processes."""
+        while not self._closed:
+            if not self.is_available():
+                time.sleep(1)
+                continue
+            try:
+                connection, _ = self._server.accept()
+                try:
+                    t = threading.Thread(
+                        target=self._serve_connection,
+                        args=(connection,),
+                        daemon=True,
+                    )
+                    t.start()
+                except Exception as e:
+                    logger.error(
+                        f"{self.__class__.__name__} failed to serve "
+                        f"the connection: {e}"
+                    )
+                    connection.close()
+            except Exception as e:
+                if self._closed:
+                    break
+                logger.error(
+                    f"Unexpected error in {self.__class__.__name__} "
+                    f"occurred: {e}"
+                )
+
+    def _serve_connection(self, connection):
+        channel = _ServerChannel(connection)
+        try:
+            while True:
+                try:
+                    request: SocketRequest = channel.recv()
+                except EOFError:
+                    # The client has closed the connection.
+                    break
+                except (ConnectionError, OSError) as e:
+                    logger.debug(
+                        f"{self.__class__.__name__} connection error: {e}"
+                    )
+                    break
+                try:
+                    response = self._handle_request(channel, request)
+                    if not response.status:
+                        response.status = SUCCESS_CODE
+                except Exception as e:
+                    logger.error(
+                        f"{self.__class__.__name__} failed to handle the "
+                        f"request {request.method}: {e}"
+                    )
+                    response = SocketResponse(status=ERROR_CODE)
+                try:
+                    channel.reply(response)
+                except (ConnectionError, OSError) as e:
+                    logger.error(
+                        f"{self.__class__.__name__} failed to send the "
+                        f"response: {e}"
+                    )
+                    break
+        finally:
+            self._close_connection(channel)
+            channel.close()
+
+    @abstractmethod
+    def _handle_request(
+        self, channel: _ServerChannel, request: SocketRequest
+    ) -> SocketResponse:
+        """Handle a request from the client and return the response."""
+        pass
+
+    def _close_connection(self, channel: _ServerChannel):
+        """Clean the state of a connection after the client closes it."""
         pass
 
     @retry_socket
     def _request(self, request: SocketRequest):
-        """Create a socket client to request the shared object."""
-        if self._client is None:
-            self._client = _create_socket_client(self._socket_file)
-        message = pickle.dumps(request)
-        _socket_send(self._client, message)
-        rcv_data = _socket_recv(self._client)
-        if not self._persist:
-            self._client.close()
-            self._client = None
-        response: LockAcquireResponse = pickle.loads(rcv_data)
-        return response
+        """Request the shared object by the connection to the server."""
+        with self._request_lock:
+            if self._client and self._client.pid != os.getpid():
+                # The connection belongs to the parent process.
+                self._client = None
+            reused = self._client is not None
+            if self._client is None:
+                self._client = _ClientChannel(
+                    _create_socket_client(self._socket_file)
+                )
+            try:
+                response = self._client.request(request)
+            except (BrokenPipeError, ConnectionResetError, EOFError):
+                self._client.close()
+                self._client = None
+                if not reused:
+                    raise
+                # The server has closed the idle persistent connection.
+                self._client = _ClientChannel(
+                    _create_socket_client(self._socket_file)
+                )
+                response = self._client.request(request)
+            except Exception:
+                self._client.close()
+                self._client = None
+                raise
+            if not self._persist:
+                self._client.close()
+                self._client = None
+            return response
 
     def is_available(self):
         try:
@@ -261,6 +537,17 @@ class LocalSocketComm(metaclass=ABCMeta):
         except Exception:
             return False
 
+    def close(self):
+        try:
+            self._closed = True
+            if self._client:
+                self._client.close()
+                self._client = None
+            if self._server:
+                self._server.close()
+        except Exception:
+            pass
+
 
 class SharedLock(LocalSocketComm):
     """
@@ -276,84 +563,37 @@ class SharedLock(LocalSocketComm):
     """
 
     def __init__(self, name="", create=False, owner=""):
-        super().__init__(name, create, persist=True)
-        if self._create:
+        if create:
             self._lock = threading.Lock()
         else:
             self._lock = None
+        # The connections which acquire the lock.
+        self._acquired_channels: Set[_ServerChannel] = set()
+        super().__init__(name, create, persist=True)
         self._id = owner
 
-    def _deal_shared_lock_msg(self, connection):
-        lock_acquired = False
-
-        while True:
-            try:
-                recv_data = _socket_recv(connection)
-                msg: SocketRequest = pickle.loads(recv_data)
-                if msg.method == "acquire":
-                    response = LockAcquireResponse()
-                    response.acquired = self.acquire(**msg.args)
-                    lock_acquired = response.acquired
-                elif msg.method == "locked":
-                    response = LockedResponse()
-                    response.locked = self.locked()
-                elif msg.method == "release":
-                    self.release()
-                    lock_acquired = False
-                response.status = SUCCESS_CODE
-            except (
-                ConnectionResetError,
-                ConnectionAbortedError,
-                BrokenPipeError,
-                ConnectionError,
-            ) as e:
-                # connection exception, need to re-connect a new one
-                logger.error(f"SharedLock connection error: {e}")
-                break
-            except OSError as e:
-                # unexpected os error, re-connect and retry
-                logger.error(f"SharedLock os error: {e}")
-                break
-            except EOFError as e:
-                # client has closed connection, exit safely
-                logger.info(f"SharedLock eof {e}: peer closed and exit")
-                break
-            except Exception as e:
-                # unexpected exception, the connection may be ok
-                logger.error(f"SharedLock unexpected recv error: {e}")
-                response = SocketResponse()
-                response.status = ERROR_CODE
-
-            try:
-                send_data = pickle.dumps(response)
-                _socket_send(connection, send_data)
-            except Exception as e:
-                logger.error(f"SharedLock unexpected send error: {e}")
-
-        if lock_acquired:
+    def _handle_request(self, channel, request: SocketRequest):
+        if request.method == "acquire":
+            response = LockAcquireResponse()
+            response.acquired = self.acquire(**request.args)
+            if response.acquired:
+                self._acquired_channels.add(channel)
+        elif request.method == "locked":
+            response = LockedResponse()
+            response.locked = self.locked()
+        elif request.method == "release":
+            response = SocketResponse()
             self.release()
-        connection.close()
-
-    def _sync(self):
-        while True:
-            if not self.is_available():
-                time.sleep(1)
-                continue
+            self._acquired_channels.discard(channel)
+        else:
+            raise ValueError(f"Unknown method {request.method}.")
+        return response
 
-            try:
-                connection, _ = self._server.accept()
-                try:
-                    t = threading.Thread(
-                        target=self._deal_shared_lock_msg,
-                        args=(connection,),
-                        daemon=True,
-                    )
-                    t.start()
-                except Exception as e:
-                    logger.error(f"SharedLock submit executor failed: {e}")
-                    connection.close()
-            except Exception as e:
-                logger.error(f"Unexpected error in SharedLock occurred: {e}")
+    def _close_connection(self, channel):
+        # Release the lock if the client exits without releasing it.
+        if channel in self._acquired_channels:
+            self._acquired_channels.discard(channel)
+            self.release()
 
     def acquire(self, blocking=True):
         """
@@ -408,15 +648,6 @@ class SharedLock(LocalSocketComm):
             )
             return self._request(request)
 
-    def close(self):
-        try:
-            if self._client:
-                self._client.close()
-            if self._server:
-                self._server.close()
-        except Exception:
-            pass
-
 
 @dataclass
 class QueueGetResponse(SocketResponse):
@@ -468,49 +699,29 @@ class SharedQueue(LocalSocketComm):
     """
 
     def __init__(self, name="", create=False, maxsize=1):
-        super().__init__(name, create)
-        if self._create:
+        if create:
             self._queue = queue.Queue(maxsize)
         else:
             self._queue = None
+        super().__init__(name, create, persist=True)
 
-    def _deal_shared_queue_msg(self, connection):
+    def _handle_request(self, channel, request: SocketRequest):
+        response = SocketResponse()
         try:
-            rcv_data = _socket_recv(connection)
-            msg: SocketRequest = pickle.loads(rcv_data)
-            response = SocketResponse()
-            if msg.method == "put":
-                self.put(**msg.args)
-            elif msg.method == "get":
+            if request.method == "put":
+                self.put(**request.args)
+            elif request.method == "get":
                 response = QueueGetResponse()
-                response.obj = self.get(**msg.args)
-            elif msg.method == "qsize":
+                response.obj = self.get(**request.args)
+            elif request.method == "qsize":
                 response = QueueSizeResponse()
                 response.size = self.qsize()
-            elif msg.method == "empty":
+            elif request.method == "empty":
                 response = QueueEmptyResponse()
                 response.empty = self.empty()
-            response.status = SUCCESS_CODE
-        except Exception:
-            response = SocketResponse()
-            response.status = ERROR_CODE
-
-        message = pickle.dumps(response)
-        _socket_send(connection, message)
-
-    def _sync(self):
-        while True:
-            if not self.is_available():
-                time.sleep(1)
-                continue
-            try:
-                connection, _ = self._server.accept()
-                try:
-                    self._deal_shared_queue_msg(connection)
-                finally:
-                    connection.close()
-            except Exception as e:
-                logger.error(f"An error in SharedQueue occurred: {e}")
+        except (queue.Empty, queue.Full):
+            response = SocketResponse(status=ERROR_CODE)
+        return response
 
     @property
     def queue(self):
@@ -590,49 +801,28 @@ class SharedDict(LocalSocketComm):
     """
 
     def __init__(self, name="", create=False):
-        super().__init__(name, create)
         self._dict = {}
-
         # The queue is used to notify the saver waiting for a new dict.
         self._shared_queue = SharedQueue(
-            name=f"shard_dict_{name}", create=self._create
+            name=f"shard_dict_{name}", create=create
         )
+        super().__init__(name, create, persist=True)
 
-    def _deal_shared_dict_msg(self, connection):
+    def _handle_request(self, channel, request: SocketRequest):
         try:
-            rcv_data = _socket_recv(connection)
-            msg: SocketRequest = pickle.loads(rcv_data)
             response = DictMessage()
-            if msg.method == "set":
-                self.set(**msg.args)
-            elif msg.method == "get":
-                response = DictMessage()
-                response.meta_dict = self.get(**msg.args)
-            response.status = SUCCESS_CODE
-        except Exception as e:
-            response = SocketResponse()
-            response.status = ERROR_CODE
-            logger.error(e)
+            if request.method == "set":
+                self.set(**request.args)
+            elif request.method == "get":
+                response.meta_dict = self.get(**request.args)
+            return response
         finally:
             if not self._shared_queue.empty():
                 self._shared_queue.get(1)
-        message = pickle.dumps(response)
-        _socket_send(connection, message)
 
-    def _sync(self):
-        while True:
-            if not self.is_available():
-                time.sleep(1)
-                continue
-            try:
-                connection, _ = self._server.accept()
-                try:
-                    self._deal_shared_dict_msg(connection)
-                finally:
-                    # Make sure the connection is closed
-                    connection.close()
-            except Exception as e:
-                logger.error(f"An error in SharedDict occurred: {e}")
+    def close(self):
+        super().close()
+        self._shared_queue.close()
 
     def set(self, new_dict):
         """
@@ -0,0 +1,34 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import math
+from typing import Iterable
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    """
+    Get the nearest-rank percentile of the values.
+
+    Args:
+        values: the values which are not required to be sorted.
+        q: the percentile in [0, 100].
+
+    Returns:
+        The value at the percentile or 0.0 if the values are empty.
+    """
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = max(math.ceil(q / 100 * len(values)) - 1, 0)
+    return values[index]
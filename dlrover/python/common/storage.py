@@ -11,15 +11,39 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
+import json
 import os
+import queue
 import shutil
+import struct
+import threading
+import time
+import zlib
 from abc import ABCMeta, abstractmethod
-from typing import Callable, List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 
 from .constants import CheckpointConstant
 from .log import default_logger as logger
 from .serialize import ClassMeta
 
+# The max number of buffers in a `writev` call on Linux.
+_IOV_MAX = 1024
+
+# The size of the manifest header in the compressed file.
+_MANIFEST_SIZE = struct.Struct("<Q")
+
+# The max bytes of a chunk to copy a file into the remote tier.
+_DRAIN_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class CheckpointCorruptionError(Exception):
+    """The checkpoint file is truncated or its checksum mismatches."""
+
+    pass
+
 
 class CheckpointStorage(metaclass=ABCMeta):
     """
@@ -38,6 +62,18 @@ class CheckpointStorage(metaclass=ABCMeta):
         """
         pass
 
+    def write_buffers(self, buffers, path):
+        """
+        Write the buffers in order into a file of the storage. The default
+        implementation joins the buffers, the storage can override it to
+        write the buffers without copying them.
+
+        Args:
+            buffers (list): a list of bytes-like objects.
+            path (str): the path of storage.
+        """
+        self.write(b"".join(buffers), path)
+
     @abstractmethod
     def write_state_dict(self, state_dict, path, write_func):
         """
@@ -85,6 +121,16 @@ class CheckpointStorage(metaclass=ABCMeta):
     def safe_move(self, src_path, dst_path):
         pass
 
+    def safe_link(self, src_path, dst_path):
+        """
+        Create a hard link to the source file. The storage can implement
+        the method to reuse an unchanged file of the previous checkpoint.
+
+        Returns:
+            bool: True if the link is created.
+        """
+        return False
+
     @abstractmethod
     def commit(self, step: int, success: bool):
         """
@@ -140,6 +186,26 @@ class PosixDiskStorage(CheckpointStorage):
             )
             raise e
 
+    def write_buffers(self, buffers, path):
+        views = [memoryview(b).cast("B") for b in buffers if len(b) > 0]
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while views:
+                written = os.writev(fd, views[:_IOV_MAX])
+                # Skip the written buffers because writev may write
+                # partial buffers.
+                while views and written >= len(views[0]):
+                    written -= len(views[0])
+                    views.pop(0)
+                if views and written > 0:
+                    views[0] = views[0][written:]
+            os.fsync(fd)
+        except OSError as e:
+            logger.error(f"Failed to write buffers into file: {path}")
+            raise e
+        finally:
+            os.close(fd)
+
     def write_state_dict(self, state_dict, path, write_func=None):
         dir = os.path.dirname(path)
         os.makedirs(dir, exist_ok=True)
@@ -173,6 +239,14 @@ class PosixDiskStorage(CheckpointStorage):
         if os.path.exists(src_path) and not os.path.exists(dst_path):
             shutil.move(src_path, dst_path)
 
+    def safe_link(self, src_path, dst_path):
+        try:
+            os.link(src_path, dst_path)
+            return True
+        except OSError as e:
+            logger.warning(f"Fail to link {src_path} to {dst_path}: {e}")
+            return False
+
     def commit(self, step, success):
         logger.info(
             f"Succeed {success} in persisting the checkpoint of step {step}."
@@ -192,6 +266,375 @@ class PosixDiskStorage(CheckpointStorage):
         return class_mata
 
 
+def _get_codecs() -> Dict[str, Tuple[Callable, Callable]]:
+    """Get the compress and decompress functions of available codecs."""
+    codecs: Dict[str, Tuple[Callable, Callable]] = {}
+    try:
+        import zstandard
+
+        def _zstd_compress(data):
+            return zstandard.ZstdCompressor(level=3).compress(data)
+
+        def _zstd_decompress(data, size):
+            return zstandard.ZstdDecompressor().decompress(
+                data, max_output_size=size
+            )
+
+        codecs["zstd"] = (_zstd_compress, _zstd_decompress)
+    except ImportError:
+        pass
+    try:
+        import lz4.frame
+
+        codecs["lz4"] = (
+            lz4.frame.compress,
+            lambda data, size: lz4.frame.decompress(data),
+        )
+    except ImportError:
+        pass
+    codecs["zlib"] = (
+        lambda data: zlib.compress(data, 1),
+        lambda data, size: zlib.decompress(data, bufsize=max(size, 1)),
+    )
+    # Store the chunk as it is if it is not compressible.
+    codecs["none"] = (bytes, lambda data, size: data)
+    return codecs
+
+
+def _get_checksums() -> Dict[str, Callable]:
+    """Get the checksum functions of available algorithms."""
+    checksums: Dict[str, Callable] = {}
+    try:
+        import crc32c
+
+        checksums["crc32c"] = crc32c.crc32c
+    except ImportError:
+        try:
+            import google_crc32c
+
+            checksums["crc32c"] = google_crc32c.value
+        except ImportError:
+            pass
+    checksums["crc32"] = zlib.crc32
+    return checksums
+
+
+_CODECS = _get_codecs()
+_CHECKSUMS = _get_checksums()
+
+
+def get_available_codecs():
+    """Get the names of the codecs which can compress the checkpoint."""
+    return [codec for codec in _CODECS if codec != "none"]
+
+
+def get_default_codec():
+    """Select zstd or lz4 if installed, otherwise, zlib."""
+    for codec in ["zstd", "lz4", "zlib"]:
+        if codec in _CODECS:
+            return codec
+    return "zlib"
+
+
+def _get_default_checksum():
+    return "crc32c" if "crc32c" in _CHECKSUMS else "crc32"
+
+
+def _split_chunks(buffers, chunk_size):
+    chunks = []
+    for buffer in buffers:
+        view = memoryview(buffer).cast("B")
+        for offset in range(0, len(view), chunk_size):
+            chunks.append(view[offset : offset + chunk_size])  # noqa E203
+    return chunks
+
+
+def compress_buffers(
+    buffers,
+    codec: str,
+    chunk_size: int,
+    executor: Optional[ThreadPoolExecutor] = None,
+):
+    """
+    Compress the buffers in chunks in parallel. The chunk is stored as it is
+    if the compressed chunk is not smaller.
+
+    Returns:
+        A list of buffers of the compressed file which is composed of the
+        magic, the size of the manifest, the JSON manifest and the compressed
+        chunks. The manifest has the raw size, the compressed size, the codec
+        and the checksum of the raw bytes of each chunk.
+    """
+    compress, _ = _CODECS[codec]
+    checksum_name = _get_default_checksum()
+    checksum = _CHECKSUMS[checksum_name]
+
+    def _compress_chunk(chunk):
+        data = compress(chunk)
+        if len(data) >= len(chunk):
+            return chunk, "none", checksum(chunk)
+        return data, codec, checksum(chunk)
+
+    chunks = _split_chunks(buffers, chunk_size)
+    if executor and len(chunks) > 1:
+        results = list(executor.map(_compress_chunk, chunks))
+    else:
+        results = [_compress_chunk(chunk) for chunk in chunks]
+    manifest = {
+        "checksum": checksum_name,
+        "chunks": [
+            [len(chunk), len(data), chunk_codec, value]
+            for chunk, (data, chunk_codec, value) in zip(chunks, results)
+        ],
+    }
+    header = json.dumps(manifest).encode()
+    compressed = [CheckpointConstant.COMPRESSED_CKPT_MAGIC]
+    compressed.append(_MANIFEST_SIZE.pack(len(header)))
+    compressed.append(header)
+    compressed.extend(data for data, _, _ in results)
+    return compressed
+
+
+def is_compressed(data):
+    """Check whether the bytes are compressed by `compress_buffers`."""
+    magic = CheckpointConstant.COMPRESSED_CKPT_MAGIC
+    return bytes(data[: len(magic)]) == magic
+
+
+def decompress_buffer(
+    data,
+    out=None,
+    executor: Optional[ThreadPoolExecutor] = None,
+    name="",
+):
+    """
+    Verify and decompress the chunks of bytes compressed by
+    `compress_buffers` in parallel.
+
+    Args:
+        data: the bytes-like object of the compressed file.
+        out: the writable buffer to write the decompressed bytes. A new
+            bytearray is allocated if it is None.
+        executor: the thread pool to decompress chunks.
+        name: the name of the data in the error message.
+
+    Returns:
+        The buffer with the decompressed bytes.
+
+    Raises:
+        CheckpointCorruptionError: the data is truncated or the checksum
+            of a chunk mismatches.
+    """
+    view = memoryview(data).cast("B")
+    start = len(CheckpointConstant.COMPRESSED_CKPT_MAGIC)
+    try:
+        end = start + _MANIFEST_SIZE.size
+        (header_size,) = _MANIFEST_SIZE.unpack(view[start:end])
+        header = view[end : end + header_size]  # noqa E203
+        manifest = json.loads(bytes(header))
+    except (struct.error, ValueError) as e:
+        raise CheckpointCorruptionError(f"Invalid manifest of {name}: {e}")
+    checksum = _CHECKSUMS.get(manifest["checksum"], None)
+    if checksum is None:
+        raise ValueError(f"Checksum {manifest['checksum']} is not available.")
+
+    chunks = []
+    offset = end + header_size
+    raw_offset = 0
+    for raw_size, size, codec, value in manifest["chunks"]:
+        chunks.append((offset, size, raw_offset, raw_size, codec, value))
+        offset += size
+        raw_offset += raw_size
+    if offset != len(view):
+        raise CheckpointCorruptionError(
+            f"The size of {name} is {len(view)} bytes, expected {offset}."
+        )
+    if out is None:
+        out = bytearray(raw_offset)
+    out_view = memoryview(out).cast("B")
+    if len(out_view) != raw_offset:
+        raise CheckpointCorruptionError(
+            f"The decompressed size of {name} is {raw_offset} bytes, "
+            f"expected {len(out_view)}."
+        )
+
+    def _decompress_chunk(chunk):
+        offset, size, raw_offset, raw_size, codec, value = chunk
+        _, decompress = _CODECS[codec]
+        raw = decompress(view[offset : offset + size], raw_size)  # noqa E203
+        if len(raw) != raw_size or checksum(raw) != value:
+            raise CheckpointCorruptionError(
+                f"The checksum of the chunk at {raw_offset} of {name} "
+                "mismatches."
+            )
+        out_view[raw_offset : raw_offset + raw_size] = raw  # noqa E203
+
+    try:
+        if executor and len(chunks) > 1:
+            list(executor.map(_decompress_chunk, chunks))
+        else:
+            for chunk in chunks:
+                _decompress_chunk(chunk)
+    except (zlib.error, KeyError) as e:
+        raise CheckpointCorruptionError(f"Fail to decompress {name}: {e!r}")
+    return out
+
+
+_read_executor: Optional[ThreadPoolExecutor] = None
+_read_executor_lock = threading.Lock()
+
+
+def _get_read_executor():
+    global _read_executor
+    with _read_executor_lock:
+        if _read_executor is None:
+            _read_executor = ThreadPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, 16),
+                thread_name_prefix="ckpt_decompress-",
+            )
+    return _read_executor
+
+
+def read_compressed_file(path, out=None):
+    """
+    Read a file compressed by `CompressedStorage` and verify its chunks
+    in parallel.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return decompress_buffer(
+        data, out=out, executor=_get_read_executor(), name=str(path)
+    )
+
+
+class CompressedStorage(CheckpointStorage):
+    """
+    The storage compresses the bytes in chunks with multiple threads and
+    keeps the checksum of each chunk in the manifest of the file before
+    writing it into the wrapped storage. It uses zstd or lz4 if installed,
+    otherwise, zlib. The text content like the tracker file is written
+    without compression.
+
+    The checkpoint engines load the compressed files by
+    `read_state_dict_file` which verifies the chunks in parallel. It cannot
+    be used by the FSDP checkpointer whose files are read by the
+    `StorageReader` of `torch.distributed.checkpoint`.
+
+    Arguments:
+        storage (CheckpointStorage): the storage to write compressed files.
+        codec (str): "zstd", "lz4" or "zlib". The default is the fastest
+            available codec.
+        chunk_size (int): the bytes of each chunk to compress.
+        max_workers (int): the number of threads to compress chunks.
+
+    Example::
+        storage = CompressedStorage(get_checkpoint_storage())
+        checkpointer = DdpCheckpointer(
+            checkpoint_dir="./checkpoint/",
+            storage=storage,
+        )
+    """
+
+    def __init__(
+        self,
+        storage: Optional[CheckpointStorage] = None,
+        codec: str = "",
+        chunk_size: int = CheckpointConstant.DEFAULT_COMPRESS_CHUNK_SIZE,
+        max_workers: int = 0,
+    ):
+        self._storage = storage if storage else PosixDiskStorage()
+        self._codec = codec if codec else get_default_codec()
+        if self._codec not in _CODECS:
+            raise ValueError(f"The codec {self._codec} is not installed.")
+        self._chunk_size = chunk_size
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            max_workers = self._max_workers or min(os.cpu_count() or 1, 16)
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="ckpt_compress-",
+            )
+        return self._executor
+
+    def write(self, content, path):
+        if isinstance(content, str):
+            self._storage.write(content, path)
+        else:
+            self.write_buffers([content], path)
+
+    def write_buffers(self, buffers, path):
+        compressed = compress_buffers(
+            buffers, self._codec, self._chunk_size, self._get_executor()
+        )
+        self._storage.write_buffers(compressed, path)
+
+    def write_state_dict(self, state_dict, path, write_func):
+        def _write_compressed(state_dict, path):
+            stream = io.BytesIO()
+            write_func(state_dict, stream)
+            self.write(stream.getbuffer(), path)
+
+        self._storage.write_state_dict(
+            state_dict, path, _write_compressed if write_func else None
+        )
+
+    def read(self, path, mode="r"):
+        if "b" not in mode:
+            return self._storage.read(path, mode)
+        content = self._storage.read(path, mode)
+        if content and is_compressed(content):
+            return bytes(
+                decompress_buffer(
+                    content, executor=_get_read_executor(), name=str(path)
+                )
+            )
+        return content
+
+    def read_state_dict(self, path, read_func):
+        return self._storage.read_state_dict(path, read_func)
+
+    def safe_rmtree(self, dir):
+        self._storage.safe_rmtree(dir)
+
+    def safe_remove(self, path):
+        self._storage.safe_remove(path)
+
+    def safe_makedirs(self, dir):
+        self._storage.safe_makedirs(dir)
+
+    def safe_move(self, src_path, dst_path):
+        self._storage.safe_move(src_path, dst_path)
+
+    def safe_link(self, src_path, dst_path):
+        return self._storage.safe_link(src_path, dst_path)
+
+    def commit(self, step, success):
+        self._storage.commit(step, success)
+
+    def exists(self, path: str):
+        return self._storage.exists(path)
+
+    def listdir(self, path: str):
+        return self._storage.listdir(path)
+
+    def get_class_meta(self):
+        kwargs = {
+            "storage": self._storage,
+            "codec": self._codec,
+            "chunk_size": self._chunk_size,
+            "max_workers": self._max_workers,
+        }
+        class_mata = ClassMeta(
+            module_path=self.__class__.__module__,
+            class_name=self.__class__.__name__,
+            kwargs=kwargs,
+        )
+        return class_mata
+
+
 class CheckpointDeletionStrategy(metaclass=ABCMeta):
     @abstractmethod
     def clean_up(self, step: int, delete_func: Callable):
@@ -323,6 +766,354 @@ class PosixStorageWithDeletion(PosixDiskStorage):
         return class_mata
 
 
+class TieredStorage(PosixDiskStorage):
+    """
+    The storage writes the checkpoint files into a directory on the
+    node-local disk like NVMe and a background thread drains them into
+    the checkpoint directory on the shared file system. The saver releases
+    the lock of the shared memory once the files of a shard are on the
+    local disk, so the training can save the next checkpoint into the
+    memory while the files are being drained.
+
+    Only the binary files under `checkpoint_dir` are written into the local
+    tier. The text files like the done files of shards and the tracker file
+    are written into the remote tier after all pending files are drained,
+    so the tracker file never points to a step which is incomplete in the
+    remote tier. The deletion strategy cleans up the outdated step in both
+    tiers and the local files whose remote copies are deleted are removed
+    before writing the next text file.
+
+    A file is read from the local tier if its remote copy has the same size
+    and modification time, otherwise, it is read from the remote tier.
+
+    Arguments:
+        checkpoint_dir (str): the checkpoint directory on the shared file
+            system.
+        local_dir (str): the directory on the node-local disk.
+        tracker_file (str): the file name to store the latest step.
+        deletion_strategy (CheckpointDeletionStrategy): the strategy to
+            clean outdated checkpoints of both tiers.
+        bandwidth (int): the max bytes per second to drain files. It is
+            read from the env `DLROVER_CKPT_DRAIN_BANDWIDTH` if None and
+            0 means no limit.
+        max_local_bytes (int): the max bytes of drained files to keep in
+            the local tier. The oldest drained files are removed from the
+            local tier if exceeded. 0 means no limit.
+
+    Example::
+        storage = TieredStorage(
+            checkpoint_dir="/nas/checkpoint/",
+            local_dir="/nvme/checkpoint/",
+            deletion_strategy=KeepLatestStepStrategy(3, "/nas/checkpoint/"),
+        )
+        checkpointer = DdpCheckpointer(
+            checkpoint_dir="/nas/checkpoint/",
+            storage=storage,
+        )
+    """
+
+    def __init__(
+        self,
+        checkpoint_dir: str,
+        local_dir: str,
+        tracker_file: str = CheckpointConstant.TRACER_FILE_NAME,
+        deletion_strategy: Optional[CheckpointDeletionStrategy] = None,
+        bandwidth: Optional[int] = None,
+        max_local_bytes: int = 0,
+    ):
+        super().__init__()
+        self._checkpoint_dir = os.path.abspath(checkpoint_dir)
+        self._local_dir = os.path.abspath(local_dir)
+        self._tracker_file = tracker_file
+        self._deletion_strategy = deletion_strategy
+        if bandwidth is None:
+            bandwidth = int(
+                os.getenv(CheckpointConstant.DRAIN_BANDWIDTH_ENV, 0)
+            )
+        self._bandwidth = bandwidth
+        self._max_local_bytes = max_local_bytes
+        self._pre_step = 0
+        self._lock = threading.Lock()
+        # The local path to the remote path and size of drained files
+        # in the order of draining.
+        self._local_files: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._local_bytes = 0
+        self._drain_queue: queue.Queue = queue.Queue()
+        self._drain_thread: Optional[threading.Thread] = None
+        self._drain_error: Optional[Exception] = None
+        self._drain_deadline = 0.0
+
+    def _get_local_path(self, path):
+        """Map the path under the checkpoint directory into the local tier.
+        Returns an empty string if the path is not under the directory."""
+        path = os.path.abspath(str(path))
+        rel_path = os.path.relpath(path, self._checkpoint_dir)
+        if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+            return ""
+        return os.path.normpath(os.path.join(self._local_dir, rel_path))
+
+    def _get_read_path(self, path):
+        local_path = self._get_local_path(path)
+        if not local_path:
+            return path
+        try:
+            local_stat = os.stat(local_path)
+            remote_stat = os.stat(path)
+        except OSError:
+            return path
+        if local_stat.st_size == remote_stat.st_size and int(
+            local_stat.st_mtime
+        ) == int(remote_stat.st_mtime):
+            return local_path
+        return path
+
+    def _submit_drain(self, local_path, path):
+        with self._lock:
+            if self._drain_thread is None:
+                self._drain_thread = threading.Thread(
+                    target=self._drain_files,
+                    name="ckpt_drain",
+                    daemon=True,
+                )
+                self._drain_thread.start()
+        self._drain_queue.put((local_path, str(path)))
+
+    def _drain_files(self):
+        while True:
+            local_path, path = self._drain_queue.get()
+            try:
+                self._drain_file(local_path, path)
+            except Exception as e:
+                logger.error(f"Fail to drain {local_path} into {path}: {e}")
+                self._drain_error = e
+            finally:
+                self._drain_queue.task_done()
+
+    def _throttle(self, size):
+        """Wait until the bytes can be drained under the bandwidth."""
+        if self._bandwidth <= 0:
+            return
+        now = time.time()
+        if self._drain_deadline > now:
+            time.sleep(self._drain_deadline - now)
+            now = self._drain_deadline
+        self._drain_deadline = now + size / self._bandwidth
+
+    def _drain_file(self, local_path, path):
+        try:
+            stat = os.stat(local_path)
+        except FileNotFoundError:
+            # The file has been removed before draining.
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        chunk_size = _DRAIN_CHUNK_SIZE
+        if self._bandwidth > 0:
+            chunk_size = min(chunk_size, self._bandwidth)
+        buffer = bytearray(max(min(chunk_size, stat.st_size), 1))
+        view = memoryview(buffer)
+        # Rename the file after copying to avoid reading a partial file.
+        tmp_path = path + ".draining"
+        with open(local_path, "rb") as src, open(tmp_path, "wb") as dst:
+            while True:
+                size = src.readinto(buffer)
+                if not size:
+                    break
+                self._throttle(size)
+                dst.write(view[:size])
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_path, path)
+        # The same mtime marks the local file as a valid copy.
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self._add_local_file(local_path, path, stat.st_size)
+
+    def _add_local_file(self, local_path, path, size):
+        evicted_paths = []
+        with self._lock:
+            pre_file = self._local_files.pop(local_path, None)
+            if pre_file:
+                self._local_bytes -= pre_file[1]
+            self._local_files[local_path] = (path, size)
+            self._local_bytes += size
+            while (
+                self._max_local_bytes > 0
+                and self._local_bytes > self._max_local_bytes
+                and len(self._local_files) > 1
+            ):
+                evicted_path, (_, evicted_size) = self._local_files.popitem(
+                    last=False
+                )
+                self._local_bytes -= evicted_size
+                evicted_paths.append(evicted_path)
+        for evicted_path in evicted_paths:
+            self._remove_local_file(evicted_path)
+
+    def _remove_local_file(self, local_path):
+        try:
+            os.remove(local_path)
+        except OSError:
+            pass
+
+    def _prune_local_files(self):
+        """Remove the local files whose remote copies are deleted."""
+        with self._lock:
+            files = list(self._local_files.items())
+        stale_paths = []
+        for local_path, (path, _) in files:
+            if not os.path.exists(path):
+                stale_paths.append(local_path)
+        with self._lock:
+            for local_path in stale_paths:
+                stale_file = self._local_files.pop(local_path, None)
+                if stale_file:
+                    self._local_bytes -= stale_file[1]
+        for local_path in stale_paths:
+            self._remove_local_file(local_path)
+
+    def flush(self):
+        """
+        Wait until all written files are drained into the remote tier and
+        raise the error if any file failed to be drained.
+        """
+        self._drain_queue.join()
+        self._prune_local_files()
+        if self._drain_error is not None:
+            error = self._drain_error
+            self._drain_error = None
+            raise error
+
+    def write(self, content, path):
+        local_path = self._get_local_path(path)
+        if local_path and not isinstance(content, str):
+            super().write(content, local_path)
+            self._submit_drain(local_path, path)
+            return
+        self.flush()
+        path = str(path)  # The path maybe a PosixPath.
+        if path.endswith(self._tracker_file):
+            pre_step = super().read(path)
+            if pre_step:
+                self._pre_step = int(pre_step)
+        super().write(content, path)
+
+    def write_buffers(self, buffers, path):
+        local_path = self._get_local_path(path)
+        if not local_path:
+            super().write_buffers(buffers, path)
+            return
+        super().write_buffers(buffers, local_path)
+        self._submit_drain(local_path, path)
+
+    def write_state_dict(self, state_dict, path, write_func=None):
+        local_path = self._get_local_path(path)
+        if not local_path:
+            super().write_state_dict(state_dict, path, write_func)
+            return
+        super().write_state_dict(state_dict, local_path, write_func)
+        if write_func:
+            self._submit_drain(local_path, path)
+
+    def read(self, path, mode="r"):
+        return super().read(self._get_read_path(path), mode)
+
+    def read_state_dict(self, path, read_func):
+        read_path = self._get_read_path(path)
+        if read_func and read_path != path:
+            try:
+                return read_func(read_path)
+            except Exception as e:
+                logger.warning(
+                    f"Fail to read {read_path} from the local tier and "
+                    f"read {path} instead: {e}"
+                )
+        return super().read_state_dict(path, read_func)
+
+    def safe_rmtree(self, dir):
+        local_dir = self._get_local_path(dir)
+        if local_dir:
+            super().safe_rmtree(local_dir)
+        super().safe_rmtree(dir)
+
+    def safe_remove(self, path):
+        local_path = self._get_local_path(path)
+        if local_path:
+            super().safe_remove(local_path)
+        super().safe_remove(path)
+
+    def safe_makedirs(self, dir):
+        local_dir = self._get_local_path(dir)
+        if local_dir:
+            super().safe_makedirs(local_dir)
+        super().safe_makedirs(dir)
+
+    def safe_move(self, src_path, dst_path):
+        self.flush()
+        super().safe_move(src_path, dst_path)
+        local_src = self._get_local_path(src_path)
+        local_dst = self._get_local_path(dst_path)
+        if not local_src or not local_dst or not os.path.exists(local_src):
+            return
+        os.makedirs(os.path.dirname(local_dst), exist_ok=True)
+        super().safe_move(local_src, local_dst)
+        with self._lock:
+            for local_path in list(self._local_files.keys()):
+                if local_path != local_src and not local_path.startswith(
+                    local_src + os.sep
+                ):
+                    continue
+                _, size = self._local_files.pop(local_path)
+                rel_path = os.path.relpath(local_path, local_src)
+                new_local_path = os.path.normpath(
+                    os.path.join(local_dst, rel_path)
+                )
+                new_path = os.path.normpath(
+                    os.path.join(str(dst_path), rel_path)
+                )
+                self._local_files[new_local_path] = (new_path, size)
+
+    def safe_link(self, src_path, dst_path):
+        if not super().safe_link(src_path, dst_path):
+            return False
+        local_src = self._get_local_path(src_path)
+        local_dst = self._get_local_path(dst_path)
+        if local_src and local_dst and os.path.exists(local_src):
+            super().safe_link(local_src, local_dst)
+        return True
+
+    def commit(self, step, success):
+        super().commit(step, success)
+        if (
+            not success
+            or not self._deletion_strategy
+            or self._pre_step == step
+            or self._pre_step == 0
+        ):
+            return
+        self._deletion_strategy.clean_up(self._pre_step, self._delete_dir)
+
+    def _delete_dir(self, dir):
+        local_dir = self._get_local_path(dir)
+        if local_dir:
+            shutil.rmtree(local_dir, ignore_errors=True)
+        shutil.rmtree(dir)
+
+    def get_class_meta(self):
+        kwargs = {
+            "checkpoint_dir": self._checkpoint_dir,
+            "local_dir": self._local_dir,
+            "tracker_file": self._tracker_file,
+            "deletion_strategy": self._deletion_strategy,
+            "bandwidth": self._bandwidth,
+            "max_local_bytes": self._max_local_bytes,
+        }
+        class_mata = ClassMeta(
+            module_path=self.__class__.__module__,
+            class_name=self.__class__.__name__,
+            kwargs=kwargs,
+        )
+        return class_mata
+
+
 def get_checkpoint_storage(deletion_strategy=None):
     if deletion_strategy:
         storage = PosixStorageWithDeletion(
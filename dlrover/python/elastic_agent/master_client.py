@@ -16,9 +16,10 @@ import os
 import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from dlrover.proto import elastic_training_pb2, elastic_training_pb2_grpc
 from dlrover.python.common import comm, env_utils
@@ -41,6 +42,13 @@ from dlrover.python.diagnosis.common.diagnosis_data import DiagnosisData
 from dlrover.python.util.common_util import find_free_port
 from dlrover.python.util.function_util import retry
 
+# The max number of keep-alive connections of the HTTP master client.
+_HTTP_POOL_SIZE = 16
+
+# The max ratio of the seconds of the master to hold a long-poll request
+# to the timeout of the request, so the master responds before timeout.
+_LONG_POLL_TIMEOUT_RATIO = 0.5
+
 
 class MasterClient(Singleton, ABC):
     """MasterClient provides some APIs connect with the master
@@ -92,8 +100,12 @@ class MasterClient(Singleton, ABC):
         """Abstraction of get function."""
         pass
 
-    def kv_store_set(self, key, value):
-        message = comm.KeyValuePair(key, value)
+    def batch_report(self, messages: List[comm.Message]):
+        """Report the messages and return the response of each message."""
+        return [self._report(message) for message in messages]
+
+    def kv_store_set(self, key, value, ttl=0):
+        message = comm.KeyValuePair(key, value, ttl=ttl)
         message.op = KeyValueOps.SET
         response = self._report(message)
         logger.debug(f"kv_store_set: {message} {response}")
@@ -113,14 +125,57 @@ class MasterClient(Singleton, ABC):
         logger.debug(f"kv_store_add: {request} {result}")
         return result.value
 
-    def kv_store_multi_get(self, keys):
+    def kv_store_compare_set(self, key, expected, desired):
+        """Set the key to `desired` if its value is `expected` and return
+        the value of the key after the operation."""
+        request = comm.KeyValuePair(key, desired, expected=expected)
+        request.op = KeyValueOps.COMPARE_SET
+        result: comm.KeyValuePair = self._get(request)
+        logger.debug(f"kv_store_compare_set: {request} {result}")
+        return result.value
+
+    def kv_store_clear(self, prefix):
+        """Remove the keys with the prefix in the store of the master."""
+        message = comm.KeyValuePair(prefix, op=KeyValueOps.DELETE)
+        response = self._report(message)
+        logger.debug(f"kv_store_clear: {message} {response}")
+        return response.success
+
+    def _get_long_poll_timeout(self, wait_timeout):
+        return min(wait_timeout, self._timeout * _LONG_POLL_TIMEOUT_RATIO)
+
+    def kv_store_multi_get(self, keys, wait_timeout=0):
+        """Get the values of keys. The master holds the request until all
+        keys are set or `wait_timeout` seconds elapse if it is positive.
+        The result is empty if any key is not set."""
         kvs = {key: b"" for key in keys}
         request = comm.KeyValuePairs(kvs)
         request.op = KeyValueOps.GET
+        request.wait_timeout = self._get_long_poll_timeout(wait_timeout)
         result: comm.KeyValuePairs = self._get(request)
         logger.debug(f"kv_store_multi_get: {request} {result}")
         return result.kvs
 
+    def kv_store_watch(self, versions, wait_timeout=0):
+        """
+        Watch the updates of keys. The master holds the request until any
+        key is updated after the version or `wait_timeout` seconds elapse.
+
+        Args:
+            versions (dict): the key and the latest version known by the
+                client. The version of an unset key is 0.
+
+        Returns:
+            The values and versions of the updated keys.
+        """
+        kvs = {key: b"" for key in versions}
+        request = comm.KeyValuePairs(kvs, versions=dict(versions))
+        request.op = KeyValueOps.WATCH
+        request.wait_timeout = self._get_long_poll_timeout(wait_timeout)
+        result: comm.KeyValuePairs = self._get(request)
+        logger.debug(f"kv_store_watch: {request} {result}")
+        return result.kvs, result.versions
+
     def kv_store_multi_set(self, keys, values):
         try:
             kvs = {}
@@ -189,6 +244,41 @@ class MasterClient(Singleton, ABC):
         message = comm.TaskResult(dataset_name, task_id, err_msg)
         return self._report(message)
 
+    def lease_tasks(self, dataset_name, num_tasks, lease_seconds=0):
+        """Lease at most `num_tasks` tasks of the dataset from the master.
+
+        Args:
+            dataset_name: string.
+            num_tasks: int, the max number of tasks in the lease.
+            lease_seconds: int, the master reassigns the tasks if the node
+                does not get or report any task of the dataset in the
+                seconds. The lease does not expire if it is not positive.
+
+        Returns:
+            comm.TaskLease.
+        """
+        request = comm.TaskLeaseRequest(
+            dataset_name=dataset_name,
+            num_tasks=num_tasks,
+            lease_seconds=lease_seconds,
+        )
+        return self._get(request)
+
+    def report_task_results(self, dataset_name, results):
+        """Report the results of tasks to master by one request.
+
+        Args:
+            dataset_name: string.
+            results: the list of (task_id, err_msg).
+        """
+        message = comm.TaskResults(
+            results=[
+                comm.TaskResult(dataset_name, task_id, err_msg)
+                for task_id, err_msg in results
+            ]
+        )
+        return self._report(message)
+
     def report_dataset_shard_params(
         self,
         batch_size,
@@ -407,8 +497,12 @@ class MasterClient(Singleton, ABC):
         result: comm.RendezvousState = self._get(request)
         return result.round
 
-    def get_comm_world(self, rdzv_name, node_rank):
+    def get_comm_world(self, rdzv_name, node_rank, wait_timeout=0):
+        """Get the world of the rendezvous. The master holds the request
+        until the node is in the world or `wait_timeout` seconds elapse
+        if it is positive."""
         request = comm.CommWorldRequest(node_id=node_rank, rdzv_name=rdzv_name)
+        request.wait_timeout = self._get_long_poll_timeout(wait_timeout)
         result: comm.RendezvousState = self._get(request)
         return result.round, result.group, result.world
 
@@ -500,6 +594,12 @@ class MasterClient(Singleton, ABC):
         response: comm.ElasticRunConfig = self._get(request)
         return response.configs
 
+    def get_service_stats(self) -> comm.ServiceStats:
+        """Get the stats of the requests served by the master."""
+        request = comm.ServiceStatsRequest()
+        response: comm.ServiceStats = self._get(request)
+        return response
+
     def get_pre_check_result(self) -> str:
         request = comm.PreCheckRequest()
         response: comm.PreCheckResponse = self._get(request)
@@ -571,47 +671,74 @@ class GrpcMasterClient(MasterClient):
 
 
 class HttpMasterClient(MasterClient):
-    def __init__(self, master_addr, node_id, node_type, timeout=5):
+    """
+    The master client with the HTTP implementation. The requests reuse
+    the keep-alive connections in the pool of a session.
+
+    Args:
+        binary (bool): post the pickled request as the body instead of
+            the JSON with the base64-encoded request. The master must
+            support the binary body.
+    """
+
+    def __init__(
+        self, master_addr, node_id, node_type, timeout=5, binary=False
+    ):
         super(HttpMasterClient, self).__init__(
             master_addr, node_id, node_type, timeout
         )
+        self._binary = binary
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_HTTP_POOL_SIZE)
+        self._session.mount("http://", adapter)
+
+    def __del__(self):
+        self._session.close()
 
     def _get_http_request_url(self, path: str) -> str:
         return "http://" + self._master_addr + path
 
-    @retry()
-    def _report(self, message: comm.Message):
-        with requests.post(
-            self._get_http_request_url("/report"),
-            json=self._gen_request(message).to_json(),
+    def _post(self, path, message, body=None):
+        if body is not None:
+            kwargs = {"data": body}
+        elif self._binary:
+            kwargs = {"data": self._gen_request(message).serialize()}
+        else:
+            kwargs = {"json": self._gen_request(message).to_json()}
+        if "data" in kwargs:
+            kwargs["headers"] = {"Content-Type": comm.HTTP_BINARY_CONTENT_TYPE}
+        with self._session.post(
+            self._get_http_request_url(path),
+            timeout=self._timeout,
+            **kwargs,
         ) as response:
             if response.status_code != 200:
                 error_msg = (
-                    "Failed to report master "
+                    f"Failed to request {path} of master "
                     f"with http request: {type(message)}."
                 )
                 raise RuntimeError(error_msg)
-            response_data: BaseResponse = comm.deserialize_message(
-                response.content
-            )
-            return response_data
+            return comm.deserialize_message(response.content)
+
+    @retry()
+    def _report(self, message: comm.Message):
+        response_data: BaseResponse = self._post("/report", message)
+        return response_data
 
     @retry()
     def _get(self, message: comm.Message):
-        with requests.post(
-            self._get_http_request_url("/get"),
-            json=self._gen_request(message).to_json(),
-        ) as response:
-            if response.status_code != 200:
-                error_msg = (
-                    "Failed to get from master "
-                    f"with http request: {type(message)}."
-                )
-                raise RuntimeError(error_msg)
-            response_data: BaseResponse = comm.deserialize_message(
-                response.content
-            )
-            return comm.deserialize_message(response_data.data)
+        response_data: BaseResponse = self._post("/get", message)
+        return comm.deserialize_message(response_data.data)
+
+    @retry()
+    def batch_report(self, messages: List[comm.Message]):
+        batch_request = comm.BatchRequest(
+            requests=[self._gen_request(message) for message in messages]
+        )
+        batch_response: comm.BatchResponse = self._post(
+            "/batch_report", batch_request, body=batch_request.serialize()
+        )
+        return batch_response.responses
 
     def _gen_request(self, message: comm.Message):
         request = BaseRequest()
@@ -659,8 +786,13 @@ def build_master_client(
                     master_addr, node_id, node_type, timeout
                 )
             else:
+                binary = os.getenv(NodeEnv.DLROVER_MASTER_HTTP_BINARY, "")
                 master_client = HttpMasterClient(
-                    master_addr, node_id, node_type, timeout
+                    master_addr,
+                    node_id,
+                    node_type,
+                    timeout,
+                    binary=binary.lower() in ["true", "1"],
                 )
         except Exception:
             logger.warning("The master is not available.")
@@ -11,11 +11,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import array
+import multiprocessing
+import os
+import queue
 import sys
 import threading
 import time
 from collections import OrderedDict
 from multiprocessing import SimpleQueue
+from typing import List, Tuple
 
 from dlrover.proto import elastic_training_pb2
 from dlrover.python.common import comm
@@ -24,6 +29,15 @@ from dlrover.python.elastic_agent.master_client import MasterClient
 from dlrover.python.elastic_agent.monitor.training import TFTrainingReporter
 
 _DEFAULT_MINI_BATCH_NUM_PER_SHARD = 10
+_DEFAULT_TASK_LEASE_SECONDS = 1800
+# The seconds to report the completed tasks in a batch.
+_REPORT_INTERVAL = 0.1
+# The seconds to wait to lease tasks again if the lease fails.
+_LEASE_RETRY_INTERVAL = 5
+# The seconds to wait for the tasks recovered from other nodes.
+_WAIT_TASK_INTERVAL = 1
+# The max number of index blocks in the queue for each worker process.
+_MAX_QUEUED_BLOCKS_PER_WORKER = 2
 
 
 class ShardingClient(object):
@@ -40,6 +54,13 @@ class ShardingClient(object):
         storage_type: the storage type of dataset. It is "text" if the
             dataset is stored in a text file. It is "table" if the
             dataset is stored in a table like MaxCompute and Hive.
+        num_prefetch_tasks: the number of tasks to lease ahead from the
+            master in the background. The client gets a task from the
+            master per request and reports the completed task per request
+            if it is 0. Otherwise, the client leases multiple tasks by
+            a request and reports the completed tasks in batches.
+        lease_seconds: the master reassigns the leased tasks if the client
+            does not get or report any task in the seconds.
     Example:
         batch_size = 64
         client = ShardingClient(
@@ -68,6 +89,8 @@ class ShardingClient(object):
         task_type=elastic_training_pb2.TRAINING,
         num_minibatches_per_shard=_DEFAULT_MINI_BATCH_NUM_PER_SHARD,
         storage_type="",
+        num_prefetch_tasks=0,
+        lease_seconds=_DEFAULT_TASK_LEASE_SECONDS,
     ):
         self._mc = MasterClient.singleton_instance()
         self._batch_size = batch_size
@@ -85,8 +108,20 @@ class ShardingClient(object):
         self._batch_count = 0
         self._max_shard_count = sys.maxsize
         self._shard_count = 0
+        self._num_prefetch_tasks = num_prefetch_tasks
+        self._lease_seconds = lease_seconds
+        self._task_queue: queue.Queue = queue.Queue()
+        self._result_lock = threading.Lock()
+        self._completed_results: List[Tuple[int, str]] = []
+        self._lease_finished = False
         self._report_sharding_params()
         self._training_reporter = TFTrainingReporter.singleton_instance()
+        if self._num_prefetch_tasks > 0:
+            threading.Thread(
+                target=self._prefetch_tasks,
+                name="prefetch_tasks",
+                daemon=True,
+            ).start()
 
     def _report_sharding_params(self):
         if self._num_epochs and self._dataset_size:
@@ -115,11 +150,18 @@ class ShardingClient(object):
         self._training_reporter.set_start_time()
         if self._shard_count >= self._max_shard_count:
             return None
-        for _ in range(5):
-            success, task = self._mc.get_task(self._dataset_name)
-            if success:
-                break
-            time.sleep(5)
+        if self._num_prefetch_tasks > 0:
+            task = self._task_queue.get()
+            if task is None:
+                # Keep the end mark for other callers.
+                self._task_queue.put(None)
+                return None
+        else:
+            for _ in range(5):
+                success, task = self._mc.get_task(self._dataset_name)
+                if success:
+                    break
+                time.sleep(5)
         if task.shard.end - task.shard.start > 0:
             with self._lock:
                 self._pending_tasks[task.task_id] = task
@@ -129,7 +171,93 @@ class ShardingClient(object):
             return task
         return None
 
+    def _prefetch_tasks(self):
+        """Lease tasks ahead and report the completed tasks in batches."""
+        # Renew the leases in time if the client does not need tasks.
+        renew_interval = self._lease_seconds / 3
+        lease_time = 0.0
+        while True:
+            self._flush_task_results()
+            num_tasks = self._num_prefetch_tasks - self._task_queue.qsize()
+            if num_tasks <= 0 and (
+                renew_interval <= 0
+                or time.time() - lease_time < renew_interval
+            ):
+                time.sleep(_REPORT_INTERVAL)
+                continue
+            try:
+                lease = self._mc.lease_tasks(
+                    self._dataset_name, max(num_tasks, 0), self._lease_seconds
+                )
+                lease_time = time.time()
+            except Exception as e:
+                logger.warning(
+                    f"Fail to lease tasks of {self._dataset_name}: {e}"
+                )
+                time.sleep(_LEASE_RETRY_INTERVAL)
+                continue
+            self._drop_revoked_tasks(lease.revoked_task_ids)
+            for task in lease.tasks:
+                self._task_queue.put(task)
+            if num_tasks <= 0:
+                continue
+            if lease.finished:
+                break
+            elif not lease.tasks:
+                time.sleep(_WAIT_TASK_INTERVAL)
+        with self._result_lock:
+            self._lease_finished = True
+        self._flush_task_results()
+        self._task_queue.put(None)
+
+    def _drop_revoked_tasks(self, task_ids):
+        """
+        Drop the tasks whose leases are revoked by the master because
+        the master has assigned them to other nodes.
+        """
+        if not task_ids:
+            return
+        logger.info(f"The leases of tasks {task_ids} are revoked.")
+        revoked_ids = set(task_ids)
+        with self._task_queue.mutex:
+            self._task_queue.queue = type(self._task_queue.queue)(
+                t
+                for t in self._task_queue.queue
+                if t is None or t.task_id not in revoked_ids
+            )
+        with self._lock:
+            for task_id in revoked_ids:
+                self._pending_tasks.pop(task_id, None)
+                self._reported_record_count.pop(task_id, None)
+            current_task = self._current_task
+            if current_task and current_task.task_id in revoked_ids:
+                self._current_task = next(
+                    iter(self._pending_tasks.values()), None
+                )
+        with self._result_lock:
+            self._completed_results = [
+                r for r in self._completed_results if r[0] not in revoked_ids
+            ]
+
+    def _flush_task_results(self):
+        with self._result_lock:
+            results = self._completed_results
+            self._completed_results = []
+        if not results:
+            return
+        try:
+            self._mc.report_task_results(self._dataset_name, results)
+        except Exception as e:
+            logger.warning(f"Fail to report the results of tasks: {e}")
+            with self._result_lock:
+                self._completed_results = results + self._completed_results
+
     def _report_task(self, task, err_msg=""):
+        if self._num_prefetch_tasks > 0:
+            with self._result_lock:
+                if not self._lease_finished:
+                    self._completed_results.append((task.task_id, err_msg))
+                    return
         self._mc.report_task_result(
             self._dataset_name,
             task.task_id,
@@ -206,16 +334,16 @@ class ShardingClient(object):
 
         Returns:
             Json String: {
-                "dataset_name": string.
-                "todo": [(start_0, end_0), (start_1, end_1)],
-                "doing": [(start_2, end_2), (start_3, end_3)],
-                "current_epoch": int64, the index of epoch,
-                "num_epochs": int64, the number of epoch,
-                "batch_size": int64, batch size,
-                "dataset_size": int64, the size of dataset,
-                "shuffle_shards": bool, true of false.
-                ""
+                "dataset_name": string,
+                "todo": a list of encoded shards,
+                "doing": a list of encoded shards,
+                "epoch": int64, the index of epoch,
             }
+            The successive shards with the same size are encoded as a
+            range {"start": int, "end": int, "shard_size": int} with an
+            optional "permutation": {"size": int, "seed": int} to shuffle
+            the records. A single shard is encoded as [start, end] or
+            [start, end, permutation_dict | record_indices].
         """
         shard_checkpoint = self._mc.get_shard_checkpoint(self._dataset_name)
         return shard_checkpoint
@@ -247,6 +375,13 @@ class IndexShardingClient(ShardingClient):
             dataset is stored in a table like MaxCompute and Hive.
         num_workers: the number of worker processes to share the client
             to get the sample index.
+        num_prefetch_tasks: the number of tasks to lease ahead from the
+            master in the background.
+        lease_seconds: the master reassigns the leased tasks if the client
+            does not get or report any task in the seconds.
+        index_block_size: the number of sample indices in a block. The
+            client splits a shard into blocks and each worker process
+            gets whole blocks. It is the batch size if it is 0.
     """
 
     def __init__(
@@ -260,6 +395,9 @@ class IndexShardingClient(ShardingClient):
         num_minibatches_per_shard=_DEFAULT_MINI_BATCH_NUM_PER_SHARD,
         storage_type="",
         num_workers=1,
+        num_prefetch_tasks=0,
+        lease_seconds=_DEFAULT_TASK_LEASE_SECONDS,
+        index_block_size=0,
     ):
         super(IndexShardingClient, self).__init__(
             dataset_name,
@@ -270,9 +408,21 @@ class IndexShardingClient(ShardingClient):
             task_type,
             num_minibatches_per_shard,
             storage_type,
+            num_prefetch_tasks,
+            lease_seconds,
         )
         self._num_workers = num_workers
+        self._index_block_size = index_block_size or batch_size
+        # The queue of blocks shared by the worker processes and the
+        # semaphore limits the number of blocks in the queue.
         self._sample_queue = SimpleQueue()
+        self._queue_slots = multiprocessing.Semaphore(
+            _MAX_QUEUED_BLOCKS_PER_WORKER * max(num_workers, 1)
+        )
+        # The indices of the block being consumed by the process.
+        self._local_pid = os.getpid()
+        self._local_lock = threading.Lock()
+        self._local_indices = iter(())
         self._report_sharding_params()
 
         threading.Thread(
@@ -283,35 +433,66 @@ class IndexShardingClient(ShardingClient):
 
     def _prefetch_sample_indices(self):
         while True:
-            if self._sample_queue.empty():
-                task = self.get_task()
-                if not task or not task.shard:
-                    for _ in range(128):
-                        self._sample_queue.put(None)
-                    break
-                ids = (
-                    task.shard.indices
-                    if task.shard.indices
-                    else list(range(task.shard.start, task.shard.end))
-                )
-                for i in ids:
-                    self._sample_queue.put(i)
-            else:
-                time.sleep(0.001)
-
-    def fetch_sample_index(self):
-        """Fetch an index of the sample. The function get an index
-        from a queue because there may be multiple sub-process to call
-        the function.
+            task = self.get_task()
+            if not task or not task.shard:
+                self._sample_queue.put(None)
+                break
+            for block in self._split_index_blocks(task.shard):
+                # Block until a process takes a block from the queue.
+                self._queue_slots.acquire()
+                self._sample_queue.put(block)
+
+    def _split_index_blocks(self, shard):
+        """Split the shard into blocks of a range or an array of indices."""
+        size = self._index_block_size
+        if shard.indices:
+            indices = array.array("q", shard.indices)
+            for i in range(0, len(indices), size):
+                yield indices[i : i + size]  # noqa E203
+        else:
+            for start in range(shard.start, shard.end, size):
+                yield range(start, min(start + size, shard.end))
+
+    def fetch_index_block(self):
+        """Fetch a block of sample indices which is a `range` or
+        an `array.array`. The worker processes sharing the client get
+        different blocks.
         """
-        index = self._sample_queue.get()
-        if index is None:
+        block = self._sample_queue.get()
+        if block is None:
+            # Keep the end mark for other processes.
+            self._sample_queue.put(None)
             logger.info("No more data.")
             raise StopIteration()
-        return index
+        self._queue_slots.release()
+        return block
+
+    def fetch_sample_index(self):
+        """Fetch an index of the sample. The process gets the index from
+        its current block and fetches a new block from the queue shared
+        by the worker processes if the block is consumed.
+        """
+        if self._local_pid != os.getpid():
+            # The forked process does not consume the block of its parent.
+            self._local_pid = os.getpid()
+            self._local_lock = threading.Lock()
+            self._local_indices = iter(())
+        with self._local_lock:
+            index = next(self._local_indices, None)
+            while index is None:
+                self._local_indices = iter(self.fetch_index_block())
+                index = next(self._local_indices, None)
+            return index
 
     def clear_shard_queue(self):
-        self._sample_queue = SimpleQueue()
+        end = False
+        while not self._sample_queue.empty():
+            if self._sample_queue.get() is None:
+                end = True
+            else:
+                self._queue_slots.release()
+        if end:
+            self._sample_queue.put(None)
 
     def restore_shard_from_checkpoint(self, shard_checkpoint):
         # To avoid duplicate shards, drop all shards in the _shard_queue
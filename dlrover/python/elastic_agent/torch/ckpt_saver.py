@@ -11,13 +11,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import array
+import dataclasses
 import importlib
+import io
 import json
+import mmap
 import os
 import pickle
 import signal
+import struct
 import threading
 import time
+import weakref
 from abc import ABCMeta, abstractmethod
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
@@ -45,10 +51,31 @@ from dlrover.python.common.multi_process import (
     SharedQueue,
 )
 from dlrover.python.common.serialize import ClassMeta
+from dlrover.python.common.storage import read_compressed_file
 from dlrover.python.elastic_agent.master_client import MasterClient
 
 DLROVER_CKPT_CONFIG_KEY = "_DLORVER_CKPT_CONFIG"
 
+# The size of the metadata header in the raw checkpoint file.
+_RAW_HEADER_SIZE = struct.Struct("<Q")
+
+
+def is_delta_mode_enabled():
+    """Whether to only save the modified tensors of the state dict."""
+    value = os.getenv(CheckpointConstant.DELTA_MODE_ENV, "false")
+    return value.lower() in ["true", "1"]
+
+
+def get_delta_full_interval():
+    """The interval to save all tensors in the delta mode."""
+    interval = int(
+        os.getenv(
+            CheckpointConstant.DELTA_FULL_INTERVAL_ENV,
+            CheckpointConstant.DEFAULT_DELTA_FULL_INTERVAL,
+        )
+    )
+    return max(interval, 1)
+
 
 def report_local_event(
     event_type: str = "",
@@ -93,6 +120,9 @@ class TensorMeta:
     element_size: int = 0
     numel: int = 0
     offset: int = 0
+    # The version of the tensor in the shared memory, which changes when
+    # the tensor is copied into the shared memory in the delta mode.
+    version: int = 0
 
 
 @dataclass
@@ -116,10 +146,257 @@ class CheckpointConfig:
     paths: Dict[str, str] = None  # type: ignore
 
 
+_DICT_NODE = 0
+_LIST_NODE = 1
+_TENSOR_NODE = 2
+_VALUE_NODE = 3
+
+
+def _compact_array(values: array.array):
+    """Convert the non-negative integers into the smallest typecode."""
+    max_value = max(values, default=0)
+    for typecode in "BHIQ":
+        if max_value < 1 << (8 * array.array(typecode).itemsize):
+            return array.array(typecode, values)
+    return values
+
+
+class TensorMetaTable(object):
+    """
+    The columnar encoding of a meta dict whose leaves are `TensorMeta` or
+    other values. Pickling the table only pickles a few flat integer arrays
+    and interned tables instead of a `TensorMeta` object for each tensor.
+
+    The nodes of the nested dict are flattened in the pre-order into the
+    arrays of kinds, indices into the interned key table and the sizes of
+    subtrees. The tensor metas are flattened into the arrays of offsets,
+    numels, versions, dtype indices and shape indices in the pre-order.
+    The table can find a tensor meta by the fully-qualified name like
+    "model.layer.weight" in O(1).
+    """
+
+    def __init__(self):
+        self._keys: List[object] = []
+        self._values: List[object] = []
+        self._dtypes: List[Tuple[torch.dtype, int]] = []
+        self._shapes: List[Tuple[int]] = []
+        self._kinds = array.array("B")
+        # The index of the key in the key table plus 1 and 0 means the node
+        # is the root or an element of a list.
+        self._key_ids = array.array("Q")
+        self._sizes = array.array("Q")
+        self._offsets = array.array("Q")
+        self._numels = array.array("Q")
+        self._versions = array.array("Q")
+        self._dtype_ids = array.array("Q")
+        self._shape_ids = array.array("Q")
+        self._refs: Optional[List[int]] = None
+        self._top_nodes: Optional[Dict[object, int]] = None
+        self._fqn_index: Optional[Dict[str, int]] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_refs"] = None
+        state["_top_nodes"] = None
+        state["_fqn_index"] = None
+        return state
+
+    @classmethod
+    def from_meta_dict(cls, meta_dict):
+        """Encode a meta dict into a table."""
+        table = cls()
+        table._encode(meta_dict, 0, {}, {}, {})
+        for name in [
+            "_key_ids",
+            "_sizes",
+            "_offsets",
+            "_numels",
+            "_versions",
+            "_dtype_ids",
+            "_shape_ids",
+        ]:
+            setattr(table, name, _compact_array(getattr(table, name)))
+        return table
+
+    def _intern(self, table: List, ids: Dict, value, key):
+        index = ids.get(key, None)
+        if index is None:
+            index = len(table)
+            ids[key] = index
+            table.append(value)
+        return index
+
+    def _encode(self, value, key_id, key_ids, dtype_ids, shape_ids):
+        node = len(self._kinds)
+        self._key_ids.append(key_id)
+        self._sizes.append(0)
+        if isinstance(value, Mapping):
+            self._kinds.append(_DICT_NODE)
+            for k, v in value.items():
+                # Intern the key with its type because 1 == 1.0 == True.
+                kid = self._intern(self._keys, key_ids, k, (type(k), k))
+                self._encode(v, kid + 1, key_ids, dtype_ids, shape_ids)
+        elif isinstance(value, List):
+            self._kinds.append(_LIST_NODE)
+            for v in value:
+                self._encode(v, 0, key_ids, dtype_ids, shape_ids)
+        elif isinstance(value, TensorMeta):
+            self._kinds.append(_TENSOR_NODE)
+            self._offsets.append(value.offset)
+            self._numels.append(value.numel)
+            self._versions.append(value.version)
+            dtype = (value.dtype, value.element_size)
+            self._dtype_ids.append(
+                self._intern(self._dtypes, dtype_ids, dtype, dtype)
+            )
+            shape = tuple(value.shape) if value.shape is not None else None
+            self._shape_ids.append(
+                self._intern(self._shapes, shape_ids, shape, shape)
+            )
+        else:
+            self._kinds.append(_VALUE_NODE)
+            self._values.append(value)
+        self._sizes[node] = len(self._kinds) - node
+
+    @property
+    def tensor_num(self):
+        return len(self._offsets)
+
+    def get_tensor_meta(self, index) -> TensorMeta:
+        """Get the meta of the tensor with the index in the columns."""
+        dtype, element_size = self._dtypes[self._dtype_ids[index]]
+        return TensorMeta(
+            shape=self._shapes[self._shape_ids[index]],  # type: ignore
+            dtype=dtype,
+            element_size=element_size,
+            numel=self._numels[index],
+            offset=self._offsets[index],
+            version=self._versions[index],
+        )
+
+    def _get_refs(self):
+        """The index of each leaf node in the tensor or value columns."""
+        if self._refs is None:
+            counts = [0, 0, 0, 0]
+            refs = []
+            for kind in self._kinds:
+                refs.append(counts[kind])
+                counts[kind] += 1
+            self._refs = refs
+        return self._refs
+
+    def _get_key(self, node):
+        return self._keys[self._key_ids[node] - 1]
+
+    def _children(self, node):
+        child = node + 1
+        end = node + self._sizes[node]
+        while child < end:
+            yield child
+            child += self._sizes[child]
+
+    def _decode(self, node, visitor, refs):
+        kind = self._kinds[node]
+        if kind == _DICT_NODE:
+            result = {}
+            for child in self._children(node):
+                result[self._get_key(child)] = self._decode(
+                    child, visitor, refs
+                )
+            return result
+        elif kind == _LIST_NODE:
+            return [
+                self._decode(child, visitor, refs)
+                for child in self._children(node)
+            ]
+        elif kind == _TENSOR_NODE:
+            return visitor(self.get_tensor_meta(refs[node]))
+        else:
+            return visitor(self._values[refs[node]])
+
+    def to_meta_dict(self, visitor: Optional[Callable] = None):
+        """
+        Decode the table into the meta dict and invoke ``visitor`` for
+        each leaf value if it is not None.
+        """
+        if not self._kinds:
+            return {}
+        if visitor is None:
+            visitor = _identity
+        return self._decode(0, visitor, self._get_refs())
+
+    def _get_top_nodes(self):
+        if self._top_nodes is None:
+            top_nodes = {}
+            if self._kinds and self._kinds[0] == _DICT_NODE:
+                for child in self._children(0):
+                    top_nodes[self._get_key(child)] = child
+            self._top_nodes = top_nodes
+        return self._top_nodes
+
+    def get(self, key, default=None):
+        """Get the decoded value of the key at the top level."""
+        node = self._get_top_nodes().get(key, None)
+        if node is None:
+            return default
+        return self._decode(node, _identity, self._get_refs())
+
+    def __getitem__(self, key):
+        node = self._get_top_nodes()[key]
+        return self._decode(node, _identity, self._get_refs())
+
+    def __contains__(self, key):
+        return key in self._get_top_nodes()
+
+    def __len__(self):
+        return len(self._get_top_nodes())
+
+    def keys(self):
+        return self._get_top_nodes().keys()
+
+    def _build_fqn_index(self):
+        refs = self._get_refs()
+        fqn_index: Dict[str, int] = {}
+        stack = [(0, "")] if self._kinds else []
+        while stack:
+            node, fqn = stack.pop()
+            kind = self._kinds[node]
+            if kind == _TENSOR_NODE:
+                fqn_index[fqn] = refs[node]
+                continue
+            if kind == _VALUE_NODE:
+                continue
+            for i, child in enumerate(self._children(node)):
+                if kind == _DICT_NODE:
+                    name = str(self._get_key(child))
+                else:
+                    name = str(i)
+                stack.append((child, f"{fqn}.{name}" if fqn else name))
+        return fqn_index
+
+    def find(self, fqn: str) -> Optional[TensorMeta]:
+        """
+        Find the tensor meta by the fully-qualified name which joins the
+        keys and list indices with ".", like "model.layer.weight".
+        """
+        if self._fqn_index is None:
+            self._fqn_index = self._build_fqn_index()
+        index = self._fqn_index.get(fqn, None)
+        if index is None:
+            return None
+        return self.get_tensor_meta(index)
+
+
+def _identity(value):
+    return value
+
+
 def _traverse_state_dict(value: object, visitor: Callable[[object], None]):
     """
     Invoke ``visitor`` for each value recursively in ``state_dict``.
     """
+    if isinstance(value, TensorMetaTable):
+        return value.to_meta_dict(visitor)
     if isinstance(value, Mapping):
         temp_dict = {}
         for k, v in value.items():
@@ -137,12 +414,12 @@ def _traverse_state_dict(value: object, visitor: Callable[[object], None]):
 def _read_state_dict_from_shm(meta_dict, tensor_shm):
     state_dict = _traverse_state_dict(
         meta_dict,
-        lambda x: _read_tensor_from_buf(x, tensor_shm),
+        lambda x: _read_tensor_from_buf(x, tensor_shm.buf),
     )
     return state_dict
 
 
-def _read_tensor_from_buf(value, shm_tensor_buffer):
+def _read_tensor_from_buf(value, buffer):
     """
     Read a tensor from the buffer of shared memory.
     """
@@ -151,7 +428,7 @@ def _read_tensor_from_buf(value, shm_tensor_buffer):
             return torch.tensor([], dtype=value.dtype)
         else:
             shm_tensor = torch.frombuffer(
-                buffer=shm_tensor_buffer.buf,
+                buffer=buffer,
                 dtype=value.dtype,
                 offset=value.offset,
                 count=value.numel,
@@ -196,25 +473,36 @@ def _create_shared_memory(name, create, size=0):
     return shm
 
 
-def _traverse_copy_to_shm(value, meta, buffer):
+def _traverse_copy_to_shm(
+    value, meta, buffer, write_func: Optional[Callable] = None
+):
+    """
+    Copy the tensors of the state dict into the buffer.
+
+    Args:
+        write_func: the function to copy a tensor with its meta into
+            the buffer, default `_write_shared_memory`.
+    """
+    if write_func is None:
+        write_func = _write_shared_memory
     if isinstance(value, Mapping):
         for k, v in value.items():
             if isinstance(v, (Mapping, List)):
                 m = meta[k]
-                _traverse_copy_to_shm(v, m, buffer)
+                _traverse_copy_to_shm(v, m, buffer, write_func)
             elif torch.is_tensor(v):
                 m = meta[k]
-                _write_shared_memory(v, m, buffer)
+                write_func(v, m, buffer)
             else:
                 meta[k] = v
     elif isinstance(value, List):
         for i, v in enumerate(value):
             if isinstance(v, (Mapping, List)):
                 m = meta[i]
-                _traverse_copy_to_shm(v, m, buffer)
+                _traverse_copy_to_shm(v, m, buffer, write_func)
             elif torch.is_tensor(v):
                 m = meta[i]
-                _write_shared_memory(v, m, buffer)
+                write_func(v, m, buffer)
             else:
                 meta[i] = v
 
@@ -232,11 +520,424 @@ def _write_shared_memory(value: torch.Tensor, meta: TensorMeta, buffer):
         shm_tensor.copy_(value)
 
 
+def _get_tensor_buffer_range(meta_dict):
+    """
+    Get the range of bytes occupied by the tensors of the meta dict in the
+    buffer. The tensors of a state dict are contiguous in the buffer because
+    `SharedMemoryHandler` allocates offsets by traversing the state dict.
+    """
+    start, end = -1, 0
+
+    def _visit(value):
+        nonlocal start, end
+        if isinstance(value, TensorMeta) and value.numel > 0:
+            tensor_end = value.offset + value.numel * value.element_size
+            start = value.offset if start < 0 else min(start, value.offset)
+            end = max(end, tensor_end)
+        return value
+
+    _traverse_state_dict(meta_dict, _visit)
+    start = max(start, 0)
+    return start, max(start, end)
+
+
+def _rebase_tensor_meta(meta_dict, base: int):
+    """Shift the offsets of tensor metas by the base offset."""
+
+    def _rebase(value):
+        if isinstance(value, TensorMeta):
+            return dataclasses.replace(value, offset=value.offset - base)
+        return value
+
+    return _traverse_state_dict(meta_dict, _rebase)
+
+
+@dataclass
+class SegmentManifest:
+    """
+    The manifest to reassemble a state dict from its segment files.
+
+    Attributes:
+        meta_dict (TensorMetaTable): the encoded state dict whose tensors
+            are replaced by `TensorMeta` with the offset in the concatenated
+            segments.
+        segments (list): the file name and the number of bytes of
+            each segment in order.
+        signatures (list): the signature of each segment computed by
+            the offsets and versions of its tensors. It is None if some
+            tensors of the segment have no version.
+    """
+
+    meta_dict: Dict = None  # type: ignore
+    segments: List[Tuple[str, int]] = None  # type: ignore
+    signatures: List[Optional[int]] = None  # type: ignore
+
+
+def _get_segment_signatures(meta_dict, start, end, chunk_size):
+    """
+    Compute the signature of each segment by the offsets and versions of
+    tensors overlapped with the segment. The segment is unchanged if its
+    signature is the same as the one of the previous checkpoint.
+    """
+    metas: List[TensorMeta] = []
+
+    def _collect(value):
+        if isinstance(value, TensorMeta) and value.numel > 0:
+            metas.append(value)
+        return value
+
+    _traverse_state_dict(meta_dict, _collect)
+    metas.sort(key=lambda m: m.offset)
+    ends = [m.offset + m.numel * m.element_size for m in metas]
+
+    signatures: List[Optional[int]] = []
+    index = 0
+    for seg_start in range(start, end, chunk_size):
+        seg_end = min(seg_start + chunk_size, end)
+        # Skip the tensors ending before the segment.
+        while index < len(metas) and ends[index] <= seg_start:
+            index += 1
+        versions = []
+        i = index
+        while i < len(metas) and metas[i].offset < seg_end:
+            versions.append((metas[i].offset - start, metas[i].version))
+            i += 1
+        if all(version > 0 for _, version in versions):
+            signatures.append(hash(tuple(versions)))
+        else:
+            signatures.append(None)
+    return signatures
+
+
+def write_state_dict_segments(
+    storage,
+    buffer,
+    meta_dict,
+    path,
+    executor: ThreadPoolExecutor,
+    chunk_size,
+    base: Optional[Tuple[str, SegmentManifest]] = None,
+):
+    """
+    Split the bytes of the state dict in the buffer into segments with
+    `chunk_size` bytes and write them into files in parallel. The manifest
+    is written into the path after all segments are written, so the path
+    exists only if the checkpoint is complete.
+
+    Args:
+        storage: a `CheckpointStorage` instance.
+        buffer: the buffer of the shared memory.
+        meta_dict (dict): the meta dict of the state dict in the buffer.
+        path (str): the path to save the state dict.
+        executor: the thread pool to write segments.
+        chunk_size (int): the max bytes of a segment.
+        base (tuple): the path and manifest of the previous checkpoint.
+            The segment unchanged since the base is linked to the segment
+            file of the base instead of being written.
+
+    Returns:
+        Tuple(int, SegmentManifest): the number of bytes written into
+            the storage and the manifest.
+    """
+    path = str(path)
+    ckpt_dir, name = os.path.split(path)
+    storage.safe_makedirs(ckpt_dir)
+    start, end = _get_tensor_buffer_range(meta_dict)
+    chunk_size = max(int(chunk_size), 1)
+    signatures = _get_segment_signatures(meta_dict, start, end, chunk_size)
+
+    base_dir, base_manifest = "", None
+    if base and base[1].signatures:
+        base_dir, base_manifest = os.path.dirname(base[0]), base[1]
+
+    def _write_segment(i, seg_start, seg_end, seg_path):
+        # Remove the file because it may be linked by other checkpoints.
+        storage.safe_remove(seg_path)
+        if (
+            base_manifest
+            and signatures[i] is not None
+            and i < len(base_manifest.segments)
+            and base_manifest.signatures[i] == signatures[i]
+            and base_manifest.segments[i][1] == seg_end - seg_start
+        ):
+            base_path = os.path.join(base_dir, base_manifest.segments[i][0])
+            if storage.safe_link(base_path, seg_path):
+                return 0
+        storage.write(buffer[seg_start:seg_end], seg_path)
+        return seg_end - seg_start
+
+    segments: List[Tuple[str, int]] = []
+    futures: List[Future] = []
+    for i, seg_start in enumerate(range(start, end, chunk_size)):
+        seg_end = min(seg_start + chunk_size, end)
+        seg_name = f"{name}{CheckpointConstant.SEGMENT_FILE_SUFFIX}{i}"
+        segments.append((seg_name, seg_end - seg_start))
+        seg_path = os.path.join(ckpt_dir, seg_name)
+        future = executor.submit(
+            _write_segment, i, seg_start, seg_end, seg_path
+        )
+        futures.append(future)
+    written_bytes = 0
+    for future in futures:
+        written_bytes += future.result()
+
+    manifest = SegmentManifest(
+        meta_dict=TensorMetaTable.from_meta_dict(
+            _rebase_tensor_meta(meta_dict, start)
+        ),
+        segments=segments,
+        signatures=signatures,
+    )
+    content = CheckpointConstant.SEGMENT_MANIFEST_MAGIC + pickle.dumps(
+        manifest
+    )
+    storage.write(content, path)
+    return written_bytes, manifest
+
+
+def write_state_dict_raw(storage, buffer, meta_dict, path):
+    """
+    Stream the bytes of the state dict in the buffer into a file with a
+    metadata header. The file is composed of the magic, the size of the
+    header, the pickled meta dict and the raw bytes of tensors which start
+    at the page boundary. The bytes are written from the buffer by
+    `storage.write_buffers` without being pickled or copied.
+
+    Returns:
+        The number of bytes of tensors.
+    """
+    path = str(path)
+    storage.safe_makedirs(os.path.dirname(path))
+    start, end = _get_tensor_buffer_range(meta_dict)
+    header = pickle.dumps(
+        TensorMetaTable.from_meta_dict(_rebase_tensor_meta(meta_dict, start))
+    )
+    magic = CheckpointConstant.RAW_CKPT_MAGIC
+    prefix_size = len(magic) + _RAW_HEADER_SIZE.size + len(header)
+    data_offset = -(-prefix_size // mmap.PAGESIZE) * mmap.PAGESIZE
+    padding = bytes(data_offset - prefix_size)
+    buffers = [magic, _RAW_HEADER_SIZE.pack(len(header)), header, padding]
+    buffers.append(buffer[start:end])
+    storage.write_buffers(buffers, path)
+    return end - start
+
+
+def read_state_dict_raw(path):
+    """
+    Read the state dict saved by `write_state_dict_raw`. The file is mapped
+    into the memory and the tensors are lazily loaded by the page faults
+    when they are accessed.
+    """
+    path = str(path)
+    with open(path, "rb") as f:
+        # The private mapping is writable without modifying the file.
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    return _read_state_dict_raw_buffer(mapped)
+
+
+def _read_state_dict_raw_buffer(buffer):
+    """Read the state dict from the bytes of a raw checkpoint file."""
+    magic_len = len(CheckpointConstant.RAW_CKPT_MAGIC)
+    header_start = magic_len + _RAW_HEADER_SIZE.size
+    (header_size,) = _RAW_HEADER_SIZE.unpack(buffer[magic_len:header_start])
+    meta_dict = pickle.loads(
+        buffer[header_start : header_start + header_size]  # noqa E203
+    )
+    prefix_size = header_start + header_size
+    data_offset = -(-prefix_size // mmap.PAGESIZE) * mmap.PAGESIZE
+    if len(buffer) <= data_offset:
+        return _traverse_state_dict(
+            meta_dict, lambda x: _read_tensor_from_buf(x, b"")
+        )
+
+    def _map_tensor(value):
+        if isinstance(value, TensorMeta):
+            value = dataclasses.replace(
+                value, offset=value.offset + data_offset
+            )
+        return _read_tensor_from_buf(value, buffer)
+
+    return _traverse_state_dict(meta_dict, _map_tensor)
+
+
+def _read_magic(path):
+    magic_len = len(CheckpointConstant.SEGMENT_MANIFEST_MAGIC)
+    try:
+        with open(path, "rb") as f:
+            return f.read(magic_len)
+    except (OSError, TypeError):
+        return b""
+
+
+def is_segmented_checkpoint(path):
+    """Check whether the file is the manifest of segment files."""
+    return _read_magic(path) == CheckpointConstant.SEGMENT_MANIFEST_MAGIC
+
+
+def is_raw_checkpoint(path):
+    """Check whether the file is saved by `write_state_dict_raw`."""
+    return _read_magic(path) == CheckpointConstant.RAW_CKPT_MAGIC
+
+
+def _read_segment(path, view: memoryview):
+    if _read_magic(path) == CheckpointConstant.COMPRESSED_CKPT_MAGIC:
+        read_compressed_file(path, out=view)
+        return
+    with open(path, "rb", buffering=0) as f:
+        read_size = 0
+        while read_size < len(view):
+            n = f.readinto(view[read_size:])
+            if not n:
+                raise EOFError(
+                    f"The segment {path} is truncated with {read_size} "
+                    f"bytes, expected {len(view)} bytes."
+                )
+            read_size += n
+
+
+def read_state_dict_segments(path, max_workers=None):
+    """
+    Read the state dict saved by `write_state_dict_segments`. The segments
+    are read in parallel into one buffer and the tensors of the state dict
+    share the memory of the buffer.
+    """
+    path = str(path)
+    with open(path, "rb") as f:
+        content = f.read()
+    return _read_state_dict_segments(path, content, max_workers)
+
+
+def _read_state_dict_segments(path, content, max_workers=None):
+    magic_len = len(CheckpointConstant.SEGMENT_MANIFEST_MAGIC)
+    manifest: SegmentManifest = pickle.loads(content[magic_len:])
+    ckpt_dir = os.path.dirname(path)
+    total_size = sum(size for _, size in manifest.segments)
+    buffer = bytearray(total_size)
+    view = memoryview(buffer)
+
+    offset = 0
+    futures: List[Future] = []
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="ckpt_reader-"
+    ) as executor:
+        for seg_name, size in manifest.segments:
+            seg_path = os.path.join(ckpt_dir, seg_name)
+            seg_view = view[offset : offset + size]  # noqa E203
+            futures.append(executor.submit(_read_segment, seg_path, seg_view))
+            offset += size
+        for future in futures:
+            future.result()
+
+    state_dict = _traverse_state_dict(
+        manifest.meta_dict,
+        lambda x: _read_tensor_from_buf(x, buffer),
+    )
+    return state_dict
+
+
+def read_state_dict_file(path, load_func: Callable):
+    """
+    Read the state dict from a checkpoint file persisted by the saver.
+    The file compressed by `CompressedStorage` is verified and decompressed
+    before loading.
+
+    Args:
+        path (str): the path of the checkpoint file.
+        load_func: the function to load the file if it is neither the
+            manifest of segments nor a raw checkpoint, like `torch.load`.
+
+    Raises:
+        CheckpointCorruptionError: the compressed file is corrupted.
+    """
+    magic = _read_magic(path)
+    if magic == CheckpointConstant.SEGMENT_MANIFEST_MAGIC:
+        return read_state_dict_segments(path)
+    elif magic == CheckpointConstant.RAW_CKPT_MAGIC:
+        return read_state_dict_raw(path)
+    elif magic == CheckpointConstant.COMPRESSED_CKPT_MAGIC:
+        content = read_compressed_file(path)
+        magic = bytes(content[: len(magic)])
+        if magic == CheckpointConstant.SEGMENT_MANIFEST_MAGIC:
+            return _read_state_dict_segments(str(path), content)
+        elif magic == CheckpointConstant.RAW_CKPT_MAGIC:
+            return _read_state_dict_raw_buffer(content)
+        return load_func(io.BytesIO(content))
+    return load_func(path)
+
+
+class _DeltaTensorWriter(object):
+    """
+    Copy the tensors modified since the latest copy into the shared memory
+    and set a new version into their metas.
+
+    Args:
+        copied_versions (dict): the storage reference, data pointer and
+            version counter of tensors by offset at the latest copy.
+        full_copy (bool): copy all tensors if True.
+        write_func: the function to copy a modified tensor into the buffer,
+            default `_write_shared_memory`.
+    """
+
+    def __init__(
+        self,
+        copied_versions: Dict,
+        full_copy: bool,
+        write_func: Callable = _write_shared_memory,
+    ):
+        self._copied_versions = copied_versions
+        self._full_copy = full_copy
+        self._write_func = write_func
+        self._version = time.time_ns()
+        self.copied_bytes = 0
+        self.skipped_bytes = 0
+
+    def _is_modified(self, value: torch.Tensor, meta: TensorMeta):
+        if self._full_copy:
+            return True
+        copied = self._copied_versions.get(meta.offset, None)
+        if copied is None:
+            return True
+        storage_ref, data_ptr, version = copied
+        return (
+            storage_ref() is not value.untyped_storage()
+            or data_ptr != value.data_ptr()
+            or version != value._version
+        )
+
+    def __call__(self, value: torch.Tensor, meta: TensorMeta, buffer):
+        nbytes = value.numel() * value.element_size()
+        if not self._is_modified(value, meta):
+            self.skipped_bytes += nbytes
+            return
+        self._write_func(value, meta, buffer)
+        meta.version = self._version
+        self.copied_bytes += nbytes
+        try:
+            storage_ref = weakref.ref(value.untyped_storage())
+        except TypeError:
+            # The tensor is always copied if the storage does not
+            # support the weak reference.
+            self._copied_versions.pop(meta.offset, None)
+            return
+        self._copied_versions[meta.offset] = (
+            storage_ref,
+            value.data_ptr(),
+            value._version,
+        )
+
+
 class SharedMemoryHandler(object):
     """
     The handler to write and read the shared memory with the state dict
     of PyTorch Module.
 
+    In the delta mode enabled by `DLROVER_CKPT_DELTA_MODE`, the handler
+    only copies the tensors modified since the latest copy into the shared
+    memory. A tensor is modified if it is not the same storage or its
+    version counter changes. In-place updates by `tensor.data` do not
+    bump the counter, so the engines of frameworks which update the
+    weights by `tensor.data` disable the delta mode.
+
     Args:
         local_rank (int): the local rank of the process on a node.
         host (bool): the handler is on the host if True, otherwise,
@@ -245,6 +946,12 @@ class SharedMemoryHandler(object):
 
     def __init__(self, local_rank, host=True):
         self._buffer_size = 0
+        self._delta_mode = is_delta_mode_enabled()
+        self._full_copy_interval = get_delta_full_interval()
+        self._save_count = 0
+        # The storage reference and version of tensors by the offset
+        # when the tensors are copied into the shared memory.
+        self._copied_versions: Dict[int, Tuple[weakref.ref, int, int]] = {}
         meta_name = CheckpointSharedObjPrefix.META_NAME + str(local_rank)
         job_name = os.getenv(NodeEnv.TORCHELASTIC_RUN_ID, "")
         if job_name:
@@ -260,6 +967,9 @@ class SharedMemoryHandler(object):
             )
         self.shared_memory: Optional[SharedMemory] = None
         self.metadata = SharedDict(name=meta_name, create=host)
+        # The meta dict of the state dict in the shared memory. The handler
+        # shares it by the compact `TensorMetaTable`.
+        self._meta_dict = None
         self._need_creation = True
         self._master_client = None
 
@@ -268,6 +978,15 @@ class SharedMemoryHandler(object):
             self._master_client = MasterClient.singleton_instance()
         return self._master_client
 
+    @property
+    def delta_mode(self):
+        return self._delta_mode
+
+    def disable_delta_mode(self):
+        """Copy all tensors into the shared memory at every saving."""
+        self._delta_mode = False
+        self._copied_versions.clear()
+
     def close(self):
         if self.shared_memory:
             self.shared_memory.close()
@@ -301,17 +1020,29 @@ class SharedMemoryHandler(object):
         self._buffer_size += value.numel() * value.element_size()
         return meta
 
-    def save_state_dict(self, state_dict):
+    def save_state_dict(self, state_dict, copier=None):
         """
         Copy the state dict from CPU memory buffer into the shared memory.
+
+        Args:
+            state_dict (dict): the state dict to save.
+            copier: a `PipelinedTensorCopier` to copy the tensors in the
+                background. The handler marks the shared memory completed
+                after the copier finishes all copies if it is not None.
         """
         if not self.shared_memory:
             meta_dict = _traverse_state_dict(
                 state_dict, self._create_tensor_meta
             )
             self.init_shared_memory(create=True, size=self._buffer_size)
-        else:
-            meta_dict = self.metadata.get(local=True)
+            self._copied_versions.clear()
+            self._meta_dict = meta_dict
+        elif self._meta_dict is None:
+            # The shared memory is restored by other processes.
+            self._meta_dict = _traverse_state_dict(
+                self.metadata.get(local=True), _identity
+            )
+        meta_dict = self._meta_dict
         ckpt_conf: CheckpointConfig = meta_dict[DLROVER_CKPT_CONFIG_KEY]
         ckpt_conf.writing_shm = True
 
@@ -321,17 +1052,48 @@ class SharedMemoryHandler(object):
             action=EventReportConstants.ACTION_MEM_CKPT_START,
             msg=f"step={ckpt_conf.step}",
         )
-        self.metadata.set(meta_dict)
+        # Only mark the shared memory is being written because the tensor
+        # metas are useless until the copy completes.
+        self.metadata.set({DLROVER_CKPT_CONFIG_KEY: ckpt_conf})
         assert self.shared_memory is not None
-        _traverse_copy_to_shm(state_dict, meta_dict, self.shared_memory.buf)
-        ckpt_conf.writing_shm = False
-        self.metadata.set(meta_dict)
-        report_local_event(
-            event_type=EventReportConstants.TYPE_INFO,
-            instance=str(ckpt_conf.rank),
-            action=EventReportConstants.ACTION_MEM_CKPT_COMPLETE,
-            msg=f"step={ckpt_conf.step}",
+        write_func = copier.write if copier else _write_shared_memory
+        delta_writer = None
+        if self._delta_mode:
+            full_copy = self._save_count % self._full_copy_interval == 0
+            delta_writer = _DeltaTensorWriter(
+                self._copied_versions, full_copy, write_func
+            )
+            write_func = delta_writer
+        self._save_count += 1
+        _traverse_copy_to_shm(
+            state_dict, meta_dict, self.shared_memory.buf, write_func
         )
+        if delta_writer:
+            logger.info(
+                f"Copy {delta_writer.copied_bytes} bytes of modified tensors "
+                f"and skip {delta_writer.skipped_bytes} bytes into the "
+                f"shared memory at step {ckpt_conf.step}."
+            )
+
+        def _complete_saving():
+            if copier and copier.failed:
+                # Keep the shared memory incomplete and copy all tensors
+                # at the next saving if the copy fails.
+                self._copied_versions.clear()
+                return
+            ckpt_conf.writing_shm = False
+            self.metadata.set(TensorMetaTable.from_meta_dict(meta_dict))
+            report_local_event(
+                event_type=EventReportConstants.TYPE_INFO,
+                instance=str(ckpt_conf.rank),
+                action=EventReportConstants.ACTION_MEM_CKPT_COMPLETE,
+                msg=f"step={ckpt_conf.step}",
+            )
+
+        if copier:
+            copier.flush(_complete_saving)
+        else:
+            _complete_saving()
 
     def load_state_dict(self):
         """
@@ -459,6 +1221,33 @@ class AsyncCheckpointSaver(metaclass=ABCMeta):
         self._executor = ThreadPoolExecutor(
             max_workers=self.local_shard_num, thread_name_prefix="ckpt_saver-"
         )
+        self._persist_chunk_size = int(
+            os.getenv(
+                CheckpointConstant.PERSIST_CHUNK_SIZE_ENV,
+                CheckpointConstant.DEFAULT_PERSIST_CHUNK_SIZE,
+            )
+        )
+        self._delta_mode = is_delta_mode_enabled()
+        self._delta_full_interval = get_delta_full_interval()
+        # The path and manifest of the latest segments of each state dict.
+        self._segment_bases: Dict[
+            Tuple[int, str], Tuple[str, SegmentManifest]
+        ] = {}
+        self._segment_persist_counts: Dict[Tuple[int, str], int] = {}
+        self._persist_format = os.getenv(
+            CheckpointConstant.PERSIST_FORMAT_ENV,
+            CheckpointConstant.TORCH_FORMAT,
+        )
+        persist_workers = int(
+            os.getenv(CheckpointConstant.PERSIST_WORKERS_ENV, 0)
+        )
+        # The I/O pool shared by all shards to write segments in parallel.
+        self._persist_executor: Optional[ThreadPoolExecutor] = None
+        if persist_workers > 1:
+            self._persist_executor = ThreadPoolExecutor(
+                max_workers=persist_workers,
+                thread_name_prefix="ckpt_persist-",
+            )
         self._master_client = None
 
         logger.info(f"AsyncSaver({self.__class__.__name__}) initialized.")
@@ -578,6 +1367,8 @@ class AsyncCheckpointSaver(metaclass=ABCMeta):
             self._shm_locks[i].unlink()
         self._event_queue.unlink()
         self._executor.shutdown(wait=False)
+        if self._persist_executor:
+            self._persist_executor.shutdown(wait=False)
 
     def release_locks(self):
         for i in range(self.local_shard_num):
@@ -713,6 +1504,66 @@ class AsyncCheckpointSaver(metaclass=ABCMeta):
         finally:
             shm_lock.release()
 
+    def _get_segment_base(self, key):
+        """
+        Get the previous checkpoint of a state dict whose unchanged segments
+        can be linked in the delta mode. Returns None to write all segments
+        as a full base checkpoint every `DELTA_FULL_INTERVAL` checkpoints.
+        """
+        if not self._delta_mode:
+            return None
+        count = self._segment_persist_counts.get(key, 0)
+        self._segment_persist_counts[key] = count + 1
+        if count % self._delta_full_interval == 0:
+            return None
+        return self._segment_bases.get(key, None)
+
+    def _persist_shard_buffer(
+        self, local_shard_id: int, ckpt_config: CheckpointConfig
+    ):
+        """
+        Write each state dict of the shard from the buffer of the shared
+        memory into the storage without `torch.save`. The saver writes
+        segment files in parallel by the I/O pool if it is configured,
+        otherwise, it streams the state dict into a raw checkpoint file.
+        """
+        shm_handler = self._shm_handlers[local_shard_id]
+        meta_dict = shm_handler.metadata.get()
+        config = meta_dict.get(DLROVER_CKPT_CONFIG_KEY, CheckpointConfig())
+        if config.writing_shm or shm_handler.shared_memory is None:
+            return
+        buffer = shm_handler.shared_memory.buf
+        start = time.time()
+        total_bytes = 0
+        for state_name, path in ckpt_config.paths.items():
+            state_meta = meta_dict.get(state_name, None)
+            if not state_meta:
+                continue
+            if self._persist_executor:
+                key = (local_shard_id, state_name)
+                written_bytes, manifest = write_state_dict_segments(
+                    self.storage,
+                    buffer,
+                    state_meta,
+                    path,
+                    self._persist_executor,
+                    self._persist_chunk_size,
+                    base=self._get_segment_base(key),
+                )
+                self._segment_bases[key] = (str(path), manifest)
+                total_bytes += written_bytes
+            else:
+                total_bytes += write_state_dict_raw(
+                    self.storage, buffer, state_meta, path
+                )
+        elapsed = max(time.time() - start, 1e-6)
+        throughput = round(total_bytes / elapsed / 1024**3, 3)
+        logger.info(
+            f"Persist the shard {local_shard_id} of rank {ckpt_config.rank} "
+            f"with {total_bytes} bytes in {round(elapsed, 3)}s, "
+            f"throughput: {throughput}GB/s."
+        )
+
     def _dist_make_dir(self, path, timeout=30):
         if self._node_rank == 0:
             logger.info(f"Create path by rank0 worker: {path}.")
@@ -1052,6 +1903,12 @@ class CommonDirCheckpointSaver(AsyncCheckpointSaver):
     def persist_to_storage(
         self, local_shard_id: int, ckpt_config: CheckpointConfig
     ):
+        if (
+            self._persist_executor
+            or self._persist_format == CheckpointConstant.RAW_FORMAT
+        ):
+            self._persist_shard_buffer(local_shard_id, ckpt_config)
+            return
         state_dict = self._shm_handlers[local_shard_id].load_state_dict()
         for state_name, sd in state_dict.items():
             if sd and state_name in ckpt_config.paths:
@@ -17,9 +17,19 @@ from typing import Optional
 
 from torch.distributed import Store
 
+from dlrover.python.common.constants import JobConstant
 from dlrover.python.common.log import default_logger as logger
 from dlrover.python.elastic_agent.master_client import MasterClient
 
+# The seconds to get the keys again if the master cannot hold the request.
+_POLL_INTERVAL = 2
+
+
+def _to_bytes(value) -> bytes:
+    if isinstance(value, str):
+        return value.encode()
+    return bytes(value)
+
 
 class MasterKVStore(Store):
     """
@@ -121,6 +131,26 @@ class MasterKVStore(Store):
         key = self.prefix + key
         return self.client.kv_store_add(key, num)
 
+    def compare_set(self, key, expected_value, desired_value) -> bytes:
+        """
+        Set the key to ``desired_value`` if its value is ``expected_value``.
+        The key is set if it is not present and ``expected_value`` is empty.
+        Both values may be either Python ``str`` or ``bytes``.
+
+        Returns:
+            the value of the key after the operation, which is
+            ``expected_value`` if the key is not present and
+            ``expected_value`` is not empty.
+        """
+        key = self.prefix + key
+        return self.client.kv_store_compare_set(
+            key, _to_bytes(expected_value), _to_bytes(desired_value)
+        )
+
+    def clear_prefix(self, prefix):
+        """Remove the keys with the prefix from ``MasterKVStore``."""
+        self.client.kv_store_clear(self.prefix + prefix)
+
     def wait(
         self, keys, override_timeout: Optional[datetime.timedelta] = None
     ):
@@ -150,15 +180,23 @@ class MasterKVStore(Store):
 
     def _try_wait_get(self, keys, override_timeout=None):
         """
-        Get all of the (base64-encoded) etcd keys at once, or wait until
-        all the keys are published or timeout occurs.
+        Get all of the keys at once, or wait until all the keys are
+        published or timeout occurs. The master holds the request until
+        all keys are set, so a request returns once the keys are published.
         """
         timeout = override_timeout if override_timeout else self.timeout
         deadline = time.time() + timeout.total_seconds()
 
         while True:
+            start = time.time()
             try:
-                kvs = self.client.kv_store_multi_get(keys)
+                kvs = self.client.kv_store_multi_get(
+                    keys,
+                    wait_timeout=min(
+                        deadline - start,
+                        JobConstant.KV_STORE_LONG_POLL_TIMEOUT,
+                    ),
+                )
                 if kvs:
                     logger.debug(f"_try_wait_get {keys}: {kvs}")
                     return kvs
@@ -173,4 +211,7 @@ class MasterKVStore(Store):
                     f"_try_wait_get {keys} timeout: {timeout.total_seconds()}"
                 )
                 return None
-            time.sleep(2)
+            # Only poll periodically if the master responds immediately.
+            interval = _POLL_INTERVAL - (time.time() - start)
+            if interval > 0:
+                time.sleep(min(interval, watch_timeout))
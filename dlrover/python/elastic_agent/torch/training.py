@@ -384,8 +384,18 @@ class MasterRendezvousHandler(RendezvousHandler):
         start_pending = 0
         while True:
             self._check_network_rdzv()
+            start_query = time.time()
             round, group, world = self._client.get_comm_world(
-                self._name, self._node_rank
+                self._name,
+                self._node_rank,
+                wait_timeout=JobConstant.RENDEZVOUS_LONG_POLL_TIMEOUT,
+            )
+            # The master holds the request until the rendezvous completes
+            # and only sleeps if the master responds immediately.
+            interval = max(
+                JobConstant.RENDEZVOUS_DEFAULT_INTERVAL
+                - (time.time() - start_query),
+                0,
             )
             if world:
                 if self._node_rank in world:
@@ -397,7 +407,7 @@ class MasterRendezvousHandler(RendezvousHandler):
                             "and waits for more nodes."
                         )
                         start_pending = time.time()
-                    time.sleep(JobConstant.RENDEZVOUS_DEFAULT_INTERVAL)
+                    time.sleep(interval)
                     start_join = time.time()
                     if start_join - start_pending > self.pend_timeout:
                         err_msg = (
@@ -417,7 +427,7 @@ class MasterRendezvousHandler(RendezvousHandler):
                 )
                 _rdzv_evt.fail(error=err_msg)
                 raise RendezvousTimeoutError(err_msg)
-            time.sleep(JobConstant.RENDEZVOUS_DEFAULT_INTERVAL)
+            time.sleep(interval)
         rank = list(world.keys()).index(self._node_rank)
         world_size = len(world)
         logger.info(
@@ -437,6 +447,9 @@ class MasterRendezvousHandler(RendezvousHandler):
             rank=rank,
             world_size=world_size,
         )
+        if rank == 0 and round > 0:
+            # All nodes have left the previous round if the round completes.
+            self._store.clear_prefix(self._get_store_prefix(round - 1))
         store = self._get_store(round, group)
         return store, world
 
@@ -462,8 +475,11 @@ class MasterRendezvousHandler(RendezvousHandler):
         if self._node_rank == 0:
             self._client.report_failures(err_msg, 0, level)
 
+    def _get_store_prefix(self, round):
+        return f"torch.rendezvous.{self._name}.{round}."
+
     def _get_store(self, round, group) -> Store:
-        key_prefix = f"torch.rendezvous.{self._name}.{round}.{group}"
+        key_prefix = f"{self._get_store_prefix(round)}{group}"
         return PrefixStore(key_prefix, self._store)
 
     def num_nodes_waiting(self):
@@ -162,6 +162,28 @@ def _build_master_args_parser():
         type=str,
         help="The service type of master: grpc/http.",
     )
+    parser.add_argument(
+        "--async_service",
+        "--async-service",
+        default=False,
+        type=str2bool,
+        help="Whether to serve the gRPC requests by asyncio.",
+    )
+    parser.add_argument(
+        "--pod_creation_concurrency",
+        "--pod-creation-concurrency",
+        default=DefaultValues.POD_CREATION_CONCURRENCY,
+        type=pos_int,
+        help="The max number of pods to create concurrently.",
+    )
+    parser.add_argument(
+        "--pod_creation_qps",
+        "--pod-creation-qps",
+        default=DefaultValues.POD_CREATION_QPS,
+        type=float,
+        help="The max requests per second to create pods. "
+        "The rate is not limited if it is not positive.",
+    )
     parser.add_argument(
         "--pre_check_ops",
         "--pre-check-ops",
@@ -11,35 +11,293 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from threading import Lock
-from typing import Dict
+import itertools
+import time
+from threading import Condition, Lock
+from typing import Dict, Iterable, List, Tuple
 
+from dlrover.python.common.async_notifier import AsyncNotifier
+
+_DEFAULT_SHARD_NUM = 16
+
+
+class _KVShard(object):
+    """A shard of the store with its own lock."""
 
-class KVStoreService(object):
     def __init__(self):
-        self._lock = Lock()
-        self._store: Dict[str, bytes] = {}
+        self.lock = Lock()
+        # The requests waiting for keys in the shard are notified
+        # if any key in the shard is updated.
+        self.key_updated = Condition(self.lock)
+        self.store: Dict[str, bytes] = {}
+        self.versions: Dict[str, int] = {}
+        # The monotonic time when the key expires.
+        self.expirations: Dict[str, float] = {}
+
+    def remove(self, key):
+        self.store.pop(key, None)
+        self.versions.pop(key, None)
+        self.expirations.pop(key, None)
+
+    def get(self, key, now=None):
+        """Get the value of the key. The caller must hold the lock."""
+        if key in self.expirations:
+            now = now or time.monotonic()
+            if self.expirations[key] <= now:
+                self.remove(key)
+        return self.store.get(key, b"")
+
+    def remove_expired_keys(self):
+        now = time.monotonic()
+        for key in [k for k, t in self.expirations.items() if t <= now]:
+            self.remove(key)
+
+
+class KVStoreService(object):
+    """
+    The key-value store in the master. The keys are hashed into shards
+    and each shard has its own lock, so the requests of many nodes
+    to different keys do not serialize on one lock.
+
+    Each key has a version which is the revision of the store when the key
+    is updated last, so the client can wait until the keys are set or watch
+    the updates of keys by one request without polling the store.
+
+    Args:
+        shard_num (int): the number of shards.
+    """
+
+    def __init__(self, shard_num=_DEFAULT_SHARD_NUM):
+        self._shards = [_KVShard() for _ in range(max(shard_num, 1))]
+        # `next` of the counter is atomic, so the shards share
+        # the revision without a lock.
+        self._revision = itertools.count(1)
+        # The watchers waiting for keys in any shard.
+        self._watch_cond = Condition(Lock())
+        self._watchers = 0
+        # The coroutines waiting for keys in any shard.
+        self._async_notifier = AsyncNotifier()
+
+    def _get_shard(self, key) -> _KVShard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _update(self, shard: _KVShard, key, value, ttl=0.0):
+        """Update the key and its version. The caller must hold the lock."""
+        shard.store[key] = value
+        shard.versions[key] = next(self._revision)
+        if ttl > 0:
+            shard.expirations[key] = time.monotonic() + ttl
+        else:
+            shard.expirations.pop(key, None)
+
+    def _notify_watchers(self):
+        # The watcher increases the number before checking the keys,
+        # so it is notified if the key is updated after the check.
+        if self._watchers > 0:
+            with self._watch_cond:
+                self._watch_cond.notify_all()
+        self._async_notifier.notify_all()
 
-    def set(self, key, value):
-        with self._lock:
-            self._store[key] = value
+    def set(self, key, value, ttl=0.0):
+        """
+        Set the value of the key. The key expires after `ttl` seconds
+        if `ttl` is positive.
+        """
+        shard = self._get_shard(key)
+        with shard.lock:
+            self._update(shard, key, value, ttl)
+            shard.key_updated.notify_all()
+        self._notify_watchers()
+
+    def multi_set(self, kvs: Dict[str, bytes], ttl=0.0):
+        """Set the keys. It is atomic for the keys in the same shard."""
+        shard_kvs: Dict[int, Dict[str, bytes]] = {}
+        for key, value in kvs.items():
+            index = hash(key) % len(self._shards)
+            shard_kvs.setdefault(index, {})[key] = value
+        for index, kvs in shard_kvs.items():
+            shard = self._shards[index]
+            with shard.lock:
+                for key, value in kvs.items():
+                    self._update(shard, key, value, ttl)
+                shard.key_updated.notify_all()
+        self._notify_watchers()
 
     def get(self, key):
-        with self._lock:
-            return self._store.get(key, b"")
+        shard = self._get_shard(key)
+        with shard.lock:
+            return shard.get(key)
 
     def add(self, key, value):
-        with self._lock:
+        """
+        Atomically add the value to the key. The key is an integer counter
+        if the value is an integer, otherwise, the value is appended.
+
+        Returns:
+            The new value of the key.
+        """
+        shard = self._get_shard(key)
+        with shard.lock:
             try:
-                if key not in self._store:
-                    self._store[key] = value
-                    return value
+                v0 = shard.get(key)
+                if v0 == b"":
+                    new_value = value
+                elif isinstance(value, int):
+                    new_value = int(v0) + value
                 else:
-                    v0 = self._store.get(key)
-                    self._store[key] = v0 + value
-                    return self._store.get(key)
+                    new_value = v0 + value
+                self._update(shard, key, new_value)
             except Exception:
+                new_value = value
+            shard.key_updated.notify_all()
+        # Notify the watchers out of the shard lock because the watcher
+        # holds the watch condition to take the shard locks.
+        self._notify_watchers()
+        return new_value
+
+    def compare_set(self, key, expected, desired):
+        """
+        Set the key to `desired` if its value is `expected` like the
+        `compare_set` of torch's TCPStore. An unset key is set if
+        `expected` is empty.
+
+        Returns:
+            The value of the key after the operation. It is `expected` if
+            the key is unset and `expected` is not empty.
+        """
+        shard = self._get_shard(key)
+        with shard.lock:
+            value = shard.get(key)
+            if key not in shard.store and expected:
+                return expected
+            if value != expected:
                 return value
+            self._update(shard, key, desired)
+            shard.key_updated.notify_all()
+        self._notify_watchers()
+        return desired
+
+    def multi_get(self, keys: List[str], timeout=0.0) -> Dict[str, bytes]:
+        """
+        Get the values of all keys. It waits until all keys are set
+        or the timeout elapses.
+
+        Returns:
+            A dict of the keys and values. It is empty if any key is not set.
+        """
+        deadline = time.time() + timeout
+        while True:
+            kvs: Dict[str, bytes] = {}
+            missing_key = None
+            for key in keys:
+                value = self.get(key)
+                if value == b"":
+                    missing_key = key
+                    break
+                kvs[key] = value
+            if missing_key is None:
+                return kvs
+            # Wait on the shard of the missing key until it is set.
+            shard = self._get_shard(missing_key)
+            with shard.lock:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return {}
+                if shard.get(missing_key) == b"":
+                    shard.key_updated.wait(remaining)
+
+    async def async_wait_keys(self, keys: List[str], timeout=0.0) -> bool:
+        """Wait until all keys are set like `multi_get` in the event loop
+        without holding a thread."""
+        return await self._async_notifier.wait_for(
+            lambda: bool(self.multi_get(keys)), timeout
+        )
+
+    def get_versions(self, keys: Iterable[str]) -> Dict[str, int]:
+        """Get the versions of keys. The version of an unset key is 0."""
+        versions: Dict[str, int] = {}
+        for key in keys:
+            shard = self._get_shard(key)
+            with shard.lock:
+                shard.get(key)
+                versions[key] = shard.versions.get(key, 0)
+        return versions
 
-    def clear(self):
-        self._store.clear()
+    def _get_updated_keys(self, versions: Dict[str, int]):
+        kvs: Dict[str, bytes] = {}
+        new_versions: Dict[str, int] = {}
+        for key, version in versions.items():
+            shard = self._get_shard(key)
+            with shard.lock:
+                value = shard.get(key)
+                cur_version = shard.versions.get(key, 0)
+                if cur_version > version:
+                    kvs[key] = value
+                    new_versions[key] = cur_version
+        return kvs, new_versions
+
+    def watch(
+        self, versions: Dict[str, int], timeout=0.0
+    ) -> Tuple[Dict[str, bytes], Dict[str, int]]:
+        """
+        Wait until any key is updated after the given version or
+        the timeout elapses.
+
+        Args:
+            versions: the key and the latest version known by the client.
+            timeout: the max seconds to wait.
+
+        Returns:
+            The values and versions of the updated keys.
+        """
+        deadline = time.time() + timeout
+        with self._watch_cond:
+            self._watchers += 1
+            try:
+                while True:
+                    kvs, new_versions = self._get_updated_keys(versions)
+                    remaining = deadline - time.time()
+                    if kvs or remaining <= 0:
+                        return kvs, new_versions
+                    self._watch_cond.wait(remaining)
+            finally:
+                self._watchers -= 1
+
+    async def async_wait_updates(
+        self, versions: Dict[str, int], timeout=0.0
+    ) -> bool:
+        """Wait until any key is updated after the given version like
+        `watch` in the event loop without holding a thread."""
+        return await self._async_notifier.wait_for(
+            lambda: bool(self._get_updated_keys(versions)[0]), timeout
+        )
+
+    def scan(self, prefix="") -> Dict[str, bytes]:
+        """Get all keys with the prefix."""
+        kvs: Dict[str, bytes] = {}
+        for shard in self._shards:
+            with shard.lock:
+                shard.remove_expired_keys()
+                for key, value in shard.store.items():
+                    if key.startswith(prefix):
+                        kvs[key] = value
+        return kvs
+
+    def clear(self, prefix=""):
+        """
+        Remove the keys with the prefix, like the keys of a finished
+        rendezvous round. All keys are removed if the prefix is empty.
+        """
+        for shard in self._shards:
+            with shard.lock:
+                if prefix:
+                    keys = [k for k in shard.store if k.startswith(prefix)]
+                    for key in keys:
+                        shard.remove(key)
+                else:
+                    shard.store.clear()
+                    shard.versions.clear()
+                    shard.expirations.clear()
+                shard.remove_expired_keys()
+                shard.key_updated.notify_all()
+        self._notify_watchers()
@@ -15,9 +15,10 @@ import math
 import time
 from abc import ABCMeta, abstractmethod
 from collections import OrderedDict
-from threading import Lock
+from threading import Condition, Lock
 from typing import Dict, List, Tuple
 
+from dlrover.python.common.async_notifier import AsyncNotifier
 from dlrover.python.common.constants import (
     EventReportConstants,
     NetworkFailureReason,
@@ -26,6 +27,7 @@ from dlrover.python.common.constants import (
 from dlrover.python.common.event.reporter import get_event_reporter
 from dlrover.python.common.log import default_logger as logger
 from dlrover.python.common.node import Node
+from dlrover.python.common.stats_utils import percentile
 from dlrover.python.master.elastic_training.net_topology import (
     DefaultTopologyQuerier,
     DpTopologySorter,
@@ -66,6 +68,11 @@ class RendezvousParameters(object):
 class RendezvousManager(metaclass=ABCMeta):
     def __init__(self):
         self._lock = Lock()
+        # The requests of the world wait on the condition until the
+        # rendezvous state changes.
+        self._rdzv_cond = Condition(self._lock)
+        self._async_notifier = AsyncNotifier()
+        self._rdzv_version = 0
         self._alive_nodes = set()
         self._released_workers = []
         # for both '_waiting_nodes' and '_rdzv_nodes', key is the node rank.
@@ -87,6 +94,12 @@ class RendezvousManager(metaclass=ABCMeta):
         self._topology_sorter = DpTopologySorter()
         self._event_reporter = get_event_reporter()
         self.rendezvous_events: Dict[int, DurationSpan] = {}
+        # key is the node rank, value is the timestamp to join.
+        self._node_join_ts: Dict[int, float] = {}
+        # The seconds from joining to getting the world of nodes
+        # in the latest round.
+        self._rdzv_latencies: List[float] = []
+        self._latency_round = 0
 
     def get_min_nodes(self):
         return self._rdzv_params.min_nodes
@@ -146,12 +159,20 @@ class RendezvousManager(metaclass=ABCMeta):
                 self._rdzv_params.max_nodes = max_nodes
                 self._rdzv_params.waiting_timeout = waiting_timeout
                 self._node_unit = node_unit
+                self._notify_rdzv_waiters()
                 logger.info(
                     f"{self._name} manager updates rdzv params: "
                     f"min_nodes={min_nodes}, max_nodes={max_nodes}, "
                     f"waiting_timeout={waiting_timeout}, node_unit={node_unit}"
                 )
 
+    def _notify_rdzv_waiters(self):
+        """Wake all requests waiting for the world. The caller must hold
+        the lock."""
+        self._rdzv_version += 1
+        self._rdzv_cond.notify_all()
+        self._async_notifier.notify_all()
+
     def _check_rdzv_completed(self):
         rdzv_completed = False
         waiting_num = len(self._waiting_nodes)
@@ -180,6 +201,7 @@ class RendezvousManager(metaclass=ABCMeta):
                     extra_nodes[i] = self._waiting_nodes[i]
             self._waiting_nodes = extra_nodes
             self._lastcall_time = 0
+            self._notify_rdzv_waiters()
             self._log_rendezvous_info()
             if self._waiting_nodes:
                 waiting_node_ids = []
@@ -307,6 +329,9 @@ class RendezvousManager(metaclass=ABCMeta):
             self._waiting_nodes[node_rank] = meta
             self._rdzv_nodes = OrderedDict()
             self._lastcall_time = time.time()
+            self._node_join_ts[node_rank] = self._lastcall_time
+            if len(self._waiting_nodes) >= self._rdzv_params.max_nodes:
+                self._notify_rdzv_waiters()
             self._node_rdzv_times[node_rank] = round(
                 self._lastcall_time - self._start_rdzv_ts, 2
             )
@@ -381,6 +406,98 @@ class RendezvousManager(metaclass=ABCMeta):
             min_nodes=self.get_min_nodes(),
         )
 
+    def wait_comm_world(
+        self, node_rank, timeout=0.0
+    ) -> Tuple[int, int, Dict[int, NodeTopologyMeta]]:
+        """Get the communication world like `get_comm_world` but wait
+        until the node is in the world or the timeout elapses. The request
+        waits on a condition which is notified if the rendezvous completes
+        or the waiting nodes are enough, so the nodes need not poll the
+        master periodically.
+
+        Args:
+            node_rank: the id of node.
+            timeout: the max seconds to wait. The method returns
+                the current world without waiting if it is not positive.
+        """
+        deadline = time.time() + timeout
+        while True:
+            version = self._rdzv_version
+            rdzv_round, group, world = self.get_comm_world(node_rank)
+            remaining = deadline - time.time()
+            if node_rank in world or remaining <= 0:
+                break
+            with self._rdzv_cond:
+                if version == self._rdzv_version:
+                    wait_time = self._get_completion_wait_time(remaining)
+                    self._rdzv_cond.wait(wait_time)
+        if node_rank in world:
+            self._record_rdzv_latency(node_rank)
+        return rdzv_round, group, world
+
+    async def async_wait_comm_world(self, node_rank, timeout=0.0) -> bool:
+        """Wait until the node is in the world like `wait_comm_world` in
+        the event loop without holding a thread.
+
+        Returns:
+            Whether the node is in the world.
+        """
+
+        def _get_wait_time(remaining):
+            with self._lock:
+                return self._get_completion_wait_time(remaining)
+
+        return await self._async_notifier.wait_for(
+            lambda: node_rank in self.get_comm_world(node_rank)[2],
+            timeout,
+            _get_wait_time,
+        )
+
+    def _get_completion_wait_time(self, max_wait_time):
+        """The seconds until the rendezvous may complete because no more
+        nodes join in the waiting timeout. The caller must hold the lock.
+        """
+        if (
+            self._lastcall_time > 0
+            and len(self._waiting_nodes) >= self._rdzv_params.min_nodes
+        ):
+            wait_time = (
+                self._lastcall_time
+                + self._rdzv_params.waiting_timeout
+                - time.time()
+            )
+            if wait_time > 0:
+                return min(wait_time, max_wait_time)
+        return max_wait_time
+
+    def _record_rdzv_latency(self, node_rank):
+        with self._lock:
+            join_ts = self._node_join_ts.pop(node_rank, 0)
+            if join_ts == 0:
+                return
+            if self._latency_round != self._rdzv_round:
+                self._latency_round = self._rdzv_round
+                self._rdzv_latencies = []
+            self._rdzv_latencies.append(round(time.time() - join_ts, 3))
+            if len(self._rdzv_latencies) == len(self._rdzv_nodes):
+                p50, p99 = self._get_latency_percentiles()
+                logger.info(
+                    f"The latency of nodes to get the world of round "
+                    f"{self._rdzv_round - 1} of {self._name} rendezvous "
+                    f"is p50={p50}s and p99={p99}s."
+                )
+
+    def _get_latency_percentiles(self):
+        p50 = percentile(self._rdzv_latencies, 50)
+        p99 = percentile(self._rdzv_latencies, 99)
+        return p50, p99
+
+    def get_rdzv_latency_percentiles(self):
+        """Return the p50 and p99 seconds from joining the rendezvous to
+        getting the world of nodes in the latest round."""
+        with self._lock:
+            return self._get_latency_percentiles()
+
     @abstractmethod
     def get_comm_world(
         self, node_rank
@@ -61,6 +61,9 @@ def run(args):
     _dlrover_context.pending_fail_strategy = args.pending_fail_strategy
     _dlrover_context.pending_timeout = args.pending_timeout
     _dlrover_context.master_service_type = args.service_type
+    _dlrover_context.master_service_async = args.async_service
+    _dlrover_context.pod_creation_concurrency = args.pod_creation_concurrency
+    _dlrover_context.pod_creation_qps = args.pod_creation_qps
     _dlrover_context.pre_check_operators = args.pre_check_ops
     if args.xpu_type.lower() == "ascend":
         job_args.xpu_type = Accelerators.ASCEND_NPU
@@ -91,6 +91,8 @@ _master_evt = DLRoverMasterEvent().singleton_instance()
 job_ctx = get_job_context()
 
 _MAX_POD_RELAUNCH_COUNT = 5
+# The seconds to check the expired heartbeats which costs O(expired nodes).
+_HEARTBEAT_CHECK_INTERVAL = 3
 
 
 def is_positive_exit(exit_reason):
@@ -489,62 +491,69 @@ class DistributedJobManager(JobManager):
             # deal with heartbeat
             self._monitor_node_heart_beat()
 
-            time.sleep(15)
+            time.sleep(_HEARTBEAT_CHECK_INTERVAL)
 
     def _get_dead_node_event(self, window_interval=600) -> List[NodeEvent]:
         now = time.time()
         dead_events: List[NodeEvent] = []
-        job_nodes = self.get_job_nodes()
-        logger.debug(f"Current job nodes are: {job_nodes}.")
-        for nodes in job_nodes.values():
-            for node in list(nodes.values()):
-                if (
-                    node.heartbeat_time > 0
-                    and now - node.heartbeat_time > window_interval
-                    and node.start_time
-                    and node.create_time
-                    and node.status == NodeStatus.RUNNING
-                    and not node.is_succeeded_and_exited()
-                ):
-                    if (
-                        node.heartbeat_time <= node.start_time.timestamp()
-                        or node.heartbeat_time <= node.create_time.timestamp()
-                    ):
-                        logger.warning(
-                            f"Skip dead node judgement for "
-                            f"node: {node.id}-{node.name} "
-                            f"because heartbeat time < create/start time. "
-                            f"Current nodes: {self._get_nodes_time_info()}."
-                        )
-                        continue
-
-                    event_node = copy.deepcopy(node)
-                    event_node.status = NodeStatus.FAILED
-                    event_node.exit_reason = NodeExitReason.NO_HEARTBEAT
-                    event = NodeEvent(
-                        event_type=NodeEventType.DELETED,
-                        node=event_node,
-                    )
-                    dead_events.append(event)
-                    error_data = (
-                        f"No heartbeat for over {window_interval} seconds."
-                    )
-                    self._process_error(
-                        node,
-                        node.relaunch_count,
-                        error_data,
-                        TrainingExceptionLevel.NODE_ERROR,
-                    )
-                    logger.warning(
-                        f"The node {node.id}-{node.name} has not sent a "
-                        f"heartbeat for over {window_interval} seconds, "
-                        f"last heartbeat: {node.heartbeat_time}, "
-                        f"created at: {node.create_time}, "
-                        f"started at: {node.start_time}."
-                    )
-                    self._event_reporter.report_node_no_heartbeat(
-                        node, window_interval
-                    )
+        # Only the nodes whose latest heartbeat has expired are checked.
+        expired_nodes = self._job_context.pop_expired_heartbeat_nodes(
+            now - window_interval
+        )
+        for node in expired_nodes:
+            if (
+                NodeStatus.is_terminal_status(node.status)
+                or node.is_succeeded_and_exited()
+            ):
+                continue
+            if (
+                not node.start_time
+                or not node.create_time
+                or node.status != NodeStatus.RUNNING
+            ):
+                # Check the node again in the next round.
+                self._job_context.track_node_heartbeat(node)
+                continue
+            # Check the node again after the window until it is terminated
+            # or it sends a new heartbeat, so it is reported once a window.
+            self._job_context.track_node_heartbeat(node, now)
+            if (
+                node.heartbeat_time <= node.start_time.timestamp()
+                or node.heartbeat_time <= node.create_time.timestamp()
+            ):
+                logger.warning(
+                    f"Skip dead node judgement for "
+                    f"node: {node.id}-{node.name} "
+                    f"because heartbeat time < create/start time. "
+                    f"Current nodes: {self._get_nodes_time_info()}."
+                )
+                continue
+
+            event_node = copy.deepcopy(node)
+            event_node.status = NodeStatus.FAILED
+            event_node.exit_reason = NodeExitReason.NO_HEARTBEAT
+            event = NodeEvent(
+                event_type=NodeEventType.DELETED,
+                node=event_node,
+            )
+            dead_events.append(event)
+            error_data = f"No heartbeat for over {window_interval} seconds."
+            self._process_error(
+                node,
+                node.relaunch_count,
+                error_data,
+                TrainingExceptionLevel.NODE_ERROR,
+            )
+            logger.warning(
+                f"The node {node.id}-{node.name} has not sent a "
+                f"heartbeat for over {window_interval} seconds, "
+                f"last heartbeat: {node.heartbeat_time}, "
+                f"created at: {node.create_time}, "
+                f"started at: {node.start_time}."
+            )
+            self._event_reporter.report_node_no_heartbeat(
+                node, window_interval
+            )
         return dead_events
 
     def _get_nodes_time_info(self):
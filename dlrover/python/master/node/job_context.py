@@ -12,9 +12,10 @@
 # limitations under the License.
 
 import copy
+import heapq
 import threading
 import time
-from typing import Dict, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from dlrover.python.common.constants import (
     JobStage,
@@ -47,6 +48,14 @@ class JobContext(Singleton):
         self._job_nodes: Dict[str, Dict[int, Node]] = {}
         self._total_worker_num = 0
         self._failed_nodes: Dict[int, int] = {}
+        # The min-heap of the check times of nodes to find the nodes
+        # without heartbeats by O(expired) instead of scanning all nodes.
+        # The check time is the heartbeat time unless the expired node is
+        # checked again later. The entry is stale if its check time is not
+        # the tracked one of the node.
+        self._heartbeat_heap: List[Tuple[float, str, int]] = []
+        # The tracked heartbeat time and check time of nodes.
+        self._heartbeat_times: Dict[Tuple[str, int], Tuple[float, float]] = {}
 
         self._pre_check_status: str = PreCheckStatus.CHECKING
 
@@ -214,10 +223,15 @@ class JobContext(Singleton):
             if node_type not in self._job_nodes:
                 self._job_nodes[node_type] = {}
             self._job_nodes[node_type] = copy.deepcopy(job_nodes)
+            for node in job_nodes.values():
+                self._track_heartbeat(node)
 
     def update_job_nodes(self, job_nodes: Dict[str, Dict[int, Node]]):
         with self._locker:
             self._job_nodes = copy.deepcopy(job_nodes)
+            for nodes in job_nodes.values():
+                for node in nodes.values():
+                    self._track_heartbeat(node)
 
     def update_job_node(self, node: Node):
         with self._locker:
@@ -226,10 +240,80 @@ class JobContext(Singleton):
             if node.type not in self._job_nodes:
                 self._job_nodes[node.type] = {}
             self._job_nodes[node.type][node.id] = copy.deepcopy(node)
+            self._track_heartbeat(node)
 
     def clear_job_nodes(self):
         with self._locker:
             self._job_nodes = {}
+            self._heartbeat_heap = []
+            self._heartbeat_times = {}
+
+    def _track_heartbeat(self, node: Node, check_time=0.0):
+        """
+        Track the heartbeat of the node. The node expires if `check_time`
+        expires and it is the latest heartbeat time by default.
+        """
+        key = (node.type, node.id)
+        tracked = self._heartbeat_times.get(key)
+        if node.heartbeat_time <= 0 or (
+            not check_time and tracked and tracked[0] == node.heartbeat_time
+        ):
+            return
+        check_time = check_time or node.heartbeat_time
+        self._heartbeat_times[key] = (node.heartbeat_time, check_time)
+        heapq.heappush(self._heartbeat_heap, (check_time, node.type, node.id))
+        # Rebuild the heap if there are too many stale entries.
+        if len(self._heartbeat_heap) > 4 * len(self._heartbeat_times) + 1024:
+            self._heartbeat_heap = [
+                (times[1], node_type, node_id)
+                for (
+                    node_type,
+                    node_id,
+                ), times in self._heartbeat_times.items()
+            ]
+            heapq.heapify(self._heartbeat_heap)
+
+    def pop_expired_heartbeat_nodes(self, expired_time) -> List[Node]:
+        """Pop the nodes whose latest heartbeat is before the expired time.
+
+        Args:
+            expired_time: the timestamp in seconds.
+
+        Returns:
+            The copies of nodes which may be dead. The caller should call
+            `track_node_heartbeat` to check a node again later.
+        """
+        nodes: List[Node] = []
+        with self._locker:
+            heap = self._heartbeat_heap
+            while heap and heap[0][0] < expired_time:
+                check_time, node_type, node_id = heapq.heappop(heap)
+                key = (node_type, node_id)
+                tracked = self._heartbeat_times.get(key)
+                if not tracked or tracked[1] != check_time:
+                    continue
+                self._heartbeat_times.pop(key)
+                node = self._job_nodes.get(node_type, {}).get(node_id)
+                if node is None:
+                    continue
+                if node.heartbeat_time >= expired_time:
+                    self._track_heartbeat(node)
+                    continue
+                nodes.append(copy.deepcopy(node))
+        return nodes
+
+    def track_node_heartbeat(self, node: Node, check_time=0.0):
+        """
+        Track the heartbeat of a node popped by the expired time.
+
+        Args:
+            node: the node.
+            check_time: the node is checked again if the time expires and
+                the node does not send a new heartbeat. It is the latest
+                heartbeat time of the node by default.
+        """
+        with self._locker:
+            self._track_heartbeat(node, check_time)
 
     def report_failed_node(self, node_id: Union[int, str] = None):
         if node_id is None:
@@ -0,0 +1,166 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Optional
+
+from dlrover.python.common import comm
+from dlrover.python.common.stats_utils import percentile
+
+# The number of the latest requests to compute the latency percentiles.
+_LATENCY_WINDOW = 1000
+
+
+class RequestCategory(object):
+    HEARTBEAT = "heartbeat"
+    KV_STORE = "kv_store"
+    RENDEZVOUS = "rendezvous"
+    TASK = "task"
+    DIAGNOSIS = "diagnosis"
+    DEFAULT = "default"
+
+
+_MESSAGE_CATEGORIES = {
+    comm.HeartBeat: RequestCategory.HEARTBEAT,
+    comm.GlobalStep: RequestCategory.HEARTBEAT,
+    comm.ResourceStats: RequestCategory.HEARTBEAT,
+    comm.KeyValuePair: RequestCategory.KV_STORE,
+    comm.KeyValuePairs: RequestCategory.KV_STORE,
+    comm.RendezvousRequest: RequestCategory.RENDEZVOUS,
+    comm.RendezvousParams: RequestCategory.RENDEZVOUS,
+    comm.NetworkReadyRequest: RequestCategory.RENDEZVOUS,
+    comm.StragglerExistRequest: RequestCategory.RENDEZVOUS,
+    comm.NetworkCheckResult: RequestCategory.RENDEZVOUS,
+    comm.SyncJoin: RequestCategory.RENDEZVOUS,
+    comm.SyncFinish: RequestCategory.RENDEZVOUS,
+    comm.SyncBarrier: RequestCategory.RENDEZVOUS,
+    comm.TaskRequest: RequestCategory.TASK,
+    comm.TaskResult: RequestCategory.TASK,
+    comm.TaskLeaseRequest: RequestCategory.TASK,
+    comm.TaskResults: RequestCategory.TASK,
+    comm.DatasetShardParams: RequestCategory.TASK,
+    comm.ShardCheckpointRequest: RequestCategory.TASK,
+    comm.ShardCheckpoint: RequestCategory.TASK,
+    comm.DiagnosisReportData: RequestCategory.DIAGNOSIS,
+    comm.PreCheckRequest: RequestCategory.DIAGNOSIS,
+    comm.NodeFailure: RequestCategory.DIAGNOSIS,
+    comm.AtorchEvent: RequestCategory.DIAGNOSIS,
+    comm.Event: RequestCategory.DIAGNOSIS,
+}
+
+# The requests to wait for the rendezvous or the keys wait in the event
+# loop, so they do not hold the threads of their categories.
+_DEFAULT_MAX_WORKERS = {
+    RequestCategory.HEARTBEAT: 8,
+    RequestCategory.KV_STORE: 16,
+    RequestCategory.RENDEZVOUS: 8,
+    RequestCategory.TASK: 16,
+    RequestCategory.DIAGNOSIS: 4,
+    RequestCategory.DEFAULT: 16,
+}
+
+
+def get_request_category(message) -> str:
+    """Get the category of the message by its class or base class."""
+    for cls in type(message).__mro__:
+        if cls in _MESSAGE_CATEGORIES:
+            return _MESSAGE_CATEGORIES[cls]
+    return RequestCategory.DEFAULT
+
+
+class _CategoryStats(object):
+    def __init__(self):
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+
+class RequestExecutor(object):
+    """
+    Run the handlers of the master service in a bounded thread pool per
+    category of the request message, so the heavy requests like the task
+    and diagnosis requests cannot block the heartbeats and the requests
+    of the KV store.
+
+    Args:
+        max_workers (dict): the max number of threads of each category.
+    """
+
+    def __init__(self, max_workers: Optional[Dict[str, int]] = None):
+        workers = dict(_DEFAULT_MAX_WORKERS)
+        workers.update(max_workers or {})
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._stats: Dict[str, _CategoryStats] = {}
+        for category, num in workers.items():
+            self._executors[category] = ThreadPoolExecutor(
+                max_workers=num,
+                thread_name_prefix=f"master_{category}",
+            )
+            self._stats[category] = _CategoryStats()
+        self._lock = threading.Lock()
+
+    def _execute(self, category, submit_time, func, *args):
+        stats = self._stats[category]
+        with self._lock:
+            stats.pending -= 1
+            stats.running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                stats.running -= 1
+                stats.completed += 1
+                stats.latencies.append(time.time() - submit_time)
+
+    async def run(self, message, func, *args):
+        """Run the function in the executor of the message category."""
+        category = get_request_category(message)
+        with self._lock:
+            self._stats[category].pending += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executors[category],
+            self._execute,
+            category,
+            time.time(),
+            func,
+            *args,
+        )
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the queue depth, the number of running and completed requests
+        and the latency percentiles in milliseconds of each category.
+        """
+        result: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for category, stats in self._stats.items():
+                p50 = percentile(stats.latencies, 50)
+                p99 = percentile(stats.latencies, 99)
+                result[category] = {
+                    "queue_depth": stats.pending,
+                    "running": stats.running,
+                    "completed": stats.completed,
+                    "latency_p50_ms": round(p50 * 1000, 3),
+                    "latency_p99_ms": round(p99 * 1000, 3),
+                }
+        return result
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
@@ -0,0 +1,139 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from collections import deque
+from typing import Deque
+
+from dlrover.python.common.stats_utils import percentile
+
+# The number of the latest created pods to compute the metrics.
+_METRIC_WINDOW = 1000
+# The seconds to compute the creation throughput.
+_THROUGHPUT_WINDOW = 60
+
+
+class TokenBucket(object):
+    """
+    The token bucket to limit the rate of the requests to the k8s
+    API server.
+
+    Args:
+        rate (float): the number of tokens per second. The bucket does not
+            limit the rate if it is not positive.
+        burst (int): the max number of tokens in the bucket.
+    """
+
+    def __init__(self, rate: float, burst: int = 0):
+        self._rate = rate
+        self._burst = max(burst, 1) if burst else max(int(rate), 1)
+        self._tokens = float(self._burst)
+        self._update_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token and return the seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._burst,
+                self._tokens + (now - self._update_time) * self._rate,
+            )
+            self._update_time = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def acquire(self):
+        """Block until a token is available."""
+        if self._rate <= 0:
+            return
+        wait_time = self._reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+class NodeCreationState(object):
+    """
+    The state to create the pod of a node with the exponential backoff.
+
+    Args:
+        base_backoff (float): the seconds to wait after the first failure.
+        max_backoff (float): the max seconds to wait to retry.
+    """
+
+    def __init__(self, base_backoff=1.0, max_backoff=60.0):
+        self.first_time = time.time()
+        self.failures = 0
+        self.next_time = 0.0
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+
+    def fail(self):
+        self.failures += 1
+        backoff = self._base_backoff * (2 ** (self.failures - 1))
+        self.next_time = time.time() + min(backoff, self._max_backoff)
+
+    def is_ready(self, now):
+        return now >= self.next_time
+
+
+class PodCreationStats(object):
+    """The throughput, the latency and the failures to create pods."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._created = 0
+        self._failures = 0
+        self._latencies: Deque[float] = deque(maxlen=_METRIC_WINDOW)
+        self._created_times: Deque[float] = deque(maxlen=_METRIC_WINDOW)
+
+    def record_created(self, latency):
+        """
+        Record a created pod.
+
+        Args:
+            latency (float): the seconds from the node is first dispatched
+                to the pod and service are created.
+        """
+        with self._lock:
+            self._created += 1
+            self._latencies.append(latency)
+            self._created_times.append(time.time())
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+
+    def to_dict(self):
+        now = time.time()
+        with self._lock:
+            latencies = list(self._latencies)
+            recent = [
+                t for t in self._created_times if now - t < _THROUGHPUT_WINDOW
+            ]
+            result = {
+                "created": self._created,
+                "failures": self._failures,
+                "throughput_per_sec": round(
+                    len(recent) / _THROUGHPUT_WINDOW, 3
+                ),
+                "latency_avg_s": 0.0,
+                "latency_p99_s": 0.0,
+            }
+        if latencies:
+            result["latency_avg_s"] = round(sum(latencies) / len(latencies), 3)
+            result["latency_p99_s"] = round(percentile(latencies, 99), 3)
+        return result
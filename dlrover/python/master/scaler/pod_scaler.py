@@ -20,7 +20,7 @@ import threading
 import time
 from collections import deque
 from concurrent.futures import ThreadPoolExecutor
-from typing import Deque, Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Tuple
 
 from kubernetes import client
 from kubernetes.client import V1EnvVar, V1EnvVarSource, V1ObjectFieldSelector
@@ -39,6 +39,11 @@ from dlrover.python.common.log import default_logger as logger
 from dlrover.python.common.node import Node, NodeResource
 from dlrover.python.master.node.job_context import get_job_context
 from dlrover.python.master.scaler.base_scaler import ScalePlan, Scaler
+from dlrover.python.master.scaler.pod_creation import (
+    NodeCreationState,
+    PodCreationStats,
+    TokenBucket,
+)
 from dlrover.python.scheduler.kubernetes import (
     NODE_SERVICE_PORTS,
     convert_cpu_to_decimal,
@@ -53,6 +58,10 @@ from dlrover.python.scheduler.kubernetes import (
 _dlrover_context = Context.singleton_instance()
 _job_context = get_job_context()
 
+# The seconds to wait for the nodes to create if there is no ready node.
+_CREATE_POD_POLL_INTERVAL = 0.5
+_CREATION_STATS_LOG_INTERVAL = 60
+
 
 class FakeKubeResponse:
     def __init__(self, obj):
@@ -107,6 +116,12 @@ class PodScaler(Scaler):
         self._master_service_type = _dlrover_context.master_service_type
         self._event_reporter = get_event_reporter()
         self._started = False
+        self._create_concurrency = _dlrover_context.pod_creation_concurrency
+        self._create_rate_limiter = TokenBucket(
+            _dlrover_context.pod_creation_qps, self._create_concurrency
+        )
+        self._creation_states: Dict[Tuple[str, int], NodeCreationState] = {}
+        self._creation_stats = PodCreationStats()
 
     def start(self):
         self._job = self._retry_to_get_job()
@@ -297,6 +312,7 @@ class PodScaler(Scaler):
                 break
         if not_created_pod:
             self._create_node_queue.remove(not_created_pod)
+            self._pop_creation_state(not_created_pod)
             return True
         return False
 
@@ -401,6 +417,7 @@ class PodScaler(Scaler):
         while down_num > 0 and not_created_pods:
             pod = not_created_pods.pop()
             self._create_node_queue.remove(pod)
+            self._pop_creation_state(pod)
             down_num -= 1
         cur_pods.sort(key=lambda x: x.id, reverse=True)
         for pod in cur_pods:
@@ -421,16 +438,76 @@ class PodScaler(Scaler):
         pod_name = get_pod_name(self._job_name, pod_type, id)
         return self._k8s_client.get_pod(pod_name)
 
+    def get_creation_stats(self):
+        """Get the throughput, latency and failures to create pods."""
+        stats = self._creation_stats.to_dict()
+        stats["pending"] = len(self._create_node_queue)
+        return stats
+
+    def _get_creation_state(self, node: Node):
+        key = (node.type, node.id)
+        with self._var_lock:
+            state = self._creation_states.get(key)
+            if state is None:
+                state = NodeCreationState(
+                    max_backoff=_dlrover_context.pod_creation_max_backoff
+                )
+                self._creation_states[key] = state
+            return state
+
+    def _pop_creation_state(self, node: Node):
+        with self._var_lock:
+            return self._creation_states.pop((node.type, node.id), None)
+
+    def _pop_ready_node(self) -> Optional[Node]:
+        """Pop the first node which is not waiting for the backoff."""
+        now = time.time()
+        for node in list(self._create_node_queue):
+            with self._var_lock:
+                state = self._creation_states.get((node.type, node.id))
+                if state and not state.is_ready(now):
+                    continue
+            try:
+                self._create_node_queue.remove(node)
+            except ValueError:
+                # The node is removed by scaling down.
+                continue
+            return node
+        return None
+
     def _periodic_create_pod(self):
-        logger.info("Start the thread to create Pod.")
-        with ThreadPoolExecutor(max_workers=4) as executor:
+        """
+        Create the pods of nodes in the queue by a pipeline which limits
+        the concurrency and the rate of requests to the k8s API server.
+        The node failing to create is retried with exponential backoff.
+        """
+        logger.info(
+            "Start the thread to create Pod with concurrency "
+            f"{self._create_concurrency} and qps "
+            f"{_dlrover_context.pod_creation_qps}."
+        )
+        inflight = threading.Semaphore(self._create_concurrency)
+        log_time = time.time()
+        with ThreadPoolExecutor(
+            max_workers=self._create_concurrency
+        ) as executor:
             while self._started:
-                while self._create_node_queue:
-                    executor.submit(
-                        self._create_pod_from_queue,
-                        self._create_node_queue.popleft(),
-                    )
-                time.sleep(3)
+                if time.time() - log_time > _CREATION_STATS_LOG_INTERVAL:
+                    log_time = time.time()
+                    if self._create_node_queue:
+                        logger.info(
+                            f"Pod creation stats: {self.get_creation_stats()}"
+                        )
+                inflight.acquire()
+                node = self._pop_ready_node()
+                if node is None:
+                    inflight.release()
+                    time.sleep(_CREATE_POD_POLL_INTERVAL)
+                    continue
+                self._get_creation_state(node)
+                self._create_rate_limiter.acquire()
+                future = executor.submit(self._create_pod_from_queue, node)
+                future.add_done_callback(lambda _: inflight.release())
 
     def _create_pod_from_queue(self, node_from_queue=None):
         """
@@ -446,16 +523,25 @@ class PodScaler(Scaler):
         if node_from_queue is None:
             return True
 
+        state = self._get_creation_state(node_from_queue)
         succeed = False
-        if self._check_cluster_ready_for_pod(node_from_queue):
-            pod = self._create_pod(node_from_queue)
-            succeed = self._k8s_client.create_pod(pod)
-        if not succeed:
-            self._create_node_queue.appendleft(node_from_queue)
-        else:
+        try:
+            if self._check_cluster_ready_for_pod(node_from_queue):
+                pod = self._create_pod(node_from_queue)
+                succeed = self._k8s_client.create_pod(pod)
             # create svs for succeed pod
-            if not self._create_service_for_pod(node_from_queue):
-                self._create_node_queue.appendleft(node_from_queue)
+            if succeed and not self._create_service_for_pod(node_from_queue):
+                succeed = False
+        except Exception as e:
+            logger.warning(f"Fail to create pod {node_from_queue.name}: {e}")
+        if succeed:
+            self._pop_creation_state(node_from_queue)
+            self._creation_stats.record_created(time.time() - state.first_time)
+        else:
+            with self._var_lock:
+                state.fail()
+            self._creation_stats.record_failure()
+            self._create_node_queue.append(node_from_queue)
         return succeed
 
     def _check_cluster_ready_for_pod(self, node: Node):
@@ -11,13 +11,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import importlib
 import json
 import threading
 import time
 from abc import ABC, abstractmethod
 from concurrent import futures
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import grpc as grpc_lib
 import tornado
@@ -32,6 +33,7 @@ from dlrover.python.common.constants import (
     JobConstant,
     JobStage,
     KeyValueOps,
+    MessageCodecType,
     NodeEventType,
     NodeType,
     RendezvousName,
@@ -59,9 +61,11 @@ from dlrover.python.master.monitor.perf_monitor import PerfMonitor
 from dlrover.python.master.node.job_context import get_job_context
 from dlrover.python.master.node.job_manager import JobManager
 from dlrover.python.master.node.training_node import SyncNodeTrainingPorts
+from dlrover.python.master.request_executor import RequestExecutor
 from dlrover.python.master.shard.dataset_splitter import new_dataset_splitter
 from dlrover.python.master.shard.task_manager import TaskManager
 from dlrover.python.master.stats.job_collector import JobMetricCollector
+from dlrover.python.master.stats.message_stats import MessageStats
 from dlrover.python.master.watcher.base_watcher import Node
 from dlrover.python.util.queue.queue import RayEventQueue
 
@@ -85,6 +89,10 @@ job_ctx = get_job_context()
 class MasterServicer(ABC):
     """Master service base class."""
 
+    # Whether the service can hold the requests of the world and the keys
+    # until the rendezvous completes or the keys are set.
+    long_poll_supported = True
+
     def __init__(
         self,
         task_manager,
@@ -110,6 +118,12 @@ class MasterServicer(ABC):
         self._start_training_time = 0
         self._start_autoscale = False
         self._event_reporter = get_event_reporter()
+        self._long_poll_slots = threading.BoundedSemaphore(
+            JobConstant.MASTER_MAX_LONG_POLL_REQUESTS
+        )
+        self._request_executor = RequestExecutor()
+        self._message_stats = MessageStats()
+        self._init_handlers()
 
         # preload module for class reflection
         self._diagnosis_data_module = importlib.import_module(
@@ -118,6 +132,17 @@ class MasterServicer(ABC):
         # clear kv store in case previous data is still there
         self._kv_store.clear()
 
+    def get_request_stats(self):
+        """Get the queue depth and latency of each request category."""
+        return self._request_executor.get_stats()
+
+    def get_message_stats(self):
+        """Get the number, latency, payload size and errors by message."""
+        return self._message_stats.to_dict()
+
+    def shutdown(self):
+        self._request_executor.shutdown()
+
     @abstractmethod
     def get_response(self, method):
         """Should be implemented by subclasses."""
@@ -128,64 +153,205 @@ class MasterServicer(ABC):
         """Should be implemented by subclasses."""
         pass
 
+    def _init_handlers(self):
+        """
+        Register the handlers of the request messages by the message class.
+        Each handler gets the node type, the node ID and the message.
+        """
+        self._get_handlers: Dict[type, Callable] = {
+            comm.TaskRequest: self._get_task,
+            comm.TaskLeaseRequest: self._lease_tasks,
+            comm.ShardCheckpointRequest: lambda t, i, m: (
+                self._get_shard_checkpoint(m)
+            ),
+            comm.ClusterVersionRequest: lambda t, i, m: (
+                self._get_cluster_version(m)
+            ),
+            comm.RunningNodesRequest: lambda t, i, m: (
+                self._get_running_nodes()
+            ),
+            comm.JoinRendezvousRequest: lambda t, i, m: (
+                self._join_rendezvous(m)
+            ),
+            comm.WaitingNodeNumRequest: lambda t, i, m: (
+                self._num_nodes_waiting(m.rdzv_name)
+            ),
+            comm.NetworkReadyRequest: lambda t, i, m: (
+                self._check_fault_node()
+            ),
+            comm.StragglerExistRequest: lambda t, i, m: (
+                self._check_straggler()
+            ),
+            comm.CommWorldRequest: lambda t, i, m: self._get_comm_world(m),
+            comm.KeyValuePair: lambda t, i, m: self._kv_store_get_by_op(m),
+            comm.KeyValuePairs: lambda t, i, m: (
+                self._kv_store_multi_get_by_op(m)
+            ),
+            comm.PsNodesRequest: lambda t, i, m: self._query_ps_nodes(),
+            comm.TrainingStatusRequest: lambda t, i, m: (
+                self._get_training_status()
+            ),
+            comm.ParallelConfigRequest: lambda t, i, m: (
+                self._get_paral_config()
+            ),
+            comm.CheckHardwareResetRequest: lambda t, i, m: (
+                self._need_to_restart_training(t, i)
+            ),
+            comm.SyncTrainingPort: lambda t, i, m: (
+                self._sync_training_ports(i, m)
+            ),
+            comm.ElasticRunConfigRequest: lambda t, i, m: (
+                self._get_elastic_run_config()
+            ),
+            comm.PreCheckRequest: self._get_pre_check_result,
+            comm.HeartBeat: self._report_heartbeat,
+            comm.ServiceStatsRequest: lambda t, i, m: (
+                self._get_service_stats()
+            ),
+        }
+        self._report_handlers: Dict[type, Callable] = {
+            comm.DatasetShardParams: lambda t, i, m: (
+                self._collect_dataset_shard_params(m)
+            ),
+            comm.ResourceStats: self._update_node_resource_usage,
+            comm.ModelInfo: lambda t, i, m: self._collect_model_info(m),
+            comm.GlobalStep: lambda t, i, m: self._collect_global_step(m),
+            comm.ShardCheckpoint: lambda t, i, m: (
+                self._restore_shard_checkpoint(m)
+            ),
+            comm.TaskResult: lambda t, i, m: self._report_task_result(m),
+            comm.TaskResults: self._report_task_results,
+            comm.ClusterVersion: lambda t, i, m: (
+                self._update_cluster_version(m)
+            ),
+            comm.NodeAddress: lambda t, i, m: self._update_node_address(m),
+            comm.NodeEvent: lambda t, i, m: (
+                self._deal_with_reported_node_event(m)
+            ),
+            comm.AtorchEvent: lambda t, i, m: (
+                self._handle_reported_atorch_event(m)
+            ),
+            comm.SyncJoin: self._join_sync,
+            comm.SyncFinish: lambda t, i, m: self._sync_finished(m),
+            comm.SyncBarrier: lambda t, i, m: self._barrier(m),
+            comm.NodeFailure: self._report_failure,
+            comm.RendezvousParams: lambda t, i, m: (
+                self._report_rdzv_params(m)
+            ),
+            comm.PsReady: lambda t, i, m: self._ready_for_ps_relaunch(),
+            comm.KeyValuePair: lambda t, i, m: self._kv_store_set_by_op(m),
+            comm.KeyValuePairs: lambda t, i, m: self._kv_store_multi_set(m),
+            comm.ParallelConfig: self._report_paral_config,
+            comm.NodeCheckpointState: self._sync_checkpoint,
+            comm.DiagnosisReportData: lambda t, i, m: (
+                self._report_node_diagnosis_data(m)
+            ),
+            comm.Event: lambda t, i, m: self._report_event(m),
+        }
+
+    def _find_handler(self, handlers: Dict[type, Callable], message):
+        """Find the handler of the message class or its base class."""
+        message_cls = type(message)
+        handler = handlers.get(message_cls)
+        if handler is None:
+            for base in message_cls.__mro__[1:]:
+                if base in handlers:
+                    handler = handlers[base]
+                    # Cache the handler of the subclass.
+                    handlers[message_cls] = handler
+                    break
+        return handler
+
     def get(self, request, _):
-        node_type = request.node_type
-        node_id = request.node_id
+        start = time.time()
         req_message = comm.deserialize_message(request.data)
+        return self._get_by_message(
+            request.node_type,
+            request.node_id,
+            req_message,
+            start,
+            len(request.data),
+            comm.get_message_codec(request.data),
+        )
 
+    async def async_get(self, request):
+        """Run `get` in the executor of the message category."""
+        start = time.time()
+        req_message = comm.deserialize_message(request.data)
+        await self._async_hold_request(req_message)
+        return await self._request_executor.run(
+            req_message,
+            self._get_by_message,
+            request.node_type,
+            request.node_id,
+            req_message,
+            start,
+            len(request.data),
+            comm.get_message_codec(request.data),
+        )
+
+    def _get_by_message(
+        self,
+        node_type,
+        node_id,
+        req_message,
+        start=0.0,
+        request_size=0,
+        codec=MessageCodecType.PICKLE,
+    ):
+        """
+        Handle the request message. The response message is serialized
+        by the codec of the request, so the agents with the old codec
+        can decode it during the rolling upgrade.
+        """
         response = self.get_response("get")
         if not req_message:
+            self._message_stats.record(
+                "get/invalid", 0, request_size, error=True
+            )
             return response
-        message = None
-        if isinstance(req_message, comm.TaskRequest):
-            message = self._get_task(node_type, node_id, req_message)
-        elif isinstance(req_message, comm.ShardCheckpointRequest):
-            message = self._get_shard_checkpoint(req_message)
-        elif isinstance(req_message, comm.ClusterVersionRequest):
-            message = self._get_cluster_version(req_message)
-        elif isinstance(req_message, comm.RunningNodesRequest):
-            message = self._get_running_nodes()
-        elif isinstance(req_message, comm.JoinRendezvousRequest):
-            message = self._join_rendezvous(req_message)
-        elif isinstance(req_message, comm.WaitingNodeNumRequest):
-            message = self._num_nodes_waiting(req_message.rdzv_name)
-        elif isinstance(req_message, comm.NetworkReadyRequest):
-            message = self._check_fault_node()
-        elif isinstance(req_message, comm.StragglerExistRequest):
-            message = self._check_straggler()
-        elif isinstance(req_message, comm.CommWorldRequest):
-            message = self._get_comm_world(req_message)
-        elif isinstance(req_message, comm.KeyValuePair):
-            if req_message.op == KeyValueOps.ADD:
-                message = self._kv_store_add(req_message)
-            else:
-                message = self._kv_store_get(req_message)
-        elif isinstance(req_message, comm.KeyValuePairs):
-            message = self._kv_store_multi_get(req_message)
-        elif isinstance(req_message, comm.PsNodesRequest):
-            message = self._query_ps_nodes()
-        elif isinstance(req_message, comm.TrainingStatusRequest):
-            message = self._get_training_status()
-        elif isinstance(req_message, comm.ParallelConfigRequest):
-            message = self._get_paral_config()
-        elif isinstance(req_message, comm.CheckHardwareResetRequest):
-            message = self._need_to_restart_training(node_type, node_id)
-        elif isinstance(req_message, comm.SyncTrainingPort):
-            message = self._sync_training_ports(node_id, req_message)
-        elif isinstance(req_message, comm.ElasticRunConfigRequest):
-            configs = self._job_manager.get_elastic_run_configs()
-            message = comm.ElasticRunConfig(configs=configs)
-        elif isinstance(req_message, comm.PreCheckRequest):
-            message = self._get_pre_check_result(
-                node_type, node_id, req_message
+        start = start or time.time()
+        handler = self._find_handler(self._get_handlers, req_message)
+        error = True
+        try:
+            message = None
+            if handler:
+                message = handler(node_type, node_id, req_message)
+            if message:
+                response.data = message.serialize(codec)
+            error = False
+        finally:
+            self._message_stats.record(
+                f"get/{type(req_message).__name__}",
+                time.time() - start,
+                request_size,
+                len(response.data),
+                error,
             )
-        elif isinstance(req_message, comm.HeartBeat):
-            message = self._report_heartbeat(node_type, node_id, req_message)
-
-        if message:
-            response.data = message.serialize()
         return response
 
+    def _get_elastic_run_config(self):
+        configs = self._job_manager.get_elastic_run_configs()
+        return comm.ElasticRunConfig(configs=configs)
+
+    def _get_service_stats(self):
+        return comm.ServiceStats(
+            message_stats=self.get_message_stats(),
+            executor_stats=self.get_request_stats(),
+        )
+
+    def _kv_store_get_by_op(self, request: comm.KeyValuePair):
+        if request.op == KeyValueOps.ADD:
+            return self._kv_store_add(request)
+        elif request.op == KeyValueOps.COMPARE_SET:
+            return self._kv_store_compare_set(request)
+        return self._kv_store_get(request)
+
+    def _kv_store_multi_get_by_op(self, request: comm.KeyValuePairs):
+        if request.op == KeyValueOps.WATCH:
+            return self._kv_store_watch(request)
+        return self._kv_store_multi_get(request)
+
     def _get_task(self, node_type, node_id, request: comm.TaskRequest):
         if not self._start_training_time:
             self._start_training_time = int(time.time())
@@ -198,19 +364,51 @@ class MasterServicer(ABC):
         task = self._task_manager.get_dataset_task(node_type, node_id, ds_name)
 
         if task:
-            res.task_id = task.task_id
-            res.type = task.task_type
-            res.shard.name = task.shard.name
-            res.shard.start = task.shard.start
-            res.shard.end = task.shard.end
-            if task.shard.record_indices:
-                res.shard.indices = task.shard.record_indices
+            res = self._to_task_message(task)
         elif not dataset.completed():
             res.type = self.get_task_type(TaskType.WAIT)
         with self._lock:
             self._task_manager.reset_worker_start_task_time(node_id)
         return res
 
+    def _to_task_message(self, task):
+        shard = comm.Shard(
+            name=task.shard.name,
+            start=task.shard.start,
+            end=task.shard.end,
+        )
+        record_indices = task.shard.record_indices
+        if record_indices:
+            shard.indices = record_indices
+        return comm.Task(
+            task_id=task.task_id, shard=shard, type=task.task_type
+        )
+
+    def _lease_tasks(self, node_type, node_id, request: comm.TaskLeaseRequest):
+        if not self._start_training_time:
+            self._start_training_time = int(time.time())
+        res = comm.TaskLease()
+        ds_name = request.dataset_name
+        dataset = self._task_manager.get_dataset(ds_name)
+        if not dataset:
+            res.finished = True
+            return res
+        tasks, revoked_ids = self._task_manager.lease_dataset_tasks(
+            node_type,
+            node_id,
+            ds_name,
+            request.num_tasks,
+            request.lease_seconds,
+        )
+        res.tasks = [self._to_task_message(task) for task in tasks]
+        res.revoked_task_ids = revoked_ids
+        # The node waits for the tasks recovered from other nodes
+        # if the dataset is not completed.
+        res.finished = not tasks and dataset.completed()
+        with self._lock:
+            self._task_manager.reset_worker_start_task_time(node_id)
+        return res
+
     def _get_shard_checkpoint(self, request: comm.ShardCheckpointRequest):
         response = comm.ShardCheckpoint()
         dataset = self._task_manager.get_dataset(request.dataset_name)
@@ -339,7 +537,12 @@ class MasterServicer(ABC):
 
     def _get_comm_world(self, request: comm.CommWorldRequest):
         rdzv_manager = self._rdzv_managers[request.rdzv_name]
-        rdzv_round, group, nodes = rdzv_manager.get_comm_world(request.node_id)
+        timeout = min(
+            request.wait_timeout, JobConstant.RENDEZVOUS_LONG_POLL_TIMEOUT
+        )
+        rdzv_round, group, nodes = self._hold_request(
+            timeout, rdzv_manager.wait_comm_world, request.node_id
+        )
         res = comm.RendezvousState(world={})
         res.group = group
         res.round = rdzv_round
@@ -347,13 +550,71 @@ class MasterServicer(ABC):
             res.world[rank] = meta.process_num
         if nodes and request.rdzv_name == RendezvousName.ELASTIC_TRAINING:
             rdzv_round = rdzv_manager.get_rdzv_round()
-            metrics = {CustomMetricKeys.RDZV_ROUND: rdzv_round}
+            p50, p99 = rdzv_manager.get_rdzv_latency_percentiles()
+            metrics = {
+                CustomMetricKeys.RDZV_ROUND: rdzv_round,
+                CustomMetricKeys.RDZV_LATENCY_P50: p50,
+                CustomMetricKeys.RDZV_LATENCY_P99: p99,
+            }
             self._job_metric_collector.collect_custom_data(metrics)
             # Finish elastic training rendezvous so we continue diagnosis
             self._diagnosis_manager.continue_observing()
 
         return res
 
+    def _hold_request(self, timeout, wait_func, *args):
+        """
+        Call the function which waits at most the timeout seconds. The
+        function is called without waiting if too many requests are held,
+        and the client will send the request again.
+        """
+        if (
+            timeout > 0
+            and self.long_poll_supported
+            and self._long_poll_slots.acquire(blocking=False)
+        ):
+            try:
+                return wait_func(*args, timeout)
+            finally:
+                self._long_poll_slots.release()
+        return wait_func(*args, 0)
+
+    async def _async_hold_request(self, message):
+        """
+        Wait for the world or the keys of the long-poll request in the
+        event loop, so the waiting requests do not hold the threads of
+        the executors. Then the handler gets the result without waiting.
+        """
+        if isinstance(message, comm.CommWorldRequest):
+            timeout = min(
+                message.wait_timeout, JobConstant.RENDEZVOUS_LONG_POLL_TIMEOUT
+            )
+            rdzv_manager = self._rdzv_managers[message.rdzv_name]
+            wait_func = rdzv_manager.async_wait_comm_world
+            args: Tuple = (message.node_id,)
+        elif isinstance(message, comm.KeyValuePairs):
+            timeout = min(
+                message.wait_timeout, JobConstant.KV_STORE_LONG_POLL_TIMEOUT
+            )
+            if message.op == KeyValueOps.WATCH:
+                wait_func = self._kv_store.async_wait_updates
+                args = ({k: message.versions.get(k, 0) for k in message.kvs},)
+            else:
+                wait_func = self._kv_store.async_wait_keys
+                args = (list(message.kvs.keys()),)
+        else:
+            return
+        message.wait_timeout = 0
+        if (
+            timeout > 0
+            and self.long_poll_supported
+            and self._long_poll_slots.acquire(blocking=False)
+        ):
+            try:
+                await wait_func(*args, timeout)
+            finally:
+                self._long_poll_slots.release()
+
     def _kv_store_get(self, request: comm.KeyValuePair):
         value = self._kv_store.get(request.key)
         res = comm.KeyValuePair(request.key, value)
@@ -366,20 +627,38 @@ class MasterServicer(ABC):
         logger.debug(f"_kv_store_add: {request} {res}")
         return res
 
-    def _kv_store_multi_get(self, request: comm.KeyValuePairs):
-        kvs: Dict[str, bytes] = {}
-        for key in request.kvs.keys():
-            value = self._kv_store.get(key)
-            if value == b"":
-                kvs = {}
-                break
-            else:
-                kvs[key] = value
+    def _kv_store_compare_set(self, request: comm.KeyValuePair):
+        value = self._kv_store.compare_set(
+            request.key, request.expected, request.value
+        )
+        res = comm.KeyValuePair(request.key, value)
+        logger.debug(f"_kv_store_compare_set: {request} {res}")
+        return res
 
+    def _kv_store_multi_get(self, request: comm.KeyValuePairs):
+        timeout = min(
+            request.wait_timeout, JobConstant.KV_STORE_LONG_POLL_TIMEOUT
+        )
+        keys = list(request.kvs.keys())
+        kvs = self._hold_request(timeout, self._kv_store.multi_get, keys)
         res = comm.KeyValuePairs(kvs)
+        res.versions = self._kv_store.get_versions(kvs.keys())
         logger.debug(f"_kv_store_multi_get: {request} {res}")
         return res
 
+    def _kv_store_watch(self, request: comm.KeyValuePairs):
+        timeout = min(
+            request.wait_timeout, JobConstant.KV_STORE_LONG_POLL_TIMEOUT
+        )
+        versions = {key: request.versions.get(key, 0) for key in request.kvs}
+        kvs, versions = self._hold_request(
+            timeout, self._kv_store.watch, versions
+        )
+        res = comm.KeyValuePairs(kvs, op=KeyValueOps.WATCH)
+        res.versions = versions
+        logger.debug(f"_kv_store_watch: {request} {res}")
+        return res
+
     def _get_paral_config(self):
         res = self._job_manager.get_opt_strategy()
         if not res:
@@ -395,65 +674,63 @@ class MasterServicer(ABC):
         return res
 
     def report(self, request, _):
-        node_type = request.node_type
-        node_id = request.node_id
+        start = time.time()
         message = comm.deserialize_message(request.data)
+        return self._report_by_message(
+            request.node_type,
+            request.node_id,
+            message,
+            start,
+            len(request.data),
+        )
 
+    async def async_report(self, request):
+        """Run `report` in the executor of the message category."""
+        start = time.time()
+        message = comm.deserialize_message(request.data)
+        return await self._request_executor.run(
+            message,
+            self._report_by_message,
+            request.node_type,
+            request.node_id,
+            message,
+            start,
+            len(request.data),
+        )
+
+    def _report_by_message(
+        self, node_type, node_id, message, start=0.0, request_size=0
+    ):
         response = self.get_response("report")
         if not message:
+            self._message_stats.record(
+                "report/invalid", 0, request_size, error=True
+            )
             return response
 
-        success = False
-        if isinstance(message, comm.DatasetShardParams):
-            success = self._collect_dataset_shard_params(message)
-        elif isinstance(message, comm.ResourceStats):
-            success = self._update_node_resource_usage(
-                node_type, node_id, message
+        start = start or time.time()
+        handler = self._find_handler(self._report_handlers, message)
+        error = True
+        try:
+            success = False
+            if handler:
+                success = handler(node_type, node_id, message)
+            response.success = success
+            error = False
+        finally:
+            self._message_stats.record(
+                f"report/{type(message).__name__}",
+                time.time() - start,
+                request_size,
+                error=error,
             )
-        elif isinstance(message, comm.ModelInfo):
-            success = self._collect_model_info(message)
-        elif isinstance(message, comm.GlobalStep):
-            success = self._collect_global_step(message)
-        elif isinstance(message, comm.ShardCheckpoint):
-            success = self._restore_shard_checkpoint(message)
-        elif isinstance(message, comm.TaskResult):
-            success = self._report_task_result(message)
-        elif isinstance(message, comm.ClusterVersion):
-            success = self._update_cluster_version(message)
-        elif isinstance(message, comm.NodeAddress):
-            success = self._update_node_address(message)
-        elif isinstance(message, comm.NodeEvent):
-            success = self._deal_with_reported_node_event(message)
-        elif isinstance(message, comm.AtorchEvent):
-            success = self._handle_reported_atorch_event(message)
-        elif isinstance(message, comm.SyncJoin):
-            success = self._join_sync(node_type, node_id, message)
-        elif isinstance(message, comm.SyncFinish):
-            success = self._sync_finished(message)
-        elif isinstance(message, comm.SyncBarrier):
-            success = self._barrier(message)
-        elif isinstance(message, comm.NodeFailure):
-            success = self._report_failure(node_type, node_id, message)
-        elif isinstance(message, comm.RendezvousParams):
-            success = self._report_rdzv_params(message)
-        elif isinstance(message, comm.PsReady):
-            success = self._ready_for_ps_relaunch()
-        elif isinstance(message, comm.KeyValuePair):
-            success = self._kv_store_set(message)
-        elif isinstance(message, comm.KeyValuePairs):
-            success = self._kv_store_multi_set(message)
-        elif isinstance(message, comm.ParallelConfig):
-            success = self._report_paral_config(node_type, node_id, message)
-        elif isinstance(message, comm.NodeCheckpointState):
-            success = self._sync_checkpoint(node_type, node_id, message)
-        elif isinstance(message, comm.DiagnosisReportData):
-            success = self._report_node_diagnosis_data(message)
-        elif isinstance(message, comm.Event):
-            success = self._report_event(message)
-
-        response.success = success
         return response
 
+    def _kv_store_set_by_op(self, message: comm.KeyValuePair):
+        if message.op == KeyValueOps.DELETE:
+            return self._kv_store_clear(message)
+        return self._kv_store_set(message)
+
     def _ready_for_ps_relaunch(self):
         self._job_manager.post_ps_ready()
         return True
@@ -533,12 +810,16 @@ class MasterServicer(ABC):
                 self._perf_monitor, nodes
             )
 
-    def _report_task_result(self, request: comm.TaskResult):
+    def _report_task_result(
+        self, request: comm.TaskResult, node_type="", node_id=-1
+    ):
         success = True
         if request.err_message:
             logger.warning("Worker reported error: " + request.err_message)
             success = False
-        task, _ = self._task_manager.report_dataset_task(request, success)
+        task, _ = self._task_manager.report_dataset_task(
+            request, success, node_type, node_id
+        )
         if (
             not self._start_autoscale
             and self._job_manager
@@ -559,6 +840,19 @@ class MasterServicer(ABC):
             self._check_start_auto_scale_worker()
         return success
 
+    def _report_task_results(
+        self, node_type, node_id, request: comm.TaskResults
+    ):
+        # The results of the leased tasks are ignored if the leases are
+        # revoked and the tasks are assigned to other nodes.
+        success = True
+        for result in request.results:
+            success = (
+                self._report_task_result(result, node_type, node_id)
+                and success
+            )
+        return success
+
     def _check_start_auto_scale_worker(self):
         sample_count = self._perf_monitor.get_sample_count()
         if (
@@ -687,13 +981,20 @@ class MasterServicer(ABC):
         return True
 
     def _kv_store_set(self, message: comm.KeyValuePair):
-        self._kv_store.set(message.key, message.value)
+        self._kv_store.set(message.key, message.value, message.ttl)
         logger.debug(f"_kv_store_set: {message}")
         return True
 
+    def _kv_store_clear(self, message: comm.KeyValuePair):
+        """Remove the keys with the prefix in the message key."""
+        if not message.key:
+            return False
+        self._kv_store.clear(message.key)
+        logger.info(f"Clear the keys with the prefix {message.key}.")
+        return True
+
     def _kv_store_multi_set(self, message: comm.KeyValuePairs):
-        for k, v in message.kvs.items():
-            self._kv_store.set(k, v)
+        self._kv_store.multi_set(message.kvs)
         logger.debug(f"_kv_store_multi_set: {message}")
         return True
 
@@ -863,29 +1164,106 @@ class GrpcMasterServicer(
             return elastic_training_pb2.NONE
 
 
+class AsyncGrpcMasterServicer(GrpcMasterServicer):
+    """
+    Master service with the asyncio implementation of grpc. The handlers
+    run in the executors of the request categories.
+    """
+
+    async def get(self, request, _):
+        return await self.async_get(request)
+
+    async def report(self, request, _):
+        return await self.async_report(request)
+
+
+class AsyncGrpcServer(object):
+    """
+    The grpc.aio server running in the event loop of a thread. It has
+    the same `start` and `stop` as the grpc server.
+    """
+
+    def __init__(self, port, master_servicer: AsyncGrpcMasterServicer):
+        self._port = port
+        self._servicer = master_servicer
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="grpc_master_service_loop",
+            daemon=True,
+        )
+        self._server = None
+
+    async def _start(self):
+        self._server = grpc_lib.aio.server(
+            options=[
+                ("comm.max_send_message_length", GRPC.MAX_SEND_MESSAGE_LENGTH),
+                (
+                    "comm.max_receive_message_length",
+                    GRPC.MAX_RECEIVE_MESSAGE_LENGTH,
+                ),
+            ],
+        )
+        elastic_training_pb2_grpc.add_MasterServicer_to_server(
+            self._servicer, self._server
+        )
+        self._server.add_insecure_port("[::]:{}".format(self._port))
+        await self._server.start()
+
+    def start(self):
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    def stop(self, grace=None):
+        if self._server:
+            asyncio.run_coroutine_threadsafe(
+                self._server.stop(grace), self._loop
+            ).result()
+            self._server = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._servicer.shutdown()
+
+
 class HttpMasterHandler(tornado.web.RequestHandler):
     def initialize(self, master_servicer: HttpMasterServicer):
         self._handler = master_servicer
 
     def get(self):
-        self.write("Not supported")
+        if self.request.path == "/request_stats":
+            self.write(self._handler.get_request_stats())
+        elif self.request.path == "/message_stats":
+            self.write(self._handler.get_message_stats())
+        else:
+            self.write("Not supported")
+
+    def _parse_request(self):
+        content_type = self.request.headers.get("Content-Type", "")
+        if content_type == comm.HTTP_BINARY_CONTENT_TYPE:
+            request = comm.deserialize_message(self.request.body)
+        else:
+            request = BaseRequest.from_json(json.loads(self.request.body))
+        return request
 
-    def post(self):
+    async def post(self):
+        # The handlers run in the executors of the servicer, so a slow
+        # handler does not block the IO loop.
         try:
             path = self.request.path
-            request = BaseRequest.from_json(json.loads(self.request.body))
+            if path == "/batch_report":
+                await self._batch_report()
+                return
+            request = self._parse_request()
 
             if path == "/get":
                 # return message
-                response = self._handler.get(request, BaseRequest())
+                response = await self._handler.async_get(request)
                 if not response.data:
                     response.success = True
                 self.write(response.serialize())
             elif path == "/report":
                 # return boolean
-                self.write(
-                    self._handler.report(request, BaseRequest()).serialize()
-                )
+                response = await self._handler.async_report(request)
+                self.write(response.serialize())
             else:
                 self.set_status(404)
                 logger.error(f"No service found for {path}.")
@@ -895,6 +1273,17 @@ class HttpMasterHandler(tornado.web.RequestHandler):
             self.set_status(500)
             self.write(f"{str(e)}")
 
+    async def _batch_report(self):
+        batch_request = comm.deserialize_message(self.request.body)
+        if not isinstance(batch_request, comm.BatchRequest):
+            raise ValueError("The body of /batch_report is not a batch.")
+        batch_response = comm.BatchResponse()
+        # Report the messages in order.
+        for request in batch_request.requests:
+            response = await self._handler.async_report(request)
+            batch_response.responses.append(response)
+        self.write(batch_response.serialize())
+
 
 def create_master_service(
     port,
@@ -911,7 +1300,26 @@ def create_master_service(
     service_type = _dlrover_context.master_service_type
     logger.info(f"Creating master {service_type} service with port: {port}")
 
-    if service_type == CommunicationType.COMM_SERVICE_GRPC:
+    if (
+        service_type == CommunicationType.COMM_SERVICE_GRPC
+        and _dlrover_context.master_service_async
+    ):
+        master_servicer = AsyncGrpcMasterServicer(
+            task_manager=task_manager,
+            job_manager=job_manager,
+            perf_monitor=perf_monitor,
+            rdzv_managers=rdzv_managers,
+            diagnosis_manager=diagnosis_manager,
+            job_metric_collector=job_metric_collector,
+            elastic_ps_service=elastic_ps_service,
+            sync_service=sync_service,
+        )
+        server = AsyncGrpcServer(port, master_servicer)
+    elif service_type == CommunicationType.COMM_SERVICE_GRPC:
+        if max_threads:
+            # The requests like waiting for the world of the rendezvous
+            # may be held in threads.
+            max_threads += JobConstant.MASTER_MAX_LONG_POLL_REQUESTS
         server = grpc_lib.server(
             futures.ThreadPoolExecutor(
                 max_workers=max_threads,
@@ -970,6 +1378,21 @@ def create_master_service(
                     HttpMasterHandler,
                     dict(master_servicer=master_servicer),
                 ),
+                (
+                    r"/batch_report",
+                    HttpMasterHandler,
+                    dict(master_servicer=master_servicer),
+                ),
+                (
+                    r"/request_stats",
+                    HttpMasterHandler,
+                    dict(master_servicer=master_servicer),
+                ),
+                (
+                    r"/message_stats",
+                    HttpMasterHandler,
+                    dict(master_servicer=master_servicer),
+                ),
             ],
         )
     return server
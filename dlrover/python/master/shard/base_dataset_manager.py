@@ -13,7 +13,8 @@
 
 import json
 from abc import ABCMeta, abstractmethod
-from typing import Dict, List
+from collections import deque
+from typing import Deque, Dict, List, Set, Tuple
 
 from dlrover.proto import elastic_training_pb2
 from dlrover.python.master.shard.dataset_splitter import DatasetSplitter, Shard
@@ -46,6 +47,10 @@ class DoingTask(object):
         task: a task with a data shard.
         node_id: the id of a node.
         start_time: the timestamp of a worker to fetch the task.
+        lease_seconds: the seconds of the lease of the task. The task
+            is reassigned if the node does not renew the lease before
+            the deadline. The task has no lease if it is not positive.
+        lease_deadline: the timestamp when the lease expires.
     """
 
     def __init__(
@@ -55,6 +60,57 @@ class DoingTask(object):
         self.node_type = node_type
         self.node_id = node_id
         self.start_time = start_time
+        self.lease_seconds = 0
+        self.lease_deadline = 0.0
+
+    def renew_lease(self, now):
+        if self.lease_seconds > 0:
+            self.lease_deadline = now + self.lease_seconds
+
+    def lease_expired(self, now):
+        return self.lease_seconds > 0 and now > self.lease_deadline
+
+
+class DoingTaskTable(dict):
+    """The dict of doing tasks by the task id which also indexes the task
+    ids by the node to find the tasks of a node without a full scan.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._node_task_ids: Dict[Tuple[str, int], Set[int]] = {}
+
+    def __setitem__(self, task_id, doing_task: DoingTask):
+        if task_id in self:
+            self._remove_node_task(task_id)
+        super().__setitem__(task_id, doing_task)
+        key = (doing_task.node_type, doing_task.node_id)
+        self._node_task_ids.setdefault(key, set()).add(task_id)
+
+    def _remove_node_task(self, task_id):
+        doing_task = super().__getitem__(task_id)
+        key = (doing_task.node_type, doing_task.node_id)
+        task_ids = self._node_task_ids.get(key)
+        if task_ids is not None:
+            task_ids.discard(task_id)
+            if not task_ids:
+                self._node_task_ids.pop(key)
+
+    def __delitem__(self, task_id):
+        self._remove_node_task(task_id)
+        super().__delitem__(task_id)
+
+    def pop(self, task_id, *args):
+        if task_id in self:
+            self._remove_node_task(task_id)
+        return super().pop(task_id, *args)
+
+    def clear(self):
+        self._node_task_ids.clear()
+        super().clear()
+
+    def get_node_task_ids(self, node_type, node_id) -> List[int]:
+        return sorted(self._node_task_ids.get((node_type, node_id), []))
 
 
 class DatasetShardCheckpoint(object):
@@ -71,6 +127,12 @@ class DatasetShardCheckpoint(object):
         Args:
             todo: [[start_0, end_0], [start_1, end_1]],
             doing: [[start_2, end_2], [start_3, end_3]],
+                The shard of a text dataset may have the third element
+                which is the record indices or the dict of the size and
+                seed of the permutation to compute the indices.
+                The successive shards with the same size are encoded as
+                a range like {"start": 0, "end": 1000, "shard_size": 10}
+                by the BatchDatasetManager.
             current_epoch: int64, the index of epoch,
             epoch: the epoch index of dataset.
         """
@@ -93,15 +155,15 @@ class DatasetShardCheckpoint(object):
 class DatasetManger(metaclass=ABCMeta):
     """DatasetManger manages the task with a shard of the dataset
     Attributes:
-        todo: A list to store tasks.
-        doing: Dict[int, DoingTask] where key is the task id.
+        todo: A deque to store tasks.
+        doing: DoingTaskTable where key is the task id.
     """
 
     def __init__(
         self, task_type, batch_size, dataset_splitter: DatasetSplitter
     ):
-        self.todo: List[Task] = []
-        self.doing: Dict[int, DoingTask] = {}
+        self.todo: Deque[Task] = deque()
+        self.doing: DoingTaskTable = DoingTaskTable()
 
         self._task_type = task_type
         self._batch_size = batch_size
@@ -115,6 +177,29 @@ class DatasetManger(metaclass=ABCMeta):
         epoch_task_count = self._dataset_splitter.get_shard_count()
         return len(self.todo) + epoch_task_count
 
+    def lease_task(self, task_id, lease_seconds, now):
+        """Set the lease of a doing task."""
+        doing_task = self.doing.get(task_id)
+        if doing_task:
+            doing_task.lease_seconds = lease_seconds
+            doing_task.renew_lease(now)
+
+    def renew_node_leases(self, node_type, node_id, now):
+        """Renew the leases of all doing tasks of the node."""
+        for task_id in self.doing.get_node_task_ids(node_type, node_id):
+            self.doing[task_id].renew_lease(now)
+
+    def revoke_expired_leases(self, now) -> List[DoingTask]:
+        """
+        Requeue the tasks whose leases expire. The retry count of the task
+        is not increased because the node may be slow but healthy.
+        """
+        expired = [t for t in self.doing.values() if t.lease_expired(now)]
+        for doing_task in expired:
+            self.doing.pop(doing_task.task.task_id)
+            self.todo.append(doing_task.task)
+        return expired
+
     @abstractmethod
     def get_epoch(self):
         """Get the training epoch"""
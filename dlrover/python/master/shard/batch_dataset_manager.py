@@ -13,12 +13,16 @@
 
 import math
 import time
+from collections import deque
+from typing import Dict, List, Optional
 
+from dlrover.python.common.index_permutation import IndexPermutation
 from dlrover.python.common.log import default_logger as logger
 from dlrover.python.master.shard.base_dataset_manager import (
     DatasetManger,
     DatasetShardCheckpoint,
     DoingTask,
+    DoingTaskTable,
     Task,
 )
 from dlrover.python.master.shard.dataset_splitter import DatasetSplitter, Shard
@@ -62,7 +66,7 @@ class BatchDatasetManager(DatasetManger):
         if not self.todo:
             # No more tasks
             return Task.create_invalid_task()
-        task: Task = self.todo.pop(0)
+        task: Task = self.todo.popleft()
         self.doing[task.task_id] = DoingTask(
             task, node_type, node_id, int(time.time())
         )
@@ -154,21 +158,61 @@ class BatchDatasetManager(DatasetManger):
     def get_doing_tasks(self):
         return self.doing
 
+    def _get_shard_checkpoints(self, tasks) -> List:
+        """
+        Encode the shards of tasks. The successive shards with the same
+        size and permutation are encoded as a range like
+        {"start": 0, "end": 1000, "shard_size": 10}.
+        """
+        # The runs of successive shards like [start, end, size, shards].
+        runs: List[List] = []
+        permutations: List[Optional[IndexPermutation]] = []
+        for task in tasks:
+            shard: Shard = task.shard
+            size = shard.end - shard.start
+            if shard.permutation is None and shard.record_indices:
+                runs.append([shard.start, shard.end, shard.record_indices, 0])
+                permutations.append(None)
+                continue
+            if runs:
+                run = runs[-1]
+                if (
+                    run[-1] > 0
+                    and shard.start == run[1]
+                    and size <= run[2]
+                    and run[1] - run[0] == run[2] * run[-1]
+                    and shard.permutation is permutations[-1]
+                ):
+                    run[1] = shard.end
+                    run[-1] += 1
+                    continue
+            runs.append([shard.start, shard.end, size, 1])
+            permutations.append(shard.permutation)
+
+        checkpoints: List = []
+        for run, permutation in zip(runs, permutations):
+            start, end, size, num = run
+            if num == 0:
+                checkpoints.append([start, end, size])
+                continue
+            # Only the seed of the permutation is saved.
+            permutation_dict = permutation.to_dict() if permutation else None
+            if num == 1:
+                checkpoint = [start, end]
+                if permutation_dict:
+                    checkpoint.append(permutation_dict)
+            else:
+                checkpoint = {"start": start, "end": end, "shard_size": size}
+                if permutation_dict:
+                    checkpoint["permutation"] = permutation_dict
+            checkpoints.append(checkpoint)
+        return checkpoints
+
     def checkpoint(self):
-        todo_shards = []
-        for task in self.todo:
-            shard = [task.shard.start, task.shard.end]
-            if task.shard.record_indices:
-                shard.append(task.shard.record_indices)
-            todo_shards.append(shard)
-
-        doing_shards = []
-        for task_id in self.doing:
-            task = self.doing[task_id].task
-            shard = [task.shard.start, task.shard.end]
-            if task.shard.record_indices:
-                shard.append(task.shard.record_indices)
-            doing_shards.append(shard)
+        todo_shards = self._get_shard_checkpoints(self.todo)
+        doing_shards = self._get_shard_checkpoints(
+            doing_task.task for doing_task in self.doing.values()
+        )
 
         return DatasetShardCheckpoint(
             dataset_name=self._dataset_splitter.dataset_name,
@@ -177,21 +221,53 @@ class BatchDatasetManager(DatasetManger):
             epoch=self._dataset_splitter.epoch,
         )
 
-    def restore_checkpoint(self, checkpoint: DatasetShardCheckpoint):
-        """Restore the task manager from a checkpoint"""
-        self._dataset_splitter.epoch = checkpoint.epoch
-        self.todo = []
-        self.doing = {}
-        for shard_indices in checkpoint.doing + checkpoint.todo:
+    def _restore_shards(self, shard_checkpoints):
+        permutations: Dict[int, IndexPermutation] = {}
+
+        def _get_permutation(permutation_dict):
+            seed = permutation_dict["seed"]
+            if seed not in permutations:
+                permutations[seed] = IndexPermutation(**permutation_dict)
+            return permutations[seed]
+
+        name = self._dataset_splitter.dataset_name
+        for shard_indices in shard_checkpoints:
+            if isinstance(shard_indices, dict):
+                permutation = None
+                if "permutation" in shard_indices:
+                    permutation = _get_permutation(
+                        shard_indices["permutation"]
+                    )
+                end = shard_indices["end"]
+                shard_size = shard_indices["shard_size"]
+                for start in range(shard_indices["start"], end, shard_size):
+                    yield Shard(
+                        name=name,
+                        start=start,
+                        end=min(start + shard_size, end),
+                        permutation=permutation,
+                    )
+                continue
             record_indices = None
-            if len(shard_indices) > 2:
+            permutation = None
+            if len(shard_indices) > 2 and isinstance(shard_indices[2], dict):
+                permutation = _get_permutation(shard_indices[2])
+            elif len(shard_indices) > 2:
                 record_indices = shard_indices[2]
-            shard = Shard(
-                name=self._dataset_splitter.dataset_name,
+            yield Shard(
+                name=name,
                 start=shard_indices[0],
                 end=shard_indices[1],
                 record_indices=record_indices,
+                permutation=permutation,
             )
+
+    def restore_checkpoint(self, checkpoint: DatasetShardCheckpoint):
+        """Restore the task manager from a checkpoint"""
+        self._dataset_splitter.epoch = checkpoint.epoch
+        self.todo = deque()
+        self.doing = DoingTaskTable()
+        for shard in self._restore_shards(checkpoint.doing + checkpoint.todo):
             self.todo.append(
                 Task(
                     self._task_id,
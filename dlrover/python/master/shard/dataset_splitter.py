@@ -16,8 +16,9 @@ import inspect
 import math
 import random
 from abc import ABCMeta, abstractmethod
-from typing import List
+from typing import List, Optional
 
+from dlrover.python.common.index_permutation import IndexPermutation
 from dlrover.python.common.log import default_logger as logger
 
 _MAX_SHARD_COUNT = 50000
@@ -31,13 +32,33 @@ class Shard(object):
         start: int, the start record index of the shard.
         end: int, the end record index of the shard.
         record_indices: indices of records in the dataset.
+        permutation: the permutation of the dataset to compute the record
+            indices of the shard on demand if record_indices is None.
     """
 
-    def __init__(self, name, start, end, record_indices: List[int] = None):
+    def __init__(
+        self,
+        name,
+        start,
+        end,
+        record_indices: List[int] = None,
+        permutation: Optional[IndexPermutation] = None,
+    ):
         self.name = name
         self.start = start
         self.end = end
-        self.record_indices = record_indices
+        self._record_indices = record_indices
+        self.permutation = permutation
+
+    @property
+    def record_indices(self) -> Optional[List[int]]:
+        if self._record_indices is None and self.permutation is not None:
+            return self.permutation.get_indices(self.start, self.end)
+        return self._record_indices
+
+    @record_indices.setter
+    def record_indices(self, record_indices):
+        self._record_indices = record_indices
 
 
 class PartitionOffsets(object):
@@ -279,6 +300,7 @@ class TextDatasetSplitter(DatasetSplitter):
         )
         self._dataset_name = dataset_name
         self._shuffle = shuffle
+        self._seed = random.getrandbits(63)
         self._shards: List[Shard] = []
 
     def get_epoch(self):
@@ -297,26 +319,26 @@ class TextDatasetSplitter(DatasetSplitter):
 
     def _create_shards_with_indices(self, start_idx, end_idx) -> List[Shard]:
         shards = []
-        record_indices = list(range(self._dataset_size))
+        permutation = None
         if self._shuffle:
-            random.shuffle(record_indices)
+            # The record indices of shards are computed on demand from
+            # the permutation of the epoch.
+            permutation = IndexPermutation(
+                self._dataset_size,
+                random.Random(self._seed + self.epoch).getrandbits(63),
+            )
         for shard_start_idx in range(start_idx, end_idx, self._shard_size):
             shard_end_idx = min(
                 shard_start_idx + self._shard_size,
                 end_idx,
             )
-            if self._shuffle:
-                size = shard_end_idx - shard_start_idx
-                shard_indices = record_indices[0:size]
-                record_indices = record_indices[size:]
-            else:
-                shard_indices = []
             shards.append(
                 Shard(
                     name=self._dataset_name,
                     start=shard_start_idx,
                     end=shard_end_idx,
-                    record_indices=shard_indices,
+                    record_indices=None if permutation else [],
+                    permutation=permutation,
                 )
             )
         return shards
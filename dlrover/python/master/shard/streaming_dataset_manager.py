@@ -13,6 +13,7 @@
 
 import math
 import time
+from collections import deque
 
 from dlrover.python.common.log import default_logger as logger
 from dlrover.python.master.shard.base_dataset_manager import (
@@ -188,7 +189,7 @@ class StreamingDatasetManager(DatasetManger):
         self._dataset_splitter = StreamingDatasetSplitter.from_checkpoint(
             checkpoint.splitter
         )
-        self.todo = []
+        self.todo = deque()
         for shard_indices in checkpoint.doing + checkpoint.todo:
             shard = Shard(
                 name=self._dataset_splitter.dataset_name,
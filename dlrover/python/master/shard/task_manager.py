@@ -15,7 +15,7 @@ import threading
 import time
 from collections import OrderedDict
 from collections.abc import Callable
-from typing import Dict, List
+from typing import Dict, List, Set, Tuple
 
 from dlrover.proto import elastic_training_pb2
 from dlrover.python.common import comm
@@ -25,12 +25,17 @@ from dlrover.python.master.monitor.perf_monitor import PerfMonitor
 from dlrover.python.master.shard.base_dataset_manager import (
     DatasetManger,
     DatasetShardCheckpoint,
+    Task,
 )
 from dlrover.python.master.shard.batch_dataset_manager import (
     BatchDatasetManager,
 )
 from dlrover.python.master.shard.dataset_splitter import DatasetSplitter
 
+_TASK_CHECK_INTERVAL = 30
+# The max number of tasks leased by a request.
+_MAX_LEASE_TASKS = 128
+
 
 class TaskManager(object):
     """Creates and dispatches Tasks. Keep track of a Task's lifecycle."""
@@ -51,6 +56,9 @@ class TaskManager(object):
         self._perf_monitor = perf_monitor
         self._paral_eval_count = 0
         self._paral_eval_started = False
+        # The ids of tasks whose leases are revoked by the dataset name,
+        # the node type and the node id.
+        self._revoked_task_ids: Dict[Tuple[str, str, int], Set[int]] = {}
         logger.info(
             "Task manager initialized with "
             f"process-timeout: {task_process_timeout}"
@@ -120,11 +128,48 @@ class TaskManager(object):
             else:
                 return None
 
+    def lease_dataset_tasks(
+        self, node_type, node_id, dataset_name, num_tasks, lease_seconds
+    ) -> Tuple[List[Task], List[int]]:
+        """
+        Get at most `num_tasks` tasks with the lease. The node renews the
+        leases of all its tasks of the dataset if it gets or reports
+        a task of the dataset.
+
+        Returns:
+            The leased tasks and the ids of the tasks of the node whose
+            leases are revoked since the last request.
+        """
+        tasks: List[Task] = []
+        for _ in range(min(max(num_tasks, 0), _MAX_LEASE_TASKS)):
+            task = self.get_dataset_task(node_type, node_id, dataset_name)
+            if not task or task.task_id < 0:
+                break
+            tasks.append(task)
+        with self._lock:
+            dataset = self._datasets.get(dataset_name, None)
+            if dataset:
+                now = time.time()
+                for task in tasks:
+                    dataset.lease_task(task.task_id, lease_seconds, now)
+                dataset.renew_node_leases(node_type, node_id, now)
+            revoked_ids = self._revoked_task_ids.pop(
+                (dataset_name, node_type, node_id), set()
+            )
+        # The task may be revoked and leased to the node again.
+        revoked_ids.difference_update(task.task_id for task in tasks)
+        return tasks, sorted(revoked_ids)
+
     def get_dataset(self, dataset_name):
         return self._datasets.get(dataset_name, None)
 
-    def report_dataset_task(self, request: comm.TaskResult, success: bool):
-        """Report if the task is successful or not"""
+    def report_dataset_task(
+        self, request: comm.TaskResult, success: bool, node_type="", node_id=-1
+    ):
+        """
+        Report if the task is successful or not. The report is ignored
+        if the node is given and the task is not assigned to the node.
+        """
 
         task_id = request.task_id
         dataset_name = request.dataset_name
@@ -136,7 +181,23 @@ class TaskManager(object):
                         dataset_name
                     )
                 )
+            doing_task = dataset.doing.get(task_id)
+            if node_type and (
+                not doing_task
+                or doing_task.node_type != node_type
+                or doing_task.node_id != node_id
+            ):
+                logger.info(
+                    f"Ignore the result of task {task_id} of dataset "
+                    f"{dataset_name} which is not assigned to "
+                    f"{node_type}-{node_id}."
+                )
+                return None, None
             success, doing_task = dataset.report_task_status(task_id, success)
+            if doing_task:
+                dataset.renew_node_leases(
+                    doing_task.node_type, doing_task.node_id, time.time()
+                )
             if success:
                 self._worker_start_task_time[doing_task.node_id] = time.time()
                 return doing_task.task, doing_task.node_id
@@ -174,16 +235,13 @@ class TaskManager(object):
 
     def recover_tasks(self, node_type, node_id):
         """Recover doing tasks for a dead worker if needed"""
+        with self._lock:
+            # The dead node does not request the revoked tasks any more.
+            self._remove_revoked_task_ids(
+                lambda key: key[1:] == (node_type, node_id)
+            )
         for name, dataset in self._datasets.items():
-            doing_tasks = dataset.doing
-            if not doing_tasks:
-                continue
-            ids = [
-                task_id
-                for task_id, doing_task in doing_tasks.items()
-                if doing_task.node_id == node_id
-                and doing_task.node_type == node_type
-            ]
+            ids = dataset.doing.get_node_task_ids(node_type, node_id)
             if not ids:
                 continue
             request = comm.TaskResult()
@@ -202,12 +260,11 @@ class TaskManager(object):
             )
 
     def start(self):
-        if self._task_process_timeout > 0:
-            threading.Thread(
-                target=self._check_and_reassign_timeout_tasks,
-                name="check_timeout_tasks",
-                daemon=True,
-            ).start()
+        threading.Thread(
+            target=self._check_and_reassign_timeout_tasks,
+            name="check_timeout_tasks",
+            daemon=True,
+        ).start()
 
     def reset_worker_start_task_time(self, worker_id):
         self._worker_start_task_time[worker_id] = time.time()
@@ -223,6 +280,10 @@ class TaskManager(object):
         """Check whether there are timeout tasks periodically."""
         logger.info("Start the thread to monitor timeout tasks.")
         while True:
+            self._recover_lease_expired_tasks()
+            if self._task_process_timeout <= 0:
+                time.sleep(_TASK_CHECK_INTERVAL)
+                continue
             for _, dataset in self._datasets.items():
                 # Copy doing task list because the doing list will pop items
                 # in the following loop.
@@ -244,7 +305,31 @@ class TaskManager(object):
                         dataset.report_task_status(task_id, success=False)
                         self._invoke_task_timeout_callback(doing_task.node_id)
                         break
-            time.sleep(30)
+            time.sleep(_TASK_CHECK_INTERVAL)
+
+    def _recover_lease_expired_tasks(self):
+        """Reassign the tasks whose leases expire to other nodes."""
+        with self._lock:
+            now = time.time()
+            for name, dataset in self._datasets.items():
+                if dataset.completed():
+                    self._remove_revoked_task_ids(lambda key: key[0] == name)
+                    continue
+                for doing_task in dataset.revoke_expired_leases(now):
+                    task_id = doing_task.task.task_id
+                    logger.info(
+                        f"The lease of task {task_id} of dataset {name} "
+                        f"assigned to {doing_task.node_type}-"
+                        f"{doing_task.node_id} expires."
+                    )
+                    key = (name, doing_task.node_type, doing_task.node_id)
+                    self._revoked_task_ids.setdefault(key, set()).add(task_id)
+
+    def _remove_revoked_task_ids(self, match: Callable):
+        """Remove the revoked task ids whose key matches."""
+        for key in list(self._revoked_task_ids.keys()):
+            if match(key):
+                self._revoked_task_ids.pop(key)
 
     def get_dataset_checkpoint(self, dataset_name):
         """Get the data shard checkpoint by dataset name.
@@ -0,0 +1,90 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import threading
+from typing import Dict, List
+
+# The upper bounds in milliseconds of the buckets of the latency histogram.
+_LATENCY_BUCKETS_MS = [1, 5, 10, 50, 100, 500, 1000, 5000, 10000]
+
+
+class _HandlerStats(object):
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        self.latency_buckets: List[int] = [0] * (len(_LATENCY_BUCKETS_MS) + 1)
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+class MessageStats(object):
+    """
+    The number of requests, the latency histogram, the payload sizes and
+    the errors of the master service by the handler of each message type,
+    like "get/TaskRequest" or "report/HeartBeat".
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _HandlerStats] = {}
+
+    def record(
+        self, name, latency, request_bytes=0, response_bytes=0, error=False
+    ):
+        """
+        Record a request.
+
+        Args:
+            name (str): the name of the handler.
+            latency (float): the seconds to handle the request.
+            request_bytes (int): the size of the serialized request.
+            response_bytes (int): the size of the serialized response.
+            error (bool): whether the handler raises an error.
+        """
+        index = bisect.bisect_left(_LATENCY_BUCKETS_MS, latency * 1000)
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = _HandlerStats()
+                self._stats[name] = stats
+            stats.count += 1
+            stats.errors += int(error)
+            stats.latency_sum += latency
+            stats.latency_buckets[index] += 1
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+
+    def to_dict(self):
+        """Get the stats of handlers sorted by the number of requests."""
+        result = {}
+        bucket_names = [f"<={b}" for b in _LATENCY_BUCKETS_MS] + ["+inf"]
+        with self._lock:
+            items = sorted(
+                self._stats.items(), key=lambda x: x[1].count, reverse=True
+            )
+            for name, stats in items:
+                result[name] = {
+                    "count": stats.count,
+                    "error_rate": round(stats.errors / stats.count, 4),
+                    "latency_avg_ms": round(
+                        stats.latency_sum / stats.count * 1000, 3
+                    ),
+                    "latency_histogram_ms": dict(
+                        zip(bucket_names, stats.latency_buckets)
+                    ),
+                    "request_bytes": stats.request_bytes,
+                    "response_bytes": stats.response_bytes,
+                }
+        return result
@@ -12,8 +12,12 @@
 # limitations under the License.
 
 import json
+import threading
+import time
+from collections import deque
 from datetime import datetime
-from typing import List
+from http import HTTPStatus
+from typing import Deque, Dict, List
 
 from kubernetes import client, watch
 
@@ -46,6 +50,13 @@ from dlrover.python.scheduler.kubernetes import (
 
 job_ctx = get_job_context()
 
+_WATCH_TIMEOUT_SECONDS = 60
+# The cache of pods is relisted if the watch has not synced it for the time.
+_POD_CACHE_EXPIRED_SECONDS = 180
+# The max seconds of the cache which `list` serves without relisting pods.
+_POD_LIST_STALE_SECONDS = 10
+_BOOKMARK_EVENT = "BOOKMARK"
+
 
 def _get_start_timestamp(pod_status_obj):
     """Get the start timestamp of a Pod"""
@@ -174,6 +185,52 @@ def _verify_restarting_training(pod):
     return False
 
 
+def _get_resource_version(obj):
+    # The object of a bookmark event is not deserialized to a pod.
+    if isinstance(obj, dict):
+        return obj.get("metadata", {}).get("resourceVersion")
+    metadata = getattr(obj, "metadata", None)
+    return metadata.resource_version if metadata else None
+
+
+def _get_pod_state(pod):
+    """Get the fields of the pod to build the node of its event."""
+    running, terminated = None, None
+    statuses = pod.status.container_statuses if pod.status else None
+    if statuses and statuses[0].state:
+        state = statuses[0].state
+        if state.running:
+            running = state.running.started_at
+        if state.terminated:
+            terminated = (state.terminated.exit_code, state.terminated.reason)
+    metadata: client.V1ObjectMeta = pod.metadata
+    return (
+        pod.status.phase if pod.status else None,
+        metadata.deletion_timestamp is not None,
+        pod.spec.node_name if pod.spec else None,
+        pod.status.host_ip if pod.status else None,
+        running,
+        terminated,
+        (metadata.labels or {}).get(ElasticJobLabel.RELAUNCH_COUNT),
+        (metadata.annotations or {}).get("pod.sigma.ali/scheduled-action"),
+    )
+
+
+def _diff_pods(old_pods, new_pods):
+    """Get the events from the old pods to the new pods."""
+    events = []
+    for name, pod in new_pods.items():
+        old_pod = old_pods.get(name)
+        if old_pod is None:
+            events.append({"type": NodeEventType.ADDED, "object": pod})
+        elif _get_pod_state(old_pod) != _get_pod_state(pod):
+            events.append({"type": NodeEventType.MODIFIED, "object": pod})
+    for name, pod in old_pods.items():
+        if name not in new_pods:
+            events.append({"type": NodeEventType.DELETED, "object": pod})
+    return events
+
+
 def _get_pod_unique_labels(job_name, pod_type, rank_index):
     return {
         ElasticJobLabel.JOB_KEY: job_name,
@@ -183,7 +240,13 @@ def _get_pod_unique_labels(job_name, pod_type, rank_index):
 
 
 class PodWatcher(NodeWatcher):
-    """PodWatcher monitors all Pods of a k8s Job."""
+    """
+    PodWatcher monitors all Pods of a k8s Job by an informer-style cache.
+    It lists the pods once and then watches the changes from the resource
+    version of the cache, so `list` is served from the cache while the
+    watch keeps it synced. The pods are relisted if the resource version
+    has expired (410 Gone) or the cache has not been synced for a while.
+    """
 
     def __init__(self, job_name, namespace):
         super().__init__(job_name)
@@ -191,17 +254,87 @@ class PodWatcher(NodeWatcher):
         self._namespace = namespace
         self._k8s_client = k8sClient.singleton_instance(namespace)
         self._job_selector = ElasticJobLabel.JOB_KEY + "=" + self._job_name
+        self._lock = threading.Lock()
+        self._pods: Dict[str, client.V1Pod] = {}
+        self._resource_version = None
+        self._sync_time = 0.0
+        # The events found by relisting pods which are not watched.
+        self._pending_events: Deque[dict] = deque()
         logger.info(
             f"Initialize PodWatcher with "
             f"namespace: {self._namespace}, "
             f"job-selector: {self._job_selector}"
         )
 
-    def watch(self):
-        resource_version = None
+    def _is_cache_synced(self, expired_seconds=_POD_CACHE_EXPIRED_SECONDS):
+        return (
+            self._resource_version is not None
+            and time.time() - self._sync_time < expired_seconds
+        )
+
+    def _relist(self):
         pod_list = self._k8s_client.list_namespaced_pod(self._job_selector)
-        if pod_list:
+        if not pod_list:
+            return
+        pods = {pod.metadata.name: pod for pod in pod_list.items or []}
+        resource_version = None
+        if pod_list.metadata:
             resource_version = pod_list.metadata.resource_version
+        with self._lock:
+            # The initial list does not generate events like the k8s watch
+            # from the resource version of the list.
+            if self._resource_version is not None:
+                self._pending_events.extend(_diff_pods(self._pods, pods))
+            self._pods = pods
+            self._resource_version = resource_version
+            self._sync_time = time.time()
+
+    def _update_cache(self, event):
+        """Update the cache by the event and return it if it is a delta."""
+        evt_type = event.get("type")
+        obj = event.get("object")
+        resource_version = _get_resource_version(obj)
+        if evt_type == _BOOKMARK_EVENT or not hasattr(obj, "metadata"):
+            with self._lock:
+                if resource_version:
+                    self._resource_version = resource_version
+                self._sync_time = time.time()
+            return None if evt_type == _BOOKMARK_EVENT else event
+
+        name = obj.metadata.name
+        with self._lock:
+            old_pod = self._pods.get(name)
+            if evt_type == NodeEventType.DELETED:
+                self._pods.pop(name, None)
+            else:
+                self._pods[name] = obj
+            if resource_version:
+                self._resource_version = resource_version
+            self._sync_time = time.time()
+        # The change may have been found by relisting pods during the watch
+        # and its event is pending.
+        if old_pod is None:
+            return None if evt_type == NodeEventType.DELETED else event
+        unchanged = _get_pod_state(old_pod) == _get_pod_state(obj)
+        if evt_type != NodeEventType.DELETED and unchanged:
+            return None
+        return event
+
+    def _pop_pending_events(self):
+        with self._lock:
+            events = list(self._pending_events)
+            self._pending_events.clear()
+        for event in events:
+            node_event = _convert_pod_event_to_node_event(event)
+            if node_event:
+                yield node_event
+
+    def watch(self):
+        if not self._is_cache_synced():
+            self._relist()
+        yield from self._pop_pending_events()
+        if self._resource_version is None:
+            return
 
         w = watch.Watch()
         try:
@@ -209,26 +342,46 @@ class PodWatcher(NodeWatcher):
                 self._k8s_client.client.list_namespaced_pod,
                 self._namespace,
                 label_selector=self._job_selector,
-                resource_version=resource_version,
-                timeout_seconds=60,
+                resource_version=self._resource_version,
+                allow_watch_bookmarks=True,
+                timeout_seconds=_WATCH_TIMEOUT_SECONDS,
             )
 
             for event in stream:
+                event = self._update_cache(event)
+                if not event:
+                    continue
                 node_event = _convert_pod_event_to_node_event(event)
                 if not node_event:
                     continue
                 yield node_event
-        except Exception as e:
-            raise e
+            with self._lock:
+                self._sync_time = time.time()
+        except client.rest.ApiException as e:
+            if e.status != HTTPStatus.GONE:
+                raise e
+            logger.info(
+                f"The resource version {self._resource_version} of pods "
+                "has expired, relist the pods."
+            )
+            self._relist()
+            yield from self._pop_pending_events()
         finally:
             w.stop()
 
     def list(self) -> List[Node]:
+        """
+        List the nodes from the cache. The pods are relisted from the API
+        server if the cache has not been synced in the last
+        `_POD_LIST_STALE_SECONDS`, so callers deciding by the status of
+        nodes do not see a stale cache if the watch is not running.
+        """
         nodes: List[Node] = []
-        pod_list = self._k8s_client.list_namespaced_pod(self._job_selector)
-        if not pod_list:
-            return nodes
-        if not pod_list.items:
+        if not self._is_cache_synced(_POD_LIST_STALE_SECONDS):
+            self._relist()
+        with self._lock:
+            pods = list(self._pods.values())
+        if not pods:
             return nodes
 
         replica_type_key = ElasticJobLabel.REPLICA_TYPE_KEY
@@ -236,7 +389,7 @@ class PodWatcher(NodeWatcher):
         rank_index_key = ElasticJobLabel.RANK_INDEX_KEY
         relaunch_count_key = ElasticJobLabel.RELAUNCH_COUNT
 
-        for pod in pod_list.items:
+        for pod in pods:
             metadata: client.V1ObjectMeta = pod.metadata
             pod_name = metadata.name
             pod_type = metadata.labels[replica_type_key]
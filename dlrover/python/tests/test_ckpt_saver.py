@@ -12,6 +12,7 @@
 # limitations under the License.
 
 import os
+import pickle
 import signal
 import tempfile
 import threading
@@ -30,7 +31,12 @@ from dlrover.python.common.multi_process import (
     SharedMemory,
     SharedQueue,
 )
-from dlrover.python.common.storage import PosixDiskStorage
+from dlrover.python.common.storage import (
+    CheckpointCorruptionError,
+    CompressedStorage,
+    PosixDiskStorage,
+    TieredStorage,
+)
 from dlrover.python.elastic_agent.master_client import (
     MasterClient,
     build_master_client,
@@ -47,8 +53,15 @@ from dlrover.python.elastic_agent.torch.ckpt_saver import (
     FsdpDcpSaver,
     SharedMemoryHandler,
     TempDirCheckpointSaver,
+    TensorMeta,
+    TensorMetaTable,
     _create_shared_memory,
+    _read_state_dict_from_shm,
     _traverse_state_dict,
+    is_raw_checkpoint,
+    is_segmented_checkpoint,
+    read_state_dict_file,
+    read_state_dict_segments,
 )
 from dlrover.python.tests.test_utils import start_local_master
 
@@ -130,6 +143,120 @@ class SharedMemoryHandlerTest(unittest.TestCase):
         self.assertDictEqual(meta_dict, {"step": 100})
 
 
+def _create_meta_dict(state_dict):
+    offsets = [0]
+
+    def _create_tensor_meta(value):
+        if not torch.is_tensor(value):
+            return value
+        meta = TensorMeta(
+            shape=tuple(value.shape),  # type: ignore
+            dtype=value.dtype,
+            element_size=value.element_size(),
+            numel=value.numel(),
+            offset=offsets[0],
+        )
+        offsets[0] += value.numel() * value.element_size()
+        return meta
+
+    meta_dict = _traverse_state_dict(state_dict, _create_tensor_meta)
+    return meta_dict, offsets[0]
+
+
+class TensorMetaTableTest(unittest.TestCase):
+    def setUp(self):
+        self._state_dict = {
+            "model": {
+                "layer.0": {"weight": torch.rand(4, 4), "bias": torch.rand(4)},
+                "layer.1": {"weight": torch.rand(4, 4), "bias": torch.rand(4)},
+            },
+            "optimizer": {"state": [torch.rand(2), torch.rand(3)], "lr": 0.1},
+            "step": 10,
+            1: (1, 2),
+            DLROVER_CKPT_CONFIG_KEY: CheckpointConfig(step=10),
+        }
+        self._meta_dict, self._buffer_size = _create_meta_dict(
+            self._state_dict
+        )
+
+    def test_encode_and_decode(self):
+        table = TensorMetaTable.from_meta_dict(self._meta_dict)
+        self.assertEqual(table.tensor_num, 6)
+        self.assertEqual(table.to_meta_dict(), self._meta_dict)
+        table = pickle.loads(pickle.dumps(table))
+        self.assertEqual(table.to_meta_dict(), self._meta_dict)
+        self.assertEqual(
+            _traverse_state_dict(table, lambda x: x), self._meta_dict
+        )
+        self.assertEqual(TensorMetaTable().to_meta_dict(), {})
+
+        self.assertEqual(len(table), 5)
+        self.assertTrue("step" in table)
+        self.assertEqual(table.get("step"), 10)
+        self.assertEqual(table[1], (1, 2))
+        self.assertEqual(table["model"], self._meta_dict["model"])
+        config = table.get(DLROVER_CKPT_CONFIG_KEY, None)
+        self.assertEqual(config.step, 10)
+        self.assertIsNone(table.get("epoch"))
+        with self.assertRaises(KeyError):
+            table["epoch"]
+
+    def test_find_by_fqn(self):
+        table = TensorMetaTable.from_meta_dict(self._meta_dict)
+        meta = table.find("model.layer.1.weight")
+        expected = self._meta_dict["model"]["layer.1"]["weight"]
+        self.assertEqual(meta, expected)
+        meta = table.find("optimizer.state.1")
+        self.assertEqual(meta, self._meta_dict["optimizer"]["state"][1])
+        self.assertIsNone(table.find("optimizer.lr"))
+        self.assertIsNone(table.find("model.layer.2.weight"))
+
+    def test_read_state_dict_from_shm(self):
+        table = TensorMetaTable.from_meta_dict(self._meta_dict)
+        shm = bytearray(self._buffer_size)
+
+        def _write(value, meta):
+            dst = torch.frombuffer(
+                shm,
+                dtype=torch.uint8,
+                count=meta.numel * meta.element_size,
+                offset=meta.offset,
+            )
+            dst.copy_(value.reshape(-1).view(torch.uint8))
+
+        _write(
+            self._state_dict["model"]["layer.1"]["bias"],
+            self._meta_dict["model"]["layer.1"]["bias"],
+        )
+        _write(
+            self._state_dict["optimizer"]["state"][0],
+            self._meta_dict["optimizer"]["state"][0],
+        )
+        state_dict = _read_state_dict_from_shm(table, mock.MagicMock(buf=shm))
+        self.assertTrue(
+            torch.equal(
+                state_dict["model"]["layer.1"]["bias"],
+                self._state_dict["model"]["layer.1"]["bias"],
+            )
+        )
+        self.assertTrue(
+            torch.equal(
+                state_dict["optimizer"]["state"][0],
+                self._state_dict["optimizer"]["state"][0],
+            )
+        )
+        self.assertEqual(state_dict["optimizer"]["lr"], 0.1)
+
+    def test_compact_size(self):
+        meta_dict, _ = _create_meta_dict(
+            {f"layer.{i}": torch.rand(2) for i in range(1000)}
+        )
+        table = TensorMetaTable.from_meta_dict(meta_dict)
+        self.assertLess(
+            len(pickle.dumps(table)), len(pickle.dumps(meta_dict)) / 2
+        )
+
+
 class CheckpointSaverTest(unittest.TestCase):
     def setUp(self) -> None:
         self.storage = PosixDiskStorage()
@@ -389,6 +516,234 @@ class CheckpointSaverTest(unittest.TestCase):
                 self.assertTrue(saver._latest_step == step)
                 saver.close()
 
+    def test_persist_shard_segments(self):
+        model = SimpleNet()
+        step = 100
+        env = {
+            CheckpointConstant.PERSIST_WORKERS_ENV: "4",
+            CheckpointConstant.PERSIST_CHUNK_SIZE_ENV: "1024",
+        }
+        with tempfile.TemporaryDirectory() as tmpdir, mock.patch.dict(
+            os.environ, env
+        ):
+            saver = DdpCheckpointSaver(tmpdir, self.storage.get_class_meta())
+            self.assertIsNotNone(saver._persist_executor)
+            path = os.path.join(tmpdir, str(step), "checkpoint.pt")
+            paths = {CheckpointConstant.MODEL_STATES_NAME: path}
+            ckpt_config = CheckpointConfig(step=step, paths=paths)
+            state_dict = {
+                CheckpointConstant.MODEL_STATES_NAME: dict(
+                    model=model.state_dict(), step=step
+                ),
+                DLROVER_CKPT_CONFIG_KEY: ckpt_config,
+            }
+            saver._shm_handlers[0].save_state_dict(state_dict)
+            saver.persist_to_storage(0, ckpt_config)
+
+            files = os.listdir(os.path.dirname(path))
+            seg_num = len(files) - 1
+            # The model has 2410 float32 parameters.
+            self.assertEqual(seg_num, 10)
+            self.assertTrue(is_segmented_checkpoint(path))
+            self.assertFalse(is_segmented_checkpoint(tmpdir))
+
+            loaded = read_state_dict_segments(path, max_workers=2)
+            self.assertEqual(loaded["step"], step)
+            for name, value in model.state_dict().items():
+                self.assertTrue(torch.equal(loaded["model"][name], value))
+            saver.close()
+
+    def test_persist_delta_checkpoint(self):
+        model = SimpleNet()
+        env = {
+            CheckpointConstant.PERSIST_WORKERS_ENV: "2",
+            CheckpointConstant.PERSIST_CHUNK_SIZE_ENV: "1024",
+            CheckpointConstant.DELTA_MODE_ENV: "true",
+        }
+        with tempfile.TemporaryDirectory() as tmpdir, mock.patch.dict(
+            os.environ, env
+        ):
+            saver = DdpCheckpointSaver(tmpdir, self.storage.get_class_meta())
+            handler = saver._shm_handlers[0]
+            versions = []
+            for step in [1, 2]:
+                if step == 2:
+                    with torch.no_grad():
+                        model.fc1.weight.add_(1.0)
+                path = os.path.join(tmpdir, str(step), "checkpoint.pt")
+                paths = {CheckpointConstant.MODEL_STATES_NAME: path}
+                ckpt_config = CheckpointConfig(step=step, paths=paths)
+                state_dict = {
+                    CheckpointConstant.MODEL_STATES_NAME: model.state_dict(),
+                    DLROVER_CKPT_CONFIG_KEY: ckpt_config,
+                }
+                handler.save_state_dict(state_dict)
+                meta_dict = handler.metadata.get()
+                model_meta = meta_dict[CheckpointConstant.MODEL_STATES_NAME]
+                versions.append({k: v.version for k, v in model_meta.items()})
+                saver.persist_to_storage(0, ckpt_config)
+
+            self.assertTrue(all(v > 0 for v in versions[0].values()))
+            for name, version in versions[1].items():
+                if name == "fc1.weight":
+                    self.assertNotEqual(version, versions[0][name])
+                else:
+                    self.assertEqual(version, versions[0][name])
+
+            # The segments with fc1.weight are written and others are
+            # linked to the files of step 1.
+            linked_segments = []
+            step_dir = os.path.join(tmpdir, "2")
+            for name in os.listdir(step_dir):
+                if os.stat(os.path.join(step_dir, name)).st_nlink > 1:
+                    linked_segments.append(name)
+            self.assertListEqual(
+                sorted(linked_segments),
+                ["checkpoint.pt.seg_8", "checkpoint.pt.seg_9"],
+            )
+            loaded = read_state_dict_file(path, torch.load)
+            for name, value in model.state_dict().items():
+                self.assertTrue(torch.equal(loaded[name], value))
+            saver.close()
+
+    def test_persist_raw_checkpoint(self):
+        model = SimpleNet()
+        step = 100
+        env = {CheckpointConstant.PERSIST_FORMAT_ENV: "raw"}
+        with tempfile.TemporaryDirectory() as tmpdir, mock.patch.dict(
+            os.environ, env
+        ):
+            saver = DdpCheckpointSaver(tmpdir, self.storage.get_class_meta())
+            self.assertIsNone(saver._persist_executor)
+            path = os.path.join(tmpdir, str(step), "checkpoint.pt")
+            paths = {CheckpointConstant.MODEL_STATES_NAME: path}
+            ckpt_config = CheckpointConfig(step=step, paths=paths)
+            state_dict = {
+                CheckpointConstant.MODEL_STATES_NAME: dict(
+                    model=model.state_dict(),
+                    empty=torch.tensor([]),
+                    step=step,
+                ),
+                DLROVER_CKPT_CONFIG_KEY: ckpt_config,
+            }
+            saver._shm_handlers[0].save_state_dict(state_dict)
+            saver.persist_to_storage(0, ckpt_config)
+
+            files = os.listdir(os.path.dirname(path))
+            self.assertListEqual(files, ["checkpoint.pt"])
+            self.assertTrue(is_raw_checkpoint(path))
+            self.assertFalse(is_segmented_checkpoint(path))
+            loaded = read_state_dict_file(path, torch.load)
+            self.assertEqual(loaded["step"], step)
+            self.assertEqual(loaded["empty"].numel(), 0)
+            for name, value in model.state_dict().items():
+                self.assertTrue(torch.equal(loaded["model"][name], value))
+            saver.close()
+
+            torch_path = os.path.join(tmpdir, "torch.pt")
+            torch.save({"step": step}, torch_path)
+            loaded = read_state_dict_file(torch_path, torch.load)
+            self.assertDictEqual(loaded, {"step": step})
+
+    def test_persist_compressed_checkpoint(self):
+        model = SimpleNet()
+        step = 100
+        storage = CompressedStorage(PosixDiskStorage(), chunk_size=1024)
+        for persist_env in [
+            {CheckpointConstant.PERSIST_FORMAT_ENV: "raw"},
+            {
+                CheckpointConstant.PERSIST_WORKERS_ENV: "2",
+                CheckpointConstant.PERSIST_CHUNK_SIZE_ENV: "4096",
+            },
+        ]:
+            with tempfile.TemporaryDirectory() as tmpdir, mock.patch.dict(
+                os.environ, persist_env
+            ):
+                saver = DdpCheckpointSaver(tmpdir, storage.get_class_meta())
+                self.assertIsInstance(saver.storage, CompressedStorage)
+                path = os.path.join(tmpdir, str(step), "checkpoint.pt")
+                paths = {CheckpointConstant.MODEL_STATES_NAME: path}
+                ckpt_config = CheckpointConfig(step=step, paths=paths)
+                state_dict = {
+                    CheckpointConstant.MODEL_STATES_NAME: dict(
+                        model=model.state_dict(), step=step
+                    ),
+                    DLROVER_CKPT_CONFIG_KEY: ckpt_config,
+                }
+                saver._shm_handlers[0].save_state_dict(state_dict)
+                saver.persist_to_storage(0, ckpt_config)
+                self.assertFalse(is_raw_checkpoint(path))
+                self.assertFalse(is_segmented_checkpoint(path))
+                loaded = read_state_dict_file(path, torch.load)
+                self.assertEqual(loaded["step"], step)
+                for name, value in model.state_dict().items():
+                    self.assertTrue(torch.equal(loaded["model"][name], value))
+                saver.close()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "torch.pt")
+            storage.write_state_dict({"step": step}, path, torch.save)
+            loaded = read_state_dict_file(path, torch.load)
+            self.assertDictEqual(loaded, {"step": step})
+
+            # Corrupt a byte of the last chunk.
+            with open(path, "r+b") as f:
+                f.seek(-1, os.SEEK_END)
+                value = f.read(1)
+                f.seek(-1, os.SEEK_END)
+                f.write(bytes([value[0] ^ 0xFF]))
+            with self.assertRaises(CheckpointCorruptionError):
+                read_state_dict_file(path, torch.load)
+
+    @mock.patch.dict(
+        os.environ,
+        {
+            CheckpointConstant.PERSIST_WORKERS_ENV: "2",
+            CheckpointConstant.PERSIST_CHUNK_SIZE_ENV: "4096",
+        },
+    )
+    def test_persist_tiered_checkpoint(self):
+        model = SimpleNet()
+        step = 100
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ckpt_dir = os.path.join(tmpdir, "remote")
+            local_dir = os.path.join(tmpdir, "local")
+            storage = TieredStorage(ckpt_dir, local_dir)
+            saver = DdpCheckpointSaver(ckpt_dir, storage.get_class_meta())
+            self.assertIsInstance(saver.storage, TieredStorage)
+            path = os.path.join(ckpt_dir, str(step), "checkpoint.pt")
+            paths = {CheckpointConstant.MODEL_STATES_NAME: path}
+            ckpt_config = CheckpointConfig(step=step, paths=paths)
+            state_dict = {
+                CheckpointConstant.MODEL_STATES_NAME: dict(
+                    model=model.state_dict(), step=step
+                ),
+                DLROVER_CKPT_CONFIG_KEY: ckpt_config,
+            }
+            saver._shm_handlers[0].save_state_dict(state_dict)
+            step_done_dir = saver._get_checkpoint_done_dir(step)
+            saver.storage.safe_makedirs(step_done_dir)
+            self.assertTrue(
+                saver._save_shard(step, 0, ckpt_config, step_done_dir)
+            )
+            self.assertFalse(saver._shm_locks[0].locked())
+            # All files are drained before writing the done file.
+            self.assertListEqual(os.listdir(step_done_dir), ["0"])
+            self.assertTrue(is_segmented_checkpoint(path))
+            local_path = os.path.join(local_dir, str(step), "checkpoint.pt")
+            self.assertListEqual(
+                sorted(os.listdir(os.path.dirname(path))),
+                sorted(os.listdir(os.path.dirname(local_path))),
+            )
+            for read_path in [path, local_path]:
+                loaded = read_state_dict_file(read_path, torch.load)
+                for name, value in model.state_dict().items():
+                    self.assertTrue(torch.equal(loaded["model"][name], value))
+            self.assertEqual(
+                saver.storage.read_state_dict(path, lambda p: p), local_path
+            )
+            saver.close()
+
 
 class FsdpCheckpointSaverTest(unittest.TestCase):
     def setUp(self) -> None:
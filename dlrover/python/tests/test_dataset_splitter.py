@@ -13,6 +13,7 @@
 
 import unittest
 
+from dlrover.python.common.index_permutation import IndexPermutation
 from dlrover.python.master.shard.dataset_splitter import (
     PartitionOffsets,
     StreamingDatasetSplitter,
@@ -126,3 +127,26 @@ class TextDatasetSplitterTest(unittest.TestCase):
         self.assertNotEqual(shards[0].record_indices, list(range(10)))
         self.assertEqual(shards[0].name, "test")
         self.assertEqual(splitter.epoch, 1)
+        indices = []
+        for shard in shards:
+            indices.extend(shard.record_indices)
+        self.assertListEqual(sorted(indices), list(range(1000)))
+
+        splitter.create_shards()
+        self.assertNotEqual(
+            splitter.get_shards()[0].record_indices, shards[0].record_indices
+        )
+
+    def test_index_permutation(self):
+        for size in [1, 2, 7, 1000, 4097]:
+            permutation = IndexPermutation(size, seed=size)
+            indices = permutation.get_indices(0, size)
+            self.assertListEqual(sorted(indices), list(range(size)))
+            self.assertListEqual(
+                indices[: size // 2],  # noqa E203
+                [permutation.get(i) for i in range(size // 2)],
+            )
+        permutation = IndexPermutation(10**12, seed=1)
+        indices = permutation.get_indices(10**12 - 100, 10**12)
+        self.assertEqual(len(set(indices)), 100)
+        self.assertTrue(all(0 <= i < 10**12 for i in indices))
@@ -14,6 +14,9 @@
 import unittest
 
 from dlrover.python.common.constants import NodeType, TaskType
+from dlrover.python.master.shard.base_dataset_manager import (
+    DatasetShardCheckpoint,
+)
 from dlrover.python.master.shard.batch_dataset_manager import (
     BatchDatasetManager,
 )
@@ -70,7 +73,10 @@ class BatchDatasetTaskMangerTest(unittest.TestCase):
         self.assertEqual(len(ds_manager.doing), 1)
         self.assertFalse(ds_manager.completed())
         checkpoint = ds_manager.checkpoint()
-        self.assertListEqual(checkpoint.todo[0], [100, 200])
+        self.assertDictEqual(
+            checkpoint.todo[0], {"start": 100, "end": 10000, "shard_size": 100}
+        )
+        self.assertListEqual(checkpoint.doing, [[0, 100]])
         ds_manager.restore_checkpoint(checkpoint)
         self.assertEqual(ds_manager.todo[0].shard.start, 0)
         self.assertEqual(ds_manager.todo[0].shard.end, 100)
@@ -91,12 +97,53 @@ class BatchDatasetTaskMangerTest(unittest.TestCase):
         self.assertEqual(len(ds_manager.todo), 99)
         self.assertEqual(len(ds_manager.doing), 1)
         self.assertFalse(ds_manager.completed())
+        record_indices = task.shard.record_indices
         checkpoint = ds_manager.checkpoint()
-        self.assertEqual(len(checkpoint.todo[0][-1]), 100)
+        self.assertEqual(len(checkpoint.todo), 1)
+        self.assertListEqual(
+            list(checkpoint.todo[0]["permutation"]), ["size", "seed"]
+        )
+        checkpoint = DatasetShardCheckpoint.from_json(checkpoint.to_json())
         ds_manager.restore_checkpoint(checkpoint)
         self.assertEqual(ds_manager.todo[0].shard.start, 0)
         self.assertEqual(ds_manager.todo[0].shard.end, 100)
-        self.assertEqual(len(ds_manager.todo[0].shard.record_indices), 100)
+        self.assertListEqual(
+            ds_manager.todo[0].shard.record_indices, record_indices
+        )
+        self.assertEqual(len(ds_manager.todo), 100)
+        self.assertEqual(ds_manager.todo[-1].shard.start, 9900)
+
+    def test_doing_task_table(self):
+        splitter = TableDatasetSplitter(
+            dataset_name="test",
+            dataset_size=1000,
+            shard_size=100,
+            num_epochs=1,
+        )
+        ds_manager = BatchDatasetManager(TaskType.TRAINING, 10, splitter)
+        for i in range(4):
+            ds_manager.get_task(NodeType.WORKER, i % 2)
+        self.assertListEqual(
+            ds_manager.doing.get_node_task_ids(NodeType.WORKER, 0), [0, 2]
+        )
+        ds_manager.report_task_status(0, True)
+        ds_manager.report_task_status(2, False)
+        self.assertListEqual(
+            ds_manager.doing.get_node_task_ids(NodeType.WORKER, 0), []
+        )
+        self.assertListEqual(
+            ds_manager.doing.get_node_task_ids(NodeType.WORKER, 1), [1, 3]
+        )
+        self.assertEqual(ds_manager.todo[-1].task_id, 2)
+        checkpoint = ds_manager.checkpoint()
+        self.assertListEqual(
+            checkpoint.todo,
+            [{"start": 400, "end": 1000, "shard_size": 100}, [200, 300]],
+        )
+        ds_manager.doing.clear()
+        self.assertListEqual(
+            ds_manager.doing.get_node_task_ids(NodeType.WORKER, 1), []
+        )
 
 
 class StreamingDatasetTaskMangerTest(unittest.TestCase):
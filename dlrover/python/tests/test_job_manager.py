@@ -440,6 +440,8 @@ class DistributedJobManagerTest(unittest.TestCase):
             self.job_context.update_job_node(node)
         events = manager._get_dead_node_event()
         self.assertEqual(len(events), 2)
+        # The dead nodes are not reported again in the window.
+        self.assertEqual(len(manager._get_dead_node_event()), 0)
 
         nodes_time_info = manager._get_nodes_time_info()
         self.assertIsNotNone(nodes_time_info)
@@ -489,6 +491,44 @@ class DistributedJobManagerTest(unittest.TestCase):
         events = manager._get_dead_node_event()
         self.assertEqual(len(events), 2)
 
+    def test_pop_expired_heartbeat_nodes(self):
+        params = MockK8sPSJobArgs()
+        params.initilize()
+        manager = create_job_manager(params, PerfMonitor())
+        manager._init_nodes()
+        now = time.time()
+        for i in range(3):
+            manager.collect_node_heart_beat(NodeType.WORKER, i, now - i * 100)
+        manager.collect_node_heart_beat(NodeType.WORKER, 0, now - 300)
+        manager.collect_node_heart_beat(NodeType.WORKER, 0, now)
+
+        nodes = self.job_context.pop_expired_heartbeat_nodes(now - 150)
+        self.assertListEqual([n.id for n in nodes], [2])
+        nodes = self.job_context.pop_expired_heartbeat_nodes(now - 50)
+        self.assertListEqual([n.id for n in nodes], [1])
+        self.assertListEqual(
+            self.job_context.pop_expired_heartbeat_nodes(now - 50), []
+        )
+        self.job_context.track_node_heartbeat(nodes[0])
+        nodes = self.job_context.pop_expired_heartbeat_nodes(now + 1)
+        self.assertListEqual(sorted(n.id for n in nodes), [0, 1])
+
+        # The popped nodes are copies.
+        nodes[0].status = NodeStatus.DELETED
+        job_nodes = self.job_context.job_nodes()
+        self.assertNotEqual(
+            job_nodes[NodeType.WORKER][nodes[0].id].status, NodeStatus.DELETED
+        )
+
+        # The node checked again later is not popped before the time.
+        self.job_context.track_node_heartbeat(nodes[0], now + 100)
+        self.job_context.update_job_node(nodes[0])
+        self.assertListEqual(
+            self.job_context.pop_expired_heartbeat_nodes(now + 50), []
+        )
+        nodes = self.job_context.pop_expired_heartbeat_nodes(now + 101)
+        self.assertEqual(len(nodes), 1)
+
     def test_relaunch_training_master(self):
         params = MockK8sPSJobArgs()
         params.initilize()
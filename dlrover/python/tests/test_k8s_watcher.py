@@ -11,6 +11,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import datetime
 import json
 import os
@@ -45,6 +46,24 @@ from dlrover.python.tests.test_utils import (
 )
 
 
+class _FakeWatch(object):
+    """The stand-in of the k8s watch which streams the given events."""
+
+    events: List[dict] = []
+    error = None
+    kwargs: dict = {}
+
+    def stream(self, func, *args, **kwargs):
+        _FakeWatch.kwargs = kwargs
+        if _FakeWatch.error:
+            raise _FakeWatch.error
+        for event in _FakeWatch.events:
+            yield event
+
+    def stop(self):
+        pass
+
+
 def _mock_pod_labels():
     labels = {
         ElasticJobLabel.APP_NAME: "test",
@@ -116,6 +135,96 @@ class PodWatcherTest(unittest.TestCase):
         except Exception as e:
             self.assertEqual(e.args[0], "test123")
 
+    def test_list_and_watch_by_cache(self):
+        pods = mock_list_namespaced_pod("")
+        pod_watcher = PodWatcher("test", "")
+        list_pods = mock.MagicMock(return_value=pods)
+        pod_watcher._k8s_client.list_namespaced_pod = list_pods
+        self.assertEqual(len(pod_watcher.list()), 5)
+        self.assertEqual(len(pod_watcher.list()), 5)
+        self.assertEqual(list_pods.call_count, 1)
+
+        unchanged_pod = copy.deepcopy(pods.items[0])
+        unchanged_pod.metadata.resource_version = "12345679"
+        failed_pod = copy.deepcopy(pods.items[1])
+        failed_pod.status.phase = NodeStatus.FAILED
+        _FakeWatch.events = [
+            {"type": NodeEventType.MODIFIED, "object": unchanged_pod},
+            {"type": NodeEventType.MODIFIED, "object": failed_pod},
+            {"type": NodeEventType.DELETED, "object": pods.items[4]},
+            {
+                "type": "BOOKMARK",
+                "object": {"metadata": {"resourceVersion": "12345690"}},
+            },
+        ]
+        with mock.patch(
+            "dlrover.python.master.watcher.k8s_watcher.watch.Watch",
+            _FakeWatch,
+        ):
+            events: List[NodeEvent] = list(pod_watcher.watch())
+        self.assertEqual(_FakeWatch.kwargs["resource_version"], "12345678")
+        self.assertTrue(_FakeWatch.kwargs["allow_watch_bookmarks"])
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[0].node.status, NodeStatus.FAILED)
+        self.assertEqual(events[1].event_type, NodeEventType.DELETED)
+        self.assertEqual(pod_watcher._resource_version, "12345690")
+
+        nodes = pod_watcher.list()
+        self.assertEqual(len(nodes), 4)
+        self.assertEqual(nodes[1].status, NodeStatus.FAILED)
+        self.assertEqual(list_pods.call_count, 1)
+
+        # The pods are relisted if the cache is stale.
+        pod_watcher._sync_time -= 60
+        self.assertEqual(len(pod_watcher.list()), 5)
+        self.assertEqual(list_pods.call_count, 2)
+        # The changes found by relisting are not watched twice.
+        _FakeWatch.events = [
+            {"type": NodeEventType.ADDED, "object": pods.items[4]},
+            {"type": NodeEventType.MODIFIED, "object": pods.items[1]},
+        ]
+        with mock.patch(
+            "dlrover.python.master.watcher.k8s_watcher.watch.Watch",
+            _FakeWatch,
+        ):
+            events = list(pod_watcher.watch())
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[0].event_type, NodeEventType.MODIFIED)
+        self.assertEqual(events[1].event_type, NodeEventType.ADDED)
+
+    def test_relist_after_resource_version_expired(self):
+        pods = mock_list_namespaced_pod("")
+        pod_watcher = PodWatcher("test", "")
+        pod_watcher._k8s_client.list_namespaced_pod = mock.MagicMock(
+            return_value=pods
+        )
+        pod_watcher.list()
+
+        new_pods = mock_list_namespaced_pod("")
+        new_pods.items[0] = pods.items[0]
+        new_pods.items[1].status.phase = NodeStatus.SUCCEEDED
+        new_pods.items.pop()
+        new_pods.metadata.resource_version = "22345678"
+        pod_watcher._k8s_client.list_namespaced_pod = mock.MagicMock(
+            return_value=new_pods
+        )
+        _FakeWatch.error = client.rest.ApiException(status=410)
+        try:
+            with mock.patch(
+                "dlrover.python.master.watcher.k8s_watcher.watch.Watch",
+                _FakeWatch,
+            ):
+                events: List[NodeEvent] = list(pod_watcher.watch())
+        finally:
+            _FakeWatch.error = None
+        # The other pods are modified because of their random host IPs.
+        event_types = [e.event_type for e in events]
+        self.assertEqual(event_types.count(NodeEventType.DELETED), 1)
+        self.assertNotIn(
+            pods.items[0].metadata.name, [e.node.name for e in events]
+        )
+        self.assertEqual(pod_watcher._resource_version, "22345678")
+
     def test_convert_pod_event_to_node_event(self):
         labels = _mock_pod_labels()
         pod = create_pod(labels)
@@ -19,10 +19,13 @@ from datetime import datetime
 from typing import List
 from unittest import mock
 
+import requests
+
 from dlrover.python.common import comm
 from dlrover.python.common.comm import DiagnosisAction, HeartbeatResponse
 from dlrover.python.common.constants import (
     CommunicationType,
+    KeyValueOps,
     NodeEnv,
     NodeEventType,
     NodeType,
@@ -103,7 +106,10 @@ class MasterClientTest(unittest.TestCase):
         checkpoint = self._master_client.get_shard_checkpoint(ds_name)
         checkpoint = json.loads(checkpoint)
         self.assertListEqual(checkpoint["doing"][0], [640, 1280])
-        self.assertEqual(len(checkpoint["todo"]), 14)
+        self.assertListEqual(
+            checkpoint["todo"],
+            [{"start": 1280, "end": 10000, "shard_size": 640}],
+        )
         checkpoint["doing"][0] = [1280, 1600]
         checkpoint = json.dumps(checkpoint)
         self._master_client.report_shard_checkpoint(checkpoint)
@@ -206,12 +212,37 @@ class MasterClientTest(unittest.TestCase):
             self._master_client.kv_store_multi_get(["alpha", "beta", "gamma"]),
             {"alpha": b"0", "beta": b"100", "gamma": b"200"},
         )
+        self.assertEqual(
+            self._master_client.kv_store_compare_set("alpha", b"0", b"1"),
+            b"1",
+        )
+        self._master_client.kv_store_set("omega", b"0", ttl=60)
+        self.assertEqual(self._master_client.kv_store_get("omega"), b"0")
+        self._master_client.kv_store_clear("alpha")
+        self.assertEqual(self._master_client.kv_store_get("alpha"), b"")
 
     def test_num_nodes_waiting(self):
         rdzv_name = RendezvousName.ELASTIC_TRAINING
         num = self._master_client.num_nodes_waiting(rdzv_name)
         self.assertEqual(num, 0)
 
+    def test_long_poll_timeout(self):
+        client = self._master_client
+        client._timeout = 5
+        client._get = mock.MagicMock(
+            return_value=comm.KeyValuePairs(kvs={}, versions={})
+        )
+        client.kv_store_multi_get(["alpha"], wait_timeout=60)
+        client.kv_store_watch({"alpha": 0}, wait_timeout=60)
+        client._get.return_value = comm.RendezvousState()
+        rdzv_name = RendezvousName.ELASTIC_TRAINING
+        client.get_comm_world(rdzv_name, 0, wait_timeout=60)
+        client.get_comm_world(rdzv_name, 0, wait_timeout=1)
+        wait_timeouts = [
+            call.args[0].wait_timeout for call in client._get.call_args_list
+        ]
+        self.assertListEqual(wait_timeouts, [2.5, 2.5, 2.5, 1])
+
     def test_report_heartbeat(self):
         now = time.time()
         self._master_client._get = mock.MagicMock(side_effect=[None])
@@ -376,3 +407,27 @@ class MasterHttpClientTest(unittest.TestCase):
         # report request
         res = self._master_client.ready_for_ps_relaunch()
         self.assertTrue(res.success)
+
+    def test_http_client_binary_and_batch(self):
+        self._master_client._binary = True
+        self._master_client.kv_store_set("alpha", b"0")
+        self.assertEqual(self._master_client.kv_store_get("alpha"), b"0")
+
+        messages = [
+            comm.KeyValuePair("beta", b"1", op=KeyValueOps.SET),
+            comm.KeyValuePair("gamma", b"2", op=KeyValueOps.SET),
+        ]
+        responses = self._master_client.batch_report(messages)
+        self.assertEqual(len(responses), 2)
+        self.assertTrue(all(res.success for res in responses))
+        self.assertDictEqual(
+            self._master_client.kv_store_multi_get(["beta", "gamma"]),
+            {"beta": b"1", "gamma": b"2"},
+        )
+
+    def test_http_request_stats(self):
+        self._master_client.kv_store_set("alpha", b"0")
+        url = self._master_client._get_http_request_url("/request_stats")
+        stats = json.loads(requests.get(url).text)
+        self.assertEqual(stats["kv_store"]["completed"], 1)
+        self.assertIn("latency_p99_ms", stats["heartbeat"])
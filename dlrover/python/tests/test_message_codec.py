@@ -0,0 +1,109 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+from unittest import mock
+
+import msgpack
+
+from dlrover.python.common import comm, message_codec
+from dlrover.python.common.constants import MessageCodecType, NodeEnv
+
+
+class MessageCodecTest(unittest.TestCase):
+    def test_encode_and_decode(self):
+        messages = [
+            comm.HeartBeat(timestamp=100),
+            comm.Task(task_id=1, shard=comm.Shard("test", 0, 10, [1, 2])),
+            comm.ResourceStats(
+                memory=1024, cpu=0.5, gpu_stats=[comm.GPUStats(0, 80, 40, 0.9)]
+            ),
+            comm.KeyValuePairs({"a": b"1"}, versions={"a": 2}),
+            comm.NodeEvent("add", comm.NodeAddress(type="worker", rank=1)),
+            comm.BatchRequest([comm.BaseRequest(1, "worker", b"data")]),
+            comm.TaskResult("test", 1, exec_counters={"a": 1}),
+        ]
+        for message in messages:
+            data = message_codec.encode(message)
+            self.assertTrue(message_codec.is_encoded(data))
+            self.assertLess(len(data), len(message.serialize()))
+            self.assertEqual(message_codec.decode(data), message)
+
+        message = comm.KeyValuePair("a", (1, 2))
+        message.value = {"set": {1, 2}, 3: (4,)}
+        decoded = message_codec.decode(message_codec.encode(message))
+        self.assertDictEqual(decoded.value, {"set": {1, 2}, 3: (4,)})
+
+    def test_schema_evolution(self):
+        # The payload sent by an old peer without the last fields.
+        old_data = b"\xd1\x01" + msgpack.packb(["GlobalStep", [10, 5]])
+        message = message_codec.decode(old_data)
+        self.assertEqual(message, comm.GlobalStep(10, 5, 0.0))
+        # The payload sent by a new peer with more fields.
+        new_data = b"\xd1\x01" + msgpack.packb(["HeartBeat", [10, "new"]])
+        self.assertEqual(message_codec.decode(new_data), comm.HeartBeat(10))
+        with self.assertRaises(ValueError):
+            message_codec.decode(
+                b"\xd1\x02" + msgpack.packb(["HeartBeat", []])
+            )
+        with self.assertRaises(ValueError):
+            message_codec.decode(b"\xd1\x01" + msgpack.packb(["Unknown", []]))
+
+    def test_schema_evolution_of_subclass(self):
+        # The fields of a subclass are encoded by names, so a field
+        # appended to the base class does not shift them.
+        message = comm.CommWorldRequest(1, 8, "test", wait_timeout=10)
+        data = message_codec.encode(message)
+        name, values = msgpack.unpackb(data[2:])
+        self.assertEqual(name, "CommWorldRequest")
+        self.assertEqual(values["wait_timeout"], 10)
+        self.assertEqual(message_codec.decode(data), message)
+        new_data = b"\xd1\x01" + msgpack.packb(
+            [
+                "CommWorldRequest",
+                {"node_id": 1, "new_base_field": 2, "wait_timeout": 10},
+            ]
+        )
+        self.assertEqual(
+            message_codec.decode(new_data),
+            comm.CommWorldRequest(node_id=1, wait_timeout=10),
+        )
+        message = comm.NodeEvent(
+            "add", node=comm.NodeAddress(type="worker", id=2)
+        )
+        decoded = message_codec.decode(message_codec.encode(message))
+        self.assertEqual(decoded, message)
+        self.assertIs(type(decoded.node), comm.NodeAddress)
+
+    def test_serialize_message(self):
+        message = comm.HeartBeat(timestamp=100)
+        with mock.patch.dict(os.environ):
+            os.environ.pop(NodeEnv.DLROVER_MESSAGE_CODEC, None)
+            self.assertFalse(message_codec.is_encoded(message.serialize()))
+            os.environ[
+                NodeEnv.DLROVER_MESSAGE_CODEC
+            ] = MessageCodecType.MSGPACK
+            data = message.serialize()
+            self.assertTrue(message_codec.is_encoded(data))
+            self.assertEqual(
+                comm.get_message_codec(data), MessageCodecType.MSGPACK
+            )
+            self.assertEqual(comm.deserialize_message(data), message)
+
+            # Pickle the message with the value not supported by the codec.
+            message = comm.KeyValuePair("a", object())
+            data = message.serialize()
+            self.assertEqual(
+                comm.get_message_codec(data), MessageCodecType.PICKLE
+            )
@@ -12,6 +12,8 @@
 # limitations under the License.
 
 import os
+import socket
+import threading
 import time
 import unittest
 from unittest import mock
@@ -24,6 +26,8 @@ from dlrover.python.common.multi_process import (
     SharedMemory,
     SharedQueue,
     SocketResponse,
+    _socket_recv,
+    _socket_send,
     clear_sock_dir,
     retry_socket,
 )
@@ -145,6 +149,40 @@ class SharedObjectTest(unittest.TestCase):
             client_dict.set(new_dict)
         server_dict.unlink()
 
+    def test_shared_dict_by_shared_memory(self):
+        name = "test-large"
+        server_dict = SharedDict(name=name, create=True)
+        client_dict = SharedDict(name=name, create=False)
+        new_dict = {i: bytes(1024) for i in range(256)}
+        client_dict.set(new_dict)
+        self.assertIsNotNone(client_dict._client._shm)
+        d = server_dict.get()
+        self.assertDictEqual(d, new_dict)
+
+        # The first large response passes the socket and the next one
+        # passes the shared memory.
+        new_dict[0] = b"1"
+        client_dict.set(new_dict)
+        d = client_dict.get()
+        self.assertDictEqual(d, new_dict)
+        client_dict._dict = {}
+        d = client_dict.get()
+        self.assertDictEqual(d, new_dict)
+        self.assertGreater(client_dict._client._response_size, 0)
+        client_dict.close()
+        server_dict.close()
+        server_dict.unlink()
+
+    def test_socket_send_recv(self):
+        server, client = socket.socketpair()
+        message = os.urandom(1024 * 1024)
+        t = threading.Thread(target=_socket_send, args=(client, message))
+        t.start()
+        self.assertEqual(_socket_recv(server), message)
+        t.join()
+        server.close()
+        client.close()
+
 
 class SharedMemoryTest(unittest.TestCase):
     def test_unlink(self):
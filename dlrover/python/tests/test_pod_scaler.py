@@ -12,6 +12,7 @@
 # limitations under the License.
 
 import os
+import threading
 import time
 import unittest
 from collections import deque
@@ -25,7 +26,12 @@ from dlrover.python.common.constants import (
 from dlrover.python.common.global_context import Context
 from dlrover.python.common.node import Node, NodeGroupResource, NodeResource
 from dlrover.python.master.scaler.base_scaler import ScalePlan
-from dlrover.python.master.scaler.pod_scaler import PodScaler, new_tf_config
+from dlrover.python.master.scaler.pod_creation import TokenBucket
+from dlrover.python.master.scaler.pod_scaler import (
+    PodScaler,
+    get_pod_name,
+    new_tf_config,
+)
 from dlrover.python.tests.test_utils import mock_k8s_client
 
 _dlrover_ctx = Context.singleton_instance()
@@ -115,6 +121,88 @@ class PodScalerTest(unittest.TestCase):
         self.assertEqual(scaler._create_pod.call_count, test_num)
         self.assertEqual(scaler._create_service_for_pod.call_count, test_num)
 
+    def test_create_pod_pipeline_with_backoff(self):
+        scaler = PodScaler("elasticjob-sample", "default")
+        scaler._create_pod = mock.MagicMock(return_value=True)
+        scaler._create_service_for_pod = mock.MagicMock(return_value=True)
+        failures = {"count": 0}
+
+        def create_pod(pod):
+            # The API server rejects the first two requests.
+            failures["count"] += 1
+            return failures["count"] > 2
+
+        scaler._k8s_client.create_pod = create_pod
+        max_backoff = _dlrover_ctx.pod_creation_max_backoff
+        _dlrover_ctx.pod_creation_max_backoff = 0.1
+        for i in range(5):
+            node = Node(
+                NodeType.WORKER, i, NodeResource(4, 8192), rank_index=i
+            )
+            scaler._create_node_queue.append(node)
+        scaler._started = True
+        thread = threading.Thread(
+            target=scaler._periodic_create_pod, daemon=True
+        )
+        thread.start()
+        try:
+            for _ in range(50):
+                if scaler.get_creation_stats()["created"] == 5:
+                    break
+                time.sleep(0.1)
+        finally:
+            scaler.stop()
+            _dlrover_ctx.pod_creation_max_backoff = max_backoff
+        thread.join()
+        stats = scaler.get_creation_stats()
+        self.assertEqual(stats["created"], 5)
+        self.assertEqual(stats["failures"], 2)
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(scaler._create_service_for_pod.call_count, 5)
+        self.assertDictEqual(scaler._creation_states, {})
+
+    def test_remove_creation_state_of_removed_node(self):
+        scaler = PodScaler("elasticjob-sample", "default")
+        for i in range(2):
+            node = Node(
+                NodeType.WORKER,
+                i,
+                NodeResource(4, 8192),
+                rank_index=i,
+                name=get_pod_name("elasticjob-sample", NodeType.WORKER, i),
+            )
+            scaler._create_node_queue.append(node)
+            scaler._get_creation_state(node).fail()
+        self.assertIsNone(scaler._pop_ready_node())
+        removed = scaler._remove_not_create_pod(
+            get_pod_name("elasticjob-sample", NodeType.WORKER, 0)
+        )
+        self.assertTrue(removed)
+        self.assertListEqual(
+            list(scaler._creation_states.keys()), [(NodeType.WORKER, 1)]
+        )
+        plan = ScalePlan()
+        plan.node_group_resources[NodeType.WORKER] = NodeGroupResource(
+            0, NodeResource(4, 8192)
+        )
+        scaler._scale_down_pods(
+            NodeType.WORKER, plan, list(scaler._create_node_queue)
+        )
+        self.assertEqual(len(scaler._create_node_queue), 0)
+        self.assertDictEqual(scaler._creation_states, {})
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(20, burst=2)
+        start = time.time()
+        for _ in range(4):
+            bucket.acquire()
+        self.assertGreater(time.time() - start, 0.09)
+        bucket = TokenBucket(0)
+        start = time.time()
+        for _ in range(100):
+            bucket.acquire()
+        self.assertLess(time.time() - start, 0.1)
+
     def test_create_pod(self):
         scaler = PodScaler("elasticjob-sample", "default")
         scaler._check_master_service_avaliable = mock.MagicMock(
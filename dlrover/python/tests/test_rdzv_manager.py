@@ -11,7 +11,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import datetime
+import sys
+import threading
 import time
 import unittest
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -39,8 +42,8 @@ from dlrover.python.tests.test_utils import start_local_master
 
 class MasterKVStoreTest(unittest.TestCase):
     def setUp(self) -> None:
-        self._master, addr = start_local_master()
-        MasterClient._instance = build_master_client(addr, 0.5)
+        self._master, self._addr = start_local_master()
+        MasterClient._instance = build_master_client(self._addr, 0.5)
 
     def tearDown(self):
         self._master.stop()
@@ -58,6 +61,164 @@ class MasterKVStoreTest(unittest.TestCase):
         self.assertEqual(kv_store.get("key0"), b"")
         self.assertEqual(kv_store.get("key1"), b"")
 
+    def test_kv_store_service_ops(self):
+        kv_store = KVStoreService(shard_num=4)
+        kv_store.set("counter", b"3")
+        self.assertEqual(kv_store.add("counter", 2), 5)
+        self.assertEqual(kv_store.add("bytes", b"a"), b"a")
+        self.assertEqual(kv_store.add("bytes", b"b"), b"ab")
+
+        self.assertEqual(kv_store.compare_set("cas", b"", b"0"), b"0")
+        self.assertEqual(kv_store.compare_set("cas", b"1", b"2"), b"0")
+        self.assertEqual(kv_store.compare_set("cas", b"0", b"1"), b"1")
+        self.assertEqual(kv_store.compare_set("unset", b"1", b"2"), b"1")
+        self.assertEqual(kv_store.get("unset"), b"")
+        self.assertEqual(kv_store.get("cas"), b"1")
+
+        kv_store.multi_set({f"rdzv.0.{i}": b"0" for i in range(10)})
+        kv_store.multi_set({f"rdzv.1.{i}": b"1" for i in range(10)})
+        self.assertEqual(len(kv_store.scan("rdzv.0.")), 10)
+        self.assertEqual(len(kv_store.scan("rdzv.")), 20)
+        kv_store.clear("rdzv.0.")
+        self.assertDictEqual(kv_store.scan("rdzv.0."), {})
+        self.assertEqual(len(kv_store.scan("rdzv.1.")), 10)
+        self.assertEqual(kv_store.get("cas"), b"1")
+
+        kv_store.set("ttl", b"0", ttl=0.2)
+        self.assertEqual(kv_store.get("ttl"), b"0")
+        time.sleep(0.3)
+        self.assertEqual(kv_store.get("ttl"), b"")
+        self.assertNotIn("ttl", kv_store.scan())
+
+    def test_kv_store_service_concurrency(self):
+        kv_store = KVStoreService(shard_num=8)
+
+        def _join(rank):
+            kv_store.set(f"rank/{rank}", str(rank).encode())
+            kv_store.add("num", 1)
+            kvs = kv_store.multi_get([f"rank/{i}" for i in range(32)], 10)
+            return len(kvs)
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            futures = [executor.submit(_join, i) for i in range(32)]
+            for future in as_completed(futures):
+                self.assertEqual(future.result(), 32)
+        self.assertEqual(kv_store.get("num"), 32)
+
+    def test_kv_store_service_async_wait(self):
+        kv_store = KVStoreService()
+
+        async def wait_keys():
+            waiting = asyncio.ensure_future(
+                kv_store.async_wait_keys(["key0", "key1"], timeout=5)
+            )
+            watching = asyncio.ensure_future(
+                kv_store.async_wait_updates({"key1": 0}, timeout=5)
+            )
+            await asyncio.sleep(0.1)
+            # The key is set by another thread.
+            threading.Thread(target=kv_store.set, args=("key0", b"0")).start()
+            await asyncio.sleep(0.1)
+            self.assertFalse(waiting.done())
+            self.assertFalse(watching.done())
+            threading.Thread(target=kv_store.set, args=("key1", b"1")).start()
+            return await asyncio.wait_for(asyncio.gather(waiting, watching), 1)
+
+        self.assertListEqual(asyncio.run(wait_keys()), [True, True])
+        waiting = kv_store.async_wait_keys(["key2"], timeout=0.1)
+        self.assertFalse(asyncio.run(waiting))
+
+    def test_kv_store_service_add_and_watch(self):
+        kv_store = KVStoreService(shard_num=1)
+        # The watchers wait for a key which is never updated.
+        versions = kv_store.get_versions(["key"])
+
+        def _add():
+            for _ in range(2000):
+                kv_store.add("num", 1)
+
+        def _watch():
+            for _ in range(200):
+                kv_store.watch(versions, 0.001)
+
+        # Switch the threads frequently to interleave the locks.
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [
+                threading.Thread(target=target, daemon=True)
+                for target in [_add, _add, _watch, _watch]
+            ]
+            for t in threads:
+                t.start()
+            deadline = time.time() + 30
+            for t in threads:
+                t.join(timeout=max(deadline - time.time(), 0))
+        finally:
+            sys.setswitchinterval(switch_interval)
+        self.assertFalse(any(t.is_alive() for t in threads))
+        self.assertEqual(kv_store.get("num"), 4000)
+
+    def test_kv_store_service_wait(self):
+        kv_store = KVStoreService()
+        kv_store.set("key0", b"0")
+        self.assertDictEqual(kv_store.multi_get(["key0", "key1"]), {})
+        versions = kv_store.get_versions(["key0", "key1"])
+        self.assertEqual(versions["key1"], 0)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            get_future = executor.submit(
+                kv_store.multi_get, ["key0", "key1"], 10
+            )
+            watch_future = executor.submit(kv_store.watch, versions, 10)
+            time.sleep(0.3)
+            self.assertFalse(get_future.done())
+            self.assertFalse(watch_future.done())
+            kv_store.multi_set({"key1": b"1", "key2": b"2"})
+            kvs = get_future.result(timeout=1)
+            self.assertDictEqual(kvs, {"key0": b"0", "key1": b"1"})
+            kvs, new_versions = watch_future.result(timeout=1)
+            self.assertDictEqual(kvs, {"key1": b"1"})
+            self.assertGreater(new_versions["key1"], versions["key0"])
+
+        # Return after the timeout if no key is updated.
+        kvs, _ = kv_store.watch(kv_store.get_versions(["key0"]), 0.2)
+        self.assertDictEqual(kvs, {})
+        self.assertDictEqual(kv_store.multi_get(["key3"], 0.2), {})
+
+    def test_kv_store_wait_by_long_poll(self):
+        MasterClient._instance = build_master_client(self._addr, 10)
+        kv_store = MasterKVStore("dlrover/torch/test")
+        kv_store.set_timeout(datetime.timedelta(seconds=10))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(kv_store.wait, ["key0", "key1"])
+            time.sleep(0.3)
+            kv_store.set("key0", b"0")
+            time.sleep(0.3)
+            self.assertFalse(future.done())
+            start = time.time()
+            kv_store.set("key1", b"1")
+            future.result(timeout=5)
+            self.assertLess(time.time() - start, 1)
+
+        client = MasterClient.singleton_instance()
+        versions = {"dlrover/torch/test/key0": 0}
+        kvs, versions = client.kv_store_watch(versions, wait_timeout=1)
+        self.assertDictEqual(kvs, {"dlrover/torch/test/key0": b"0"})
+        kvs, _ = client.kv_store_watch(versions, wait_timeout=0.2)
+        self.assertDictEqual(kvs, {})
+
+        self.assertEqual(kv_store.compare_set("key2", b"", b"2"), b"2")
+        self.assertEqual(kv_store.compare_set("key2", b"0", b"3"), b"2")
+        self.assertEqual(kv_store.compare_set("key3", "", "v"), b"v")
+        self.assertEqual(kv_store.compare_set("key3", "v", "w"), b"w")
+        self.assertEqual(kv_store.compare_set("key3", "v", "x"), b"w")
+        self.assertEqual(kv_store.compare_set("key4", "v", "w"), b"v")
+        self.assertEqual(kv_store.get("key3"), b"w")
+        kv_store.clear_prefix("key")
+        self.assertDictEqual(
+            client.kv_store_multi_get(["dlrover/torch/test/key0"]), {}
+        )
+
     def test_kv_store_api(self):
         kv_store = MasterKVStore("dlrover/torch/test")
         kv_store.set_timeout(datetime.timedelta(seconds=0.5))
@@ -360,6 +521,51 @@ class ElasticTrainingRendezvousManagerTest(unittest.TestCase):
         for i in rdzv_manager._waiting_nodes.keys():
             self.assertTrue(900 <= i <= 999)
 
+    def test_wait_comm_world(self):
+        rdzv_manager = ElasticTrainingRendezvousManager()
+        rdzv_manager.update_rdzv_params(3, 3, 60, 1)
+        rdzv_manager.join_rendezvous(0, 0, 8)
+        rdzv_manager.join_rendezvous(1, 1, 8)
+        round, _, world = rdzv_manager.wait_comm_world(0)
+        self.assertDictEqual(world, {})
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(rdzv_manager.wait_comm_world, i, 30)
+                for i in range(2)
+            ]
+            time.sleep(0.5)
+            self.assertFalse(any(f.done() for f in futures))
+            start = time.time()
+            rdzv_manager.join_rendezvous(2, 2, 8)
+            # The waiting requests return once the rendezvous completes.
+            for future in futures:
+                round, _, world = future.result()
+                self.assertEqual(round, 1)
+                self.assertListEqual(list(world.keys()), [0, 1, 2])
+            self.assertLess(time.time() - start, 2)
+        round, _, world = rdzv_manager.wait_comm_world(2, 30)
+        self.assertEqual(len(world), 3)
+        p50, p99 = rdzv_manager.get_rdzv_latency_percentiles()
+        self.assertGreater(p50, 0.4)
+        self.assertGreaterEqual(p99, p50)
+
+        # Complete the rendezvous with the min nodes after waiting timeout.
+        rdzv_manager = ElasticTrainingRendezvousManager()
+        rdzv_manager.update_rdzv_params(1, 3, 0.5, 1)
+        rdzv_manager.join_rendezvous(0, 0, 8)
+        start = time.time()
+        round, _, world = rdzv_manager.wait_comm_world(0, 30)
+        self.assertEqual(round, 1)
+        self.assertListEqual(list(world.keys()), [0])
+        self.assertLess(time.time() - start, 5)
+
+        # Return the current world if the timeout elapses.
+        rdzv_manager.join_rendezvous(1, 1, 8)
+        rdzv_manager._rdzv_params.min_nodes = 3
+        round, _, world = rdzv_manager.wait_comm_world(1, 0.5)
+        self.assertDictEqual(world, {})
+
 
 class NetworkCheckRendezvousManagerTest(unittest.TestCase):
     def test_network_check_rdzv(self):
@@ -0,0 +1,79 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import unittest
+
+from dlrover.python.common import comm
+from dlrover.python.master.request_executor import (
+    RequestCategory,
+    RequestExecutor,
+    get_request_category,
+)
+
+
+class RequestExecutorTest(unittest.TestCase):
+    def test_get_request_category(self):
+        self.assertEqual(
+            get_request_category(comm.HeartBeat()), RequestCategory.HEARTBEAT
+        )
+        self.assertEqual(
+            get_request_category(comm.CommWorldRequest()),
+            RequestCategory.RENDEZVOUS,
+        )
+        self.assertEqual(
+            get_request_category(comm.KeyValuePairs()),
+            RequestCategory.KV_STORE,
+        )
+        self.assertEqual(
+            get_request_category(comm.TaskLeaseRequest()),
+            RequestCategory.TASK,
+        )
+        self.assertEqual(
+            get_request_category(comm.TaskResults()),
+            RequestCategory.TASK,
+        )
+        self.assertEqual(
+            get_request_category(comm.PsNodesRequest()),
+            RequestCategory.DEFAULT,
+        )
+        self.assertEqual(get_request_category(None), RequestCategory.DEFAULT)
+
+    def test_isolate_categories(self):
+        executor = RequestExecutor({RequestCategory.TASK: 1})
+        blocked = threading.Event()
+
+        async def _run():
+            task = asyncio.ensure_future(
+                executor.run(comm.TaskRequest(), blocked.wait, 10)
+            )
+            await asyncio.sleep(0.1)
+            # The heartbeat is not blocked by the slow task request.
+            result = await asyncio.wait_for(
+                executor.run(comm.HeartBeat(), lambda x: x + 1, 1), 5
+            )
+            stats = executor.get_stats()
+            blocked.set()
+            await task
+            return result, stats
+
+        result, stats = asyncio.run(_run())
+        self.assertEqual(result, 2)
+        self.assertEqual(stats[RequestCategory.TASK]["running"], 1)
+        self.assertEqual(stats[RequestCategory.HEARTBEAT]["completed"], 1)
+        stats = executor.get_stats()
+        self.assertEqual(stats[RequestCategory.TASK]["running"], 0)
+        self.assertEqual(stats[RequestCategory.TASK]["completed"], 1)
+        self.assertGreater(stats[RequestCategory.TASK]["latency_p99_ms"], 0)
+        executor.shutdown()
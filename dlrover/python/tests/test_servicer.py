@@ -10,10 +10,13 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import copy
 import os
+import threading
 import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
 import ray
@@ -32,6 +35,7 @@ from dlrover.python.common.constants import (
 )
 from dlrover.python.common.global_context import Context
 from dlrover.python.diagnosis.common.diagnosis_data import WorkerTrainingMetric
+from dlrover.python.elastic_agent.master_client import build_master_client
 from dlrover.python.master.diagnosis.diagnosis_master import DiagnosisMaster
 from dlrover.python.master.elastic_training.elastic_ps import ElasticPsService
 from dlrover.python.master.elastic_training.rdzv_manager import (
@@ -42,7 +46,12 @@ from dlrover.python.master.elastic_training.sync_service import SyncService
 from dlrover.python.master.monitor.perf_monitor import PerfMonitor
 from dlrover.python.master.node.dist_job_manager import create_job_manager
 from dlrover.python.master.node.job_context import get_job_context
+from dlrover.python.master.request_executor import (
+    RequestCategory,
+    RequestExecutor,
+)
 from dlrover.python.master.servicer import (
+    AsyncGrpcServer,
     GrpcMasterServicer,
     create_master_service,
 )
@@ -68,6 +77,7 @@ class MasterServicerBasicTest(unittest.TestCase):
     def tearDown(self) -> None:
         context = Context.singleton_instance()
         context.master_service_type = "grpc"
+        context.master_service_async = False
         if self.server:
             self.server.stop(grace=None)
 
@@ -112,6 +122,32 @@ class MasterServicerBasicTest(unittest.TestCase):
         self.server.start()
         self.server.stop(grace=None)
 
+    def test_async_grpc_start_and_stop(self):
+        context = Context.singleton_instance()
+        context.master_service_async = True
+        self.server = create_master_service(
+            TEST_SERVER_PORT,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+        self.assertIsInstance(self.server, AsyncGrpcServer)
+        self.server.start()
+        client = build_master_client(f"localhost:{TEST_SERVER_PORT}", 1)
+        self.assertTrue(client.kv_store_set("key0", b"0"))
+        self.assertEqual(client.kv_store_get("key0"), b"0")
+        stats = self.server._servicer.get_request_stats()
+        self.assertEqual(stats["kv_store"]["completed"], 2)
+        self.assertEqual(stats["kv_store"]["queue_depth"], 0)
+        self.server.stop(grace=None)
+        self.server = None
+
     def test_http_basic(self):
         context = Context.singleton_instance()
         context.master_service_type = "http"
@@ -258,6 +294,22 @@ class MasterServicerFunctionalTest(unittest.TestCase):
         self.assertLessEqual(10, len(checkpoint.content))
         self.servicer._restore_shard_checkpoint(checkpoint)
 
+        request = comm.TaskLeaseRequest("test", num_tasks=4, lease_seconds=60)
+        lease: comm.TaskLease = self.servicer._lease_tasks(
+            NodeType.WORKER, 0, request
+        )
+        self.assertEqual(len(lease.tasks), 4)
+        self.assertFalse(lease.finished)
+        results = comm.TaskResults(
+            results=[
+                comm.TaskResult("test", task.task_id) for task in lease.tasks
+            ]
+        )
+        self.assertTrue(
+            self.servicer._report_task_results(NodeType.WORKER, 0, results)
+        )
+        self.assertEqual(len(self.task_manager._datasets["test"].doing), 0)
+
     def test_metric_service(self):
         self.job_manager._init_nodes()
         self.job_manager._init_job_auto_scaler()
@@ -396,6 +448,37 @@ class MasterServicerFunctionalTest(unittest.TestCase):
         response = self.servicer.report(request, None)
         self.assertFalse(response.success)
 
+    def test_message_stats(self):
+        request = elastic_training_pb2.Message()
+        request.data = comm.KeyValuePair("key", b"0").serialize()
+        response = self.servicer.report(request, None)
+        self.assertTrue(response.success)
+        message = comm.ClusterVersion(NodeType.WORKER, 0, "local")
+        request.data = message.serialize()
+        response = self.servicer.get(request, None)
+        self.assertIsNotNone(comm.deserialize_message(response.data))
+        request.data = comm.KeyValuePair("key", b"0").serialize()
+        with mock.patch.object(
+            self.servicer._kv_store, "set", side_effect=RuntimeError()
+        ):
+            with self.assertRaises(RuntimeError):
+                self.servicer.report(request, None)
+
+        stats = self.servicer.get_message_stats()
+        self.assertEqual(stats["report/KeyValuePair"]["count"], 2)
+        self.assertEqual(stats["report/KeyValuePair"]["error_rate"], 0.5)
+        self.assertGreater(stats["report/KeyValuePair"]["request_bytes"], 0)
+        self.assertEqual(stats["get/ClusterVersion"]["count"], 1)
+        self.assertGreater(stats["get/ClusterVersion"]["response_bytes"], 0)
+        histogram = stats["get/ClusterVersion"]["latency_histogram_ms"]
+        self.assertEqual(sum(histogram.values()), 1)
+
+        request.data = comm.ServiceStatsRequest().serialize()
+        response = self.servicer.get(request, None)
+        res_msg: comm.ServiceStats = comm.deserialize_message(response.data)
+        self.assertIn("report/KeyValuePair", res_msg.message_stats)
+        self.assertIn("kv_store", res_msg.executor_stats)
+
     def test_report_task_result(self):
         request = elastic_training_pb2.Message()
         message = comm.TaskResult("test", 0, "error")
@@ -532,6 +615,72 @@ class MasterServicerFunctionalTest(unittest.TestCase):
         self.assertEqual(res.waiting_num, -1)
         job_ctx.update_job_stage(JobStage.JOB_INIT)
 
+    def test_get_comm_world_by_long_poll(self):
+        rdzv_name = RendezvousName.ELASTIC_TRAINING
+        self.servicer._rdzv_managers[rdzv_name].update_rdzv_params(2, 2, 60, 1)
+        self.servicer._join_rendezvous(
+            comm.JoinRendezvousRequest(0, 8, rdzv_name)
+        )
+        # The request is held until the rendezvous completes.
+        request = comm.CommWorldRequest(0, 8, rdzv_name, wait_timeout=10)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.servicer._get_comm_world, request)
+            time.sleep(0.3)
+            self.assertFalse(future.done())
+            self.servicer._join_rendezvous(
+                comm.JoinRendezvousRequest(1, 8, rdzv_name)
+            )
+            res: comm.RendezvousState = future.result(timeout=5)
+        self.assertDictEqual(res.world, {0: 8, 1: 8})
+        self.assertEqual(res.round, 1)
+
+        # Return immediately if no slot to hold the request.
+        self.servicer._long_poll_slots = threading.BoundedSemaphore(1)
+        self.servicer._long_poll_slots.acquire()
+        request = comm.CommWorldRequest(2, 8, rdzv_name, wait_timeout=10)
+        start = time.time()
+        res = self.servicer._get_comm_world(request)
+        self.assertLess(time.time() - start, 1)
+        self.assertNotIn(2, res.world)
+
+    def test_async_get_comm_world_without_threads(self):
+        rdzv_name = RendezvousName.ELASTIC_TRAINING
+        self.servicer._rdzv_managers[rdzv_name].update_rdzv_params(3, 3, 60, 1)
+        self.servicer.shutdown()
+        self.servicer._request_executor = RequestExecutor(
+            {RequestCategory.RENDEZVOUS: 1}
+        )
+
+        def new_request(node_id):
+            request = elastic_training_pb2.Message()
+            request.data = comm.CommWorldRequest(
+                node_id, 8, rdzv_name, wait_timeout=10
+            ).serialize()
+            request.node_type = NodeType.WORKER
+            request.node_id = node_id
+            return request
+
+        async def get_worlds():
+            # The requests wait in the event loop with one thread.
+            tasks = [
+                asyncio.ensure_future(self.servicer.async_get(new_request(i)))
+                for i in range(3)
+            ]
+            await asyncio.sleep(0.3)
+            self.assertFalse(any(task.done() for task in tasks))
+            stats = self.servicer.get_request_stats()
+            self.assertEqual(stats[RequestCategory.RENDEZVOUS]["running"], 0)
+            for i in range(3):
+                self.servicer._join_rendezvous(
+                    comm.JoinRendezvousRequest(i, 8, rdzv_name)
+                )
+            return await asyncio.wait_for(asyncio.gather(*tasks), 5)
+
+        responses = asyncio.run(get_worlds())
+        for response in responses:
+            res = comm.deserialize_message(response.data)
+            self.assertDictEqual(res.world, {0: 8, 1: 8, 2: 8})
+
     def test_report_heartbeat(self):
         request = elastic_training_pb2.Message()
         ts = int(time.time())
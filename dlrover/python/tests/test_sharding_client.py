@@ -11,9 +11,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import array
 import json
 import unittest
 
+from dlrover.python.common import comm
 from dlrover.python.elastic_agent.master_client import (
     MasterClient,
     build_master_client,
@@ -81,6 +83,46 @@ class DataShardClientTest(unittest.TestCase):
             if i == loop - 1:
                 self.assertIsNone(shard)
 
+    def test_sharding_client_with_prefetch(self):
+        client = ShardingClient(
+            batch_size=10,
+            num_epochs=1,
+            dataset_size=1000,
+            num_minibatches_per_shard=1,
+            dataset_name="test",
+            num_prefetch_tasks=8,
+        )
+        starts = []
+        while True:
+            shard = client.fetch_shard()
+            if not shard:
+                break
+            starts.append(shard.start)
+            client.report_batch_done()
+        self.assertListEqual(starts, list(range(0, 1000, 10)))
+        dataset = self._master.task_manager.get_dataset("test")
+        self.assertTrue(dataset.completed())
+
+    def test_drop_revoked_tasks(self):
+        client = ShardingClient(
+            batch_size=10,
+            num_epochs=1,
+            dataset_size=100,
+            num_minibatches_per_shard=1,
+            dataset_name="test",
+        )
+        task = client.get_task()
+        for i in range(1, 4):
+            client._task_queue.put(comm.Task(i, comm.Shard("test", i, i + 1)))
+        client._completed_results = [(0, ""), (5, "")]
+        client._drop_revoked_tasks([0, 2])
+        self.assertEqual(task.task_id, 0)
+        self.assertNotIn(0, client._pending_tasks)
+        self.assertIsNone(client.get_current_task())
+        queued_ids = [t.task_id for t in client._task_queue.queue]
+        self.assertListEqual(queued_ids, [1, 3])
+        self.assertListEqual(client._completed_results, [(5, "")])
+
     def test_index_sharding_client(self):
         client = IndexShardingClient(
             batch_size=16,
@@ -106,6 +148,47 @@ class DataShardClientTest(unittest.TestCase):
                 break
         self.assertFalse(shuffled)
 
+    def test_fetch_index_block(self):
+        client = IndexShardingClient(
+            batch_size=16,
+            num_epochs=1,
+            dataset_size=100,
+            num_minibatches_per_shard=2,
+            dataset_name="test",
+            storage_type="table",
+        )
+        blocks = []
+        while True:
+            try:
+                blocks.append(client.fetch_index_block())
+            except StopIteration:
+                break
+        self.assertTrue(all(isinstance(b, range) for b in blocks))
+        self.assertListEqual([len(b) for b in blocks], [16] * 6 + [4])
+        indices = [i for b in blocks for i in b]
+        self.assertListEqual(indices, list(range(100)))
+
+        client = IndexShardingClient(
+            batch_size=16,
+            num_epochs=1,
+            dataset_size=100,
+            num_minibatches_per_shard=2,
+            dataset_name="test-0",
+            shuffle=True,
+            storage_type="text",
+            index_block_size=10,
+        )
+        block = client.fetch_index_block()
+        self.assertIsInstance(block, array.array)
+        self.assertEqual(len(block), 10)
+        indices = list(block)
+        while True:
+            try:
+                indices.append(client.fetch_sample_index())
+            except StopIteration:
+                break
+        self.assertListEqual(sorted(indices), list(range(100)))
+
     def test_index_sharding_client_with_shuffle(self):
         client = IndexShardingClient(
             batch_size=16,
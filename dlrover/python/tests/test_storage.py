@@ -18,10 +18,16 @@ import time
 import unittest
 
 from dlrover.python.common.storage import (
+    CheckpointCorruptionError,
+    CompressedStorage,
     KeepLatestStepStrategy,
     KeepStepIntervalStrategy,
     PosixDiskStorage,
+    TieredStorage,
+    compress_buffers,
+    decompress_buffer,
     get_checkpoint_storage,
+    is_compressed,
 )
 
 
@@ -94,6 +100,140 @@ class TestLocalStrategyGenerator(unittest.TestCase):
         except OSError:
             self.assertTrue(True)
 
+    def test_write_buffers(self):
+        storage = PosixDiskStorage()
+        buffers = [b"dlrover", b"", memoryview(bytearray(b"-ckpt"))]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "buffers")
+            storage.write_buffers(buffers, path)
+            self.assertEqual(storage.read(path, "rb"), b"dlrover-ckpt")
+
+            buffers = [bytes([i % 256]) for i in range(2000)]
+            storage.write_buffers(buffers, path)
+            self.assertEqual(storage.read(path, "rb"), b"".join(buffers))
+
+    def test_compress_buffers(self):
+        buffers = [b"dlrover" * 1000, b"", os.urandom(3000)]
+        compressed = compress_buffers(buffers, "zlib", chunk_size=1024)
+        data = b"".join(compressed)
+        self.assertTrue(is_compressed(data))
+        self.assertLess(len(data), sum(len(b) for b in buffers))
+        self.assertEqual(decompress_buffer(data), b"".join(buffers))
+
+        out = bytearray(10000)
+        decompress_buffer(data, out=out)
+        self.assertEqual(out, b"".join(buffers))
+        with self.assertRaises(CheckpointCorruptionError):
+            decompress_buffer(data, out=bytearray(10))
+        with self.assertRaises(CheckpointCorruptionError):
+            decompress_buffer(data[:-1])
+        corrupted = bytearray(data)
+        corrupted[-1000] ^= 0xFF
+        with self.assertRaises(CheckpointCorruptionError):
+            decompress_buffer(corrupted)
+
+    def test_compressed_storage(self):
+        storage = CompressedStorage(chunk_size=1024, max_workers=2)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "ckpt")
+            content = b"dlrover-ckpt" * 1000
+            storage.write(content, path)
+            self.assertTrue(is_compressed(PosixDiskStorage().read(path, "rb")))
+            self.assertEqual(storage.read(path, "rb"), content)
+
+            storage.write("100", path)
+            self.assertEqual(storage.read(path), "100")
+
+            class_meta = storage.get_class_meta()
+            self.assertEqual(class_meta.class_name, "CompressedStorage")
+            self.assertEqual(class_meta.kwargs["chunk_size"], 1024)
+
+    def test_tiered_storage(self):
+        tracker_file = "dlrover_latest.txt"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ckpt_dir = os.path.join(tmpdir, "remote")
+            local_dir = os.path.join(tmpdir, "local")
+            strategy = KeepLatestStepStrategy(
+                max_to_keep=2, checkpoint_dir=ckpt_dir
+            )
+            storage = TieredStorage(
+                ckpt_dir, local_dir, tracker_file, strategy, bandwidth=0
+            )
+            tracker_path = os.path.join(ckpt_dir, tracker_file)
+            for step in range(1, 4):
+                step_dir = os.path.join(ckpt_dir, str(step))
+                storage.safe_makedirs(step_dir)
+                path = os.path.join(step_dir, "model.pt")
+                storage.write(b"model" * step, path)
+                storage.write_buffers(
+                    [b"optim", b"-", b"states"],
+                    os.path.join(step_dir, "optim.pt"),
+                )
+                local_path = os.path.join(local_dir, str(step), "model.pt")
+                self.assertTrue(os.path.exists(local_path))
+                # The tracker file is written after draining the files.
+                storage.write(str(step), tracker_path)
+                self.assertTrue(os.path.exists(path))
+                self.assertEqual(
+                    storage.read(os.path.join(step_dir, "optim.pt"), "rb"),
+                    b"optim-states",
+                )
+                storage.commit(step, True)
+
+            self.assertEqual(storage.read(tracker_path), "3")
+            self.assertListEqual(
+                sorted(os.listdir(ckpt_dir)), ["2", "3", tracker_file]
+            )
+            self.assertListEqual(sorted(os.listdir(local_dir)), ["2", "3"])
+
+            path = os.path.join(ckpt_dir, "3", "model.pt")
+            local_path = os.path.join(local_dir, "3", "model.pt")
+            self.assertEqual(storage.read(path, "rb"), b"model" * 3)
+            self.assertEqual(
+                storage.read_state_dict(path, lambda p: p), local_path
+            )
+            # Read the remote file if the local copy is different.
+            with open(local_path, "wb") as f:
+                f.write(b"stale")
+            self.assertEqual(storage.read_state_dict(path, lambda p: p), path)
+            self.assertEqual(storage.read(path, "rb"), b"model" * 3)
+
+            # The local files are removed if the remote files are deleted.
+            shutil.rmtree(os.path.join(ckpt_dir, "2"))
+            storage.write("done", os.path.join(ckpt_dir, "done"))
+            self.assertFalse(
+                os.path.exists(os.path.join(local_dir, "2", "model.pt"))
+            )
+
+            class_meta = storage.get_class_meta()
+            self.assertEqual(class_meta.class_name, "TieredStorage")
+            self.assertEqual(class_meta.kwargs["local_dir"], local_dir)
+
+    def test_tiered_storage_bandwidth(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ckpt_dir = os.path.join(tmpdir, "remote")
+            local_dir = os.path.join(tmpdir, "local")
+            storage = TieredStorage(
+                ckpt_dir,
+                local_dir,
+                bandwidth=256 * 1024,
+                max_local_bytes=1024 * 1024,
+            )
+            storage.safe_makedirs(ckpt_dir)
+            content = os.urandom(1024 * 1024)
+            start = time.time()
+            storage.write(content, os.path.join(ckpt_dir, "0.pt"))
+            storage.write(content, os.path.join(ckpt_dir, "1.pt"))
+            self.assertLess(time.time() - start, 1.0)
+            storage.flush()
+            self.assertGreater(time.time() - start, 1.5)
+            self.assertEqual(
+                PosixDiskStorage().read(os.path.join(ckpt_dir, "1.pt"), "rb"),
+                content,
+            )
+            # The oldest drained file is evicted from the local tier.
+            self.assertListEqual(os.listdir(local_dir), ["1.pt"])
+
 
 if __name__ == "__main__":
     unittest.main()
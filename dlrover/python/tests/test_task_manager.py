@@ -13,10 +13,12 @@
 
 import json
 import unittest
+from unittest import mock
 
 from dlrover.proto import elastic_training_pb2
 from dlrover.python.common.comm import TaskResult
 from dlrover.python.common.constants import NodeType
+from dlrover.python.master.shard import task_manager as task_manager_module
 from dlrover.python.master.shard.task_manager import DatasetShardCheckpoint
 from dlrover.python.tests.test_utils import (
     create_task_manager,
@@ -56,6 +58,87 @@ class TaskMangerTest(unittest.TestCase):
         self.assertEqual(len(dataset.todo), 10)
         self.assertEqual(len(dataset.doing), 0)
 
+    def test_lease_tasks(self):
+        task_manager = create_task_manager()
+        dataset_name = "test"
+        tasks, revoked_ids = task_manager.lease_dataset_tasks(
+            NodeType.WORKER, 0, dataset_name, 3, 60
+        )
+        self.assertListEqual([t.task_id for t in tasks], [0, 1, 2])
+        self.assertListEqual(revoked_ids, [])
+        dataset = task_manager.get_dataset(dataset_name)
+        self.assertEqual(len(dataset.doing), 3)
+        self.assertEqual(len(dataset.todo), 7)
+
+        # The report of a task renews the leases of other tasks.
+        for doing_task in dataset.doing.values():
+            doing_task.lease_deadline = 0
+        request = TaskResult(dataset_name=dataset_name, task_id=0)
+        task_manager.report_dataset_task(request, True)
+        task_manager._recover_lease_expired_tasks()
+        self.assertEqual(len(dataset.doing), 2)
+
+        # The expired tasks are requeued without counting the retries.
+        for doing_task in dataset.doing.values():
+            doing_task.lease_deadline = 0
+        task_manager._recover_lease_expired_tasks()
+        self.assertEqual(len(dataset.doing), 0)
+        self.assertEqual(len(dataset.todo), 9)
+        self.assertEqual(dataset.todo[-1].retry_count, 0)
+
+        # The revoked tasks are leased to another node and the results
+        # reported by the node of the revoked leases are ignored.
+        task_manager.lease_dataset_tasks(
+            NodeType.WORKER, 1, dataset_name, 9, 60
+        )
+        request = TaskResult(dataset_name=dataset_name, task_id=1)
+        task, _ = task_manager.report_dataset_task(
+            request, True, NodeType.WORKER, 0
+        )
+        self.assertIsNone(task)
+        self.assertIn(1, dataset.doing)
+        tasks, revoked_ids = task_manager.lease_dataset_tasks(
+            NodeType.WORKER, 0, dataset_name, 0, 60
+        )
+        self.assertListEqual(tasks, [])
+        self.assertListEqual(revoked_ids, [1, 2])
+
+        # The number of leased tasks is limited.
+        tasks, _ = task_manager.lease_dataset_tasks(
+            NodeType.WORKER, 2, dataset_name, 10**9, 60
+        )
+        self.assertLessEqual(len(tasks), task_manager_module._MAX_LEASE_TASKS)
+
+        # The tasks without the lease never expire.
+        task_manager.get_dataset_task(NodeType.WORKER, 1, dataset_name)
+        task_manager._recover_lease_expired_tasks()
+        self.assertGreater(len(dataset.doing), 0)
+
+    def test_remove_revoked_task_ids(self):
+        task_manager = create_task_manager()
+        dataset_name = "test"
+        dataset = task_manager.get_dataset(dataset_name)
+        for node_id in [0, 1]:
+            task_manager.lease_dataset_tasks(
+                NodeType.WORKER, node_id, dataset_name, 2, 60
+            )
+        for doing_task in dataset.doing.values():
+            doing_task.lease_deadline = 0
+        task_manager._recover_lease_expired_tasks()
+        self.assertEqual(len(task_manager._revoked_task_ids), 2)
+
+        # The revoked task ids of a dead node are removed.
+        task_manager.recover_tasks(NodeType.WORKER, 0)
+        self.assertListEqual(
+            list(task_manager._revoked_task_ids.keys()),
+            [(dataset_name, NodeType.WORKER, 1)],
+        )
+
+        # The revoked task ids of a completed dataset are removed.
+        with mock.patch.object(dataset, "completed", return_value=True):
+            task_manager._recover_lease_expired_tasks()
+        self.assertDictEqual(task_manager._revoked_task_ids, {})
+
     def test_dataset_checkpoint(self):
         task_manager = create_task_manager()
         dataset_name = "test"
@@ -65,8 +148,10 @@ class TaskMangerTest(unittest.TestCase):
             task_manager.get_dataset_checkpoint(dataset_name)
         )
         self.assertEqual(checkpoint.dataset_name, dataset_name)
-        self.assertListEqual(checkpoint.doing, [[0, 100], [100, 200]])
-        self.assertEqual(len(checkpoint.todo), 8)
+        self.assertListEqual(
+            checkpoint.doing, [{"start": 0, "end": 200, "shard_size": 100}]
+        )
+        self.assertEqual(len(checkpoint.todo), 1)
         self.assertEqual(checkpoint.epoch, 1)
         checkpoint_str = checkpoint.to_json()
 
@@ -75,17 +160,8 @@ class TaskMangerTest(unittest.TestCase):
             checkpoint_dict,
             {
                 "dataset_name": "test",
-                "todo": [
-                    [200, 300],
-                    [300, 400],
-                    [400, 500],
-                    [500, 600],
-                    [600, 700],
-                    [700, 800],
-                    [800, 900],
-                    [900, 1000],
-                ],
-                "doing": [[0, 100], [100, 200]],
+                "todo": [{"start": 200, "end": 1000, "shard_size": 100}],
+                "doing": [{"start": 0, "end": 200, "shard_size": 100}],
                 "epoch": 1,
                 "splitter": None,
             },
@@ -175,6 +175,9 @@ class MockRayJobArgs(JobArgs):
 
 
 def create_pod(labels, with_deletion_timestamp=False):
+    pod_type = labels.get(ElasticJobLabel.REPLICA_TYPE_KEY, NodeType.WORKER)
+    pod_index = labels.get(ElasticJobLabel.REPLICA_INDEX_KEY, "0")
+    name = f"test-{pod_type}-{pod_index}"
     status = client.V1PodStatus(
         container_statuses=[
             client.V1ContainerStatus(
@@ -199,11 +202,11 @@ def create_pod(labels, with_deletion_timestamp=False):
         f".{random.randint(0, 255)}",
     )
 
-    resource = {"cpu": 1, "memory": "10Gi"}
+    resource = {"cpu": "1", "memory": "10Gi"}
     container = client.V1Container(
         name="main",
         image="test",
-        command="echo 1",
+        command=["echo", "1"],
         resources=client.V1ResourceRequirements(
             requests=resource,
             limits=resource,
@@ -228,7 +231,7 @@ def create_pod(labels, with_deletion_timestamp=False):
         kind="Pod",
         spec=spec,
         metadata=client.V1ObjectMeta(
-            name="test-worker-0",
+            name=name,
             labels=labels,
             creation_timestamp=datetime.datetime.now(),
             deletion_timestamp=deletion_timestamp,
@@ -81,15 +81,30 @@ def run_checkpoint_backup(rank, world_size):
     ):
         back_manager = ShardCkptReplicaManager(replica_count=2)
     back_manager.backup_ranks = list(range(world_size))
+    back_manager._chunk_size = 1000
     back_manager.backup(shm_hanlder)
+    peer_rank = 1 - rank
+    if peer_rank not in back_manager._rank_shms:
+        raise ValueError("Test Failed!")
     if rank == 0:
-        shm_hanlders = [shm_hanlder, shm_hanlder]
+        # The rank 0 loses its shard and restores it from the rank 1.
+        lost_shm_handler = SharedMemoryHandler(local_rank=2)
+        shm_hanlders = {
+            0: lost_shm_handler,
+            1: back_manager._rank_shms[1],
+        }
     else:
-        peer_shm_handler = SharedMemoryHandler(2)
-        shm_hanlders = [peer_shm_handler, peer_shm_handler]
-    shm_tensor, _ = back_manager._gather_owner_checkpoint(shm_hanlders)
-    if rank == 0 and shm_tensor.numel() != 1632:
-        raise ValueError("Test Failed!")
+        shm_hanlders = {0: back_manager._rank_shms[0], 1: shm_hanlder}
+    shm_tensor, meta = back_manager._gather_owner_checkpoint(shm_hanlders)
+    if rank == 0:
+        expected = torch.frombuffer(
+            shm_hanlder.shared_memory.buf, dtype=torch.uint8
+        )
+        if shm_tensor.numel() != 1632 or not torch.equal(shm_tensor, expected):
+            raise ValueError("Test Failed!")
+        if meta[DLROVER_CKPT_CONFIG_KEY].rank != 0:
+            raise ValueError("Test Failed!")
+        lost_shm_handler.unlink()
 
     with mock.patch.object(
         FullCkptReplicaManager, "_get_backup_ranks", return_value=[0, 1]
@@ -123,6 +138,10 @@ class CheckpointBackupTest(unittest.TestCase):
         shard_manager = FullCkptReplicaManager(replica_count=2)
         self.assertListEqual(shard_manager.backup_ranks, [0, 8, 16, 24])
 
+        # The replicas are placed in the nodes strided by the group number.
+        shard_manager = ShardCkptReplicaManager(replica_count=2)
+        self.assertListEqual(shard_manager.backup_ranks, [0, 16])
+
         shard_manager = ShardCkptReplicaManager(replica_count=0)
         self.assertListEqual(shard_manager.backup_ranks, [])
 
@@ -27,7 +27,7 @@ import torch.optim as optim
 
 from dlrover.python.common.constants import CheckpointConstant, NodeEnv
 from dlrover.python.common.multi_process import clear_sock_dir
-from dlrover.python.common.storage import PosixDiskStorage
+from dlrover.python.common.storage import CompressedStorage, PosixDiskStorage
 from dlrover.python.elastic_agent.master_client import (
     MasterClient,
     build_master_client,
@@ -184,6 +184,53 @@ class ShardingCheckpointEngineTest(unittest.TestCase):
             saver.close()
             saving_engine.close()
 
+    @mock.patch.dict(
+        os.environ, {CheckpointConstant.PIPELINED_COPY_ENV: "true"}
+    )
+    def test_save_to_memory_by_pipelined_copy(self):
+        model = SimpleNet()
+        step = 100
+        state_dict = dict(
+            model=model.state_dict(),
+            step=step,
+        )
+        storage = PosixDiskStorage()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = SimpleShardingCheckpointEngine(tmpdir, storage)
+            self.assertIsNotNone(engine._copier)
+            saved_file = os.path.join(tmpdir, "checkpoint-100/checkpoint.pt")
+            sd = {CheckpointConstant.MODEL_STATES_NAME: state_dict}
+            paths = {CheckpointConstant.MODEL_STATES_NAME: saved_file}
+            saved = engine.save_to_memory(step, sd, paths)
+            self.assertTrue(saved)
+            restored_step, restored_sd = engine.get_state_dict_from_memory()
+            self.assertEqual(restored_step, step)
+            restored_model = restored_sd[CheckpointConstant.MODEL_STATES_NAME]
+            for name, value in state_dict["model"].items():
+                self.assertTrue(
+                    torch.equal(restored_model["model"][name], value)
+                )
+            # The copy has released the lock of the shared memory.
+            self.assertTrue(engine._shm_lock.acquire(blocking=False))
+            engine._shm_lock.release()
+            engine.close()
+
+    @mock.patch.dict(os.environ, {CheckpointConstant.DELTA_MODE_ENV: "true"})
+    def test_disable_delta_mode(self):
+        storage = PosixDiskStorage()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = SimpleShardingCheckpointEngine(tmpdir, storage)
+            self.assertTrue(engine._shm_handler.delta_mode)
+            engine.close()
+            engine = MegatronCheckpointEngine(tmpdir, storage)
+            self.assertFalse(engine._shm_handler.delta_mode)
+            engine.close()
+            engine = DeepSpeedCheckpointEngine(
+                tmpdir, storage, global_shard_num=1, zero_stage=1
+            )
+            self.assertFalse(engine._shm_handler.delta_mode)
+            engine.close()
+
     def test_megatron_engine(self):
         storage = PosixDiskStorage()
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -328,6 +375,31 @@ class CheckpointEngineTest(unittest.TestCase):
                 self.assertTrue(torch.equal(value, loaded_value))
             engine.close()
 
+    def test_load_corrupted_checkpoint(self):
+        model = SimpleNet()
+        storage = CompressedStorage(PosixDiskStorage(), chunk_size=1024)
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            engine = FullCheckpointEngine(tmpdirname, storage)
+            for step in [5, 10]:
+                path = engine._gen_restore_checkpoint_path(step)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                state_dict = dict(model=model.state_dict(), step=step)
+                storage.write_state_dict(state_dict, path, torch.save)
+            tracer_file = os.path.join(
+                tmpdirname, CheckpointConstant.TRACER_FILE_NAME
+            )
+            storage.write("10", tracer_file)
+            with open(path, "r+b") as f:
+                f.truncate(os.path.getsize(path) - 1)
+
+            # Fall back to the step 5 because the step 10 is corrupted.
+            loaded_state_dict = engine._load_from_storage()
+            self.assertEqual(loaded_state_dict["step"], 5)
+            for key, value in model.state_dict().items():
+                loaded_value = loaded_state_dict["model"][key]
+                self.assertTrue(torch.equal(value, loaded_value))
+            engine.close()
+
     def test_all_rank_sync(self):
         world_size = 2
         ranks = [i for i in range(world_size)]
@@ -76,3 +76,36 @@ class ElasticDistributedSamplerTest(unittest.TestCase):
         sampler.load_state_dict(sampler_state)
         val = next(iter(sampler))
         self.assertEqual(val, 63)
+
+    def test_stateless_shuffle(self):
+        dataset = SimpleDataset()
+        samplers = [
+            ElasticDistributedSampler(
+                dataset=dataset,
+                num_replicas=3,
+                rank=rank,
+                shuffle=True,
+                stateless_shuffle=True,
+            )
+            for rank in range(3)
+        ]
+        rank_indices = [list(sampler) for sampler in samplers]
+        self.assertListEqual(rank_indices[0], list(samplers[0]))
+        indices = [i for r in rank_indices for i in r]
+        self.assertEqual(len(indices), 60003)
+        self.assertEqual(len(set(indices)), 60001)
+        self.assertNotEqual(rank_indices[0][:10], list(range(0, 30, 3)))
+
+        sampler_state = samplers[0].state_dict(4, 8)
+        sampler = ElasticDistributedSampler(
+            dataset=dataset,
+            num_replicas=3,
+            rank=0,
+            shuffle=True,
+            stateless_shuffle=True,
+        )
+        sampler.load_state_dict(sampler_state)
+        self.assertListEqual(list(sampler), rank_indices[0][32:])
+
+        sampler.set_epoch(1)
+        self.assertNotEqual(list(sampler)[:10], rank_indices[0][:10])
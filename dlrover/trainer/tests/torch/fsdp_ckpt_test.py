@@ -66,6 +66,7 @@ from dlrover.trainer.torch.flash_checkpoint.fsdp_engine import (
     SharedMemoryReader,
     SharedMemoryWriter,
     _get_buffer_size,
+    _StorageInfo,
     _tensor_item_size,
     _write_item,
     _write_memory_from_list,
@@ -160,6 +161,96 @@ def _write_state_dict_to_shm(shared_memory, files, state_dict):
     return writer
 
 
+class _RecordLoadPlanner(object):
+    """The planner to record the tensors and objects loaded by a reader."""
+
+    def __init__(self, tensors):
+        self.tensors = tensors
+        self.objects = {}
+        self.committed = []
+
+    def resolve_tensor(self, read_item: ReadItem):
+        return self.tensors[read_item.dest_index.fqn]
+
+    def commit_tensor(self, read_item: ReadItem, tensor):
+        self.committed.append(read_item.dest_index.fqn)
+
+    def load_bytes(self, read_item: ReadItem, value: io.BytesIO):
+        self.objects[read_item.dest_index.fqn] = torch.load(value)
+
+
+class FileReaderTest(unittest.TestCase):
+    def test_read_files_in_parallel(self):
+        tensors = {
+            "model.weight": torch.rand((4, 4)),
+            "model.bias": torch.rand(4),
+            "optim.exp_avg": torch.rand(6).to(torch.bfloat16),
+            "optim.empty": torch.tensor([]),
+        }
+        objects = {"optim.param_groups": {"lr": 0.1}}
+        storage_data = {}
+        state_dict_metadata = {}
+        items = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i, names in enumerate(
+                [
+                    ["model.weight", "model.bias", "optim.param_groups"],
+                    ["optim.exp_avg", "optim.empty"],
+                ]
+            ):
+                file_name = f"__{i}_0.distcp"
+                offset = 0
+                with open(os.path.join(tmpdir, file_name), "wb") as f:
+                    for name in names:
+                        index = MetadataIndex(name)
+                        if name in objects:
+                            stream = io.BytesIO()
+                            torch.save(objects[name], stream)
+                            data = stream.getvalue()
+                            item_type = LoadItemType.BYTE_IO
+                            lengths = None
+                        else:
+                            tensor = tensors[name]
+                            data = tensor.view(torch.uint8).numpy().tobytes()
+                            item_type = LoadItemType.TENSOR
+                            lengths = tensor.size()
+                            state_dict_metadata[name] = TensorStorageMetadata(
+                                properties=TensorProperties(
+                                    dtype=tensor.dtype
+                                ),
+                                size=tensor.size(),
+                                chunks=[],
+                            )
+                        f.write(data)
+                        storage_data[index] = _StorageInfo(
+                            file_name, offset, len(data)
+                        )
+                        offset += len(data)
+                        zeros = None if lengths is None else [0] * len(lengths)
+                        items.append(
+                            ReadItem(
+                                item_type,
+                                dest_index=index,
+                                dest_offsets=zeros,
+                                storage_index=index,
+                                storage_offsets=zeros,
+                                lengths=lengths,
+                            )
+                        )
+
+            reader = FileReader(tmpdir, max_workers=2)
+            metadata = Metadata(state_dict_metadata, storage_data=storage_data)
+            reader.set_up_storage_reader(metadata, True)
+            targets = {k: torch.zeros_like(v) for k, v in tensors.items()}
+            planner = _RecordLoadPlanner(targets)
+            reader.read_data(LoadPlan(items), planner).wait()
+
+        self.assertEqual(len(planner.committed), len(tensors))
+        for name, tensor in tensors.items():
+            self.assertTrue(torch.equal(targets[name], tensor))
+        self.assertDictEqual(planner.objects, objects)
+
+
 class FsdpCheckpointTest(unittest.TestCase):
     def setUp(self):
         self._master, self.addr = start_local_master()
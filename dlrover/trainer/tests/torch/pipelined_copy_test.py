@@ -0,0 +1,145 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+from unittest import mock
+
+import torch
+
+from dlrover.python.common.constants import NodeEnv
+from dlrover.python.common.multi_process import SharedDict, clear_sock_dir
+from dlrover.python.elastic_agent.master_client import (
+    MasterClient,
+    build_master_client,
+)
+from dlrover.python.elastic_agent.torch.ckpt_saver import (
+    DLROVER_CKPT_CONFIG_KEY,
+    CheckpointConfig,
+    CheckpointSharedObjPrefix,
+    SharedMemoryHandler,
+    TensorMeta,
+)
+from dlrover.python.tests.test_utils import start_local_master
+from dlrover.trainer.torch.flash_checkpoint.pipelined_copy import (
+    CudaCopyStream,
+    HostCopyStream,
+    PipelinedTensorCopier,
+)
+
+
+class PipelinedTensorCopierTest(unittest.TestCase):
+    def test_copy_by_staging_buffers(self):
+        copier = PipelinedTensorCopier(100, 2, stream=HostCopyStream())
+        tensors = [
+            torch.rand(60, dtype=torch.float32),
+            torch.arange(7, dtype=torch.int64),
+            torch.tensor([], dtype=torch.float32),
+            torch.rand((3, 5), dtype=torch.float16),
+        ]
+        offsets = []
+        offset = 0
+        for t in tensors:
+            offsets.append(offset)
+            offset += t.numel() * t.element_size()
+        buffer = bytearray(offset)
+        for t, offset in zip(tensors, offsets):
+            copier.write(t, TensorMeta(offset=offset), buffer)
+        done = []
+        copier.flush(lambda: done.append(True))
+        copier.wait()
+        self.assertListEqual(done, [True])
+        self.assertEqual(copier._allocated_num, 2)
+        for t, offset in zip(tensors, offsets):
+            if t.numel() == 0:
+                continue
+            copied = torch.frombuffer(
+                buffer, dtype=t.dtype, count=t.numel(), offset=offset
+            ).reshape(t.shape)
+            self.assertTrue(torch.equal(copied, t))
+        copier.close()
+
+    def test_raise_copy_error(self):
+        copier = PipelinedTensorCopier(100, 2, stream=HostCopyStream())
+        buffer = bytearray(8)
+        copier.write(torch.rand(10), TensorMeta(offset=0), buffer)
+        done = []
+        copier.flush(lambda: done.append(copier.failed))
+        with self.assertRaises(ValueError):
+            copier.wait()
+        self.assertListEqual(done, [True])
+        self.assertFalse(copier.failed)
+        copier.close()
+
+    @mock.patch("torch.cuda.current_stream")
+    @mock.patch("torch.cuda.Event")
+    @mock.patch("torch.cuda.Stream")
+    def test_optimizer_step_waits_for_cuda_copy(self, _, event, current):
+        stream = CudaCopyStream()
+        stream.begin()
+        stream.end()
+        # Only the optimizer step waits for the copy.
+        current.return_value.wait_stream.assert_not_called()
+        current.return_value.wait_event.assert_not_called()
+
+        param = torch.nn.Parameter(torch.ones(2))
+        optimizer = torch.optim.SGD([param], lr=0.1)
+        param.grad = torch.ones(2)
+        optimizer.step()
+        current.return_value.wait_event.assert_called_once_with(
+            event.return_value
+        )
+        optimizer.step()
+        current.return_value.wait_event.assert_called_once()
+
+        stream.close()
+        stream.end()
+        optimizer.step()
+        current.return_value.wait_event.assert_called_once()
+
+
+class PipelinedSaveStateDictTest(unittest.TestCase):
+    def setUp(self):
+        local_rank = 2
+        os.environ[NodeEnv.TORCHELASTIC_RUN_ID] = "unittest"
+        self._meta_dict = SharedDict(
+            CheckpointSharedObjPrefix.META_NAME + str(local_rank), create=True
+        )
+        self._shm_handler = SharedMemoryHandler(local_rank, host=False)
+        self._master, addr = start_local_master()
+        MasterClient._instance = build_master_client(addr, 1)
+
+    def tearDown(self):
+        self._shm_handler.unlink()
+        self._master.stop()
+        clear_sock_dir()
+
+    def test_save_state_dict_with_copier(self):
+        copier = PipelinedTensorCopier(256, 2, stream=HostCopyStream())
+        state_dict = {
+            "model": {
+                "weight": torch.rand((16, 16)),
+                "bias": torch.rand(16),
+            },
+            "step": 10,
+            DLROVER_CKPT_CONFIG_KEY: CheckpointConfig(step=10),
+        }
+        self._shm_handler.save_state_dict(state_dict, copier)
+        copier.wait()
+        config = self._shm_handler.get_checkpoint_config(CheckpointConfig())
+        self.assertFalse(config.writing_shm)
+        restored = self._shm_handler.load_state_dict()
+        self.assertEqual(restored["step"], 10)
+        for name, value in state_dict["model"].items():
+            self.assertTrue(torch.equal(restored["model"][name], value))
+        copier.close()
@@ -17,16 +17,31 @@ import torch
 import torch.distributed as dist
 from torch.utils.data import Dataset, DistributedSampler
 
+from dlrover.python.common.index_permutation import IndexPermutation
 from dlrover.python.common.log import default_logger as logger
 
 T_co = TypeVar("T_co", covariant=True)
 
+# The number of indices generated at a time by the sampler.
+_INDEX_CHUNK_SIZE = 65536
+
+
+def _get_positions(positions):
+    return positions.tolist()
+
 
 class ElasticDistributedSampler(DistributedSampler):
     """ElasticDistributedSampler can checkpoint unused sample indices
     and restore sample indices from the checkpoint to support
     fault-tolerance.
 
+    The sampler generates the indices of the rank on demand. If
+    `stateless_shuffle` is True, the sampler shuffles the dataset by
+    a seeded permutation which computes the index at a position without
+    materializing the permutation of the dataset. The order is different
+    from that of `torch.randperm` and is still deterministic by the seed
+    and the epoch.
+
     Example::
 
     >>> dataset = torchvision.datasets.ImageFolder(
@@ -53,6 +68,7 @@ class ElasticDistributedSampler(DistributedSampler):
         shuffle: bool = True,
         seed: int = 0,
         drop_last: bool = False,
+        stateless_shuffle: bool = False,
     ) -> None:
         if not dist.is_initialized():
             rank = 0 if not rank else rank
@@ -66,46 +82,56 @@ class ElasticDistributedSampler(DistributedSampler):
             seed,
             drop_last,
         )
+        self.stateless_shuffle = stateless_shuffle
         self._epoch_checkpoint: Dict[int, int] = {}
 
     def __iter__(self) -> Iterator[T_co]:
-        indices = []  # type: ignore
-        if self.shuffle:
-            # deterministically shuffle based on epoch and seed
-            g = torch.Generator()
-            g.manual_seed(self.seed + self.epoch)
-            indices = torch.randperm(len(self.dataset), generator=g).tolist()
-        else:
-            indices = list(range(len(self.dataset)))
-
-        if not self.drop_last:
-            # add extra samples to make it evenly divisible
-            padding_size = self.total_size - len(indices)
-            if padding_size <= len(indices):
-                indices += indices[:padding_size]
-            else:
-                indices += (indices * math.ceil(padding_size / len(indices)))[
-                    :padding_size
-                ]
-        else:
-            # remove tail of data to make it evenly divisible.
-            indices = indices[: self.total_size]
-        assert len(indices) == self.total_size
-
-        # subsample
         # ensure each rank receives the same amount of data when importing the
         # checkpoint to continue training for the rest of the current epoch
-        if self.epoch in self._epoch_checkpoint:
-            remaining_sampler = self.num_samples * self.num_replicas
-            indices = indices[-remaining_sampler:]
-        # fmt: off
-        indices = indices[self.rank:self.total_size:self.num_replicas]
-        # fmt: on
         if self.epoch not in self._epoch_checkpoint:
             self._init_num_samples()
-        assert len(indices) == self.num_samples
+            offset = 0
+        else:
+            offset = self.total_size - self.num_samples * self.num_replicas
+
+        dataset_size = len(self.dataset)
+        if not self.shuffle:
+            get_indices = _get_positions
+        elif self.stateless_shuffle:
+            permutation = IndexPermutation(
+                dataset_size, self.seed + self.epoch
+            )
+            get_indices = permutation.take
+        else:
+            # deterministically shuffle based on epoch and seed
+            g = torch.Generator()
+            g.manual_seed(self.seed + self.epoch)
+            perm = torch.randperm(dataset_size, generator=g)
 
-        return iter(indices)
+            def get_indices(positions):
+                return perm[positions].tolist()
+
+        return self._iter_indices(offset, get_indices)
+
+    def _iter_indices(self, offset, get_indices):
+        """
+        Generate the indices of the rank by chunks. The sample at the
+        position p of the padded indices of the epoch is the p % size th
+        sample of the permutation and the rank takes the positions
+        offset + rank + k * num_replicas.
+        """
+        dataset_size = len(self.dataset)
+        start = offset + self.rank
+        step = self.num_replicas
+        for begin in range(0, self.num_samples, _INDEX_CHUNK_SIZE):
+            end = min(begin + _INDEX_CHUNK_SIZE, self.num_samples)
+            positions = torch.arange(
+                start + begin * step,
+                start + end * step,
+                step,
+                dtype=torch.int64,
+            )
+            yield from get_indices(positions % dataset_size)
 
     def _init_num_samples(self):
         if self.drop_last and len(self.dataset) % self.num_replicas != 0:
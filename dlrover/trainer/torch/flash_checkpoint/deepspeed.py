@@ -30,6 +30,7 @@ from dlrover.python.common.storage import (
 )
 from dlrover.python.elastic_agent.torch.ckpt_saver import (
     DeepSpeedCheckpointSaver,
+    read_state_dict_file,
 )
 
 from .checkpointer import Checkpointer, StorageType
@@ -78,7 +79,10 @@ class AsyncCheckpointAgent(CheckpointEngine):
 
     def load(self, path: str, map_location=None):
         def load_func(path):
-            return torch_native_load(path, map_location=map_location)
+            return read_state_dict_file(
+                path,
+                lambda p: torch_native_load(p, map_location=map_location),
+            )
 
         sd_name = ""
         if path.endswith(_DS_MODEL_SD_FILE_SUFFIX):
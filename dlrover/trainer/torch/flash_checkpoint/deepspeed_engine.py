@@ -45,6 +45,10 @@ class DeepSpeedCheckpointEngine(CheckpointEngine):
             checkpoint to the memory.
     """
 
+    # The fp16 optimizer of DeepSpeed copies the fp32 master weights
+    # into the model by `tensor.data` which keeps the version counter.
+    delta_copy_supported = False
+
     def __init__(
         self,
         checkpoint_dir,
@@ -41,6 +41,10 @@ from dlrover.python.elastic_agent.torch.ckpt_saver import (
     ClassMeta,
     SharedMemoryHandler,
 )
+from dlrover.trainer.torch.flash_checkpoint.pipelined_copy import (
+    PipelinedTensorCopier,
+    is_pipelined_copy_enabled,
+)
 from dlrover.trainer.torch.flash_checkpoint.replica import CkptReplicaManger
 
 
@@ -165,6 +169,16 @@ class CheckpointEngine(metaclass=ABCMeta):
     If the training process fail, the agent in main process can continuously
     save the state dict from the shared memory into the storage.
 
+    If `DLROVER_CKPT_PIPELINED_COPY` is enabled, the engine copies the
+    tensors into the shared memory through pinned staging buffers on a side
+    CUDA stream and returns before the copy is done. The kernels queued
+    after `save_to_memory` wait for the copy from the device, and the
+    next saving waits until the last copy finishes.
+
+    If `DLROVER_CKPT_DELTA_MODE` is enabled, the engine only copies the
+    tensors modified since the latest saving unless
+    `delta_copy_supported` is False.
+
     Args:
         checkpoint_dir (str): the directory to save checkpoint.
         storage: a CheckpointStorage instance to write/read the storage.
@@ -173,6 +187,9 @@ class CheckpointEngine(metaclass=ABCMeta):
     """
 
     saver_proc = None
+    # Whether the version counter of tensors detects all updates of
+    # the training framework to copy the modified tensors only.
+    delta_copy_supported = True
 
     def __init__(
         self,
@@ -196,6 +213,9 @@ class CheckpointEngine(metaclass=ABCMeta):
         self._local_rank = env_utils.get_local_rank()
         self._cached_step = -1
         self._restart_count = env_utils.get_torch_restart_count()
+        self._copier: Optional[PipelinedTensorCopier] = None
+        if is_pipelined_copy_enabled():
+            self._copier = PipelinedTensorCopier.from_env()
 
         # init saver
         self._notify_agent_to_create_saver()
@@ -224,6 +244,13 @@ class CheckpointEngine(metaclass=ABCMeta):
         self._shm_handler = SharedMemoryHandler(
             self.local_shard_id, host=False
         )
+        if self._shm_handler.delta_mode and not self.delta_copy_supported:
+            logger.warning(
+                f"{self.__class__.__name__} copies all tensors into the "
+                "shared memory because the framework updates the weights "
+                "by `tensor.data` without bumping the version counter."
+            )
+            self._shm_handler.disable_delta_mode()
         self._rank = 0
         self._group_rank = 0
         self._world_size = 1
@@ -290,6 +317,9 @@ class CheckpointEngine(metaclass=ABCMeta):
 
     def close(self):
         """Close the shared memory."""
+        if self._copier:
+            self._copier.close()
+            self._copier = None
         self._shm_handler.close()
 
     def _notify_agent_to_create_saver(self):
@@ -352,6 +382,10 @@ class CheckpointEngine(metaclass=ABCMeta):
         conf.group_rank = self._group_rank
         conf.world_size = self._world_size
 
+        start = time.time()
+        if self._copier:
+            # The copy of the last step holds the lock until it finishes.
+            self._copier.wait()
         acquired = self._shm_lock.acquire(blocking=False)
         logger.info(
             f"{self._rank}-{self._local_rank} acquired the lock of shared "
@@ -368,11 +402,35 @@ class CheckpointEngine(metaclass=ABCMeta):
                 self._shm_lock.release()
             return False
         state_dict[DLROVER_CKPT_CONFIG_KEY] = conf
-        self._shm_handler.save_state_dict(state_dict)
+        if self._copier:
+            self._shm_handler.save_state_dict(state_dict, self._copier)
+            stall_time = round(self._copier.stall_time, 3)
+
+            def _finish_copy():
+                if acquired:
+                    self._shm_lock.release()
+                cost = round(time.time() - start, 3)
+                logger.info(
+                    f"Rank {self._rank} finishes copying the state dict "
+                    f"of step {conf.step} into the memory in {cost}s."
+                )
 
-        if acquired:
-            self._shm_lock.release()
+            self._copier.flush(_finish_copy)
+        else:
+            stall_time = 0.0
+            self._shm_handler.save_state_dict(state_dict)
+            if acquired:
+                self._shm_lock.release()
+        blocking_time = round(time.time() - start, 3)
+        logger.info(
+            f"Rank {self._rank} blocks {blocking_time}s "
+            f"(waiting for staging buffers {stall_time}s) to save the "
+            f"state dict of step {conf.step} into the memory."
+        )
         self._cached_step = conf.step
+        if self._copier and self._replica_manager.has_replica():
+            # The replica is backed up from the shared memory.
+            self._copier.wait()
         self._replica_manager.backup(self._shm_handler)
         return True
 
@@ -380,6 +438,8 @@ class CheckpointEngine(metaclass=ABCMeta):
         """
         Restore the checkpoint state dict from the shared memory.
         """
+        if self._copier:
+            self._copier.wait()
         self._restore_memory_from_replica()
         state_dict = {}
         default_config = CheckpointConfig()
@@ -405,6 +465,11 @@ class CheckpointEngine(metaclass=ABCMeta):
         ):
             shm_size = byte_tensor.size()[0]
             self._shm_handler.init_shared_memory(create=True, size=shm_size)
+            assert self._shm_handler.shared_memory is not None
+            shm_tensor = torch.frombuffer(
+                self._shm_handler.shared_memory.buf, dtype=torch.uint8
+            )
+            shm_tensor.copy_(byte_tensor)
             self._shm_handler.metadata.set(meta)
             logger.info(
                 f"Restore the checkpoint shard with size = {shm_size}"
@@ -13,8 +13,11 @@
 
 import dataclasses
 import io
+import mmap
 import os
 import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Tuple, Union
@@ -340,36 +343,35 @@ class SharedMemoryReader(StorageReader):
         return True
 
 
-class SlicedBufferedReader(io.BufferedReader):
-    def __init__(self, base_stream: io.RawIOBase, offset: int, len: int):
-        super().__init__(base_stream)
-        self.offset = offset
-        self.len = len
-        self.seek(0)
-
-    def seek(self, __offset: int, __whence: int = os.SEEK_SET) -> int:
-        if __whence == os.SEEK_SET:
-            __offset = self.offset + __offset
-        elif __whence == os.SEEK_END:
-            __whence = os.SEEK_SET
-            __offset = (self.offset + self.len) - __offset
-        return super().seek(__offset, __whence)
-
-    def tell(self) -> int:
-        return super().tell() - self.offset
+class FileReader(StorageReader):
+    """
+    The reader to load the distributed checkpoint files. Each file is mapped
+    into the memory and the tensors are built from the mapping without
+    copying, then they are copied into the target tensors. The files are
+    read in parallel by a thread pool.
 
+    Args:
+        path: the directory of checkpoint files.
+        max_workers (int): the number of threads to read files. The default
+            is the value of `DLROVER_CKPT_LOAD_WORKERS` or the number
+            of CPUs.
+    """
 
-class FileReader(StorageReader):
-    def __init__(self, path: Union[str, os.PathLike]) -> None:
+    def __init__(self, path: Union[str, os.PathLike], max_workers=0) -> None:
         super().__init__()
         self.path = Path(path)
         self.storage_data: Dict[MetadataIndex, _StorageInfo] = dict()
         self.state_dict_metadata: Dict[str, STORAGE_TYPES] = dict()
-
-    def _slice_file(self, file, sinfo: _StorageInfo):
-        return SlicedBufferedReader(
-            io.FileIO(file.fileno(), closefd=False), sinfo.offset, sinfo.length
-        )
+        if not max_workers:
+            max_workers = int(
+                os.getenv(
+                    CheckpointConstant.LOAD_WORKERS_ENV,
+                    min(os.cpu_count() or 1, 8),
+                )
+            )
+        self._max_workers = max(max_workers, 1)
+        # The planner is not thread-safe.
+        self._planner_lock = threading.Lock()
 
     def read_data(self, plan: LoadPlan, planner: LoadPlanner) -> Future[None]:
         # group requests by file
@@ -379,40 +381,69 @@ class FileReader(StorageReader):
             path = item_md.relative_path
             per_file.setdefault(path, []).append(read_item)
 
-        for relative_path, reqs in per_file.items():
-            with (self.path / relative_path).open("rb") as file:
-                for req in reqs:
-                    item_md = self.storage_data[req.storage_index]
-                    file_slice = self._slice_file(file, item_md)
-                    bytes = io.BytesIO(file_slice.read(item_md.length))
-                    bytes.seek(0)
-                    if req.type == LoadItemType.BYTE_IO:
-                        planner.load_bytes(req, bytes)
-                    else:
-                        tensor_meta = self.state_dict_metadata[
-                            req.storage_index.fqn
-                        ]
-                        tensor = torch.frombuffer(
-                            bytes.getbuffer(),
-                            dtype=tensor_meta.properties.dtype,
-                        ).reshape(req.lengths)
-                        tensor = narrow_tensor_by_index(
-                            tensor, req.storage_offsets, req.lengths
-                        )
-                        target_tensor = planner.resolve_tensor(req).detach()
-
-                        err_msg = (
-                            f"req {req.storage_index} mismatch sizes "
-                            f"{target_tensor.size()} vs {tensor.size()}"
-                        )
-                        assert target_tensor.size() == tensor.size(), err_msg
-                        target_tensor.copy_(tensor)
-                        planner.commit_tensor(req, target_tensor)
+        max_workers = min(self._max_workers, len(per_file))
+        if max_workers <= 1:
+            for relative_path, reqs in per_file.items():
+                self._read_file(relative_path, reqs, planner)
+        else:
+            with ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="ckpt_loader-"
+            ) as executor:
+                futures = [
+                    executor.submit(self._read_file, path, reqs, planner)
+                    for path, reqs in per_file.items()
+                ]
+                for future in futures:
+                    future.result()
 
         fut: Future = Future()
         fut.set_result(None)
         return fut
 
+    def _read_file(
+        self, relative_path: str, reqs: List[ReadItem], planner: LoadPlanner
+    ):
+        with (self.path / relative_path).open("rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                buffer: Any = b""
+            else:
+                # The private mapping is writable for `torch.frombuffer`
+                # without modifying the file.
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        for req in reqs:
+            item_md = self.storage_data[req.storage_index]
+            if req.type == LoadItemType.BYTE_IO:
+                end = item_md.offset + item_md.length
+                bytes = io.BytesIO(buffer[item_md.offset : end])  # noqa E203
+                with self._planner_lock:
+                    planner.load_bytes(req, bytes)
+                continue
+            tensor_meta = self.state_dict_metadata[req.storage_index.fqn]
+            dtype = tensor_meta.properties.dtype
+            element_size = torch.empty(0, dtype=dtype).element_size()
+            numel = item_md.length // element_size
+            if numel == 0:
+                tensor = torch.empty(0, dtype=dtype)
+            else:
+                tensor = torch.frombuffer(
+                    buffer, dtype=dtype, count=numel, offset=item_md.offset
+                )
+            tensor = tensor.reshape(req.lengths)
+            tensor = narrow_tensor_by_index(
+                tensor, req.storage_offsets, req.lengths
+            )
+            with self._planner_lock:
+                target_tensor = planner.resolve_tensor(req).detach()
+
+            err_msg = (
+                f"req {req.storage_index} mismatch sizes "
+                f"{target_tensor.size()} vs {tensor.size()}"
+            )
+            assert target_tensor.size() == tensor.size(), err_msg
+            target_tensor.copy_(tensor)
+            with self._planner_lock:
+                planner.commit_tensor(req, target_tensor)
+
     # Implement the abstract function in StorageReader
     def read_metadata(self) -> Metadata:
         with (self.path / ".metadata").open("rb") as metadata_file:
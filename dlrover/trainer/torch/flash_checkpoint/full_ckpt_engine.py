@@ -20,16 +20,24 @@ import torch.distributed as dist
 from dlrover.python.common import env_utils
 from dlrover.python.common.constants import CheckpointConstant
 from dlrover.python.common.log import default_logger as logger
+from dlrover.python.common.storage import CheckpointCorruptionError
 from dlrover.python.elastic_agent.torch.ckpt_saver import (
     CheckpointConfig,
     CheckpointEvent,
     CheckpointEventType,
     DdpCheckpointSaver,
+    read_state_dict_file,
 )
 
 from .engine import CheckpointEngine, timer
 
 
+def _load_state_dict(path):
+    return read_state_dict_file(
+        path, lambda path: torch.load(path, map_location="cpu")
+    )
+
+
 class FullCheckpointEngine(CheckpointEngine):
     """
     Save the checkpoint state dict of DDP model into the memory or storage.
@@ -187,7 +195,7 @@ class FullCheckpointEngine(CheckpointEngine):
         if resume_path:
             state_dict = self.storage.read_state_dict(
                 resume_path,
-                read_func=lambda path: torch.load(path, map_location="cpu"),
+                read_func=_load_state_dict,
             )
             return state_dict
         else:
@@ -198,14 +206,37 @@ class FullCheckpointEngine(CheckpointEngine):
             if not content:
                 return state_dict
             iteration = int(content.strip())
-            path = self._gen_restore_checkpoint_path(iteration)
-            logger.info(f"Load the state dict from {path}")
-            state_dict = self.storage.read_state_dict(
-                path,
-                read_func=lambda path: torch.load(path, map_location="cpu"),
-            )
+            state_dict = self._load_step_with_fallback(iteration)
             return state_dict
 
+    def _load_step_with_fallback(self, step):
+        """
+        Load the checkpoint of the step. The method falls back to the
+        previous steps in the checkpoint directory if the checkpoint
+        is corrupted.
+        """
+        steps = [step]
+        if self.storage.exists(self.checkpoint_dir):
+            previous_steps = [
+                int(name)
+                for name in self.storage.listdir(self.checkpoint_dir)
+                if name.isdigit() and int(name) < step
+            ]
+            steps.extend(sorted(previous_steps, reverse=True))
+        for step in steps:
+            path = self._gen_restore_checkpoint_path(step)
+            logger.info(f"Load the state dict from {path}")
+            try:
+                return self.storage.read_state_dict(
+                    path,
+                    read_func=_load_state_dict,
+                )
+            except CheckpointCorruptionError as e:
+                logger.warning(
+                    f"Skip the corrupted checkpoint of step {step}: {e}"
+                )
+        return {}
+
     def _gen_restore_checkpoint_path(self, iteration):
         if self._global_shard_num == 1:
             #  Load the checkpoint saved by rank 0 if no sharding.
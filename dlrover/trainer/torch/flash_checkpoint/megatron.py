@@ -33,6 +33,7 @@ from dlrover.python.common.singleton import Singleton
 from dlrover.python.common.storage import PosixDiskStorage
 from dlrover.python.elastic_agent.torch.ckpt_saver import (
     MegatronCheckpointSaver,
+    read_state_dict_file,
 )
 
 from .checkpointer import StorageType
@@ -90,7 +91,10 @@ class MegatronCheckpointer(Singleton):
 
     def load(self, path: str, **kwargs):
         def load_func(path):
-            return torch_native_load(path, map_location="cpu")
+            return read_state_dict_file(
+                path,
+                lambda path: torch_native_load(path, map_location="cpu"),
+            )
 
         if not isinstance(path, str):
             return torch_native_load(path)
@@ -34,6 +34,10 @@ class MegatronCheckpointEngine(CheckpointEngine):
     the storage.
     """
 
+    # The mixed precision optimizer of Megatron-LM updates the fp16
+    # weights from the main params by `tensor.data`.
+    delta_copy_supported = False
+
     def __init__(
         self,
         checkpoint_dir,
@@ -166,6 +170,9 @@ class MegatronDistCheckpointEngine(CheckpointEngine):
     the storage.
     """
 
+    # See `MegatronCheckpointEngine.delta_copy_supported`.
+    delta_copy_supported = False
+
     def __init__(
         self,
         checkpoint_dir,
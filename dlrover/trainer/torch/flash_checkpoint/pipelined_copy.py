@@ -0,0 +1,327 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+import torch
+from torch.optim.optimizer import register_optimizer_step_pre_hook
+
+from dlrover.python.common.constants import CheckpointConstant
+from dlrover.python.common.log import default_logger as logger
+
+
+def is_pipelined_copy_enabled():
+    """Whether to copy the state dict into the memory by staging buffers."""
+    value = os.getenv(CheckpointConstant.PIPELINED_COPY_ENV, "false")
+    return value.lower() in ["true", "1"]
+
+
+class HostCopyStream(object):
+    """
+    The stream to synchronously copy tensors on the CPU. The engine
+    uses it if CUDA is not available.
+    """
+
+    pin_memory = False
+
+    def begin(self):
+        pass
+
+    def copy(self, dst: torch.Tensor, src: torch.Tensor):
+        dst.copy_(src)
+
+    def record(self):
+        return None
+
+    def synchronize(self, event):
+        pass
+
+    def end(self):
+        pass
+
+    def wait_copied(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class CudaCopyStream(object):
+    """
+    The side CUDA stream to asynchronously copy tensors from the device
+    into the pinned staging buffers.
+
+    Only the optimizer step, which updates the tensors in place, waits
+    for the copy on the device, so the next forward and backward overlap
+    with it. The buffers updated in the forward, like the running stats
+    of the batch norm, may be copied with the values of the next step.
+    """
+
+    pin_memory = True
+
+    def __init__(self):
+        self._stream = torch.cuda.Stream()
+        # The event recorded after all queued copies.
+        self._copied_event = None
+        self._step_hook = register_optimizer_step_pre_hook(
+            lambda optimizer, args, kwargs: self.wait_copied()
+        )
+
+    def begin(self):
+        # Copy the tensors after the queued kernels which update them.
+        self._stream.wait_stream(torch.cuda.current_stream())
+
+    def copy(self, dst: torch.Tensor, src: torch.Tensor):
+        with torch.cuda.stream(self._stream):
+            dst.copy_(src, non_blocking=True)
+        if src.is_cuda:
+            src.record_stream(self._stream)
+
+    def record(self):
+        event = torch.cuda.Event()
+        event.record(self._stream)
+        return event
+
+    def synchronize(self, event):
+        event.synchronize()
+
+    def end(self):
+        self._copied_event = self.record()
+
+    def wait_copied(self):
+        """
+        Make the kernels queued later on the current stream, like the
+        optimizer step, wait until the tensors are copied from the device.
+        """
+        event, self._copied_event = self._copied_event, None
+        if event is not None:
+            torch.cuda.current_stream().wait_event(event)
+
+    def close(self):
+        self._step_hook.remove()
+
+
+@dataclass
+class _StagingTask(object):
+    """
+    A staging buffer to copy into the shared memory and the callback
+    to call after the copy.
+
+    Attributes:
+        staging: the staging buffer.
+        event: the event recorded after copying into the staging buffer.
+        copies: the offset in the target buffer, the offset in the staging
+            buffer and the number of bytes of each copy.
+        buffer: the target buffer like the buffer of the shared memory.
+        callback: the function to call after the copy.
+    """
+
+    staging: Optional[torch.Tensor] = None
+    event: object = None
+    copies: List[Tuple[int, int, int]] = field(default_factory=list)
+    buffer: object = None
+    callback: Optional[Callable] = None
+
+
+class PipelinedTensorCopier(object):
+    """
+    Copy the tensors into the shared memory by size-bucketed chunks through
+    a reusable pool of (pinned) staging buffers. The training thread only
+    queues the copies from the device into the staging buffers on a side
+    stream and a background thread copies the staging buffers into the
+    shared memory, so the copy is overlapped with the next training step.
+    The training thread only blocks if all staging buffers are in use.
+
+    Args:
+        buffer_size (int): the bytes of a staging buffer.
+        buffer_num (int): the max number of staging buffers.
+        stream: the stream to copy tensors into the staging buffers. It is
+            a `CudaCopyStream` if CUDA is available, otherwise,
+            a `HostCopyStream`.
+    """
+
+    def __init__(self, buffer_size: int, buffer_num: int, stream=None):
+        if stream is None:
+            if torch.cuda.is_available():
+                stream = CudaCopyStream()
+            else:
+                stream = HostCopyStream()
+        self._stream = stream
+        self._buffer_size = max(buffer_size, 1)
+        self._buffer_num = max(buffer_num, 1)
+        self._allocated_num = 0
+        self._free_buffers: queue.Queue = queue.Queue()
+        self._tasks: queue.Queue = queue.Queue()
+        self._staging: Optional[torch.Tensor] = None
+        self._staging_used = 0
+        self._copies: List[Tuple[int, int, int]] = []
+        self._target = None
+        self._started = False
+        self._error: Optional[Exception] = None
+        # The time to wait for a free staging buffer since the latest wait.
+        self.stall_time = 0.0
+        self._thread = threading.Thread(
+            target=self._copy_to_target,
+            name="ckpt_staging_copy",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @classmethod
+    def from_env(cls):
+        buffer_size = int(
+            os.getenv(
+                CheckpointConstant.STAGING_BUFFER_SIZE_ENV,
+                CheckpointConstant.DEFAULT_STAGING_BUFFER_SIZE,
+            )
+        )
+        buffer_num = int(
+            os.getenv(
+                CheckpointConstant.STAGING_BUFFER_NUM_ENV,
+                CheckpointConstant.DEFAULT_STAGING_BUFFER_NUM,
+            )
+        )
+        return cls(buffer_size, buffer_num)
+
+    def _get_free_buffer(self):
+        try:
+            return self._free_buffers.get_nowait()
+        except queue.Empty:
+            pass
+        if self._allocated_num < self._buffer_num:
+            self._allocated_num += 1
+            return torch.empty(
+                self._buffer_size,
+                dtype=torch.uint8,
+                pin_memory=self._stream.pin_memory,
+            )
+        start = time.time()
+        staging = self._free_buffers.get()
+        self.stall_time += time.time() - start
+        return staging
+
+    def _submit_staging(self):
+        task = _StagingTask(
+            staging=self._staging,
+            event=self._stream.record(),
+            copies=self._copies,
+            buffer=self._target,
+        )
+        self._tasks.put(task)
+        self._staging = None
+        self._staging_used = 0
+        self._copies = []
+
+    def write(self, value: torch.Tensor, meta, buffer):
+        """
+        Queue the copy of a tensor into the buffer at the offset of its meta.
+        It can be the `write_func` of `_traverse_copy_to_shm`.
+        """
+        if value.numel() == 0:
+            return
+        if not self._started:
+            self._stream.begin()
+            self._started = True
+        if self._staging is not None and buffer is not self._target:
+            self._submit_staging()
+        self._target = buffer
+        src = value.detach().reshape(-1).view(torch.uint8)
+        copied = 0
+        total = src.numel()
+        while copied < total:
+            if self._staging is None:
+                self._staging = self._get_free_buffer()
+            nbytes = min(
+                total - copied, self._buffer_size - self._staging_used
+            )
+            end = self._staging_used + nbytes
+            self._stream.copy(
+                self._staging[self._staging_used : end],  # noqa E203
+                src[copied : copied + nbytes],  # noqa E203
+            )
+            self._copies.append(
+                (meta.offset + copied, self._staging_used, nbytes)
+            )
+            self._staging_used = end
+            copied += nbytes
+            if self._staging_used == self._buffer_size:
+                self._submit_staging()
+
+    def flush(self, callback: Optional[Callable] = None):
+        """
+        Submit the queued copies and call the callback in the background
+        thread after all queued copies are done.
+        """
+        if self._staging is not None:
+            self._submit_staging()
+        if self._started:
+            self._stream.end()
+            self._started = False
+        self._tasks.put(_StagingTask(callback=callback))
+
+    def wait(self):
+        """
+        Wait until all submitted copies are done and raise the error
+        if any copy failed.
+        """
+        self._tasks.join()
+        self._stream.wait_copied()
+        self.stall_time = 0.0
+        if self._error is not None:
+            error = self._error
+            self._error = None
+            raise error
+
+    @property
+    def failed(self):
+        return self._error is not None
+
+    def close(self, timeout=60):
+        """Stop the background thread after the submitted copies are done."""
+        self._tasks.put(None)
+        self._thread.join(timeout)
+        self._stream.close()
+
+    def _copy_to_target(self):
+        while True:
+            task: Optional[_StagingTask] = self._tasks.get()
+            if task is None:
+                self._tasks.task_done()
+                break
+            try:
+                if task.staging is not None and self._error is None:
+                    self._stream.synchronize(task.event)
+                    for dst_offset, offset, nbytes in task.copies:
+                        dst = torch.frombuffer(
+                            task.buffer,
+                            dtype=torch.uint8,
+                            count=nbytes,
+                            offset=dst_offset,
+                        )
+                        dst.copy_(
+                            task.staging[offset : offset + nbytes]  # noqa E203
+                        )
+                if task.callback:
+                    task.callback()
+            except Exception as e:
+                logger.error(f"Failed to copy the staging buffer: {e}")
+                self._error = e
+            finally:
+                if task.staging is not None:
+                    self._free_buffers.put(task.staging)
+                self._tasks.task_done()
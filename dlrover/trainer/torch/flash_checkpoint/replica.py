@@ -11,6 +11,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import time
 from abc import ABCMeta, abstractmethod
 from typing import Dict, List
 
@@ -18,11 +20,9 @@ import torch
 import torch.distributed as dist
 
 from dlrover.python.common import env_utils
-from dlrover.python.elastic_agent.torch.ckpt_saver import (
-    DLROVER_CKPT_CONFIG_KEY,
-    CheckpointConfig,
-    SharedMemoryHandler,
-)
+from dlrover.python.common.constants import CheckpointConstant
+from dlrover.python.common.log import default_logger as logger
+from dlrover.python.elastic_agent.torch.ckpt_saver import SharedMemoryHandler
 
 
 class CkptReplicaManger(metaclass=ABCMeta):
@@ -74,12 +74,23 @@ class ShardCkptReplicaManager(CkptReplicaManger):
     """
     The manager will select a rank of another node to backup the checkpoint
     of the current rank.
+
+    The ranks in a backup group exchange their shards by point-to-point
+    communication in bounded chunks which are sent from and received into
+    the shared memory directly, so the backup neither pads the shards to
+    the max size nor allocates buffers of the whole group.
     """
 
     def __init__(self, replica_count=0) -> None:
         super().__init__(replica_count)
 
         self.backup_ranks = self._get_backup_ranks(replica_count)
+        self._chunk_size = int(
+            os.getenv(
+                CheckpointConstant.REPLICA_CHUNK_SIZE_ENV,
+                CheckpointConstant.DEFAULT_REPLICA_CHUNK_SIZE,
+            )
+        )
         if dist.is_initialized() and replica_count > 0:
             self._backup_group = dist.new_group(
                 backend="gloo", ranks=self.backup_ranks
@@ -87,11 +98,17 @@ class ShardCkptReplicaManager(CkptReplicaManger):
 
     def _get_backup_ranks(self, replica_count):
         """
-        Get the ranks to backup checkpoint. Assuming each group has 3 nodes
-        (group_size=3) and each node has 2 ranks. The backup ranks of local
-        rank in each node are:
-        local rank 0: {0, 8 ,16}
-        local rank 1: {1, 9, 17}
+        Get the ranks to backup checkpoint. The rendezvous sorts the nodes
+        under an access switch together in the order of node ranks, so the
+        nodes in a backup group are strided by the number of groups to
+        place the replicas in different racks. Assuming there are 6 nodes,
+        each group has 3 nodes (group_size=3) and each node has 8 ranks.
+        The backup ranks of local rank in each node are:
+        local rank 0 of node 0: {0, 16 ,32}
+        local rank 1 of node 1: {9, 25, 41}
+
+        The nodes with continuous ranks are in a group if the number
+        of nodes is unknown or not divisible by the group size.
 
         Arguments:
             node_rank: the rank of node in the job.
@@ -106,18 +123,29 @@ class ShardCkptReplicaManager(CkptReplicaManger):
         if replica_count <= 0:
             return backup_ranks
 
-        group_index = self.node_rank // replica_count
-        for i in range(replica_count):
-            node_rank = group_index * replica_count + i
+        node_ranks = []
+        if self.node_num >= replica_count and (
+            self.node_num % replica_count == 0
+        ):
+            group_num = self.node_num // replica_count
+            group_index = self.node_rank % group_num
+            for i in range(replica_count):
+                node_ranks.append(group_index + i * group_num)
+        else:
+            group_index = self.node_rank // replica_count
+            for i in range(replica_count):
+                node_ranks.append(group_index * replica_count + i)
+        for node_rank in node_ranks:
             rank = node_rank * self.local_world_size + self.local_rank
             backup_ranks.append(rank)
         return backup_ranks
 
     def backup(self, shm_handler: SharedMemoryHandler):
         """
-        The rank of node in a backup group send its checkpoint shard
-        in the shared memory to other nodes and get the checkpoint shards
-        of other nodes by allgather.
+        The ranks of nodes in a backup group exchange the checkpoint shards
+        in the shared memory in a ring. At the i-th step, each rank sends its
+        shard to the i-th next rank and receives the shard of the i-th
+        previous rank into the shared memory of the replica.
 
         Arguments:
             shm_handler: The shared memory handler of the current rank on
@@ -127,68 +155,99 @@ class ShardCkptReplicaManager(CkptReplicaManger):
         if self.replica_count == 0:
             return
         assert shm_handler.shared_memory is not None
-        buffer = shm_handler.shared_memory.buf
-        meta_data = shm_handler.metadata.get()
-        shm_tensors, ckpt_metas = self._gather_peer_ckpt(buffer, meta_data)
+        start = time.time()
         self._rank_shms[self.rank] = shm_handler
-        self._write_peer_ckpt_to_shm(shm_tensors, ckpt_metas)
-
-    def _gather_peer_ckpt(self, buffer, meta_data):
-        byte_tensor = torch.ByteTensor(buffer)
-        group_size = dist.get_world_size(group=self._backup_group)
-        max_size = self._get_max_tensor_size(byte_tensor)
-        # Resize tensor to max size across all ranks.
-        byte_tensor.resize_(max_size)
-
-        output_tensors = [
-            torch.empty(
-                max_size, dtype=torch.uint8, device=self.current_device
-            )
-            for _ in range(group_size)
-        ]
-        dist.all_gather(output_tensors, byte_tensor, group=self._backup_group)
-
-        output_meta_objs = [None for _ in range(group_size)]
-        dist.all_gather_object(
-            output_meta_objs, meta_data, group=self._backup_group
+        byte_tensor = _get_shm_tensor(shm_handler)
+        meta_data = shm_handler.metadata.get()
+        shard_infos = self._gather_shard_infos(
+            {self.rank: (byte_tensor.numel(), meta_data)}
         )
-        return output_tensors, output_meta_objs
+        group_size = len(self.backup_ranks)
+        index = self.backup_ranks.index(self.rank)
+        sent_bytes = 0
+        recv_bytes = 0
+        for step in range(1, group_size):
+            dst_rank = self.backup_ranks[(index + step) % group_size]
+            src_rank = self.backup_ranks[(index - step) % group_size]
+            size, meta = shard_infos[src_rank][src_rank]
+            recv_tensor = None
+            if size > 0 and meta:
+                replica_handler = self._get_replica_shm_handler(src_rank, size)
+                recv_tensor = _get_shm_tensor(replica_handler)
+            send_tensor = None
+            if byte_tensor.numel() > 0 and meta_data:
+                send_tensor = byte_tensor
+                sent_bytes += byte_tensor.numel()
+            self._exchange_chunks(send_tensor, dst_rank, recv_tensor, src_rank)
+            if recv_tensor is not None:
+                self._rank_shms[src_rank].metadata.set(meta)
+                recv_bytes += size
+        self._report_bandwidth("Back up", sent_bytes + recv_bytes, start)
+
+    def _get_replica_shm_handler(self, rank, size):
+        """Get the handler of the shared memory to store the replica."""
+        if rank not in self._rank_shms:
+            self._rank_shms[rank] = SharedMemoryHandler(local_rank=rank)
+        shm_handler = self._rank_shms[rank]
+        shm = shm_handler.shared_memory
+        if shm is None or shm.size != size:
+            if shm is not None:
+                shm.close()
+            shm_handler.init_shared_memory(create=True, size=size)
+        return shm_handler
+
+    def _gather_shard_infos(self, local_infos):
+        """
+        Gather the size and meta of shards in the memory of each rank in
+        the backup group.
 
-    def _get_max_tensor_size(self, byte_tensor: torch.ByteTensor):
-        local_size = torch.LongTensor([byte_tensor.numel()]).to(
-            self.current_device
-        )
+        Returns:
+            A dict whose key is the rank and the value is a dict mapping the
+            owner rank of a shard to its size and meta.
+        """
         group_size = len(self.backup_ranks)
-        shm_sizes_tensor = torch.zeros(
-            group_size, dtype=torch.long, device=self.current_device
+        output_infos: List = [None for _ in range(group_size)]
+        dist.all_gather_object(
+            output_infos, local_infos, group=self._backup_group
         )
-        shm_size_list = [
-            shm_sizes_tensor[i].unsqueeze(dim=0) for i in range(group_size)
-        ]
-        # Allgather tensor sizes
-        dist.all_gather(shm_size_list, local_size, group=self._backup_group)
+        return dict(zip(self.backup_ranks, output_infos))
 
-        return int(max(shm_size_list))
-
-    def _write_peer_ckpt_to_shm(self, shm_tensors, ckpt_metas):
-        for shm_tensor, meta in zip(shm_tensors, ckpt_metas):
-            # Skip writing the self checkpoint into the shared memory.
-            config: CheckpointConfig = meta[DLROVER_CKPT_CONFIG_KEY]
-            if config.rank == self.rank:
-                continue
-            if config.rank not in self._rank_shms:
-                shm_hanlder = SharedMemoryHandler(local_rank=config.rank)
-                shm_hanlder.init_shared_memory(
-                    create=True, size=shm_tensor.numel()
+    def _exchange_chunks(self, send_tensor, dst_rank, recv_tensor, src_rank):
+        """
+        Send the tensor to the destination rank and receive the tensor from
+        the source rank chunk by chunk.
+        """
+        send_size = send_tensor.numel() if send_tensor is not None else 0
+        recv_size = recv_tensor.numel() if recv_tensor is not None else 0
+        for offset in range(0, max(send_size, recv_size), self._chunk_size):
+            end = offset + self._chunk_size
+            works = []
+            if offset < send_size:
+                work = dist.isend(
+                    send_tensor[offset:end],
+                    dst=dst_rank,
+                    group=self._backup_group,
                 )
-                self._rank_shms[config.rank] = shm_hanlder
-            shm_hanlder = self._rank_shms[config.rank]
-            local_shm_tensor = torch.frombuffer(
-                buffer=shm_hanlder.shared_memory.buf,
-                dtype=torch.uint8,
-            )
-            local_shm_tensor.copy_(shm_tensor)
-            shm_hanlder.metadata.set(meta)
+                works.append(work)
+            if offset < recv_size:
+                work = dist.irecv(
+                    recv_tensor[offset:end],
+                    src=src_rank,
+                    group=self._backup_group,
+                )
+                works.append(work)
+            for work in works:
+                work.wait()
+
+    def _report_bandwidth(self, action, num_bytes, start):
+        elapsed_time = max(time.time() - start, 1e-6)
+        bandwidth = num_bytes / elapsed_time / 1024 / 1024
+        logger.info(
+            f"{action} the checkpoint shards of {num_bytes} bytes "
+            f"in {round(elapsed_time, 3)}s, bandwidth = "
+            f"{round(bandwidth, 2)}MB/s."
+        )
+        return bandwidth
 
     def gather(self, shm_handler: SharedMemoryHandler):
         """
@@ -196,11 +255,9 @@ class ShardCkptReplicaManager(CkptReplicaManger):
         node in a backup group. Assuming each backup group has two nodes,
         the each rank of each node has two checkpoint shards. For example,
         assuming each node only has one rank, the checkpoint shards of 2 nodes
-        is like {0: shard_0, 1: shard_1}. The method will perform
-        len(ckpt_shards) rounds allgather for each shard. In the 1st round,
-        the ranks in 2 nodes allgather shard_0 and rank-0 will select the
-        valid shard_0 from all ranks. In the 2nd round, the rank-1 will select
-        the valid shard_1 from all ranks.
+        is like {0: shard_0, 1: shard_1}. If the rank-0 restarts without
+        shard_0 in the memory, the rank-1 sends the replica of shard_0 to
+        the rank-0 which receives it into its shared memory.
 
         Arguments:
             shm_handler: The shared memory handler of the current rank on
@@ -212,38 +269,85 @@ class ShardCkptReplicaManager(CkptReplicaManger):
         """
         shm_handlers = {}
         for rank in self.backup_ranks:
-            if rank != self.rank:
-                shm_handler = SharedMemoryHandler(local_rank=rank)
-                shm_handler.init_shared_memory()
-            shm_handlers[rank] = shm_handler
+            if rank == self.rank:
+                shm_handlers[rank] = shm_handler
+            elif rank in self._rank_shms:
+                shm_handlers[rank] = self._rank_shms[rank]
+            else:
+                replica_handler = SharedMemoryHandler(local_rank=rank)
+                replica_handler.init_shared_memory()
+                shm_handlers[rank] = replica_handler
         shm_tensor, meta = self._gather_owner_checkpoint(shm_handlers)
         return shm_tensor, meta
 
     def _gather_owner_checkpoint(
         self, shm_handlers: Dict[int, SharedMemoryHandler]
     ):
+        """
+        Send the replica of the shard to its owner rank if the owner has
+        not the shard in the memory.
+
+        Arguments:
+            shm_handlers: the handlers of shared memory with the shards
+                by the owner rank.
+        """
+        start = time.time()
+        local_infos = {}
+        for rank, shm_handler in shm_handlers.items():
+            meta_data = {}
+            if shm_handler.shared_memory:
+                meta_data = shm_handler.metadata.get()
+            if meta_data:
+                size = shm_handler.shared_memory.size
+                local_infos[rank] = (size, meta_data)
+        shard_infos = self._gather_shard_infos(local_infos)
+
         ckpt_shm_tensor = None
         ckpt_meta = {}
-        for i, rank in enumerate(self.backup_ranks):
-            shm_handler = shm_handlers[i]
-            if shm_handler.shared_memory:
-                assert shm_handler.shared_memory is not None
-                buffer = shm_handler.shared_memory.buf
-                meta_data = shm_handlers[rank].metadata.get()
-            else:
-                buffer = memoryview(b"")
-                meta_data = {}
-            shm_tensors, ckpt_metas = self._gather_peer_ckpt(buffer, meta_data)
-            if rank != self.rank:
+        if self.rank in local_infos:
+            shm_handler = shm_handlers[self.rank]
+            ckpt_shm_tensor = _get_shm_tensor(shm_handler)
+            ckpt_meta = local_infos[self.rank][1]
+
+        transferred_bytes = 0
+        for owner_rank in self.backup_ranks:
+            if owner_rank in shard_infos[owner_rank]:
+                continue
+            src_ranks = [
+                rank
+                for rank in self.backup_ranks
+                if owner_rank in shard_infos[rank]
+            ]
+            if not src_ranks:
                 continue
-            for shm_tenor, meta in zip(shm_tensors, ckpt_metas):
-                if meta:
-                    ckpt_shm_tensor = shm_tenor
-                    ckpt_meta = meta
-                    break
+            src_rank = src_ranks[0]
+            size, meta = shard_infos[src_rank][owner_rank]
+            if self.rank == src_rank:
+                send_tensor = _get_shm_tensor(shm_handlers[owner_rank])
+                self._exchange_chunks(send_tensor, owner_rank, None, -1)
+            elif self.rank == owner_rank:
+                shm_handler = shm_handlers[owner_rank]
+                shm_handler.init_shared_memory(create=True, size=size)
+                ckpt_shm_tensor = _get_shm_tensor(shm_handler)
+                self._exchange_chunks(None, -1, ckpt_shm_tensor, src_rank)
+                shm_handler.metadata.set(meta)
+                ckpt_meta = meta
+                logger.info(
+                    f"Restore the checkpoint shard with size = {size} "
+                    f"from the replica in the memory of rank {src_rank}."
+                )
+            transferred_bytes += size
+        if transferred_bytes > 0:
+            self._report_bandwidth("Restore", transferred_bytes, start)
         return ckpt_shm_tensor, ckpt_meta
 
 
+def _get_shm_tensor(shm_handler: SharedMemoryHandler):
+    """Get the byte tensor which shares the buffer of the shared memory."""
+    assert shm_handler.shared_memory is not None
+    return torch.frombuffer(shm_handler.shared_memory.buf, dtype=torch.uint8)
+
+
 class FullCkptReplicaManager(CkptReplicaManger):
     """
     The node does not need to backup checkpoint if each rank has
@@ -0,0 +1,112 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The benchmark of the throughput versus the compression ratio of
+`CompressedStorage` on the model and Adam optimizer states which are
+trained by a few steps in float32 and bfloat16.
+
+Usage:
+    python scripts/benchmark/ckpt_compression_benchmark.py \
+        --hidden-size 1024 --layers 8 --workers 1 4 8
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+import torch.nn as nn
+
+from dlrover.python.common.storage import (
+    compress_buffers,
+    decompress_buffer,
+    get_available_codecs,
+)
+
+
+def _build_state_buffers(hidden_size, layers, dtype, steps=3):
+    model = nn.Sequential(
+        *[nn.Linear(hidden_size, hidden_size) for _ in range(layers)]
+    ).to(dtype)
+    optimizer = torch.optim.Adam(model.parameters(), lr=1e-3)
+    for _ in range(steps):
+        x = torch.randn(16, hidden_size, dtype=dtype)
+        model(x).float().pow(2).mean().backward()
+        optimizer.step()
+        optimizer.zero_grad()
+
+    buffers = []
+    for value in model.state_dict().values():
+        buffers.append(value.reshape(-1).view(torch.uint8).numpy())
+    for state in optimizer.state_dict()["state"].values():
+        for value in state.values():
+            if torch.is_tensor(value) and value.numel() > 1:
+                buffers.append(value.reshape(-1).view(torch.uint8).numpy())
+    return buffers
+
+
+def run(hidden_size, layers, workers, chunk_size, iterations):
+    print(
+        f"{'dtype':<10}{'codec':<6}{'workers':>8}{'ratio':>8}"
+        f"{'compress':>16}{'decompress':>16}"
+    )
+    for dtype in [torch.float32, torch.bfloat16]:
+        buffers = _build_state_buffers(hidden_size, layers, dtype)
+        raw_size = sum(len(b) for b in buffers)
+        for codec in get_available_codecs():
+            for worker_num in workers:
+                executor = ThreadPoolExecutor(max_workers=worker_num)
+                start = time.time()
+                for _ in range(iterations):
+                    compressed = compress_buffers(
+                        buffers, codec, chunk_size, executor
+                    )
+                compress_time = (time.time() - start) / iterations
+                data = b"".join(compressed)
+                start = time.time()
+                for _ in range(iterations):
+                    decompress_buffer(data, executor=executor)
+                decompress_time = (time.time() - start) / iterations
+                executor.shutdown()
+                ratio = raw_size / len(data)
+                compress_speed = raw_size / compress_time / 1024 / 1024
+                decompress_speed = raw_size / decompress_time / 1024 / 1024
+                print(
+                    f"{str(dtype).split('.')[-1]:<10}{codec:<6}"
+                    f"{worker_num:>8}{ratio:>8.3f}"
+                    f"{compress_speed:>12.1f}MB/s"
+                    f"{decompress_speed:>12.1f}MB/s"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hidden-size", type=int, default=1024)
+    parser.add_argument("--layers", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=4 * 1024 * 1024,
+        help="The bytes of each chunk to compress.",
+    )
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+    run(
+        args.hidden_size,
+        args.layers,
+        args.workers,
+        args.chunk_size,
+        args.iterations,
+    )
@@ -0,0 +1,123 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The benchmark of the throughput of `BatchDatasetManager` to dispatch and
+complete the tasks of a dataset with many shards, to recover the tasks of
+failed workers and to checkpoint and restore the shards.
+
+Usage:
+    python scripts/benchmark/dataset_task_benchmark.py \
+        --shards 1000000 --workers 1000 --inflight 8
+"""
+
+import argparse
+import logging
+import time
+
+from dlrover.python.common.constants import NodeType
+from dlrover.python.common.log import default_logger
+from dlrover.python.master.shard.batch_dataset_manager import (
+    BatchDatasetManager,
+)
+from dlrover.python.master.shard.dataset_splitter import TableDatasetSplitter
+
+
+def _get_node_task_ids(dataset, node_id):
+    get_node_task_ids = getattr(dataset.doing, "get_node_task_ids", None)
+    if get_node_task_ids:
+        return get_node_task_ids(NodeType.WORKER, node_id)
+    return [
+        task_id
+        for task_id, doing_task in dataset.doing.items()
+        if doing_task.node_type == NodeType.WORKER
+        and doing_task.node_id == node_id
+    ]
+
+
+def create_dataset(shards, shard_size, shuffle):
+    splitter = TableDatasetSplitter(
+        dataset_name="benchmark",
+        dataset_size=shards * shard_size,
+        shard_size=shard_size,
+        num_epochs=1,
+        shuffle=shuffle,
+        max_shard_count=shards,
+    )
+    return BatchDatasetManager(0, shard_size, splitter)
+
+
+def main(args):
+    default_logger.setLevel(logging.WARNING)
+    dataset = create_dataset(args.shards, args.shard_size, args.shuffle)
+
+    start = time.time()
+    dataset.get_task(NodeType.WORKER, 0)
+    print(f"create shards: {time.time() - start:.3f}s")
+
+    # Each worker holds `inflight` tasks and reports a task to get a new one.
+    start = time.time()
+    inflight = []
+    for i in range(args.workers * args.inflight):
+        task = dataset.get_task(NodeType.WORKER, i % args.workers)
+        inflight.append(task.task_id)
+    completed = 0
+    while True:
+        task_id = inflight[completed % len(inflight)]
+        dataset.report_task_status(task_id, True)
+        completed += 1
+        task = dataset.get_task(NodeType.WORKER, completed % args.workers)
+        if task.task_id < 0:
+            break
+        inflight[(completed - 1) % len(inflight)] = task.task_id
+    elapsed = time.time() - start
+    print(
+        f"get_task + report_task_status: {elapsed:.3f}s, "
+        f"{completed / elapsed:.0f} tasks/s"
+    )
+
+    dataset = create_dataset(args.shards, args.shard_size, args.shuffle)
+    for i in range(args.workers * args.inflight):
+        dataset.get_task(NodeType.WORKER, i % args.workers)
+    start = time.time()
+    for node_id in range(args.workers):
+        for task_id in _get_node_task_ids(dataset, node_id):
+            doing_task = dataset.doing.pop(task_id)
+            dataset.recover_task(doing_task.task)
+    print(f"recover tasks of all workers: {time.time() - start:.3f}s")
+
+    start = time.time()
+    checkpoint = dataset.checkpoint()
+    content = checkpoint.to_json()
+    print(
+        f"checkpoint: {time.time() - start:.3f}s, "
+        f"{len(content) / 1024:.1f}KB"
+    )
+    start = time.time()
+    dataset.restore_checkpoint(checkpoint)
+    print(f"restore checkpoint: {time.time() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shards", type=int, default=1000000)
+    parser.add_argument("--shard-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1000)
+    parser.add_argument(
+        "--inflight",
+        type=int,
+        default=8,
+        help="The number of tasks held by each worker.",
+    )
+    parser.add_argument("--shuffle", action="store_true")
+    main(parser.parse_args())
@@ -0,0 +1,97 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The benchmark of the throughput and latency of `KVStoreService` with
+different numbers of shards. The threads of the master service simulate
+the c10d store traffic of many ranks in a rendezvous round: each rank
+publishes its address, increases the member counter, elects a leader by
+compare-and-set and waits for the addresses of its peers.
+
+Usage:
+    python scripts/benchmark/kv_store_benchmark.py \
+        --ranks 10000 --threads 16 64 --shards 1 16
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dlrover.python.master.elastic_training.kv_store_service import (
+    KVStoreService,
+)
+
+_OPS_PER_RANK = 5
+
+
+def _run_rank(kv_store: KVStoreService, prefix, rank, peer_num):
+    start = time.time()
+    kv_store.set(f"{prefix}/addr/{rank}", f"10.0.0.{rank}:29500".encode())
+    kv_store.add(f"{prefix}/num_members", 1)
+    kv_store.compare_set(f"{prefix}/leader", b"", str(rank).encode())
+    kv_store.get(f"{prefix}/leader")
+    # Wait for the addresses of the previous peers like a ring.
+    peers = [f"{prefix}/addr/{max(rank - i, 0)}" for i in range(peer_num)]
+    kv_store.multi_get(peers, timeout=60)
+    return time.time() - start
+
+
+def run(ranks, threads, shards, rounds, peer_num):
+    print(
+        f"{'shards':>8}{'threads':>9}{'ops/s':>12}"
+        f"{'p50(ms)':>10}{'p99(ms)':>10}"
+    )
+    for shard_num in shards:
+        for thread_num in threads:
+            kv_store = KVStoreService(shard_num=shard_num)
+            latencies = []
+            start = time.time()
+            with ThreadPoolExecutor(max_workers=thread_num) as executor:
+                for i in range(rounds):
+                    prefix = f"torch.rendezvous.elastic-training.{i}"
+                    latencies.extend(
+                        executor.map(
+                            lambda rank: _run_rank(
+                                kv_store, prefix, rank, peer_num
+                            ),
+                            range(ranks),
+                        )
+                    )
+                    # Clear the keys of the round like the agent.
+                    kv_store.clear(prefix + ".")
+            elapsed = time.time() - start
+            throughput = ranks * rounds * _OPS_PER_RANK / elapsed
+            latencies.sort()
+            p50 = statistics.median(latencies) * 1000
+            p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+            print(
+                f"{shard_num:>8}{thread_num:>9}{throughput:>12.0f}"
+                f"{p50:>10.3f}{p99:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ranks", type=int, default=10000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[16, 64])
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--peers",
+        type=int,
+        default=2,
+        help="The number of peer addresses which each rank waits for.",
+    )
+    args = parser.parse_args()
+    run(args.ranks, args.threads, args.shards, args.rounds, args.peers)
@@ -0,0 +1,145 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The microbenchmark of the latency and throughput of `SharedDict` to pass
+the checkpoint metadata between local processes by the socket or by
+the shared memory of the connection.
+
+Usage:
+    python scripts/benchmark/local_comm_benchmark.py --payload meta
+    python scripts/benchmark/local_comm_benchmark.py --payload bytes \
+        --sizes 64 1024 65536
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import statistics
+import time
+
+import torch
+
+from dlrover.python.common.multi_process import (
+    SHM_MESSAGE_THRESHOLD_ENV,
+    SharedDict,
+    clear_sock_dir,
+)
+from dlrover.python.elastic_agent.torch.ckpt_saver import TensorMeta
+
+
+def _serve_dict(name, ready):
+    shared_dict = SharedDict(name=name, create=True)
+    ready.set()
+    while True:
+        time.sleep(1)
+    shared_dict.close()
+
+
+def _build_meta_dict(tensor_num):
+    meta_dict = {}
+    offset = 0
+    for i in range(tensor_num):
+        meta = TensorMeta(
+            shape=(1024, 1024),
+            dtype=torch.float32,
+            element_size=4,
+            numel=1024 * 1024,
+            offset=offset,
+        )
+        offset += meta.numel * meta.element_size
+        meta_dict[f"layers.{i}.weight"] = meta
+    return meta_dict
+
+
+def _build_bytes_dict(size_kb):
+    return {"data": os.urandom(size_kb * 1024)}
+
+
+def _measure(func, iterations):
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _report(transport, op, size, latencies):
+    p50 = statistics.median(latencies) * 1000
+    mean = statistics.mean(latencies)
+    throughput = size / mean / 1024 / 1024
+    print(
+        f"{transport:<8}{op:<6}{size / 1024:>12.1f}KB"
+        f"{p50:>12.3f}ms{throughput:>14.1f}MB/s"
+    )
+
+
+def run(payload, sizes, iterations, threshold):
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'':<8}{'op':<6}{'size':>14}{'p50':>14}{'throughput':>18}")
+    for transport, env_threshold in [
+        ("socket", str(2**31)),
+        ("shm", str(threshold)),
+    ]:
+        os.environ[SHM_MESSAGE_THRESHOLD_ENV] = env_threshold
+        for num in sizes:
+            name = f"benchmark_{transport}_{num}"
+            ready = ctx.Event()
+            server = ctx.Process(target=_serve_dict, args=(name, ready))
+            server.start()
+            ready.wait()
+            client = SharedDict(name=name, create=False)
+            if payload == "meta":
+                meta_dict = _build_meta_dict(num)
+            else:
+                meta_dict = _build_bytes_dict(num)
+            size = len(pickle.dumps(meta_dict))
+            # Warm up the connection and the shared memory.
+            client.set(meta_dict)
+            client.get()
+            latencies = _measure(lambda: client.set(meta_dict), iterations)
+            _report(transport, "set", size, latencies)
+            latencies = _measure(client.get, iterations)
+            _report(transport, "get", size, latencies)
+            client.close()
+            server.kill()
+            server.join()
+    clear_sock_dir()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--payload",
+        choices=["meta", "bytes"],
+        default="meta",
+        help="Pass a dict of tensor metas or a dict with a bytes value.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 10000, 100000],
+        help="The number of tensor metas or the KB of bytes in the dict.",
+    )
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument(
+        "--threshold",
+        type=int,
+        default=64 * 1024,
+        help="The messages larger than it pass the shared memory.",
+    )
+    args = parser.parse_args()
+    run(args.payload, args.sizes, args.iterations, args.threshold)
@@ -0,0 +1,133 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The load test of the HTTP master service. It compares the reported
+messages per second of the agents:
+    - legacy: a new connection and the JSON body with the base64 request.
+    - session: the keep-alive connections and the JSON body.
+    - binary: the keep-alive connections and the pickled body.
+    - batch: the keep-alive connections and several messages per request.
+
+Usage:
+    python scripts/benchmark/master_http_benchmark.py \
+        --threads 1 8 --requests 2000 --batch-size 8
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from dlrover.python.common import comm
+from dlrover.python.common.constants import (
+    CommunicationType,
+    KeyValueOps,
+    NodeEnv,
+)
+from dlrover.python.common.global_context import Context
+from dlrover.python.elastic_agent.master_client import HttpMasterClient
+from dlrover.python.master.local_master import LocalJobMaster
+from dlrover.python.scheduler.job import LocalJobArgs
+from dlrover.python.util.common_util import find_free_port
+
+
+def _start_http_master():
+    os.environ[
+        NodeEnv.DLROVER_MASTER_SERVICE_TYPE
+    ] = CommunicationType.COMM_SERVICE_HTTP
+    Context.singleton_instance().master_service_type = "http"
+    job_args = LocalJobArgs("local", "default", "benchmark")
+    job_args.initilize()
+    port = find_free_port()
+    master = LocalJobMaster(port, job_args)
+    master.prepare()
+    addr = f"127.0.0.1:{port}"
+    for _ in range(10):
+        if comm.addr_connected(addr):
+            break
+        time.sleep(1)
+    return master, addr
+
+
+def _new_message(i):
+    return comm.KeyValuePair(f"key-{i}", b"0" * 64, op=KeyValueOps.SET)
+
+
+def _report_legacy(client: HttpMasterClient, count, batch_size):
+    for i in range(count):
+        request = client._gen_request(_new_message(i))
+        with requests.post(
+            client._get_http_request_url("/report"),
+            json=request.to_json(),
+        ) as response:
+            assert response.status_code == 200
+
+
+def _report_one_by_one(client: HttpMasterClient, count, batch_size):
+    for i in range(count):
+        client._report(_new_message(i))
+
+
+def _report_batch(client: HttpMasterClient, count, batch_size):
+    for i in range(0, count, batch_size):
+        messages = [_new_message(j) for j in range(i, i + batch_size)]
+        client.batch_report(messages)
+
+
+def run(addr, threads, request_num, batch_size):
+    modes = [
+        ("legacy", False, _report_legacy),
+        ("session", False, _report_one_by_one),
+        ("binary", True, _report_one_by_one),
+        ("batch", True, _report_batch),
+    ]
+    print(f"{'mode':<10}{'threads':>8}{'messages/s':>14}")
+    for name, binary, report_func in modes:
+        for thread_num in threads:
+            clients = [
+                HttpMasterClient(addr, i, "worker", timeout=60, binary=binary)
+                for i in range(thread_num)
+            ]
+            count = request_num // thread_num
+            start = time.time()
+            with ThreadPoolExecutor(max_workers=thread_num) as executor:
+                futures = [
+                    executor.submit(report_func, c, count, batch_size)
+                    for c in clients
+                ]
+                for future in futures:
+                    future.result()
+            elapsed = time.time() - start
+            throughput = count * thread_num / elapsed
+            print(f"{name:<10}{thread_num:>8}{throughput:>14.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=2000,
+        help="The number of messages to report in each test.",
+    )
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+    master, addr = _start_http_master()
+    try:
+        run(addr, args.threads, args.requests, args.batch_size)
+    finally:
+        master.stop()
@@ -0,0 +1,84 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The benchmark of the encoding time, the decoding time and the bytes of
+the top messages to the master by pickle and by `message_codec`.
+
+Usage:
+    python scripts/benchmark/message_codec_benchmark.py --iterations 20000
+"""
+
+import argparse
+import json
+import time
+
+from dlrover.python.common import comm
+from dlrover.python.common.constants import MessageCodecType
+
+
+def _build_messages():
+    diagnosis_content = json.dumps(
+        {
+            "timestamp": int(time.time()),
+            "data_content": "step: 100, loss: 0.1, " * 20,
+            "node_id": 1,
+            "node_type": "worker",
+            "node_rank": 1,
+        }
+    )
+    gpu_stats = [comm.GPUStats(i, 81920, 40960, 0.95) for i in range(8)]
+    return [
+        comm.HeartBeat(timestamp=int(time.time())),
+        comm.GlobalStep(int(time.time()), 1000, 0.5),
+        comm.ResourceStats(memory=1 << 34, cpu=12.5, gpu_stats=gpu_stats),
+        comm.DiagnosisReportData("WorkerTrainingMetric", diagnosis_content, 1),
+        comm.KeyValuePairs(
+            {f"torch.rendezvous.{i}": b"10.0.0.1:29500" for i in range(8)}
+        ),
+        comm.Task(1, comm.Shard("dataset", 0, 1000), type=1),
+        comm.HeartbeatResponse(action=comm.DiagnosisAction("NoAction", "{}")),
+    ]
+
+
+def _measure(message, codec, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        data = message.serialize(codec)
+    encode_time = (time.perf_counter() - start) / iterations
+    start = time.perf_counter()
+    for _ in range(iterations):
+        comm.deserialize_message(data)
+    decode_time = (time.perf_counter() - start) / iterations
+    return len(data), encode_time * 1e6, decode_time * 1e6
+
+
+def run(iterations):
+    print(
+        f"{'message':<22}{'codec':<9}{'bytes':>7}"
+        f"{'encode(us)':>12}{'decode(us)':>12}"
+    )
+    for message in _build_messages():
+        for codec in [MessageCodecType.PICKLE, MessageCodecType.MSGPACK]:
+            size, encode_us, decode_us = _measure(message, codec, iterations)
+            print(
+                f"{type(message).__name__:<22}{codec:<9}{size:>7}"
+                f"{encode_us:>12.2f}{decode_us:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.iterations)
@@ -0,0 +1,132 @@
+# Copyright 2024 The DLRover Authors. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The benchmark of the time to create the pods of a job by `PodScaler` with
+a fake k8s client. The fake API server takes the latency to handle
+a request and rejects the requests over its QPS like the throttling of
+the k8s API server.
+
+Usage:
+    python scripts/benchmark/pod_creation_benchmark.py \
+        --pods 1000 --concurrency 4 16 64 --qps 0 50
+"""
+
+import argparse
+import threading
+import time
+from unittest import mock
+
+from dlrover.python.common.constants import NodeType
+from dlrover.python.common.global_context import Context
+from dlrover.python.common.node import Node, NodeResource
+from dlrover.python.master.scaler.pod_creation import TokenBucket
+from dlrover.python.master.scaler.pod_scaler import PodScaler
+
+_dlrover_context = Context.singleton_instance()
+
+
+class FakeK8sApiServer(object):
+    def __init__(self, latency, qps):
+        self._latency = latency
+        self._limiter = TokenBucket(qps)
+        self._qps = qps
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.rejected = 0
+
+    def _throttled(self):
+        # Reject the request if there is no token like the HTTP 429.
+        with self._lock:
+            self.requests += 1
+            if self._limiter._reserve() > 0:
+                self._limiter._tokens += 1
+                self.rejected += 1
+                return True
+        return False
+
+    def create_pod(self, pod):
+        time.sleep(self._latency)
+        return not self._throttled()
+
+    def create_service(self, node):
+        time.sleep(self._latency)
+        return not self._throttled()
+
+
+def run_once(pods, concurrency, qps, server):
+    _dlrover_context.pod_creation_concurrency = concurrency
+    _dlrover_context.pod_creation_qps = qps
+    with mock.patch(
+        "dlrover.python.master.scaler.pod_scaler.k8sClient.singleton_instance"
+    ):
+        scaler = PodScaler("benchmark", "default")
+    scaler._k8s_client.create_pod = server.create_pod
+    scaler._create_pod = mock.MagicMock(return_value=True)
+    scaler._create_service_for_pod = server.create_service
+    for i in range(pods):
+        node = Node(NodeType.WORKER, i, NodeResource(1, 1024), rank_index=i)
+        scaler._create_node_queue.append(node)
+
+    start = time.time()
+    scaler._started = True
+    thread = threading.Thread(target=scaler._periodic_create_pod, daemon=True)
+    thread.start()
+    while scaler.get_creation_stats()["created"] < pods:
+        time.sleep(0.05)
+    elapsed = time.time() - start
+    scaler.stop()
+    thread.join()
+    return elapsed, scaler.get_creation_stats()
+
+
+def main(args):
+    print(
+        f"{'concurrency':>12}{'qps':>8}{'seconds':>10}{'pods/s':>10}"
+        f"{'requests':>10}{'rejected':>10}{'p99(s)':>10}"
+    )
+    for concurrency in args.concurrency:
+        for qps in args.qps:
+            server = FakeK8sApiServer(args.latency, args.server_qps)
+            elapsed, stats = run_once(args.pods, concurrency, qps, server)
+            print(
+                f"{concurrency:>12}{qps:>8}{elapsed:>10.2f}"
+                f"{args.pods / elapsed:>10.1f}{server.requests:>10}"
+                f"{server.rejected:>10}{stats['latency_p99_s']:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pods", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 16])
+    parser.add_argument(
+        "--qps",
+        type=float,
+        nargs="+",
+        default=[0, 40],
+        help="The QPS of the pipeline, 0 means no limit.",
+    )
+    parser.add_argument(
+        "--server-qps",
+        type=float,
+        default=100,
+        help="The QPS over which the fake API server rejects requests.",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.02,
+        help="The seconds of the fake API server to handle a request.",
+    )
+    main(parser.parse_args())
@@ -22,6 +22,7 @@ pip install -q grpcio-tools
 pip install -q psutil
 pip install -q deprecated
 pip install -q tornado
+pip install -q msgpack
 
 if [ "$1" = "basic" ]; then
   echo ""
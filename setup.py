@@ -30,6 +30,7 @@ extra_require = {
     "tensorflow": ["tensorflow"],
     "torch": ["torch"],
     "master": ["tornado"],
+    "msgpack": ["msgpack"],
 }
 
 